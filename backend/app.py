@@ -2,8 +2,10 @@ import sys
 import os
 import logging
 
-# Disable Python bytecode generation to prevent __pycache__ files
-sys.dont_write_bytecode = True
+# Bytecode is cached under PYTHONPYCACHEPREFIX instead of __pycache__ folders in the source tree
+sys.dont_write_bytecode = True  # until utils.bytecode has configured the cache directory
+from utils.bytecode import enable_bytecode_cache
+enable_bytecode_cache()
 
 # Configure logging to reduce verbose output
 logging.basicConfig(
@@ -15,24 +17,13 @@ logging.basicConfig(
 import warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
 
-# Suppress matplotlib font manager warnings
-try:
-    import matplotlib
-    matplotlib.set_loglevel('error')  # Only show errors, not warnings
-except ImportError:
-    pass
+# Suppress matplotlib font manager warnings (without importing Matplotlib; report routes load it on first use)
+logging.getLogger('matplotlib').setLevel(logging.ERROR)  # Only show errors, not warnings
 
-from flask import Flask, send_from_directory, jsonify, current_app
+from flask import Flask, send_from_directory, jsonify, current_app, request, g, Response
 import re
-try:
-    import matplotlib.pyplot as plt
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    print("Warning: matplotlib not available - chart functionality will be limited")
-from openpyxl import load_workbook
-from docx import Document
-from docx.shared import Inches
+import threading
+import time
 from flask import current_app
 from flask_pymongo import PyMongo
 from flask_login import LoginManager
@@ -47,6 +38,21 @@ load_dotenv()
 mongo = PyMongo() # Define the PyMongo instance globally
 login_manager = LoginManager()
 
+def create_user_indexes(app):
+    """Create the unique username and email indexes; runs once per process, off the request path"""
+    from pymongo import MongoClient
+    # A client of its own, so the shared client stays unconnected until gunicorn has forked the workers
+    client = MongoClient(app.config["MONGO_URI"], serverSelectionTimeoutMS=10000)
+    try:
+        users = client.get_default_database().users
+        users.create_index('username', unique=True, name='username_unique')
+        users.create_index('email', unique=True, name='email_unique')
+    except Exception as e:
+        # Existing duplicate accounts keep the indexes from being built; lookups still work without them
+        app.logger.warning(f"⚠️ Could not create the user indexes: {e}")
+    finally:
+        client.close()
+
 def create_app():
     app = Flask(__name__, static_folder='../frontend-react/build', static_url_path='')
     
@@ -81,7 +87,9 @@ def create_app():
         ],
         supports_credentials=True,
         allow_headers=["Content-Type", "Authorization"],
-        methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+        methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        # Streamed reports (upload_report with response=docx) carry their errors and timings in headers
+        expose_headers=["Content-Disposition", "X-Chart-Errors", "X-Report-Errors", "X-Report-Timings", "Server-Timing"]
     )
 
     mongo.init_app(app) # Initialize the global mongo instance with the app instance
@@ -90,23 +98,58 @@ def create_app():
     login_manager.init_app(app)
     
     # Import blueprints and User model AFTER mongo and login_manager are initialized
-    from routes.auth import auth_bp, User 
+    from routes.auth import auth_bp, User, USER_FIELDS
     from routes.projects import projects_bp
     app.register_blueprint(auth_bp)
     app.register_blueprint(projects_bp)
+    threading.Thread(target=create_user_indexes, args=(app,), name='user-indexes', daemon=True).start()
+
+    from utils.user_cache import get_user_cache
 
     @login_manager.user_loader
     def load_user(user_id):
+        # Recently loaded users are served from this worker's cache (emptied for a user on logout)
+        user_cache = get_user_cache()
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
         # Access PyMongo via current_app.mongo.db
-        user_doc = current_app.mongo.db.users.find_one({'_id': ObjectId(user_id)})
+        user_doc = current_app.mongo.db.users.find_one({'_id': ObjectId(user_id)}, USER_FIELDS)
         if user_doc:
-            return User(user_doc)
+            user = User(user_doc)
+            user_cache.put(user_id, user)
+            return user
         return None
 
     @login_manager.unauthorized_handler
     def unauthorized_callback():
         return jsonify({'error': 'Unauthorized'}), 401
 
+    # Request latency metrics, aggregated across gunicorn workers by /metrics
+    from utils.metrics import get_metrics, render_prometheus
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics = get_metrics()
+            metrics.observe('graph_http_request_duration_seconds', time.perf_counter() - started, route=route, method=request.method)
+            metrics.inc('graph_http_requests_total', route=route, method=request.method, status=response.status_code)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        # Scrapers don't log in; set METRICS_TOKEN to require a bearer token
+        token = os.environ.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return jsonify({'error': 'Unauthorized'}), 401
+        return Response(render_prometheus(get_metrics()), mimetype='text/plain; version=0.0.4')
+
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
     def serve(path):
@@ -0,0 +1 @@
+# Benchmarks for report generation (synthetic inputs, local Mongo stand-in, baselines)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Batch download ZIP: size against CPU time per compression setting.
+
+Generates one synthetic report, then archives --reports copies of it (each
+written twice, by name and by code, like a batch) with every setting in
+--settings. It reports the ZIP size, the CPU time spent compressing, and the
+wall time added after the last report when the archive is written:
+
+    after:      all reports are compressed once generation has finished
+    background: each report is queued as it finishes (BatchArchive)
+
+Generation is simulated with a --render-seconds pause per report, which is
+how the request thread waits on the report pool.
+
+Usage (from backend/):
+    python -m benchmarks.bench_batch_archive --reports 20 --output batch_archive.json
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from utils.batch_archive import BatchArchive, compression_settings
+
+DEFAULT_SETTINGS = "stored,deflated:1,deflated:6,deflated:9,bzip2:9,lzma"
+
+
+def build_report(work_dir, args):
+    """Bytes of one generated report"""
+    workbook_path = os.path.join(work_dir, "report.xlsx")
+    template_path = os.path.join(work_dir, "report.docx")
+    build_workbook(workbook_path, sections=args.sections, placeholders=5)
+    build_template(template_path, sections=args.sections, placeholders=5)
+    app = create_bench_app()
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'bench', 'user_id': None, 'file_name': 'report.docx', 'file_content': template,
+            'chart_output_format': args.chart_output_format,
+        }).inserted_id)
+    with open(workbook_path, 'rb') as f:
+        response = app.test_client().post(f"/api/projects/{project_id}/upload_report",
+                                          data={'report_file': (io.BytesIO(f.read()), 'report.xlsx'), 'response': 'docx'})
+    if response.status_code != 200:
+        raise RuntimeError(f"report generation failed: {response.status_code}")
+    return response.data
+
+
+def _archive(path, reports, setting, background, render_seconds):
+    name, _, level = setting.partition(':')
+    compression, compresslevel = compression_settings({'BATCH_ZIP_COMPRESSION': name, 'BATCH_ZIP_COMPRESSLEVEL': level})
+    archive = BatchArchive(path, compression, compresslevel, background=background)
+    cpu_started = time.process_time()
+    queued = []
+    for i, report_path in enumerate(reports):
+        time.sleep(render_seconds)
+        entry = {'name': f"Report {i}", 'code': f"R-{i}"}
+        if background:
+            archive.add_report(entry, report_path)
+        else:
+            queued.append((entry, report_path))
+    generated_at = time.perf_counter()
+    for entry, report_path in queued:
+        archive.add_report(entry, report_path)
+    archive.close()
+    return time.perf_counter() - generated_at, time.process_time() - cpu_started
+
+
+def bench_setting(setting, reports, work_dir, args):
+    path = os.path.join(work_dir, "batch.zip")
+    after_seconds, cpu_seconds = _archive(path, reports, setting, False, args.render_seconds)
+    size = os.path.getsize(path)
+    background_seconds, _ = _archive(path, reports, setting, True, args.render_seconds)
+    return {
+        "setting": setting,
+        "zip_mb": round(size / 1024 / 1024, 3),
+        "ratio": round(size / (2 * sum(os.path.getsize(p) for p in reports)), 4),
+        "compress_cpu_seconds": round(cpu_seconds, 4),
+        "added_wall_seconds": {"after": round(after_seconds, 4), "background": round(background_seconds, 4)},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch ZIP size against CPU time per compression setting")
+    parser.add_argument("--reports", type=int, default=20, help="Reports in the batch")
+    parser.add_argument("--sections", type=int, default=6, help="Sections in the synthetic report")
+    parser.add_argument("--chart-output-format", default="png", help="Chart format of the project (png or svg)")
+    parser.add_argument("--render-seconds", type=float, default=0.5, help="Simulated generation time per report")
+    parser.add_argument("--settings", default=DEFAULT_SETTINGS,
+                        help="Comma separated method[:level] (stored, deflated, bzip2, lzma)")
+    parser.add_argument("--output", help="Write the JSON result here (default: stdout)")
+    args = parser.parse_args(argv)
+    args.settings = [s.strip() for s in args.settings.split(",") if s.strip()]
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix="batch_archive_bench_")
+    results = []
+    try:
+        report = build_report(work_dir, args)
+        reports = []
+        for i in range(args.reports):
+            reports.append(os.path.join(work_dir, f"report_{i}.docx"))
+            with open(reports[-1], 'wb') as f:
+                f.write(report)
+        for setting in args.settings:
+            record = bench_setting(setting, reports, work_dir, args)
+            results.append(record)
+            print(f"✅ {setting}: {record['zip_mb']}MB (ratio {record['ratio']}), "
+                  f"{record['compress_cpu_seconds'] * 1000:.0f}ms CPU, added wall "
+                  f"{record['added_wall_seconds']['after'] * 1000:.0f}ms after / "
+                  f"{record['added_wall_seconds']['background'] * 1000:.0f}ms background", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "reports": args.reports,
+        "chart_output_format": args.chart_output_format,
+        "report_kb": round(len(report) / 1024, 1),
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 Batch archive benchmark written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Per-chart-type rendering micro-benchmarks.
+
+Renders every chart type at small, medium and large series sizes through
+the real generate_chart branch (a one-section report per case) and reports
+render time, image and DOCX size and how many times the Agg canvas was drawn.
+--formats png,svg renders each case once per chart output format.
+
+Usage (from backend/):
+    python -m benchmarks.bench_charts --output charts.json
+    python -m benchmarks.bench_charts --types bar,line --sizes 10,1000 --compare charts.json
+    python -m benchmarks.bench_charts --types bar,line --formats png,svg
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_report import create_bench_app, percentile
+from benchmarks.synthetic import ALL_CHART_TYPES, build_template, build_workbook
+from utils.chart_output import CHART_OUTPUT_FORMATS
+
+DEFAULT_SIZES = {"small": 6, "medium": 60, "large": 600}
+
+
+class CanvasDrawCounter:
+    """Count FigureCanvasAgg.draw calls (savefig plus any mid-render canvas.draw())"""
+
+    def __init__(self):
+        self.count = 0
+        self._original = None
+
+    def __enter__(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self._original = FigureCanvasAgg.draw
+        counter = self
+
+        def draw(canvas, *args, **kwargs):
+            counter.count += 1
+            return counter._original(canvas, *args, **kwargs)
+
+        FigureCanvasAgg.draw = draw
+        return self
+
+    def __exit__(self, *exc):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        FigureCanvasAgg.draw = self._original
+
+
+def _image_bytes(docx_path):
+    """Uncompressed size of the chart images (PNG, SVG and SVG fallbacks) in a report"""
+    with zipfile.ZipFile(docx_path) as zf:
+        return sum(info.file_size for info in zf.infolist() if info.filename.startswith("word/media/"))
+
+
+def bench_chart(app, work_dir, chart_type, size_name, points, repeat, seed, output_format="png"):
+    """Render one chart type at one size and output format repeat times; return its timing record"""
+    from routes.projects import _generate_report
+    from utils.error_store import ReportErrors
+    from utils.report_timing import ReportTimer
+
+    workbook_path = os.path.join(work_dir, f"{chart_type}_{size_name}.xlsx")
+    template_path = os.path.join(work_dir, f"{chart_type}_{size_name}.docx")
+    build_workbook(workbook_path, sections=1, chart_mix=[chart_type], series_length=points, placeholders=0, seed=seed)
+    build_template(template_path, sections=1, placeholders=0, with_table=False)
+
+    project_id = f"bench_{chart_type}_{size_name}"
+    samples, draws, image_bytes, docx_bytes, error = [], [], 0, 0, None
+    with app.app_context():
+        for _ in range(repeat):
+            report_timer, report_errors = ReportTimer(), ReportErrors()
+            with CanvasDrawCounter() as counter:
+                output = _generate_report(project_id, template_path, workbook_path, report_timer=report_timer,
+                                          chart_output_format=output_format, report_errors=report_errors)
+            chart = report_timer.charts[0] if report_timer.charts else None
+            if output and os.path.exists(output):
+                image_bytes, docx_bytes = _image_bytes(output), os.path.getsize(output)
+                os.remove(output)
+            if not chart or not chart["success"]:
+                error = report_errors.user_message("section1_chart", "chart was not rendered")
+                break
+            samples.append(chart["seconds"])
+            draws.append(counter.count)
+
+    return {
+        "chart_type": chart_type,
+        "size": size_name,
+        "format": output_format,
+        "points": points,
+        "success": error is None,
+        "error": error,
+        "runs": len(samples),
+        "seconds_p50": percentile(samples, 50),
+        "seconds_max": round(max(samples), 4) if samples else 0.0,
+        "image_bytes": image_bytes,
+        "docx_bytes": docx_bytes,
+        "canvas_draws": max(draws) if draws else 0,
+    }
+
+
+def compare(baseline, current, threshold_percent):
+    """Return (key, before, after, change_percent) for chart cases whose p50 grew beyond the threshold"""
+    before = {(r["chart_type"], r["size"], r.get("format", "png")): r for r in baseline.get("results", [])}
+    regressions = []
+    for record in current.get("results", []):
+        previous = before.get((record["chart_type"], record["size"], record.get("format", "png")))
+        if not previous or not previous["success"] or not record["success"] or not previous["seconds_p50"]:
+            continue
+        change = (record["seconds_p50"] - previous["seconds_p50"]) / previous["seconds_p50"] * 100.0
+        if change > threshold_percent:
+            key = f"{record['chart_type']}/{record['size']}"
+            if record.get("format", "png") != "png":
+                key += f"/{record['format']}"
+            regressions.append((key, previous["seconds_p50"],
+                                record["seconds_p50"], round(change, 1)))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render time and PNG size per chart type and series size")
+    parser.add_argument("--types", default="all", help="Comma separated chart types (default: all)")
+    parser.add_argument("--sizes", default=",".join(str(v) for v in DEFAULT_SIZES.values()),
+                        help="Comma separated series lengths for small,medium,large")
+    parser.add_argument("--formats", default="png", help="Comma separated chart output formats (png,svg)")
+    parser.add_argument("--repeat", type=int, default=3, help="Renders per chart type and size")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="Write the JSON result here (default: stdout)")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+    args.types = ALL_CHART_TYPES if args.types == "all" else [t.strip() for t in args.types.split(",") if t.strip()]
+    unknown = [t for t in args.types if t not in ALL_CHART_TYPES]
+    if unknown:
+        parser.error(f"unknown chart types: {unknown}")
+    args.formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    if any(f not in CHART_OUTPUT_FORMATS for f in args.formats):
+        parser.error(f"--formats must be chosen from {CHART_OUTPUT_FORMATS}")
+    points = [int(v) for v in args.sizes.split(",") if v.strip()]
+    args.sizes = dict(zip(DEFAULT_SIZES, points)) if len(points) <= len(DEFAULT_SIZES) else {f"n{p}": p for p in points}
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = create_bench_app()
+    app.logger.setLevel("WARNING")
+
+    work_dir = tempfile.mkdtemp(prefix="chart_bench_")
+    results = []
+    try:
+        for chart_type in args.types:
+            for size_name, points in args.sizes.items():
+                for output_format in args.formats:
+                    record = bench_chart(app, work_dir, chart_type, size_name, points, args.repeat, args.seed, output_format)
+                    results.append(record)
+                    status = f"{record['seconds_p50']:.3f}s images={record['image_bytes'] / 1024:.0f}KB " \
+                             f"docx={record['docx_bytes'] / 1024:.0f}KB draws={record['canvas_draws']}" \
+                        if record["success"] else f"failed: {str(record['error'])[:80]}"
+                    print(f"{'✅' if record['success'] else '❌'} {chart_type}/{size_name}/{output_format} ({points}): {status}",
+                          file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "config": {"types": args.types, "sizes": args.sizes, "formats": args.formats, "repeat": args.repeat, "seed": args.seed},
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 Chart benchmark written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), result, args.threshold)
+        for key, before, after, change in regressions:
+            print(f"❌ {key}: {before}s -> {after}s ({change:+.1f}%)", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Light-endpoint latency while reports are being generated.
+
+Serves the bench app from a threaded WSGI server (like gunicorn's gthread
+workers), keeps --generators threads posting upload_report in a loop and
+meanwhile polls GET /api/projects, which is what the dashboard does. Each
+mode is run idle (no generators) and under load:
+
+    inline: reports run in the request threads (REPORT_POOL_WORKERS=0)
+    pool:   reports run in a report pool of --pool-workers processes
+
+Usage (from backend/):
+    python -m benchmarks.bench_concurrency --seconds 20 --output concurrency.json
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+
+from benchmarks.bench_report import create_bench_app, percentile
+from benchmarks.synthetic import build_template, build_workbook
+
+
+def _multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    for name, value in fields.items():
+        body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content) in files.items():
+        body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                   f'Content-Type: application/octet-stream\r\n\r\n'.encode())
+        body.write(content + b'\r\n')
+    body.write(f'--{boundary}--\r\n'.encode())
+    return body.getvalue(), f'multipart/form-data; boundary={boundary}'
+
+
+def bench_mode(mode, args, work_dir, load):
+    workbook_path = os.path.join(work_dir, "report.xlsx")
+    template_path = os.path.join(work_dir, "report.docx")
+    if not os.path.exists(workbook_path):
+        build_workbook(workbook_path, sections=args.sections, placeholders=5)
+        build_template(template_path, sections=args.sections, placeholders=5)
+
+    app = create_bench_app()
+    if mode == "pool":
+        app.config['REPORT_POOL_WORKERS'] = args.pool_workers
+        app.config['REPORT_POOL_APP_FACTORY'] = 'benchmarks.bench_report:create_bench_app'
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'bench', 'user_id': None, 'file_name': 'report.docx', 'file_content': template,
+        }).inserted_id)
+    with open(workbook_path, 'rb') as f:
+        body, content_type = _multipart({'response': 'docx'}, {'report_file': ('report.xlsx', f.read())})
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    base = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    stop = threading.Event()
+    reports = []
+
+    def post_report():
+        request = urllib.request.Request(f"{base}/api/projects/{project_id}/upload_report", data=body,
+                                         headers={'Content-Type': content_type}, method='POST')
+        with urllib.request.urlopen(request, timeout=600) as response:
+            response.read()
+
+    def generate():
+        while not stop.is_set():
+            started = time.perf_counter()
+            post_report()
+            reports.append(time.perf_counter() - started)
+
+    if load:
+        # One report first so pool start-up is not measured as load
+        post_report()
+        generators = [threading.Thread(target=generate, daemon=True) for _ in range(args.generators)]
+        for thread in generators:
+            thread.start()
+        time.sleep(1.0)
+
+    latencies = []
+    deadline = time.perf_counter() + args.seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        with urllib.request.urlopen(f"{base}/api/projects?limit=20", timeout=60) as response:
+            response.read()
+        latencies.append(time.perf_counter() - started)
+        time.sleep(args.poll_interval)
+
+    stop.set()
+    if load:
+        for thread in generators:
+            thread.join()
+    server.shutdown()
+    from utils.report_pool import get_report_pool
+    get_report_pool(app).shutdown()
+
+    return {
+        "mode": mode,
+        "load": load,
+        "requests": len(latencies),
+        "reports_completed": len(reports),
+        "projects_latency_seconds": {
+            "p50": percentile(latencies, 50),
+            "p99": percentile(latencies, 99),
+            "max": round(max(latencies), 4) if latencies else 0.0,
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GET /api/projects latency while reports are generated")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Polling time per case")
+    parser.add_argument("--generators", type=int, default=2, help="Threads generating reports under load")
+    parser.add_argument("--pool-workers", type=int, default=2, help="Report pool processes in the pool mode")
+    parser.add_argument("--sections", type=int, default=6, help="Sections in the synthetic report")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Pause between project list requests")
+    parser.add_argument("--modes", default="inline,pool", help="Comma separated modes (inline,pool)")
+    parser.add_argument("--output", help="Write the JSON result here (default: stdout)")
+    args = parser.parse_args(argv)
+    args.modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if any(m not in ("inline", "pool") for m in args.modes):
+        parser.error("--modes must be chosen from inline,pool")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix="concurrency_bench_")
+    results = []
+    try:
+        for mode in args.modes:
+            for load in (False, True):
+                record = bench_mode(mode, args, work_dir, load)
+                results.append(record)
+                latency = record["projects_latency_seconds"]
+                print(f"✅ {mode} {'under load' if load else 'idle'}: /api/projects p50 {latency['p50'] * 1000:.1f}ms, "
+                      f"p99 {latency['p99'] * 1000:.1f}ms, max {latency['max'] * 1000:.1f}ms "
+                      f"({record['reports_completed']} reports)", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 Concurrency benchmark written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Benchmark the real report generation path on synthetic inputs.
+
+Runs _generate_report directly and the batch ZIP endpoint through a Flask
+test client backed by an in-memory Mongo stand-in, then writes a JSON
+baseline with throughput, latency percentiles and peak RSS.
+
+Usage (from backend/):
+    python -m benchmarks.bench_report --sections 8 --iterations 5 --output baseline.json
+    python -m benchmarks.bench_report --compare baseline.json --output current.json
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import ALL_CHART_TYPES, DEFAULT_CHART_MIX, build_template, build_workbook
+from benchmarks.local_mongo import LocalMongo
+from utils.chart_output import PNG_OPTIMIZATION_PRESETS
+
+BASELINE_SCHEMA = 1
+
+# Metrics compared between runs; "higher" ones regress when they drop, the rest when they grow
+COMPARED_METRICS = {
+    "single_report.throughput_per_second": "higher",
+    "single_report.latency_seconds.p50": "lower",
+    "single_report.latency_seconds.p95": "lower",
+    "single_report.latency_seconds.p99": "lower",
+    "single_report.peak_rss_mb": "lower",
+    "batch.throughput_per_second": "higher",
+    "batch.seconds": "lower",
+    "batch.peak_rss_mb": "lower",
+}
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile, matching utils.report_timing"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(int(math.ceil(percent / 100.0 * len(ordered))) - 1, 0)
+    return round(ordered[rank], 4)
+
+
+class RssSampler:
+    """Sample this process's RSS on a background thread and keep the peak"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_bytes = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.process.memory_info().rss)
+
+    @property
+    def peak_mb(self):
+        return round(self.peak_bytes / 1024 / 1024, 1)
+
+
+def create_bench_app():
+    """A minimal app with the projects blueprint, no auth and an in-memory Mongo"""
+    from flask import Flask
+    from flask_login import LoginManager
+    from routes.projects import projects_bp
+
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'benchmark'
+    app.config['LOGIN_DISABLED'] = True
+    # Reports run in the calling thread against the in-memory Mongo (no report pool processes)
+    app.config['REPORT_POOL_WORKERS'] = 0
+    login_manager = LoginManager()
+    login_manager.init_app(app)
+    login_manager.user_loader(lambda user_id: None)
+    app.mongo = LocalMongo()
+    app.register_blueprint(projects_bp)
+    return app
+
+
+def _environment():
+    import matplotlib
+    import pandas
+    import plotly
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "matplotlib": matplotlib.__version__,
+        "plotly": plotly.__version__,
+        "pandas": pandas.__version__,
+    }
+
+
+def bench_single_report(app, work_dir, args):
+    """Generate the same synthetic report args.iterations times (after warm-up runs)"""
+    from routes.projects import _generate_report
+    from utils.report_timing import ReportTimer, TimingHistogram
+
+    workbook_path = os.path.join(work_dir, "single.xlsx")
+    template_path = os.path.join(work_dir, "single.docx")
+    build_workbook(workbook_path, sections=args.sections, chart_mix=args.chart_mix,
+                   series_length=args.series_length, placeholders=args.placeholders, seed=args.seed)
+    build_template(template_path, sections=args.sections, placeholders=args.placeholders)
+
+    histogram = TimingHistogram(window_size=max(args.iterations, 1))
+    latencies = []
+    failures = 0
+    chart_failures = {}
+    with app.app_context():
+        for _ in range(args.warmup):
+            output = _generate_report("bench_warmup", template_path, workbook_path, png_optimization=args.png_optimization)
+            if output and os.path.exists(output):
+                os.remove(output)
+
+        with RssSampler() as rss:
+            started = time.perf_counter()
+            for i in range(args.iterations):
+                report_timer = ReportTimer()
+                run_started = time.perf_counter()
+                output = _generate_report(f"bench_{i}", template_path, workbook_path, report_timer=report_timer,
+                                          png_optimization=args.png_optimization)
+                latencies.append(time.perf_counter() - run_started)
+                histogram.observe_report(report_timer)
+                if not output:
+                    failures += 1
+                elif os.path.exists(output):
+                    os.remove(output)
+                for chart in report_timer.charts:
+                    if not chart["success"]:
+                        chart_failures[chart["chart_type"]] = chart_failures.get(chart["chart_type"], 0) + 1
+            elapsed = time.perf_counter() - started
+
+    summary = histogram.summary()
+    return {
+        "iterations": args.iterations,
+        "failures": failures,
+        "chart_failures": chart_failures,
+        "seconds": round(elapsed, 4),
+        "throughput_per_second": round(args.iterations / elapsed, 4) if elapsed else 0.0,
+        "latency_seconds": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "mean": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+            "max": round(max(latencies), 4) if latencies else 0.0,
+        },
+        "stages": summary["stages"],
+        "chart_types": summary["chart_types"],
+        "peak_rss_mb": rss.peak_mb,
+    }
+
+
+def bench_batch(app, work_dir, args):
+    """Upload a ZIP of args.batch_files workbooks to the batch endpoint"""
+    template_path = os.path.join(work_dir, "batch.docx")
+    build_template(template_path, sections=args.sections, placeholders=args.placeholders)
+    with open(template_path, 'rb') as f:
+        template_content = f.read()
+
+    with app.app_context():
+        project_id = app.mongo.db.projects.insert_one({
+            'name': 'Benchmark project',
+            'file_name': 'batch.docx',
+            'file_content': template_content,
+            'png_optimization': args.png_optimization,
+        }).inserted_id
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for i in range(args.batch_files):
+            workbook_path = os.path.join(work_dir, f"batch_{i}.xlsx")
+            build_workbook(workbook_path, sections=args.sections, chart_mix=args.chart_mix,
+                           series_length=args.series_length, placeholders=args.placeholders, seed=args.seed + i)
+            zf.write(workbook_path, arcname=f"batch_{i}.xlsx")
+    archive.seek(0)
+
+    client = app.test_client()
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        response = client.post(f"/api/projects/{project_id}/upload_zip",
+                               data={'zip_file': (archive, 'batch.zip')},
+                               content_type='multipart/form-data')
+        elapsed = time.perf_counter() - started
+
+    payload = response.get_json(silent=True) or {}
+    download_zip = payload.get('download_zip')
+    zip_bytes = 0
+    if download_zip and os.path.exists(download_zip):
+        zip_bytes = os.path.getsize(download_zip)
+        os.remove(download_zip)
+    generated = payload.get('processed_files', 0)
+    return {
+        "status_code": response.status_code,
+        "files": args.batch_files,
+        "generated": generated,
+        "seconds": round(elapsed, 4),
+        "throughput_per_second": round(generated / elapsed, 4) if elapsed else 0.0,
+        "zip_bytes": zip_bytes,
+        "peak_rss_mb": rss.peak_mb,
+    }
+
+
+def _lookup(result, dotted):
+    value = result
+    for part in dotted.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(baseline, current, threshold_percent):
+    """Return a list of (metric, baseline, current, change_percent, regressed) for the compared metrics"""
+    rows = []
+    for metric, better in COMPARED_METRICS.items():
+        before, after = _lookup(baseline, metric), _lookup(current, metric)
+        if not isinstance(before, (int, float)) or not isinstance(after, (int, float)) or not before:
+            continue
+        change = (after - before) / before * 100.0
+        regressed = change < -threshold_percent if better == "higher" else change > threshold_percent
+        rows.append((metric, before, after, round(change, 1), regressed))
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark report generation on synthetic workbooks")
+    parser.add_argument("--sections", type=int, default=6, help="Chart sections per report")
+    parser.add_argument("--chart-mix", default=",".join(DEFAULT_CHART_MIX),
+                        help=f"Comma separated chart types, or 'all' ({len(ALL_CHART_TYPES)} types)")
+    parser.add_argument("--series-length", type=int, default=12, help="Points per chart series")
+    parser.add_argument("--placeholders", type=int, default=20, help="Extra text placeholders per report")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed single-report runs")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed single-report runs first")
+    parser.add_argument("--batch-files", type=int, default=3, help="Workbooks in the batch ZIP (0 to skip)")
+    parser.add_argument("--png-optimization", default="off", choices=list(PNG_OPTIMIZATION_PRESETS),
+                        help="Project PNG optimisation preset for the generated reports")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="Write the JSON result here (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if any metric regressed")
+    args = parser.parse_args(argv)
+    args.chart_mix = ALL_CHART_TYPES if args.chart_mix == "all" else [t.strip() for t in args.chart_mix.split(",") if t.strip()]
+    unknown = [t for t in args.chart_mix if t not in ALL_CHART_TYPES]
+    if unknown:
+        parser.error(f"unknown chart types: {unknown}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = create_bench_app()
+    app.logger.setLevel("WARNING")
+
+    work_dir = tempfile.mkdtemp(prefix="report_bench_")
+    try:
+        result = {
+            "schema": BASELINE_SCHEMA,
+            "created_at": datetime.now().isoformat(),
+            "config": {
+                "sections": args.sections,
+                "chart_mix": args.chart_mix,
+                "series_length": args.series_length,
+                "placeholders": args.placeholders,
+                "iterations": args.iterations,
+                "batch_files": args.batch_files,
+                "seed": args.seed,
+            },
+            "environment": _environment(),
+            "single_report": bench_single_report(app, work_dir, args),
+        }
+        if args.png_optimization != "off":
+            result["config"]["png_optimization"] = args.png_optimization
+        if args.batch_files > 0:
+            result["batch"] = bench_batch(app, work_dir, args)
+        result["process_peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 Benchmark written to {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != result["config"]:
+            print("⚠️  Baseline was recorded with a different config; deltas may not be comparable")
+        rows = compare(baseline, result, args.threshold)
+        for metric, before, after, change, regressed in rows:
+            print(f"{'❌' if regressed else '✅'} {metric}: {before} -> {after} ({change:+.1f}%)")
+        if args.fail_on_regression and any(row[4] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Worker startup benchmark.
+
+Starts fresh interpreters that import app, run create_app() and serve a
+first request, and reports how long that takes with and without the
+bytecode cache, which heavy libraries were loaded on the way, and what the
+first report later pays to import them.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_report import percentile
+from utils.bytecode import REPORT_LIBRARIES
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "matplotlib.pyplot", "plotly", "openpyxl", "docx", "squarify", "PIL")
+
+# Runs in the child interpreter; prints one JSON line
+PROBE = """
+import importlib, json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+flask_app.test_client().get('/metrics')
+served = time.perf_counter()
+loaded = [name for name in %(heavy)r if name in sys.modules]
+for name in %(report)r:
+    importlib.import_module(name)
+print(json.dumps({
+    "import_seconds": imported - started,
+    "create_app_seconds": created - imported,
+    "first_request_seconds": served - created,
+    "ready_seconds": served - started,
+    "report_imports_seconds": time.perf_counter() - served,
+    "heavy_modules_loaded": loaded,
+}))
+"""
+
+
+def run_probe(env, cwd=BACKEND_DIR):
+    """Start one interpreter and return its measurements"""
+    code = PROBE % {"heavy": HEAVY_MODULES, "report": REPORT_LIBRARIES}
+    output = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench_mode(mode, runs, work_dir):
+    """
+    no_cache: the previous setup - PYTHONDONTWRITEBYTECODE on a checkout without __pycache__ folders,
+              so the backend is compiled from source on every start (libraries use their installed bytecode)
+    warm: the cache directory precompiled by `python -m utils.bytecode`
+    """
+    env = dict(os.environ, MONGO_URI=os.environ.get("MONGO_URI", "mongodb://localhost:27017/graph_project_bench"))
+    env.pop("PYTHONPYCACHEPREFIX", None)
+    env.pop("BYTECODE_CACHE", None)
+    if mode == "no_cache":
+        cwd = os.path.join(work_dir, "backend")
+        shutil.copytree(BACKEND_DIR, cwd, ignore=shutil.ignore_patterns("__pycache__", "uploads", "venv", ".venv"))
+        env.update(PYTHONDONTWRITEBYTECODE="1", BYTECODE_CACHE="0")
+    else:
+        cwd = BACKEND_DIR
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        env["PYTHONPYCACHEPREFIX"] = work_dir
+        subprocess.run([sys.executable, "-m", "utils.bytecode"], cwd=cwd, env=env, check=True, capture_output=True)
+
+    samples = [run_probe(env, cwd) for _ in range(runs)]
+    summary = {"mode": mode, "runs": runs, "heavy_modules_loaded": samples[-1]["heavy_modules_loaded"]}
+    for key in ("import_seconds", "create_app_seconds", "first_request_seconds", "ready_seconds", "report_imports_seconds"):
+        summary[key] = percentile([sample[key] for sample in samples], 50)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time from interpreter start to a served request")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter starts per mode")
+    parser.add_argument("--modes", default="no_cache,warm", help="Comma separated modes (no_cache,warm)")
+    parser.add_argument("--output", help="Write the JSON result here (default: stdout)")
+    args = parser.parse_args(argv)
+    args.modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if any(m not in ("no_cache", "warm") for m in args.modes):
+        parser.error("--modes must be chosen from no_cache,warm")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for mode in args.modes:
+        work_dir = tempfile.mkdtemp(prefix="startup_bench_")
+        try:
+            record = bench_mode(mode, args.runs, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        results.append(record)
+        print(f"✅ {mode}: ready in {record['ready_seconds']:.3f}s (import {record['import_seconds']:.3f}s), "
+              f"report libraries +{record['report_imports_seconds']:.3f}s, "
+              f"heavy modules at startup: {', '.join(record['heavy_modules_loaded']) or 'none'}", file=sys.stderr)
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 Startup benchmark written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
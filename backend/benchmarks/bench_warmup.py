@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Pre-fork warm-up benchmark.
+
+Mimics gunicorn's preload_app: a parent process builds the app (and, in
+the warm mode, runs utils.warmup.warm_rendering_stack), then forks
+workers that each generate the same small synthetic report twice. Reports
+the first and second report latency per worker and how much of the
+worker's memory is still shared with the parent afterwards.
+
+Usage (from backend/, Linux only):
+    python -m benchmarks.bench_warmup --workers 3 --output warmup.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_report import percentile
+from benchmarks.synthetic import build_template, build_workbook
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh parent interpreter; each forked worker prints one JSON line
+PROBE = """
+import json, os, sys, time
+from benchmarks.bench_report import create_bench_app
+from routes.projects import _generate_report
+app = create_bench_app()
+warmup_seconds = 0.0
+if %(warm)r:
+    from utils.warmup import warm_rendering_stack
+    started = time.perf_counter()
+    warm_rendering_stack()
+    warmup_seconds = time.perf_counter() - started
+
+def memory_kb():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0), fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)
+
+for _ in range(%(workers)d):
+    pid = os.fork()
+    if pid == 0:
+        latencies = []
+        with app.app_context():
+            for _ in range(2):
+                started = time.perf_counter()
+                output = _generate_report('bench_warmup', %(template)r, %(workbook)r)
+                latencies.append(time.perf_counter() - started)
+                if output and os.path.exists(output):
+                    os.remove(output)
+        private_kb, shared_kb = memory_kb()
+        print(json.dumps({"first_report_seconds": latencies[0], "second_report_seconds": latencies[1],
+                          "private_mb": private_kb / 1024, "shared_mb": shared_kb / 1024,
+                          "warmup_seconds": warmup_seconds}), flush=True)
+        os._exit(0)
+    os.waitpid(pid, 0)
+"""
+
+
+def bench_mode(mode, workers, work_dir, sections):
+    workbook_path = os.path.join(work_dir, "report.xlsx")
+    template_path = os.path.join(work_dir, "report.docx")
+    if not os.path.exists(workbook_path):
+        build_workbook(workbook_path, sections=sections, placeholders=5)
+        build_template(template_path, sections=sections, placeholders=5)
+    code = PROBE % {"warm": mode == "warm", "workers": workers, "template": template_path, "workbook": workbook_path}
+    env = dict(os.environ, MONGO_URI=os.environ.get("MONGO_URI", "mongodb://localhost:27017/graph_project_bench"))
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    samples = [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+    summary = {"mode": mode, "workers": len(samples), "warmup_seconds": round(samples[0]["warmup_seconds"], 4)}
+    for key in ("first_report_seconds", "second_report_seconds", "private_mb", "shared_mb"):
+        summary[key] = percentile([sample[key] for sample in samples], 50)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="First-report latency of forked workers with and without warm-up")
+    parser.add_argument("--workers", type=int, default=3, help="Workers forked per mode")
+    parser.add_argument("--sections", type=int, default=6, help="Sections in the synthetic report")
+    parser.add_argument("--modes", default="cold,warm", help="Comma separated modes (cold,warm)")
+    parser.add_argument("--output", help="Write the JSON result here (default: stdout)")
+    args = parser.parse_args(argv)
+    args.modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if any(m not in ("cold", "warm") for m in args.modes):
+        parser.error("--modes must be chosen from cold,warm")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix="warmup_bench_")
+    results = []
+    try:
+        for mode in args.modes:
+            record = bench_mode(mode, args.workers, work_dir, args.sections)
+            results.append(record)
+            print(f"✅ {mode}: first report {record['first_report_seconds']:.3f}s, "
+                  f"second {record['second_report_seconds']:.3f}s, "
+                  f"worker private {record['private_mb']:.0f}MB / shared {record['shared_mb']:.0f}MB", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 Warm-up benchmark written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
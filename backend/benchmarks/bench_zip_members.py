@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Time to the first batch workbook and temp disk use: extractall vs streaming.
+
+Builds a batch ZIP with --files workbooks plus --padding-mb of non-Excel
+attachments, then opens it the way upload_zip used to (testzip, extractall,
+os.walk) and the way it does now (central directory, one Excel member
+streamed at a time with copy_member). Report generation is not included;
+"first" is when the first workbook is on disk and ready to be generated.
+
+Usage (from backend/):
+    python -m benchmarks.bench_zip_members --files 50 --padding-mb 200 --output zip_members.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import build_workbook
+from utils.batch_upload import copy_member, is_batch_workbook
+
+
+def build_zip(work_dir, args):
+    workbook_path = os.path.join(work_dir, "workbook.xlsx")
+    build_workbook(workbook_path, sections=args.sections, placeholders=5)
+    zip_path = os.path.join(work_dir, "batch.zip")
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        # Scans and photos that users zip up with the workbooks; random so they do not compress
+        for i in range(args.padding_mb // 10):
+            zf.writestr(f"attachments/scan_{i}.bin", os.urandom(10 * 1024 * 1024))
+        for i in range(args.files):
+            zf.write(workbook_path, arcname=f"workbooks/report_{i}.xlsx")
+    return zip_path
+
+
+def _disk_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(directory) for name in files)
+
+
+def bench_extractall(zip_path):
+    out_dir = tempfile.mkdtemp(prefix="zip_extractall_")
+    started = time.perf_counter()
+    try:
+        with zipfile.ZipFile(zip_path) as zip_ref:
+            zip_ref.testzip()
+            zip_ref.extractall(out_dir)
+        excel_files = [os.path.join(root, name) for root, _, files in os.walk(out_dir)
+                       for name in files if name.endswith('.xlsx') or name.endswith('.xls')]
+        first = time.perf_counter() - started
+        peak_disk = _disk_bytes(out_dir)
+        total = time.perf_counter() - started
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return {"first_workbook_seconds": round(first, 4), "all_workbooks_seconds": round(total, 4),
+            "peak_disk_mb": round(peak_disk / 1024 / 1024, 2), "workbooks": len(excel_files)}
+
+
+def bench_streaming(zip_path):
+    out_dir = tempfile.mkdtemp(prefix="zip_streaming_")
+    started = time.perf_counter()
+    first, peak_disk, workbooks = None, 0, 0
+    try:
+        with zipfile.ZipFile(zip_path) as zip_ref:
+            for info in zip_ref.infolist():
+                if not is_batch_workbook(info.filename):
+                    continue
+                excel_path = os.path.join(out_dir, "member.xlsx")
+                with open(excel_path, 'wb') as target:
+                    copy_member(zip_ref, info, target)
+                first = first if first is not None else time.perf_counter() - started
+                peak_disk = max(peak_disk, _disk_bytes(out_dir))
+                workbooks += 1
+                os.remove(excel_path)
+        total = time.perf_counter() - started
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return {"first_workbook_seconds": round(first or 0.0, 4), "all_workbooks_seconds": round(total, 4),
+            "peak_disk_mb": round(peak_disk / 1024 / 1024, 2), "workbooks": workbooks}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch ZIP member handling: extractall vs streaming")
+    parser.add_argument("--files", type=int, default=50, help="Workbooks in the ZIP")
+    parser.add_argument("--padding-mb", type=int, default=100, help="Non-Excel attachments in the ZIP (MB)")
+    parser.add_argument("--sections", type=int, default=6, help="Sections in each synthetic workbook")
+    parser.add_argument("--output", help="Write the JSON result here (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix="zip_members_bench_")
+    try:
+        zip_path = build_zip(work_dir, args)
+        results = {"extractall": bench_extractall(zip_path), "streaming": bench_streaming(zip_path)}
+        zip_mb = round(os.path.getsize(zip_path) / 1024 / 1024, 2)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    for mode, record in results.items():
+        print(f"✅ {mode}: first workbook {record['first_workbook_seconds'] * 1000:.1f}ms, "
+              f"all {record['all_workbooks_seconds'] * 1000:.1f}ms, peak disk {record['peak_disk_mb']}MB",
+              file=sys.stderr)
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "files": args.files,
+        "zip_mb": zip_mb,
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 ZIP member benchmark written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
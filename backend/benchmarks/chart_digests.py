@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Image digests per chart case, to check that a renderer refactor draws the same pixels.
+
+Renders every chart type, plus variants that reach the less common renderer
+paths (secondary axis labels, mixed bar/line series, stacked areas, treemap
+legend and root options, bubble label distances, downsampling), through
+_generate_report and records the SHA-256 of each chart image. Run it before
+and after a change and compare:
+
+Usage (from backend/):
+    python -m benchmarks.chart_digests --output before.json
+    python -m benchmarks.chart_digests --compare before.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import ALL_CHART_TYPES, build_template, build_workbook
+
+
+def _secondary_axis(attrs):
+    attrs["chart_meta"].update({"disable_secondary_y": False, "value_format": ".1f", "data_label_font_size": 8,
+                                "secondary_y_label": "Share"})
+
+
+def _combo_line(attrs):
+    _secondary_axis(attrs)
+    first = attrs["series"]["data"][0]
+    attrs["series"]["data"].append(dict(first, name="Trend", type="line", marker={"color": "#ed7d31"}))
+
+
+def _stacked_area(attrs):
+    first = attrs["series"]["data"][0]
+    attrs["series"]["data"] = [dict(first, fill="tonexty"), dict(first, name="Series 2", fill="tonexty")]
+
+
+def _no_labels(attrs):
+    attrs["chart_meta"]["data_labels"] = False
+
+
+def _no_legend(attrs):
+    attrs["chart_meta"]["legend"] = False
+
+
+def _hidden_root(attrs):
+    attrs["chart_meta"]["hide_center_box"] = True
+
+
+def _label_distance(attrs):
+    attrs["chart_meta"].update({"x_axis_label_distance": 2, "y_axis_label_distance": 3})
+    # Bubble axes are padded numerically, and without a marker colour bubbles use the default palette
+    attrs["series"]["x_axis"] = list(range(1, 9))
+    for series in attrs["series"]["data"]:
+        series.pop("marker", None)
+    attrs["series"].pop("colors", None)
+
+
+def _downsample(attrs):
+    attrs["chart_meta"]["downsample"] = {"method": "lttb", "points": 40, "max_labels": 5}
+
+
+# name -> (chart type, change to its Chart_Attributes, series length)
+VARIANTS = {
+    "line/secondary_axis": ("line", _secondary_axis, 12),
+    "bar/combo_line": ("bar", _combo_line, 12),
+    "bar/no_labels": ("bar", _no_labels, 12),
+    "area/stacked": ("area", _stacked_area, 12),
+    "treemap/no_legend": ("treemap", _no_legend, 6),
+    "treemap/hidden_root": ("treemap", _hidden_root, 6),
+    "bubble/label_distance": ("bubble", _label_distance, 8),
+    "scatter/downsample": ("scatter", _downsample, 400),
+    "line/downsample": ("line", lambda attrs: (_secondary_axis(attrs), _downsample(attrs)), 400),
+}
+
+
+def cases():
+    """(name, chart type, attribute change, series length) for every chart type and variant"""
+    return [(chart_type, chart_type, None, 12) for chart_type in ALL_CHART_TYPES] + \
+        [(name, chart_type, change, points) for name, (chart_type, change, points) in VARIANTS.items()]
+
+
+def _patch_attributes(workbook_path, change):
+    wb = openpyxl.load_workbook(workbook_path)
+    ws = wb["report"]
+    column = [cell.value for cell in ws[1]].index("Chart_Attributes") + 1
+    attrs = json.loads(ws.cell(2, column).value)
+    change(attrs)
+    ws.cell(2, column).value = json.dumps(attrs)
+    wb.save(workbook_path)
+    wb.close()
+
+
+def chart_digest(app, work_dir, name, chart_type, change, points, seed=1234):
+    """SHA-256 of the chart images of a one-section report, or None when the chart was not drawn"""
+    from routes.projects import _generate_report
+
+    stem = os.path.join(work_dir, name.replace("/", "_"))
+    build_workbook(f"{stem}.xlsx", sections=1, chart_mix=[chart_type], series_length=points, placeholders=0, seed=seed)
+    build_template(f"{stem}.docx", sections=1, placeholders=0, with_table=False)
+    if change:
+        _patch_attributes(f"{stem}.xlsx", change)
+
+    with app.app_context():
+        output = _generate_report(f"digest_{os.path.basename(stem)}", f"{stem}.docx", f"{stem}.xlsx")
+    if not output or not os.path.exists(output):
+        return None
+    digest = hashlib.sha256()
+    with zipfile.ZipFile(output) as zf:
+        media = sorted(n for n in zf.namelist() if n.startswith("word/media/"))
+        for member in media:
+            digest.update(zf.read(member))
+    os.remove(output)
+    return digest.hexdigest() if media else None
+
+
+def compare(baseline, current):
+    """Names of the cases whose images differ from the baseline"""
+    return [name for name, digest in current.items() if name in baseline and baseline[name] != digest]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chart image digests, to compare renderer output before and after a change")
+    parser.add_argument("--output", help="Write the digests here (default: stdout)")
+    parser.add_argument("--compare", help="Earlier digests JSON; exit 1 when any chart image changed")
+    args = parser.parse_args(argv)
+
+    app = create_bench_app()
+    app.logger.setLevel("ERROR")
+    work_dir = tempfile.mkdtemp(prefix="chart_digests_")
+    try:
+        digests = {name: chart_digest(app, work_dir, name, chart_type, change, points)
+                   for name, chart_type, change, points in cases()}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(digests, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"📊 {len(digests)} chart digests written to {args.output}", file=sys.stderr)
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            changed = compare(json.load(f), digests)
+        for name in changed:
+            print(f"❌ {name}: chart image changed", file=sys.stderr)
+        if changed:
+            return 1
+        print(f"✅ {len(digests)} chart images are byte-identical", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
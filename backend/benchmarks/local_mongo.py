@@ -0,0 +1,153 @@
+"""
+In-memory stand-in for the parts of Flask-PyMongo the report routes use.
+
+Only equality and comparison ($lt/$gt) filters, exclusion projections,
+single-key sorts, $set updates and index creation (as a no-op) are
+supported - enough to drive the project endpoints without a server.
+"""
+
+import copy
+
+from bson import ObjectId
+
+
+_OPERATORS = {
+    '$lt': lambda value, operand: value is not None and value < operand,
+    '$gt': lambda value, operand: value is not None and value > operand,
+}
+
+
+def _matches(document, query):
+    for key, condition in (query or {}).items():
+        value = document.get(key)
+        if isinstance(condition, dict) and condition and all(op in _OPERATORS for op in condition):
+            if not all(_OPERATORS[op](value, operand) for op, operand in condition.items()):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(document, projection):
+    document = copy.deepcopy(document)
+    included = [key for key, include in (projection or {}).items() if include]
+    if included:
+        # Inclusion projection: only the listed fields, plus _id unless it is excluded
+        keep = set(included) | ({'_id'} if projection.get('_id', 1) else set())
+        return {key: value for key, value in document.items() if key in keep}
+    for key, include in (projection or {}).items():
+        if not include:
+            document.pop(key, None)
+    return document
+
+
+class LocalCursor:
+    """Result list with the cursor methods the app chains onto find()"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction=1):
+        self.documents.sort(key=lambda d: d.get(key), reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        if count:
+            self.documents = self.documents[:count]
+        return self
+
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class _InsertOneResult:
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class _UpdateResult:
+    def __init__(self, matched_count, modified_count):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+
+
+class _DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class LocalCollection:
+    """A list of documents with the pymongo collection methods the app calls"""
+
+    def __init__(self):
+        self.documents = []
+
+    def insert_one(self, document):
+        document.setdefault('_id', ObjectId())
+        self.documents.append(copy.deepcopy(document))
+        return _InsertOneResult(document['_id'])
+
+    def find_one(self, query=None, projection=None):
+        for document in self.documents:
+            if _matches(document, query):
+                return _project(document, projection)
+        return None
+
+    def find(self, query=None, projection=None):
+        return LocalCursor([_project(d, projection) for d in self.documents if _matches(d, query)])
+
+    def count_documents(self, query):
+        return sum(1 for d in self.documents if _matches(d, query))
+
+    def update_one(self, query, update, upsert=False):
+        for document in self.documents:
+            if _matches(document, query):
+                document.update(copy.deepcopy(update.get('$set', {})))
+                for field in update.get('$unset', {}):
+                    document.pop(field, None)
+                return _UpdateResult(1, 1)
+        if upsert:
+            document = dict(query)
+            document.update(update.get('$set', {}))
+            self.insert_one(document)
+        return _UpdateResult(0, 0)
+
+    def delete_one(self, query):
+        for i, document in enumerate(self.documents):
+            if _matches(document, query):
+                del self.documents[i]
+                return _DeleteResult(1)
+        return _DeleteResult(0)
+
+    def delete_many(self, query):
+        kept = [d for d in self.documents if not _matches(d, query)]
+        deleted, self.documents[:] = len(self.documents) - len(kept), kept
+        return _DeleteResult(deleted)
+
+    def create_index(self, keys, **kwargs):
+        return kwargs.get('name') or '_'.join(str(k) for k in (keys if isinstance(keys, list) else [keys]))
+
+
+class LocalDatabase:
+    """Collections are created on first access, like pymongo"""
+
+    def __init__(self):
+        self._collections = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self._collections.setdefault(name, LocalCollection())
+
+    def __getitem__(self, name):
+        return self.__getattr__(name)
+
+    def command(self, name, *args, **kwargs):
+        return {'ok': 1.0}
+
+
+class LocalMongo:
+    """Drop-in for app.mongo (Flask-PyMongo exposes the database as .db)"""
+
+    def __init__(self):
+        self.db = LocalDatabase()
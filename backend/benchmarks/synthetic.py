@@ -0,0 +1,199 @@
+"""
+Synthetic workbooks and Word templates for benchmarking report generation.
+
+The workbooks follow the layout _generate_report expects: global metadata
+columns in A1:M1, the Text_Tag/Text/Chart_Tag/Chart_Attributes/Chart_Type
+columns, per-section Chart_Data_Y*/Growth_Y*/CAGR columns, and the raw chart
+series on a separate "data" sheet that Chart_Attributes reference by cell
+range. Everything is driven by a seeded RNG so runs are reproducible.
+"""
+
+import json
+import random
+
+import openpyxl
+from openpyxl.utils import get_column_letter
+from docx import Document
+
+# Chart types understood by generate_chart's chart_type_mapping_mpl, grouped by the series shape they need
+SERIES_CHART_TYPES = [
+    "bar", "column", "stacked_column", "horizontal_bar",
+    "line", "scatter", "scatter_line",
+    "area", "filled_area",
+    "histogram", "box", "violin",
+    "bubble", "waterfall", "funnel", "icicle", "sankey", "indicator", "sunburst", "table",
+]
+GRID_CHART_TYPES = ["heatmap", "contour"]
+CATEGORY_CHART_TYPES = ["pie", "treemap"]
+ALL_CHART_TYPES = SERIES_CHART_TYPES + GRID_CHART_TYPES + CATEGORY_CHART_TYPES
+
+DEFAULT_CHART_MIX = ["bar", "line", "area", "scatter", "stacked_column", "pie"]
+
+METADATA_COLUMNS = ["Report_Name", "Report_Code", "Country", "Currency"]
+YEARS = ["Y2020", "Y2021", "Y2022", "Y2023", "Y2024"]
+
+PALETTE = ["#0070c0", "#ffc000", "#b7b7b7", "#70ad47", "#ed7d31", "#5b9bd5", "#a5a5a5", "#264478"]
+
+DATA_SHEET = "data"
+
+
+def _series_block(data_sheet, first_column, series_length, series_count, rng):
+    """Write an x-axis column and series_count value columns; return their cell ranges"""
+    x_col = get_column_letter(first_column)
+    data_sheet[f"{x_col}1"] = "Category"
+    for row in range(series_length):
+        data_sheet[f"{x_col}{row + 2}"] = f"P{row + 1}"
+    value_ranges = []
+    for s in range(series_count):
+        col = get_column_letter(first_column + 1 + s)
+        data_sheet[f"{col}1"] = f"Series {s + 1}"
+        level = rng.uniform(20, 200)
+        for row in range(series_length):
+            level = max(level + rng.uniform(-10, 12), 1.0)
+            data_sheet[f"{col}{row + 2}"] = round(level, 2)
+        value_ranges.append(f"{col}2:{col}{series_length + 1}")
+    return f"{x_col}2:{x_col}{series_length + 1}", value_ranges
+
+
+def chart_attributes(chart_type, data_sheet, first_column, series_length, rng, title=None):
+    """Build a Chart_Attributes JSON for chart_type, writing its data to data_sheet starting at first_column"""
+    title = title if title is not None else f"{chart_type.replace('_', ' ').title()} chart"
+    chart_meta = {
+        "source_sheet": DATA_SHEET,
+        "chart_title": title,
+        "font_color": "#333333",
+        "font_size": 11,
+        "legend": True,
+        "legend_position": "bottom",
+        "data_labels": True,
+        "x_label": "Period",
+        "primary_y_label": "Value",
+        "disable_secondary_y": True,
+    }
+
+    if chart_type in CATEGORY_CHART_TYPES:
+        count = min(max(series_length, 3), len(PALETTE))
+        x_range, value_ranges = _series_block(data_sheet, first_column, count, 1, rng)
+        series = {
+            "labels": x_range,
+            "x_axis": x_range,
+            "colors": PALETTE[:count],
+            "data": [{
+                "name": title,
+                "type": chart_type,
+                "labels": x_range,
+                "values": value_ranges[0],
+                "marker": {"colors": PALETTE[:count]},
+            }],
+        }
+        return {"chart_meta": chart_meta, "series": series}, 2
+
+    if chart_type in GRID_CHART_TYPES:
+        size = max(3, min(series_length, 24))
+        z = [[round(rng.uniform(0, 100), 1) for _ in range(size)] for _ in range(size)]
+        series = {
+            "data": [{
+                "name": title,
+                "type": chart_type,
+                "x": [f"C{i + 1}" for i in range(size)],
+                "y": [f"R{i + 1}" for i in range(size)],
+                "z": z,
+            }],
+        }
+        return {"chart_meta": chart_meta, "series": series}, 0
+
+    series_count = 3 if chart_type == "stacked_column" else 1
+    x_range, value_ranges = _series_block(data_sheet, first_column, series_length, series_count, rng)
+    data = []
+    for s, value_range in enumerate(value_ranges):
+        entry = {"name": f"Series {s + 1}", "type": chart_type, "values": value_range,
+                 "marker": {"color": PALETTE[s % len(PALETTE)]}}
+        if chart_type == "bubble":
+            entry["size"] = [round(rng.uniform(10, 60), 1) for _ in range(series_length)]
+        data.append(entry)
+    series = {"x_axis": x_range, "data": data, "colors": PALETTE[:series_count]}
+    return {"chart_meta": chart_meta, "series": series}, series_count + 1
+
+
+def build_workbook(path, sections=6, chart_mix=None, series_length=12, placeholders=20, seed=1234):
+    """
+    Write a synthetic report workbook.
+
+    Args:
+        path (str): Output .xlsx path
+        sections (int): Number of sectionN_chart/sectionN_text sections
+        chart_mix (list): Chart types assigned round-robin to the sections
+        series_length (int): Points per chart series
+        placeholders (int): Extra text placeholders (extra_N) beyond the per-section ones
+        seed (int): RNG seed
+
+    Returns:
+        dict: Section -> chart type, for reporting
+    """
+    rng = random.Random(seed)
+    chart_mix = chart_mix or DEFAULT_CHART_MIX
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "report"
+    data_sheet = wb.create_sheet(DATA_SHEET)
+
+    headers = METADATA_COLUMNS + ["Text_Tag", "Text", "Chart_Tag", "Chart_Attributes", "Chart_Type"]
+    headers += [f"Chart_Data_{year}" for year in YEARS] + [f"Growth_{year}" for year in YEARS]
+    headers += ["Chart_Data_CAGR", "Chart_Data_CAGR_Historical", "Chart_Data_CAGR_Forecast"]
+    ws.append(headers)
+
+    metadata = [f"Synthetic Report {seed}", f"SYN-{seed}", "Testland", "USD"]
+    rows = max(sections, placeholders)
+    sections_by_type = {}
+    next_column = 1
+    for i in range(rows):
+        row = list(metadata) if i == 0 else [None] * len(METADATA_COLUMNS)
+        text_tag = f"extra_{i + 1}" if i < placeholders else None
+        text = f"Synthetic text block {i + 1} " + "lorem ipsum " * rng.randint(2, 8) if text_tag else None
+        if i < sections:
+            chart_type = chart_mix[i % len(chart_mix)]
+            attrs, used_columns = chart_attributes(chart_type, data_sheet, next_column, series_length, rng,
+                                                   title=f"Section {i + 1} {chart_type}")
+            next_column += used_columns
+            sections_by_type[f"section{i + 1}"] = chart_type
+            row += [text_tag, text, f"section{i + 1}_chart", json.dumps(attrs), chart_type]
+            row += [round(rng.uniform(10, 500), 1) for _ in YEARS]
+            row += [round(rng.uniform(0.01, 0.2), 3) for _ in YEARS]
+            row += [round(rng.uniform(0.02, 0.12), 3) for _ in range(3)]
+        else:
+            row += [text_tag, text, None, None, None]
+            row += [None] * (len(YEARS) * 2 + 3)
+        ws.append(row)
+
+    wb.save(path)
+    wb.close()
+    return sections_by_type
+
+
+def build_template(path, sections=6, placeholders=20, with_table=True):
+    """
+    Write a synthetic Word template that references every section and placeholder.
+
+    Each section gets a heading with the global metadata tags, its chart
+    placeholder and a table with the section's yearly values, growth and CAGR.
+    """
+    doc = Document()
+    doc.add_heading("<report_name> (<report_code>)", level=0)
+    doc.add_paragraph("Country: <country>, currency: <currency>")
+    for i in range(placeholders):
+        doc.add_paragraph(f"${{extra_{i + 1}}}")
+    for s in range(1, sections + 1):
+        doc.add_heading(f"Section {s} - <country>", level=1)
+        doc.add_paragraph(f"${{section{s}_chart}}")
+        if with_table:
+            table = doc.add_table(rows=3, cols=len(YEARS) + 1)
+            table.cell(0, 0).text = "Year"
+            table.cell(1, 0).text = "Value"
+            table.cell(2, 0).text = "Growth"
+            for y, year in enumerate(YEARS, 1):
+                table.cell(0, y).text = year
+                table.cell(1, y).text = f"${{section{s}_{year.lower()}}}"
+                table.cell(2, y).text = f"${{section{s}_{year.lower()}_kpi2}}"
+        doc.add_paragraph(f"CAGR ${{section{s}_cgrp}} (historical ${{section{s}_cgrp_historical}}, forecast ${{section{s}_cgrp_forecast}})")
+    doc.save(path)
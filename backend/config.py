@@ -22,6 +22,15 @@ class Config:
     THREADED = True
     PROCESSES = 1  # Single process to avoid matplotlib issues
     
+    # Report generation runs in a process pool beside the request threads (see utils/report_pool.py);
+    # 0 runs it in the request thread, one report at a time
+    REPORT_POOL_WORKERS = int(os.environ.get('REPORT_POOL_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+    REPORT_POOL_APP_FACTORY = os.environ.get('REPORT_POOL_APP_FACTORY', 'app:create_app')
+    
+    # Batch download ZIP: stored, deflated, bzip2 or lzma, and the deflate/bzip2 level (see utils/batch_archive.py)
+    BATCH_ZIP_COMPRESSION = os.environ.get('BATCH_ZIP_COMPRESSION', 'deflated')
+    BATCH_ZIP_COMPRESSLEVEL = int(os.environ.get('BATCH_ZIP_COMPRESSLEVEL', 1))
+    
     # Memory management settings
     GARBAGE_COLLECTION_INTERVAL = 5  # Force GC every 5 reports
     MAX_CHARTS_PER_REPORT = 50  # Limit charts per report
@@ -51,6 +60,7 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     DEBUG = True
+    REPORT_POOL_WORKERS = 0
 
 config = {
     'development': DevelopmentConfig,
@@ -1,20 +1,33 @@
 # Gunicorn configuration file for increased timeout limits
 # This addresses the WORKER TIMEOUT issue in batch processing
 
+# Cache bytecode outside the source tree before the app is imported (see utils/bytecode.py)
+import sys
+sys.dont_write_bytecode = True
+from utils.bytecode import enable_bytecode_cache
+pycache_dir = enable_bytecode_cache()
+
 # Server socket
 bind = "0.0.0.0:5001"
 backlog = 2048
 
 # Worker processes
-workers = 2
-worker_class = "sync"
+# Threaded workers keep logins, project lists, downloads and polls responsive while reports run;
+# report generation itself goes to each worker's process pool (utils/report_pool.py)
+import os
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
 worker_connections = 1000
+# Each pool process is spawned and holds its own ~100MB rendering stack (the master's warm-up is not shared with it),
+# so all workers' pools together get about half the CPUs, at least one process per worker
+report_pool_workers = int(os.environ.get("REPORT_POOL_WORKERS", max(1, (os.cpu_count() or 2) // (2 * workers))))
 max_requests = 1000
 max_requests_jitter = 50
 
 # Timeout settings - Increased for batch processing
 timeout = 300  # 5 minutes (default is 30 seconds)
-keepalive = 2
+keepalive = 5  # Reuse dashboard connections between polls
 graceful_timeout = 300  # 5 minutes for graceful shutdown
 
 # Process naming
@@ -42,12 +55,27 @@ worker_tmp_dir = "/dev/shm"
 
 # Environment
 raw_env = [
-    "PYTHONDONTWRITEBYTECODE=1",
+    f"PYTHONPYCACHEPREFIX={pycache_dir}" if pycache_dir else "PYTHONDONTWRITEBYTECODE=1",
+    f"REPORT_POOL_WORKERS={report_pool_workers}",
 ]
 
 # Callbacks
 def on_starting(server):
     server.log.info("🚀 Starting Graph Project API with increased timeout limits...")
+    # Start every master with an empty multiprocess metrics directory
+    from utils.metrics import get_metrics
+    get_metrics().clear()
+
+def when_ready(server):
+    # Runs in the master after preload_app and before the first fork; workers inherit the warmed libraries.
+    # Report pool processes are spawned and warm their own stack, so with REPORT_POOL_WORKERS > 0 this
+    # only shares the libraries the web workers use themselves (preflight, previews of workbooks, imports)
+    from utils.warmup import warm_rendering_stack, warmup_enabled
+    if warmup_enabled():
+        import time
+        started = time.perf_counter()
+        timings = warm_rendering_stack(logger=server.log)
+        server.log.info("🔥 Rendering stack warmed in %.1fs (%s)", time.perf_counter() - started, ", ".join(timings))
 
 def on_reload(server):
     server.log.info("🔄 Reloading Graph Project API...")
@@ -64,5 +92,18 @@ def post_fork(server, worker):
 def post_worker_init(worker):
     worker.log.info("🎯 Worker initialized (pid: %s)", worker.pid)
 
+def worker_exit(server, worker):
+    # Let the worker's report pool processes finish their jobs and exit with it
+    from utils.report_pool import shutdown_report_pools
+    shutdown_report_pools()
+    # Snapshots are only written every few seconds, so write the last counters before child_exit archives them
+    from utils.metrics import get_metrics
+    get_metrics().flush()
+
 def worker_abort(worker):
     worker.log.info("💥 Worker aborted (pid: %s)", worker.pid)
+
+def child_exit(server, worker):
+    # Fold the exited worker's counters into the metrics archive so the snapshot dir stays small
+    from utils.metrics import get_metrics
+    get_metrics().compact_dead_workers()
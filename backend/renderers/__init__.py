@@ -0,0 +1,51 @@
+"""
+Chart renderer registry.
+
+Chart types map to "module:Class" names. A renderer module is imported the
+first time one of its chart types is drawn and the renderer instance is
+cached, so dispatch is a dict lookup and a chart family that is never used
+costs nothing.
+"""
+
+import importlib
+import threading
+
+from renderers.helpers import CHART_TYPE_MAPPING_MPL
+
+SERIES_RENDERER = "renderers.series:SeriesRenderer"
+
+RENDERER_REGISTRY = {chart_type: SERIES_RENDERER for chart_type in CHART_TYPE_MAPPING_MPL}
+RENDERER_REGISTRY.update({
+    **dict.fromkeys(["bar", "column", "stacked_column", "horizontal_bar", "funnel", "icicle", "sankey", "indicator"],
+                    "renderers.bar:BarRenderer"),
+    **dict.fromkeys(["line", "scatter_line", "area", "filled_area"], "renderers.line:LineRenderer"),
+    **dict.fromkeys(["scatter", "bubble"], "renderers.scatter:ScatterRenderer"),
+    **dict.fromkeys(["histogram", "box", "violin"], "renderers.statistical:StatisticalRenderer"),
+    **dict.fromkeys(["heatmap", "contour"], "renderers.grid:GridRenderer"),
+    **dict.fromkeys(["treemap", "waterfall"], "renderers.treemap:TreemapRenderer"),
+    "pie": "renderers.pie:PieRenderer",
+    "bar_of_pie": "renderers.bar_of_pie:BarOfPieRenderer",
+    "bar of pie": "renderers.bar_of_pie:BarOfPieRenderer",
+})
+
+_renderers = {}
+_lock = threading.Lock()
+
+
+def register_renderer(chart_type, target):
+    """Register (or replace) the renderer for a chart type, e.g. "renderers.pie:PieRenderer" """
+    RENDERER_REGISTRY[chart_type] = target
+
+
+def get_renderer(chart_type):
+    """Renderer instance for a chart type; unknown types are drawn by the series renderer"""
+    target = RENDERER_REGISTRY.get(chart_type, SERIES_RENDERER)
+    renderer = _renderers.get(target)
+    if renderer is None:
+        with _lock:
+            renderer = _renderers.get(target)
+            if renderer is None:
+                module_name, class_name = target.split(":")
+                renderer = getattr(importlib.import_module(module_name), class_name)()
+                _renderers[target] = renderer
+    return renderer
@@ -0,0 +1,46 @@
+from renderers.series import SeriesRenderer
+
+
+class BarRenderer(SeriesRenderer):
+    """Bar, column, stacked column and horizontal bar charts (Matplotlib)"""
+
+    @staticmethod
+    def _edge(chart):
+        """Bar border (edgecolor, linewidth)"""
+        edgecolor = chart.bar_border_color if chart.bar_border_color else 'none'
+        linewidth = chart.bar_border_width if chart.bar_border_width else 0
+        return edgecolor, linewidth
+
+    def draw_bar(self, chart, plot, i, series, label, color):
+        ax1, x_values, y_vals = plot.ax1, plot.x_values, plot.y_vals
+        edgecolor, linewidth = self._edge(chart)
+
+        if chart.chart_type == "stacked_column":
+            # For stacked column, use bottom parameter
+            bar_color = color if color is not None else 'blue'
+            if i == 0:
+                ax1.bar(x_values, y_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
+                plot.bottom_vals = y_vals
+            else:
+                ax1.bar(x_values, y_vals, bottom=plot.bottom_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
+                plot.bottom_vals = [sum(x) for x in zip(plot.bottom_vals, y_vals)]
+        else:
+            if isinstance(color, list):
+                for j, val in enumerate(y_vals):
+                    bar_color = color[j % len(color)] if color[j % len(color)] is not None else 'blue'
+                    ax1.bar(x_values[j], val, color=bar_color, alpha=0.7, label=label if j == 0 else "", edgecolor=edgecolor, linewidth=linewidth)
+            else:
+                bar_color = color if color is not None else 'blue'
+                ax1.bar(x_values, y_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
+
+    def draw_barh(self, chart, plot, i, series, label, color):
+        ax1, x_values, y_vals = plot.ax1, plot.x_values, plot.y_vals
+        edgecolor, linewidth = self._edge(chart)
+
+        if isinstance(color, list):
+            for j, val in enumerate(y_vals):
+                bar_color = color[j % len(color)] if color[j % len(color)] is not None else 'blue'
+                ax1.barh(x_values[j], val, color=bar_color, alpha=0.7, label=label if j == 0 else "", edgecolor=edgecolor, linewidth=linewidth)
+        else:
+            bar_color = color if color is not None else 'blue'
+            ax1.barh(x_values, y_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
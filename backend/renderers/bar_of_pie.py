@@ -0,0 +1,520 @@
+import re
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from renderers.base import ChartRenderer
+from renderers.helpers import calculate_optimal_label_distance, extract_excel_range
+
+
+def create_bar_of_pie_chart(labels, values, other_labels, other_values, colors, other_colors, title, value_format="", chart_meta=None):
+    """
+    Create a 'bar of pie' chart using Plotly: pie chart with one segment broken down as a bar chart.
+    Enhanced version with better title handling and layout options.
+    Supports both individual bars and stacked bars.
+    """
+    # Filter out empty/null values from other_labels and other_values
+    filtered_data = []
+    for label, value in zip(other_labels, other_values):
+        # Check if both label and value are not empty/null
+        if (label is not None and str(label).strip() != "" and 
+            value is not None and str(value).strip() != "" and 
+            str(value).strip() != "0"):
+            filtered_data.append((label, value))
+    
+    if filtered_data:
+        filtered_labels, filtered_values = zip(*filtered_data)
+    else:
+        # If no valid data, use empty lists
+        filtered_labels, filtered_values = [], []
+    
+    # Enhanced title handling
+    title_left = chart_meta.get("title_left", title) if chart_meta else title
+    title_right = chart_meta.get("title_right", "Breakdown of 'Other'") if chart_meta else "Breakdown of 'Other'"
+    
+    # Enhanced layout options
+    height = chart_meta.get("height", 500) if chart_meta else 500
+    width = chart_meta.get("width", 900) if chart_meta else 900
+    column_widths = chart_meta.get("column_widths", [0.5, 0.5]) if chart_meta else [0.5, 0.5]
+    
+    # Enhanced styling options
+    font_family = chart_meta.get("font_family", "Arial") if chart_meta else "Arial"
+    font_size = chart_meta.get("font_size", 14) if chart_meta else 14
+    font_color = chart_meta.get("font_color", "#333333") if chart_meta else "#333333"
+    chart_background = chart_meta.get("chart_background", "#FFFFFF") if chart_meta else "#FFFFFF"
+    plot_background = chart_meta.get("plot_background", "#F8F9FA") if chart_meta else "#F8F9FA"
+    
+    # Legend controls
+    show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True)) if chart_meta else True
+    # Convert string "false"/"true" to boolean if needed
+    if isinstance(show_legend_raw, str):
+        show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
+    else:
+        show_legend = bool(show_legend_raw)
+    legend_position = chart_meta.get("legend_position", "bottom") if chart_meta else "bottom"
+    legend_font_size = chart_meta.get("legend_font_size", 10) if chart_meta else 10
+    legend_orientation = chart_meta.get("legend_orientation", "v") if chart_meta else "v"  # "v" for vertical, "h" for horizontal
+    
+
+    
+    # Data label controls
+    data_labels = chart_meta.get("data_labels", True) if chart_meta else True
+    data_label_format = chart_meta.get("data_label_format", ".1f") if chart_meta else ".1f"
+    data_label_font_size = chart_meta.get("data_label_font_size", 10) if chart_meta else 10
+    data_label_color = chart_meta.get("data_label_color", "#000000") if chart_meta else "#000000"
+    
+    # Validate data_label_format to ensure it's a valid format specifier
+    if data_label_format and data_label_format not in [".0f", ".1f", ".2f", ".3f", ".4f", ".5f", ".6f", ".7f", ".8f", ".9f", "d", "i", "o", "x", "X", "e", "E", "f", "F", "g", "G", "n", "%"]:
+        # If it's not a valid format specifier, use default
+        data_label_format = ".1f"
+    
+    # Helper function to safely format data labels
+    def safe_format_label(value, format_spec=".1f"):
+        try:
+            return f"{value:{format_spec}}%"
+        except (ValueError, TypeError):
+            return f"{value:.1f}%"
+    
+    # Axis controls
+    x_axis_title = chart_meta.get("x_axis_title", "Categories") if chart_meta else "Categories"
+    y_axis_title = chart_meta.get("y_axis_title", "Value") if chart_meta else "Value"
+    show_x_axis = chart_meta.get("show_x_axis", True) if chart_meta else True
+    show_y_axis = chart_meta.get("show_y_axis", True) if chart_meta else True
+    show_x_ticks = chart_meta.get("show_x_ticks", True) if chart_meta else True
+    show_y_ticks = chart_meta.get("show_y_ticks", True) if chart_meta else True
+    x_axis_label_distance = chart_meta.get("x_axis_label_distance", "auto") if chart_meta else "auto"
+    y_axis_label_distance = chart_meta.get("y_axis_label_distance", "auto") if chart_meta else "auto"
+    axis_tick_font_size = chart_meta.get("axis_tick_font_size", 10) if chart_meta else 10
+    
+    # Grid controls
+    show_gridlines = chart_meta.get("show_gridlines", False) if chart_meta else False
+    gridline_color = chart_meta.get("gridline_color", "#E5E7EB") if chart_meta else "#E5E7EB"
+    
+    # Margin and spacing controls
+    margin = chart_meta.get("margin", dict(l=50, r=50, t=80, b=50)) if chart_meta else dict(l=50, r=50, t=80, b=50)
+    horizontal_spacing = chart_meta.get("horizontal_spacing", 0.1) if chart_meta else 0.1
+    
+    # Check if stacked bars are requested
+    is_stacked = chart_meta.get("stacked", False) if chart_meta else False
+    
+    # Connector styling
+    connector_style = chart_meta.get("connector", {}) if chart_meta else {}
+    connector_color = connector_style.get("color", "#6B7280")
+    connector_width = connector_style.get("width", 1.3)
+    connector_opacity = connector_style.get("opacity", 0.9)
+    
+    fig = make_subplots(
+        rows=1, cols=2,
+        specs=[[{"type": "pie"}, {"type": "bar"}]],
+        column_widths=column_widths,
+        subplot_titles=(title_left, title_right),
+        horizontal_spacing=horizontal_spacing
+    )
+    
+    # Check if donut chart is requested
+    is_donut = chart_meta.get("type_left") == "donut_pie" if chart_meta else False
+    hole_size = 0.4 if is_donut else 0.0
+    
+    # Main pie chart with enhanced styling
+    fig.add_trace(go.Pie(
+        labels=labels,
+        values=values,
+        marker=dict(colors=colors),
+        textinfo="percent" if data_labels else "none",
+        hoverinfo="label+percent+value",
+        pull=[0.1 if l == "Other" else 0 for l in labels],
+        name="Main Pie",
+        hole=hole_size,
+        showlegend=show_legend,
+        textfont=dict(family=font_family, size=font_size, color=font_color),
+        textposition="inside" if data_labels else "none"
+    ), row=1, col=1)
+    
+    # Bar chart for breakdown (only if we have filtered data)
+    if filtered_labels and filtered_values:
+        # Check if horizontal bars are requested
+        bar_orientation = chart_meta.get("orientation", "vertical") if chart_meta else "vertical"
+        
+        # Convert values to numeric format for proper stacking
+        numeric_values = []
+        for value in filtered_values:
+            if isinstance(value, (int, float)):
+                if value <= 1.0:  # Likely decimal format (0.11)
+                    numeric_values.append(value * 100)
+                else:  # Likely already percentage format (11.0)
+                    numeric_values.append(value)
+            else:
+                try:
+                    val = float(value)
+                    if val <= 1.0:
+                        numeric_values.append(val * 100)
+                    else:
+                        numeric_values.append(val)
+                except:
+                    numeric_values.append(0)
+        
+        # Format labels for display
+        formatted_labels = []
+        for label in filtered_labels:
+            if isinstance(label, (int, float)):
+                if label <= 1.0:  # Likely decimal format (0.06)
+                    formatted_labels.append(f"{label * 100:.1f}%")
+                else:  # Likely already percentage format (6.0)
+                    formatted_labels.append(f"{label:.1f}%")
+            else:
+                try:
+                    val = float(label)
+                    if val <= 1.0:
+                        formatted_labels.append(f"{val * 100:.1f}%")
+                    else:
+                        formatted_labels.append(f"{val:.1f}%")
+                except:
+                    formatted_labels.append(str(label))
+        
+        if is_stacked:
+            # Create stacked bar chart with separate traces for each segment
+            if bar_orientation.lower() == "horizontal":
+                # Create stacked horizontal bar with separate traces
+                for i, (label, value) in enumerate(zip(filtered_labels, numeric_values)):
+                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
+                    
+                    fig.add_trace(go.Bar(
+                        x=[value],  # Single value for this segment
+                        y=["Other"],  # Single category for stacked bar
+                        orientation="h",
+                        marker_color=bar_color,
+                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
+                        textposition="inside",
+                        name=label,
+                        showlegend=show_legend,  # Enable legend for bar traces
+                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
+                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
+                    ), row=1, col=2)
+            else:
+                # Create stacked vertical bar with separate traces
+                for i, (label, value) in enumerate(zip(filtered_labels, numeric_values)):
+                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
+                    
+                    fig.add_trace(go.Bar(
+                        x=["Other"],  # Single category for stacked bar
+                        y=[value],  # Single value for this segment
+                        marker_color=bar_color,
+                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
+                        textposition="inside",
+                        name=label,
+                        showlegend=show_legend,  # Enable legend for bar traces
+                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
+                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
+                    ), row=1, col=2)
+            
+            # Set barmode to 'stack' for proper stacking
+            fig.update_layout(barmode='stack')
+        else:
+            # Create individual bars (original behavior)
+            if bar_orientation.lower() == "horizontal":
+                # Create individual horizontal bar traces for each data point
+                for i, (label, value) in enumerate(zip(formatted_labels, numeric_values)):
+                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
+                    
+                    fig.add_trace(go.Bar(
+                        x=[value],  # Single value for this bar
+                        y=[label],  # Category label
+                        orientation="h",
+                        marker_color=bar_color,
+                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
+                        textposition="auto",
+                        name=label,  # Use actual label instead of generic name
+                        showlegend=show_legend,  # Enable legend for bar traces
+                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
+                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
+                    ), row=1, col=2)
+            else:
+                # Create individual vertical bar traces for each data point
+                for i, (label, value) in enumerate(zip(formatted_labels, numeric_values)):
+                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
+                    
+                    fig.add_trace(go.Bar(
+                        x=[label],  # Category label
+                        y=[value],  # Single value for this bar
+                        marker_color=bar_color,
+                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
+                        textposition="auto",
+                        name=label,  # Use actual label instead of generic name
+                        showlegend=show_legend,  # Enable legend for bar traces
+                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
+                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
+                    ), row=1, col=2)
+    
+    # Enhanced layout with better styling
+    fig.update_layout(
+        title_text="",  # Remove main title since we have subplot titles
+        showlegend=show_legend,
+        height=height,
+        width=width,
+        font=dict(family=font_family, size=font_size, color=font_color),
+        paper_bgcolor=chart_background,
+        plot_bgcolor=plot_background,
+        margin=margin
+    )
+    
+    # Force legend visibility based on show_legend setting
+    if not show_legend:
+        # Explicitly hide legend for all traces
+        for trace in fig.data:
+            trace.showlegend = False
+    
+    # Configure legend position and styling
+    if show_legend:
+        # Map legend positions to Plotly coordinates
+        legend_positions = {
+            "top": dict(x=0.5, y=1.1, xanchor="center", yanchor="bottom"),
+            "bottom": dict(x=0.5, y=-0.2, xanchor="center", yanchor="top"),
+            "left": dict(x=-0.2, y=0.5, xanchor="right", yanchor="middle"),
+            "right": dict(x=1.1, y=0.5, xanchor="left", yanchor="middle")
+        }
+        
+        legend_config = {}
+        if legend_position in legend_positions:
+            legend_config.update(legend_positions[legend_position])
+        
+        # Add legend orientation for horizontal/vertical layout
+        legend_config["orientation"] = legend_orientation
+        
+        # Additional legend properties for better horizontal layout
+        if legend_orientation == "h":
+            # Override position for horizontal legends
+            legend_config["x"] = 0.5
+            legend_config["y"] = -0.15
+            legend_config["xanchor"] = "center"
+            legend_config["yanchor"] = "top"
+            # Force horizontal layout
+            legend_config["traceorder"] = "normal"
+        
+        if legend_font_size:
+            legend_config["font"] = dict(size=legend_font_size, family=font_family, color=font_color)
+        
+        if legend_config:
+            fig.update_layout(legend=legend_config)
+    
+    # Update subplot titles with better styling
+    fig.update_annotations(
+        font=dict(family=font_family, size=font_size + 2, color=font_color)
+    )
+    
+    # Update bar chart axes with comprehensive controls
+    if show_x_axis:
+        x_axis_config = {
+            "title": dict(text=x_axis_title, font=dict(size=font_size)),
+            "showticklabels": show_x_ticks,
+            "tickfont": dict(size=axis_tick_font_size)
+        }
+        
+        # Handle "auto" values for axis label distances
+        if x_axis_label_distance == "auto":
+            # Calculate optimal label distance for bar chart
+            auto_x_distance, _ = calculate_optimal_label_distance(
+                "bar", [{"labels": filtered_labels, "values": filtered_values}], 
+                filtered_labels, filtered_values, (width/100, height/100), font_size
+            )
+            x_axis_label_distance = auto_x_distance
+        
+        # Apply axis label distance if specified
+        if x_axis_label_distance is not None:
+            x_axis_config["title"] = dict(
+                text=x_axis_title, 
+                font=dict(size=font_size),
+                standoff=x_axis_label_distance
+            )
+        
+        fig.update_xaxes(**x_axis_config, row=1, col=2)
+    else:
+        fig.update_xaxes(visible=False, row=1, col=2)
+    
+    if show_y_axis:
+        y_axis_config = {
+            "title": dict(text=y_axis_title, font=dict(size=font_size)),
+            "showticklabels": show_y_ticks,
+            "tickfont": dict(size=axis_tick_font_size)
+        }
+        
+        # Handle "auto" values for axis label distances
+        if y_axis_label_distance == "auto":
+            # Calculate optimal label distance for bar chart
+            _, auto_y_distance = calculate_optimal_label_distance(
+                "bar", [{"labels": filtered_labels, "values": filtered_values}], 
+                filtered_labels, filtered_values, (width/100, height/100), font_size
+            )
+            y_axis_label_distance = auto_y_distance
+        
+        # Apply axis label distance if specified
+        if y_axis_label_distance is not None:
+            y_axis_config["title"] = dict(
+                text=y_axis_title, 
+                font=dict(size=font_size),
+                standoff=y_axis_label_distance
+            )
+        
+        fig.update_yaxes(**y_axis_config, row=1, col=2)
+    else:
+        fig.update_yaxes(visible=False, row=1, col=2)
+    
+    # Add gridlines if requested
+    if show_gridlines:
+        fig.update_xaxes(
+            showgrid=True,
+            gridcolor=gridline_color,
+            gridwidth=1,
+            row=1, col=2
+        )
+        fig.update_yaxes(
+            showgrid=True,
+            gridcolor=gridline_color,
+            gridwidth=1,
+            row=1, col=2
+        )
+    
+    # Update axis formatting for the bar chart to show percentages
+    if filtered_values and isinstance(filtered_values[0], (int, float)) and filtered_values[0] <= 1.0:
+        if bar_orientation.lower() == "horizontal":
+            # For horizontal bars, format x-axis (values) as percentages
+            fig.update_xaxes(
+                tickformat=".1f",  # Format as percentage with 1 decimal place (no % symbol since values are already multiplied by 100)
+                title="Revenue (%)",
+                row=1, col=2
+            )
+            # Update y-axis title for horizontal bars
+            fig.update_yaxes(
+                title="Categories",
+                row=1, col=2
+            )
+        else:
+            # For vertical bars, format y-axis (values) as percentages
+            fig.update_yaxes(
+                tickformat=".1f",  # Format as percentage with 1 decimal place (no % symbol since values are already multiplied by 100)
+                title="Revenue (%)",
+                row=1, col=2
+            )
+            # Update x-axis title for vertical bars
+            fig.update_xaxes(
+                title="Categories",
+                row=1, col=2
+            )
+    
+    # Add connector line between pie and bar chart (if connector is enabled)
+    if connector_style.get("style") == "elbow" and filtered_labels:
+        # Calculate connector line coordinates
+        # This is a simplified connector - you can enhance this for more complex paths
+        fig.add_shape(
+            type="line",
+            x0=0.45, y0=0.5,  # Start from pie chart
+            x1=0.55, y1=0.5,  # End at bar chart
+            line=dict(color=connector_color, width=connector_width),
+            opacity=connector_opacity,
+            xref="paper", yref="paper"
+        )
+    
+    return fig
+
+
+class BarOfPieRenderer(ChartRenderer):
+    """Bar of pie charts, drawn with Plotly and exported through kaleido"""
+
+    backend = "plotly"
+
+    def render(self, chart):
+        chart_meta, series_meta, x_values, title = chart.chart_meta, chart.series_meta, chart.x_values, chart.title
+
+        # Extract cell ranges for other_labels and other_values if they are cell ranges
+        other_labels = chart_meta.get("other_labels", [])
+        other_values = chart_meta.get("other_values", [])
+        other_colors = chart_meta.get("other_colors", [])
+
+        # If other_labels and other_values are cell ranges, extract them
+        if isinstance(other_labels, str) and re.match(r"^[A-Z]+\d+:[A-Z]+\d+$", other_labels):
+            try:
+                sheet = chart.workbook.sheet(chart_meta.get("source_sheet", "sample"))
+                other_labels = extract_excel_range(sheet, other_labels)
+                # Extracted other_labels successfully
+                pass
+            except Exception:
+                # Failed to extract other_labels
+                pass
+
+        if isinstance(other_values, str) and re.match(r"^[A-Z]+\d+:[A-Z]+\d+$", other_values):
+            try:
+                sheet = chart.workbook.sheet(chart_meta.get("source_sheet", "sample"))
+                other_values = extract_excel_range(sheet, other_values)
+                # Extracted other_values successfully
+                print(f"DEBUG: other_values extracted from {other_values} = {other_values}")
+                pass
+            except Exception:
+                # Failed to extract other_values
+                pass
+
+        # Log the extracted data for debugging
+        #current_app.logger.info(f"🔍 Bar of Pie Chart Data:")
+        #current_app.logger.info(f"   Other Labels: {other_labels}")
+        #current_app.logger.info(f"   Other Values: {other_values}")
+        #current_app.logger.info(f"   Other Colors: {other_colors}")
+
+        # Check if values are percentages in decimal form and convert them
+        y_axis_title = chart_meta.get("y_axis_title", "")
+        if other_values and y_axis_title and "%" in y_axis_title:
+            # Check if all values are between 0-1 (likely percentages in decimal form)
+            if all(isinstance(v, (int, float)) and 0 <= v <= 1 for v in other_values if v is not None):
+                print(f"DEBUG: Converting decimal values to percentages: {other_values}")
+                other_values = [v * 100 if v is not None and isinstance(v, (int, float)) else v for v in other_values]
+                print(f"DEBUG: Converted to: {other_values}")
+            else:
+                # Handle string values that might be percentages
+                converted_values = []
+                for v in other_values:
+                    if v is not None:
+                        try:
+                            if isinstance(v, str):
+                                # Try to convert string to float
+                                float_val = float(v)
+                                if 0 <= float_val <= 1:
+                                    converted_values.append(float_val * 100)
+                                else:
+                                    converted_values.append(float_val)
+                            else:
+                                converted_values.append(v)
+                        except (ValueError, TypeError):
+                            converted_values.append(v)
+                    else:
+                        converted_values.append(v)
+                other_values = converted_values
+
+        # Check for empty/null values
+        if other_labels and other_values:
+            empty_count = sum(1 for label, value in zip(other_labels, other_values) 
+                            if (label is None or str(label).strip() == "" or 
+                                value is None or str(value).strip() == "" or 
+                                str(value).strip() == "0"))
+            if empty_count > 0:
+                # Found empty/null values in bar chart data (will cause missing bars)
+                pass
+
+            # Data analysis completed (logging removed for cleaner output)
+
+        value_format = chart_meta.get("value_format", "")
+        # For bar of pie charts, use labels from series_meta, fallback to x_values
+        labels = series_meta.get("labels", x_values)
+        values = series_meta.get("values", [])
+        colors = series_meta.get("colors", [])
+
+        # Chart data prepared
+        fig = create_bar_of_pie_chart(
+            labels=labels,
+            values=values,
+            other_labels=other_labels,
+            other_values=other_values,
+            colors=colors,
+            other_colors=other_colors if other_colors else colors,
+            title=title,
+            value_format=value_format,
+            chart_meta=chart_meta
+        )
+
+        return fig
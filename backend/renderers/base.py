@@ -0,0 +1,28 @@
+class ChartContext:
+    """Resolved settings and data for one chart, handed from generate_chart to its renderer.
+
+    Renderers may update attributes they change while drawing (legend placement,
+    label distances, ...) so the shared layout and save steps see the final values.
+    """
+
+    def __init__(self, **settings):
+        self.__dict__.update(settings)
+
+    def update(self, **settings):
+        self.__dict__.update(settings)
+
+
+class ChartRenderer:
+    """Draws one family of chart types.
+
+    The registry creates a single instance per class and reuses it for every
+    chart, so per-family defaults are worked out once in the class body.
+    """
+
+    # "matplotlib" renderers return (figure, ax1, ax2), or None when there is nothing to draw;
+    # "plotly" renderers return a Plotly figure
+    backend = "matplotlib"
+    defaults = {}
+
+    def render(self, chart):
+        raise NotImplementedError
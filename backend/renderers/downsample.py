@@ -0,0 +1,153 @@
+"""
+Opt-in downsampling for long line, area and scatter series.
+
+A chart image is only so many pixels wide, so series with thousands of
+points are reduced to about one point per pixel column before drawing.
+Enabled per chart with the chart_meta "downsample" option:
+
+    "downsample": "lttb"          # or "minmax", or true for lttb
+    "downsample": {"method": "minmax", "points": 800, "max_labels": 12}
+"""
+
+import numpy as np
+from flask import current_app
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+# Matplotlib drawing methods that are downsampled
+DOWNSAMPLED_MPL_TYPES = ("plot", "fill_between", "scatter")
+DEFAULT_MAX_LABELS = 20
+
+
+def downsample_settings(option, figsize, dpi=200):
+    """Normalise the chart_meta "downsample" option; None when downsampling is off"""
+    if not option:
+        return None
+    settings = dict(option) if isinstance(option, dict) else {"method": option}
+    method = settings.get("method", "lttb")
+    method = "lttb" if method is True else str(method).lower()
+    if method not in DOWNSAMPLE_METHODS:
+        current_app.logger.warning(f"⚠️ Unknown downsample method '{method}', drawing every point")
+        return None
+    try:
+        # Default target: one point per pixel column of the rendered image
+        points = int(settings.get("points") or figsize[0] * dpi)
+        max_labels = int(settings.get("max_labels", DEFAULT_MAX_LABELS))
+    except (TypeError, ValueError, IndexError):
+        current_app.logger.warning(f"⚠️ Invalid downsample option {option!r}, drawing every point")
+        return None
+    return {"method": method, "points": max(points, 3), "max_labels": max(max_labels, 0)}
+
+
+def _as_float(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _x_positions(x_values):
+    """Numeric x values as floats; category labels are treated as evenly spaced"""
+    try:
+        x = _as_float(x_values)
+    except (TypeError, ValueError):
+        return np.arange(len(x_values), dtype=float)
+    return x if np.all(np.isfinite(x)) else np.arange(len(x_values), dtype=float)
+
+
+def _bucket_winners(x, y, edges, prev_x, prev_y, next_x, next_y):
+    """Index of the largest triangle of each bucket, given each bucket's first and third vertex"""
+    sizes = np.diff(edges)
+    ax, ay = np.repeat(prev_x, sizes), np.repeat(prev_y, sizes)
+    cx, cy = np.repeat(next_x, sizes), np.repeat(next_y, sizes)
+    bx, by = x[edges[0]:edges[-1]], y[edges[0]:edges[-1]]
+    areas = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+    starts = edges[:-1] - edges[0]
+    hits = np.flatnonzero(areas == np.repeat(np.maximum.reduceat(areas, starts), sizes))
+    # The first hit of each bucket, like argmax on ties
+    buckets = np.searchsorted(starts, hits, side="right")
+    return hits[np.flatnonzero(np.diff(buckets, prepend=0))] + edges[0]
+
+
+def lttb_indices(x, y, points):
+    """
+    Largest-Triangle-Three-Buckets: indices of the points that best keep the line's shape.
+
+    Vectorised over buckets. Exact LTTB takes each triangle's first vertex
+    from the point chosen in the previous bucket, which is sequential; here a
+    first pass uses the previous bucket's average and a second pass the
+    point that pass chose.
+    """
+    n = len(y)
+    if points >= n or points < 3:
+        return np.arange(n)
+    x, y = np.asarray(x, dtype=float), np.nan_to_num(np.asarray(y, dtype=float))
+    # Bucket boundaries for the n - 2 interior points; first and last points are always kept
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    sizes = np.diff(edges)
+    # Third triangle vertex: the average of the next bucket (the last point for the last bucket)
+    next_sizes = np.append(sizes[1:], 1)
+    next_x = np.add.reduceat(x, edges[1:]) / next_sizes
+    next_y = np.add.reduceat(y, edges[1:]) / next_sizes
+    own_x = np.add.reduceat(x[:edges[-1]], edges[:-1]) / sizes
+    own_y = np.add.reduceat(y[:edges[-1]], edges[:-1]) / sizes
+
+    first = _bucket_winners(x, y, edges, np.append(x[0], own_x[:-1]), np.append(y[0], own_y[:-1]), next_x, next_y)
+    chosen = np.append(0, first[:-1])
+    keep = _bucket_winners(x, y, edges, x[chosen], y[chosen], next_x, next_y)
+    return np.concatenate([[0], keep, [n - 1]])
+
+
+def minmax_indices(y, points):
+    """Indices of the minimum and maximum of each bucket (two points per bucket)"""
+    n = len(y)
+    if points >= n or points < 4:
+        return np.arange(n)
+    buckets = points // 2
+    bucket = np.arange(n) * buckets // n
+    # Sort by value within each bucket; the first and last entry of each bucket are its min and max
+    order = np.lexsort((np.nan_to_num(y), bucket))
+    bounds = np.flatnonzero(np.diff(bucket[order], prepend=-1, append=buckets))
+    keep = np.concatenate([order[bounds[:-1]], order[bounds[1:] - 1], [0, n - 1]])
+    return np.unique(keep)
+
+
+def label_indices(y, max_labels):
+    """Up to max_labels label positions: the extrema first, then evenly spaced points"""
+    n = len(y)
+    if n <= max_labels:
+        return np.arange(n)
+    if max_labels <= 0:
+        return np.array([], dtype=int)
+    y = _as_float(y)
+    extrema = [int(np.nanargmin(y)), int(np.nanargmax(y))] if np.isfinite(y).any() else []
+    spaced = np.linspace(0, n - 1, max(max_labels - len(extrema), 0)).astype(int)
+    return np.unique(np.concatenate([extrema, spaced]).astype(int))[:max_labels]
+
+
+def downsample_series(x_values, y_vals, series, settings, keep=None):
+    """
+    Thin one series to settings["points"].
+
+    Returns (x_values, y_vals, series, keep); per-point text labels and marker
+    sizes in series are thinned to match and limited to settings["max_labels"].
+    Pass keep to reuse the indices of an earlier series (stacked areas).
+    """
+    n = len(y_vals)
+    if n != len(x_values) or (keep is None and n <= settings["points"]):
+        return x_values, y_vals, series, keep
+    if keep is None:
+        y = _as_float(y_vals)
+        if settings["method"] == "minmax":
+            keep = minmax_indices(y, settings["points"])
+        else:
+            keep = lttb_indices(_x_positions(x_values), y, settings["points"])
+    current_app.logger.debug(f"📉 Downsampled series '{series.get('name')}' from {n} to {len(keep)} points")
+
+    series = dict(series)
+    text_labels = series.get("text")
+    if isinstance(text_labels, list) and len(text_labels) == n:
+        text_labels = [text_labels[k] for k in keep]
+        shown = set(label_indices([y_vals[k] for k in keep], settings["max_labels"]).tolist())
+        # None marks a point that is drawn without a label
+        series["text"] = [text if j in shown else None for j, text in enumerate(text_labels)]
+    marker = series.get("marker")
+    if isinstance(marker, dict) and isinstance(marker.get("size"), list) and len(marker["size"]) == n:
+        series["marker"] = dict(marker, size=[marker["size"][k] for k in keep])
+    return [x_values[k] for k in keep], [y_vals[k] for k in keep], series, keep
@@ -0,0 +1,235 @@
+import matplotlib.pyplot as plt
+import numpy as np
+from flask import current_app
+
+from renderers.helpers import axis_title_style
+from renderers.series import SeriesRenderer
+
+
+class GridRenderer(SeriesRenderer):
+    """Heatmap and contour charts (Matplotlib)"""
+
+    def draw_contour(self, chart, plot, i, series, label, color):
+        # Contour plot (simplified): the series values as a single row
+        if len(plot.y_vals) > 0:
+            plot.ax1.contour([plot.y_vals])
+
+    def draw_imshow(self, chart, plot, i, series, label, color):
+        """Heatmap from the series' z grid and x/y labels; returns False when z is empty"""
+        chart_meta, title = chart.chart_meta, chart.title
+        font_size, font_color, axis_tick_font_size = chart.font_size, chart.font_color, chart.axis_tick_font_size
+        chart_background, plot_background = chart.chart_background, chart.plot_background
+        fig_mpl, ax1 = plot.fig, plot.ax1
+
+        current_app.logger.debug(f"🔥 Matplotlib heatmap processing started for series: {label}")
+
+        # For heatmaps, get data directly from series
+        z_data = series.get("z", [])
+        x_labels = series.get("x", [])
+        y_labels = series.get("y", [])
+        colorscale = series.get("colorscale", "Blues")
+        showscale = series.get("showscale", True)
+        opacity = series.get("opacity", 1.0)
+
+        # Debug logging
+        current_app.logger.debug(f"🔥 Heatmap Debug - Series: {series}")
+        current_app.logger.debug(f"🔥 Heatmap Debug - Z data: {z_data}")
+        current_app.logger.debug(f"🔥 Heatmap Debug - X labels: {x_labels}")
+        current_app.logger.debug(f"🔥 Heatmap Debug - Y labels: {y_labels}")
+
+        # Ensure we have valid data for heatmap
+        if z_data and x_labels and y_labels:
+            # Convert z_data to numpy array for better handling
+            z_array = np.array(z_data)
+
+            # Validate z_array dimensions
+            if z_array.size == 0:
+                current_app.logger.error("🔥 Heatmap Error: Z data is empty")
+                ax1.text(0.5, 0.5, "Empty heatmap data", 
+                        ha='center', va='center', 
+                        fontsize=font_size or 12,
+                        transform=ax1.transAxes)
+                return False
+
+            # Ensure z_array is 2D
+            if z_array.ndim == 1:
+                z_array = z_array.reshape(1, -1)
+                current_app.logger.debug(f"🔥 Heatmap: Reshaped 1D array to 2D: {z_array.shape}")
+
+            current_app.logger.debug(f"🔥 Heatmap: Final z_array shape: {z_array.shape}")
+            current_app.logger.debug(f"🔥 Heatmap: X labels count: {len(x_labels)}")
+            current_app.logger.debug(f"🔥 Heatmap: Y labels count: {len(y_labels)}")
+
+            # Disable gridlines globally for this heatmap
+            plt.rcParams['axes.grid'] = False
+            plt.rcParams['axes.linewidth'] = 0
+
+            # Create heatmap using imshow with proper orientation and no lines
+            current_app.logger.debug("🔥 Creating heatmap with imshow...")
+            im = ax1.imshow(z_array, 
+                           cmap=colorscale, 
+                           aspect='auto',
+                           alpha=opacity,
+                           interpolation='nearest',
+                           extent=[-0.5, len(x_labels)-0.5, -0.5, len(y_labels)-0.5])
+            current_app.logger.debug("🔥 Heatmap imshow created successfully")
+
+            # Completely disable all gridlines and minor gridlines for heatmaps BEFORE setting labels
+            ax1.grid(False, which='both')
+            ax1.set_axisbelow(False)
+
+            # Hide tick marks to remove any visual grid-like elements
+            ax1.tick_params(axis='both', length=0)
+
+            # Disable all axis spines to remove the white border lines
+            ax1.spines['top'].set_visible(False)
+            ax1.spines['bottom'].set_visible(False)
+            ax1.spines['left'].set_visible(False)
+            ax1.spines['right'].set_visible(False)
+
+            # Disable minor gridlines
+            ax1.minorticks_off()
+
+            # Additional grid removal for matplotlib heatmaps
+            ax1.xaxis.grid(False)
+            ax1.yaxis.grid(False)
+            ax1.xaxis.set_tick_params(gridOn=False)
+            ax1.yaxis.set_tick_params(gridOn=False)
+
+            # Set x and y axis labels
+            current_app.logger.debug("🔥 Setting heatmap axis labels...")
+            ax1.set_xticks(range(len(x_labels)))
+            ax1.set_yticks(range(len(y_labels)))
+            ax1.set_xticklabels(x_labels, rotation=45, ha='right', fontsize=axis_tick_font_size or 10)
+            ax1.set_yticklabels(y_labels, fontsize=axis_tick_font_size or 10)
+
+            # Ensure the plot is properly displayed
+            ax1.set_aspect('auto')
+
+            # Final comprehensive tick line removal
+            ax1.tick_params(axis='both', which='both', length=0, width=0)
+            ax1.tick_params(axis='x', bottom=False, top=False, labelbottom=True)
+            ax1.tick_params(axis='y', left=False, right=False, labelleft=True)
+
+            # Ensure no tick lines are drawn
+            for tick in ax1.xaxis.get_major_ticks():
+                tick.tick1line.set_visible(False)
+                tick.tick2line.set_visible(False)
+            for tick in ax1.yaxis.get_major_ticks():
+                tick.tick1line.set_visible(False)
+                tick.tick2line.set_visible(False)
+
+            # Remove any remaining tick lines
+            ax1.tick_params(axis='both', which='both', length=0, width=0)
+            ax1.tick_params(axis='both', which='major', length=0, width=0)
+            ax1.tick_params(axis='both', which='minor', length=0, width=0)
+
+            # Final gridline removal after all setup
+            ax1.grid(False, which='both')
+            ax1.xaxis.grid(False)
+            ax1.yaxis.grid(False)
+            ax1.xaxis.set_tick_params(gridOn=False)
+            ax1.yaxis.set_tick_params(gridOn=False)
+            ax1.figure.canvas.draw()
+
+            # Add colorbar if showscale is True
+            if showscale:
+                current_app.logger.debug("🔥 Adding colorbar...")
+                cbar = plt.colorbar(im, ax=ax1)
+                cbar.set_label('Value', rotation=270, labelpad=15)
+
+            # Add text annotations on each cell if text data is provided
+            text_data = series.get("text", [])
+            if text_data and len(text_data) == len(z_data) and len(text_data[0]) == len(z_data[0]):
+                current_app.logger.debug("🔥 Adding text annotations...")
+                for i in range(len(z_data)):
+                    for j in range(len(z_data[0])):
+                        text = str(text_data[i][j])
+                        ax1.text(j, i, text, ha='center', va='center', 
+                               color='white' if z_array[i, j] > z_array.max() * 0.5 else 'black',
+                               fontweight='bold')
+
+            # Apply background colors if specified
+            if chart_background:
+                fig_mpl.patch.set_facecolor(chart_background)
+            if plot_background:
+                ax1.set_facecolor(plot_background)
+
+            # Add title with customizable styling
+            title_font_size = font_size or 16
+            title_color = font_color if font_color else '#2C3E50'
+            title_font_family = chart_meta.get("font_family") if chart_meta.get("font_family") else None
+
+            if title and title.strip():
+                ax1.set_title(title, fontsize=title_font_size, weight='bold', pad=20,
+                            color=title_color, fontname=title_font_family)
+
+            # Set axis labels
+            x_axis_title = chart_meta.get("x_label", "")
+            y_axis_title = chart_meta.get("primary_y_label", 
+                chart_meta.get("y_label", 
+                chart_meta.get("y_axis_title", "")))
+            if x_axis_title:
+                ax1.set_xlabel(x_axis_title, **axis_title_style(chart_meta, font_size, font_color))
+            if y_axis_title:
+                ax1.set_ylabel(y_axis_title, **axis_title_style(chart_meta, font_size, font_color))
+
+            # Handle cell borders (gridlines are always off for heatmaps)
+            show_cell_borders = chart_meta.get("show_cell_borders", True)
+
+            # For heatmaps, always disable gridlines completely
+            ax1.grid(False, which='both')
+            ax1.set_axisbelow(False)
+
+            # Hide tick lines but keep tick labels
+            ax1.tick_params(axis='both', length=0, width=0, which='both')
+            ax1.tick_params(axis='x', bottom=False, top=False, labelbottom=True)
+            ax1.tick_params(axis='y', left=False, right=False, labelleft=True)
+
+            # Disable all axis spines to remove the white border lines
+            ax1.spines['top'].set_visible(False)
+            ax1.spines['bottom'].set_visible(False)
+            ax1.spines['left'].set_visible(False)
+            ax1.spines['right'].set_visible(False)
+
+            # Disable minor gridlines
+            ax1.minorticks_off()
+
+            # Additional grid removal for matplotlib heatmaps
+            ax1.xaxis.grid(False)
+            ax1.yaxis.grid(False)
+            ax1.xaxis.set_tick_params(gridOn=False)
+            ax1.yaxis.set_tick_params(gridOn=False)
+
+            # Ensure no tick lines are drawn
+            for tick in ax1.xaxis.get_major_ticks():
+                tick.tick1line.set_visible(False)
+                tick.tick2line.set_visible(False)
+            for tick in ax1.yaxis.get_major_ticks():
+                tick.tick1line.set_visible(False)
+                tick.tick2line.set_visible(False)
+
+            # Remove any remaining tick lines
+            ax1.tick_params(axis='both', which='both', length=0, width=0)
+            ax1.tick_params(axis='both', which='major', length=0, width=0)
+            ax1.tick_params(axis='both', which='minor', length=0, width=0)
+
+            if show_cell_borders:
+                # Add cell borders with customizable color
+                border_color = chart_meta.get("cell_border_color", "black")
+                border_width = chart_meta.get("cell_border_width", 1.0)  # Increased default width
+                border_alpha = chart_meta.get("cell_border_alpha", 1.0)  # Increased default alpha
+
+                for i in range(len(z_data) + 1):
+                    ax1.axhline(y=i-0.5, color=border_color, linewidth=border_width, alpha=border_alpha)
+                if z_data and len(z_data[0]) > 0:
+                    for j in range(len(z_data[0]) + 1):
+                        ax1.axvline(x=j-0.5, color=border_color, linewidth=border_width, alpha=border_alpha)
+
+            current_app.logger.debug(f"🔥 Heatmap created successfully with shape: {z_array.shape}")
+        else:
+            current_app.logger.warning(f"⚠️ Invalid heatmap data structure - Z: {z_data}, X: {x_labels}, Y: {y_labels}")
+            ax1.text(0.5, 0.5, "Invalid data structure for heatmap", 
+                    ha='center', va='center', 
+                    fontsize=font_size or 12,
+                    transform=ax1.transAxes)
@@ -0,0 +1,404 @@
+"""
+Helpers shared by the chart renderers.
+
+These used to be redefined inside generate_chart on every call; they only
+depend on their arguments, so they live here once per process.
+"""
+
+import logging
+import re
+from functools import lru_cache
+
+from flask import current_app
+
+# Matplotlib drawing method per series type; series types not listed fall back to scatter
+CHART_TYPE_MAPPING_MPL = {
+    # Bar charts
+    "bar": "bar",
+    "column": "bar",
+    "stacked_column": "bar",
+    "horizontal_bar": "barh",
+
+    # Line charts
+    "line": "plot",
+    "scatter": "scatter",
+    "scatter_line": "plot",
+
+    # Area charts
+    "area": "fill_between",
+    "filled_area": "fill_between",
+
+    # Statistical charts
+    "histogram": "hist",
+    "box": "boxplot",
+    "violin": "violinplot",
+
+    # Other charts
+    "bubble": "scatter",
+    "heatmap": "imshow",
+    "contour": "contour",
+    "waterfall": "bar",
+    "funnel": "bar",
+    "sunburst": "pie",
+    "icicle": "bar",
+    "sankey": "bar",
+    "table": "table",
+    "indicator": "bar",
+    "treemap": "treemap"
+}
+
+
+class ChartWorkbook:
+    """The report's data workbook, loaded on first use and shared by all of its charts"""
+
+    def __init__(self, path):
+        self.path = path
+        self._workbook = None
+
+    def sheet(self, name):
+        if self._workbook is None:
+            import openpyxl
+            self._workbook = openpyxl.load_workbook(self.path, data_only=True)
+        return self._workbook[name]
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+
+@lru_cache(maxsize=1)
+def available_font_names():
+    """Names of the fonts Matplotlib can use (scanning fontManager is slow, so it is done once)"""
+    import matplotlib.font_manager as fm
+    # Suppress font warnings by setting log level
+    font_logger = logging.getLogger('matplotlib.font_manager')
+    original_level = font_logger.level
+    font_logger.setLevel(logging.ERROR)
+    try:
+        return frozenset(f.name for f in fm.fontManager.ttflist)
+    finally:
+        # Restore original logging level
+        font_logger.setLevel(original_level)
+
+
+def resolve_font_family(font_family):
+    """Return font_family if installed, otherwise the closest system fallback"""
+    if not font_family or font_family in available_font_names():
+        return font_family
+    # Use system-appropriate fallback fonts
+    if font_family.lower() in ['calibri', 'arial']:
+        return 'Helvetica'  # macOS equivalent
+    if font_family.lower() in ['times new roman', 'times']:
+        return 'Times'  # macOS equivalent
+    return 'Helvetica'  # Default fallback
+
+
+def calculate_optimal_label_distance(chart_type, series_data, x_values, y_values, figsize, font_size=12):
+    """
+    Calculate optimal axis label distances to prevent overlap with data values.
+    
+    Args:
+        chart_type (str): Type of chart (bar, scatter, line, etc.)
+        series_data (list): Chart series data
+        x_values (list): X-axis values
+        y_values (list): Y-axis values
+        figsize (tuple): Figure size (width, height) in inches
+        font_size (int): Font size for labels
+    
+    Returns:
+        tuple: (x_axis_distance, y_axis_distance) in pixels
+    """
+    # Handle None or undefined values safely
+    if x_values is None:
+        x_values = []
+    if y_values is None:
+        y_values = []
+    if figsize is None:
+        figsize = (8, 6)
+    if font_size is None:
+        font_size = 12
+    
+    # If y_values is empty, try to extract from series_data
+    if not y_values and series_data:
+        for series in series_data:
+            series_values = series.get("values", [])
+            if series_values:
+                y_values.extend(series_values)
+    
+    # Convert figsize from inches to pixels (assuming 100 DPI)
+    width_px = figsize[0] * 100 if figsize else 800
+    height_px = figsize[1] * 100 if figsize else 600
+    
+    # Base distances in pixels
+    base_x_distance = 30
+    base_y_distance = 40
+    
+    # Adjust based on chart type
+    if chart_type == "bar":
+        # For bar charts, consider bar width and spacing
+        if x_values and len(x_values) > 1:
+            # Estimate bar width based on number of bars and chart width
+            estimated_bar_width = width_px / (len(x_values) * 1.5)  # 1.5 accounts for spacing
+            base_x_distance = max(base_x_distance, estimated_bar_width * 0.3)
+        
+        if y_values:
+            # For vertical bars, y-axis needs more space for value labels
+            max_y = max(y_values) if y_values else 0
+            if max_y > 1000:  # Large numbers need more space
+                base_y_distance = max(base_y_distance, 60)
+    
+    elif chart_type in ["scatter", "line"]:
+        # For scatter/line charts, consider data point density
+        if x_values and len(x_values) > 10:
+            # Dense data needs more space
+            base_x_distance = max(base_x_distance, 40)
+            base_y_distance = max(base_y_distance, 50)
+    
+    elif chart_type == "area":
+        # For area charts, need more space due to filled areas
+        base_x_distance = max(base_x_distance, 50)
+        base_y_distance = max(base_y_distance, 80)  # Area charts need more y-axis space
+        
+        if y_values:
+            # For area charts with large values, need even more space
+            max_y = max(y_values) if y_values else 0
+            if max_y > 1000:  # Large numbers need more space
+                base_y_distance = max(base_y_distance, 100)
+    
+    # Adjust based on font size
+    font_factor = font_size / 12.0
+    base_x_distance = int(base_x_distance * font_factor)
+    base_y_distance = int(base_y_distance * font_factor)
+    
+    # Adjust based on chart dimensions
+    if width_px < 600:  # Small charts need more space
+        base_x_distance = int(base_x_distance * 1.2)
+    if height_px < 400:
+        base_y_distance = int(base_y_distance * 1.2)
+    
+    # Ensure minimum distances
+    base_x_distance = max(base_x_distance, 20)
+    base_y_distance = max(base_y_distance, 25)
+    
+    return base_x_distance, base_y_distance
+
+
+def extract_excel_range(sheet, cell_range):
+    """Non-empty values of a cell range such as 'E23:E29' or 'AA20:AA23', row by row"""
+    try:
+        current_app.logger.debug(f"🔍 Extracting Excel range: {cell_range}")
+        values = []
+        for row in sheet[cell_range]:
+            for cell in row:
+                if cell.value is not None:
+                    # Debug each cell value
+                    current_app.logger.debug(f"🔍 Cell {cell.coordinate}: '{cell.value}' (type: {type(cell.value)}, repr: {repr(cell.value)})")
+                    values.append(cell.value)
+        current_app.logger.debug(f"🔍 Extracted values: {values}")
+        return values
+    except Exception as e:
+        current_app.logger.error(f"❌ Error extracting range {cell_range}: {e}")
+        return []
+
+
+def extract_cell_ranges(obj, sheet):
+    """Recursively walk through nested dicts/lists and extract cell ranges and single cells from strings"""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, str):
+                # Check for cell range pattern (e.g., "A1:B10")
+                if re.match(r"^[A-Z]+\d+:[A-Z]+\d+$", v):
+                    try:
+                        extracted = extract_excel_range(sheet, v)
+                        obj[k] = extracted
+                        current_app.logger.debug(f"🔍 Excel extraction: {k} = {v} -> {extracted}")
+                    except Exception as e:
+                        # Failed to extract data from cell range
+                        current_app.logger.error(f"❌ Failed to extract Excel range {v} for key {k}: {e}")
+                        pass
+                # Check for single cell pattern (e.g., "U13")
+                elif re.match(r"^[A-Z]+\d+$", v):
+                    try:
+                        cell_value = sheet[v].value
+                        if cell_value is not None:
+                            obj[k] = cell_value
+                        else:
+                            # Keep original value if cell is empty
+                            pass
+                    except Exception:
+                        # Failed to extract data from single cell
+                        pass
+            else:
+                extract_cell_ranges(v, sheet)
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            extract_cell_ranges(v, sheet)
+
+
+def validate_chart_config(config):
+    """Validate chart configuration for dimension consistency"""
+    if "series" in config and isinstance(config["series"], dict):
+        series_config = config["series"]
+        x_axis_range = series_config.get("x_axis", "")
+
+        if x_axis_range and isinstance(x_axis_range, str) and ":" in x_axis_range:
+            # Parse x_axis range to get length
+            try:
+                start_cell, end_cell = x_axis_range.split(":")
+                start_col, start_row = re.match(r"([A-Z]+)(\d+)", start_cell).groups()
+                end_col, end_row = re.match(r"([A-Z]+)(\d+)", end_cell).groups()
+
+                if start_col == end_col:  # Same column
+                    x_length = int(end_row) - int(start_row) + 1
+                    current_app.logger.info(f"🔍 X-axis range {x_axis_range} has {x_length} cells")
+
+                    # Check each series data
+                    series_data = series_config.get("data", [])
+                    for i, series in enumerate(series_data):
+                        series_name = series.get("name", f"Series {i+1}")
+                        values_range = series.get("values", "")
+
+                        if values_range and isinstance(values_range, str) and ":" in values_range:
+                            try:
+                                start_cell, end_cell = values_range.split(":")
+                                start_col, start_row = re.match(r"([A-Z]+)(\d+)", start_cell).groups()
+                                end_col, end_row = re.match(r"([A-Z]+)(\d+)", end_cell).groups()
+
+                                if start_col == end_col:  # Same column
+                                    y_length = int(end_row) - int(start_row) + 1
+                                    current_app.logger.info(f"📊 Series '{series_name}' range {values_range} has {y_length} cells")
+
+                                    if x_length != y_length:
+                                        pass  # Suppress warning logs: f"⚠️ Dimension mismatch detected: x_axis={x_length}, {series_name}={y_length}")
+
+                                        # Fix by adjusting the shorter range
+                                        if x_length > y_length:
+                                            # Extend y_values range
+                                            new_end_row = int(start_row) + x_length - 1
+                                            new_end_cell = f"{start_col}{new_end_row}"
+                                            series["values"] = f"{start_cell}:{new_end_cell}"
+                                            current_app.logger.info(f"🔧 Extended {series_name} range to {series['values']}")
+                                        else:
+                                            # Truncate x_axis range
+                                            new_end_row = int(start_row) + y_length - 1
+                                            new_end_cell = f"{start_col}{new_end_row}"
+                                            series_config["x_axis"] = f"{start_cell}:{new_end_cell}"
+                                            current_app.logger.info(f"🔧 Truncated x_axis range to {series_config['x_axis']}")
+                                            break  # Only need to fix once
+                            except Exception as e:
+                                current_app.logger.error(f"❌ Error parsing values range {values_range}: {e}")
+            except Exception as e:
+                current_app.logger.error(f"❌ Error parsing x_axis range {x_axis_range}: {e}")
+
+
+def validate_and_fix_dimensions(x_vals, series_data):
+    """Validate that all series have the same length as x_axis and fix if needed"""
+    if not x_vals or not series_data:
+        return x_vals, series_data
+
+    x_length = len(x_vals)
+    current_app.logger.debug(f"🔍 Validating dimensions: x_axis length = {x_length}")
+
+    for i, series in enumerate(series_data):
+        series_name = series.get("name", f"Series {i+1}")
+        y_vals = series.get("values", [])
+        y_length = len(y_vals)
+
+        current_app.logger.debug(f"📊 Series '{series_name}': {y_length} values")
+
+        if x_length != y_length:
+            pass  # Suppress warning logs: f"⚠️ Dimension mismatch in '{series_name}': x_axis={x_length}, y_values={y_length}")
+
+            # Fix by truncating to the minimum length
+            min_length = min(x_length, y_length)
+            if min_length > 0:
+                # Truncate x_axis if it's longer
+                if x_length > min_length:
+                    x_vals = x_vals[:min_length]
+                    current_app.logger.debug(f"✂️ Truncated x_axis to {min_length} values")
+
+                # Truncate y_values if they're longer
+                if y_length > min_length:
+                    series["values"] = y_vals[:min_length]
+                    current_app.logger.debug(f"✂️ Truncated '{series_name}' values to {min_length}")
+            else:
+                current_app.logger.error("❌ Cannot fix dimensions: both arrays are empty")
+
+    return x_vals, series_data
+
+
+def extract_values_from_range(df, cell_range):
+    """Values of a cell range read from the report sheet DataFrame"""
+    from openpyxl.utils import column_index_from_string
+    start_cell, end_cell = cell_range.split(":")
+    start_col, start_row = re.match(r"([A-Z]+)(\d+)", start_cell).groups()
+    end_col, end_row = re.match(r"([A-Z]+)(\d+)", end_cell).groups()
+
+    start_col_idx = column_index_from_string(start_col) - 1
+    end_col_idx = column_index_from_string(end_col) - 1
+    start_row_idx = int(start_row) - 1  # Fixed: pandas is 0-indexed, Excel is 1-indexed
+    end_row_idx = int(end_row) - 1      # Fixed: pandas is 0-indexed, Excel is 1-indexed
+
+    if start_col_idx == end_col_idx:
+        return df.iloc[start_row_idx:end_row_idx + 1, start_col_idx].tolist()
+    else:
+        return df.iloc[start_row_idx:end_row_idx + 1, start_col_idx:end_col_idx + 1].values.flatten().tolist()
+
+
+def group_and_sort(x_vals, y_vals, group_names=None, sort_order=None):
+    """Filter x/y pairs to data_grouping (if given) and sort them by y value"""
+    # Grouping: only keep x/y where x in group_names (if group_names provided)
+    if group_names:
+        filtered = [(x, y) for x, y in zip(x_vals, y_vals) if x in group_names]
+        if filtered:
+            x_vals, y_vals = zip(*filtered)
+        else:
+            x_vals, y_vals = [], []
+    # Sorting: sort by y-value
+    if sort_order == "ascending":
+        sorted_pairs = sorted(zip(x_vals, y_vals), key=lambda pair: pair[1])
+        if sorted_pairs:
+            x_vals, y_vals = zip(*sorted_pairs)
+    elif sort_order == "descending":
+        sorted_pairs = sorted(zip(x_vals, y_vals), key=lambda pair: pair[1], reverse=True)
+        if sorted_pairs:
+            x_vals, y_vals = zip(*sorted_pairs)
+    return list(x_vals), list(y_vals)
+
+
+def legend_visible(chart_meta):
+    """chart_meta showlegend/legend as a bool; strings such as "false" or "off" hide the legend"""
+    show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
+    # Convert string "false"/"true" to boolean if needed
+    if isinstance(show_legend_raw, str):
+        return show_legend_raw.lower() not in ['false', '0', 'no', 'off']
+    return bool(show_legend_raw)
+
+
+def format_data_label(value, value_format):
+    """Data label text for a value, e.g. ".1f" or ".0%"; values that are not numbers are shown as they are"""
+    try:
+        return f"{float(value):{value_format}}"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def axis_title_style(chart_meta, font_size, font_color):
+    """Font keyword arguments for set_xlabel/set_ylabel"""
+    return dict(
+        fontsize=font_size or 12,
+        color=font_color if font_color else 'black',
+        fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None,
+    )
+
+
+def text_alignment(text_position):
+    """Horizontal alignment of a text label from a textposition such as "top left" """
+    if "center" in text_position:
+        return 'center'
+    if "left" in text_position:
+        return 'left'
+    if "right" in text_position:
+        return 'right'
+    return 'center'
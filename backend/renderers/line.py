@@ -0,0 +1,180 @@
+from renderers.helpers import (
+    axis_title_style,
+    calculate_optimal_label_distance,
+    group_and_sort,
+    legend_visible,
+    text_alignment,
+)
+from renderers.series import SeriesRenderer
+
+
+class LineRenderer(SeriesRenderer):
+    """Line, scatter line and area charts (Matplotlib)"""
+
+    def draw_plot(self, chart, plot, i, series, label, color):
+        # Line chart; lines go on the secondary axis when there is one
+        marker = 'o' if series.get("type", "bar").lower() == "scatter_line" else None
+        line_color = color if color is not None else 'blue'
+        ax = plot.ax2 if plot.ax2 else plot.ax1
+        ax.plot(plot.x_values, plot.y_vals, label=label, color=line_color, marker=marker, linewidth=2)
+
+    def draw_fill_between(self, chart, plot, i, series, label, color):
+        chart_meta, series_data = chart.chart_meta, chart.series_data
+        data_label_font_size, data_label_color = chart.data_label_font_size, chart.data_label_color
+        ax1 = plot.ax1
+
+        # Pair this series' values with the x-axis (grouping/sorting applies to both)
+        x_vals, y_vals = group_and_sort(plot.x_values, plot.y_vals, chart.data_grouping, chart.sort_order)
+        plot.y_vals = y_vals
+
+        # Extract area-specific properties from series
+        fill_type = series.get("fill", "tozeroy")
+        line_color = series.get("line", {}).get("color", color)
+        line_width = series.get("line", {}).get("width", 2)
+        line_shape = series.get("line", {}).get("shape", "linear")
+        marker_symbol = series.get("marker", {}).get("symbol", "o")
+        marker_size = series.get("marker", {}).get("size", 6)
+        marker_color = series.get("marker", {}).get("color", line_color)
+        area_opacity = series.get("opacity", 0.6)
+        text_labels = series.get("text", [])
+        text_position = series.get("textposition", "top center")
+
+        # Handle line shape (Matplotlib has no built-in splines, so spline is drawn linear)
+        linestyle = "step" if line_shape in ("hv", "vh") else "-"
+
+        # Create area fill based on fill type
+        if fill_type == "tozeroy":
+            # Fill from zero to y values
+            ax1.fill_between(x_vals, y_vals, alpha=area_opacity, label=label, color=line_color)
+        elif fill_type == "tonexty":
+            # Fill to next y values (for stacked areas)
+            if i == 0:
+                # First series - fill from zero
+                ax1.fill_between(x_vals, y_vals, alpha=area_opacity, label=label, color=line_color)
+                # Store the cumulative values for next series
+                if not hasattr(ax1, '_stacked_bottom'):
+                    ax1._stacked_bottom = {}
+                ax1._stacked_bottom[label] = y_vals
+            else:
+                # Get the bottom values from previous series
+                prev_bottom = getattr(ax1, '_stacked_bottom', {}).get(series_data[i-1].get('name', f'series_{i-1}'), [0] * len(y_vals))
+                # Calculate new bottom (cumulative)
+                new_bottom = [b + y for b, y in zip(prev_bottom, y_vals)]
+                # Fill between previous bottom and new bottom
+                ax1.fill_between(x_vals, prev_bottom, new_bottom, alpha=area_opacity, label=label, color=line_color)
+                # Store the new cumulative values
+                ax1._stacked_bottom[label] = new_bottom
+        elif fill_type == "tonextx":
+            # Fill to next x values (horizontal stacking)
+            if i == 0:
+                # First series - fill from zero
+                ax1.fill_betweenx(y_vals, x_vals, alpha=area_opacity, label=label, color=line_color)
+                # Store the cumulative values for next series
+                if not hasattr(ax1, '_stacked_left'):
+                    ax1._stacked_left = {}
+                ax1._stacked_left[label] = x_vals
+            else:
+                # Get the left values from previous series
+                prev_left = getattr(ax1, '_stacked_left', {}).get(series_data[i-1].get('name', f'series_{i-1}'), [0] * len(x_vals))
+                # Calculate new left (cumulative)
+                new_left = [l + x for l, x in zip(prev_left, x_vals)]
+                # Fill between previous left and new left
+                ax1.fill_betweenx(y_vals, prev_left, new_left, alpha=area_opacity, label=label, color=line_color)
+                # Store the new cumulative values
+                ax1._stacked_left[label] = new_left
+        else:
+            # Default fill
+            ax1.fill_between(x_vals, y_vals, alpha=area_opacity, label=label, color=line_color)
+
+        # Add line on top of area
+        ax1.plot(x_vals, y_vals, color=line_color, linewidth=line_width, linestyle=linestyle, zorder=3)
+
+        # Add markers if specified
+        if marker_symbol != "none":
+            ax1.scatter(x_vals, y_vals, color=marker_color, s=marker_size*20,
+                      zorder=4, edgecolors='white', linewidth=1)
+
+        # Add data labels if text is provided
+        if text_labels and len(text_labels) == len(y_vals):
+            # Get custom label offset if specified, otherwise use defaults
+            custom_label_offset = chart_meta.get("data_label_offset", None)
+            if "top" in text_position:
+                # Increase offset to prevent overlap with data points
+                y_offset = custom_label_offset if custom_label_offset is not None else 15
+            elif "bottom" in text_position:
+                y_offset = -custom_label_offset if custom_label_offset is not None else -15
+            else:
+                y_offset = 0
+            ha = text_alignment(text_position)
+            label_color = data_label_color or '#000000'
+            # Plain text labels have no background box
+            bbox = None if chart_meta.get("plain_text_labels", False) else dict(
+                boxstyle="round,pad=0.3", facecolor='white', alpha=0.9, edgecolor='gray', linewidth=0.5)
+
+            for x, y, text in zip(x_vals, y_vals, text_labels):
+                if text is not None:
+                    ax1.text(x, y + y_offset, str(text),
+                           ha=ha, va='bottom' if y_offset > 0 else 'top',
+                           fontsize=data_label_font_size or 10,
+                           color=label_color,
+                           fontweight='bold',
+                           bbox=bbox,
+                           zorder=5)
+
+        # Set axis labels, title, and legend for area chart (only once after all series)
+        if i == len(series_data) - 1:
+            self._finish_area(chart, plot, y_vals)
+
+    def _finish_area(self, chart, plot, y_vals):
+        """Axis titles, title and legend of an area chart"""
+        chart_meta, chart_config, series_data = chart.chart_meta, chart.chart_config, chart.series_data
+        font_size, font_color, title = chart.font_size, chart.font_color, chart.title
+        x_axis_label_distance, y_axis_label_distance = chart.x_axis_label_distance, chart.y_axis_label_distance
+        ax1 = plot.ax1
+
+        x_axis_title = chart_meta.get("x_label", chart_config.get("x_axis_title", ""))
+        y_axis_title = chart_meta.get("primary_y_label", chart_config.get("primary_y_label",
+            chart_meta.get("y_label", chart_config.get("y_label",
+            chart_meta.get("y_axis_title", chart_config.get("y_axis_title", ""))))))
+        if x_axis_title:
+            # Handle "auto" values for axis label distances
+            if x_axis_label_distance == "auto":
+                # Calculate optimal label distance for area chart
+                x_axis_label_distance, _ = calculate_optimal_label_distance(
+                    "area", series_data, plot.x_values, y_vals, chart.figsize, font_size
+                )
+            # Make the distance effect much more pronounced by multiplying the value
+            x_labelpad = (x_axis_label_distance * 10) if x_axis_label_distance is not None else 50.0
+            ax1.set_xlabel(x_axis_title, labelpad=x_labelpad, **axis_title_style(chart_meta, font_size, font_color))
+        if y_axis_title:
+            if y_axis_label_distance == "auto":
+                _, y_axis_label_distance = calculate_optimal_label_distance(
+                    "area", series_data, plot.x_values, y_vals, chart.figsize, font_size
+                )
+            y_labelpad = (y_axis_label_distance * 10) if y_axis_label_distance is not None else 50.0
+            ax1.set_ylabel(y_axis_title, labelpad=y_labelpad, **axis_title_style(chart_meta, font_size, font_color))
+
+        # Set chart title
+        if title and title.strip():
+            ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20,
+                        color=font_color if font_color else 'black',
+                        fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
+
+        # Set legend
+        show_legend = legend_visible(chart_meta)
+        legend_position, legend_font_size = chart.legend_position, chart.legend_font_size
+        if show_legend:
+            legend_position = chart_meta.get("legend_position", "top")
+            legend_font_size = chart_meta.get("legend_font_size", 10)
+
+            if legend_position == "bottom":
+                ax1.legend(loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
+            elif legend_position == "top":
+                ax1.legend(loc='upper center', bbox_to_anchor=(0.5, 1.02), fontsize=legend_font_size)
+            else:
+                ax1.legend(loc='best', fontsize=legend_font_size)
+
+        chart.update(
+            x_axis_label_distance=x_axis_label_distance, y_axis_label_distance=y_axis_label_distance,
+            show_legend=show_legend, legend_position=legend_position, legend_font_size=legend_font_size,
+        )
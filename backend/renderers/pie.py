@@ -0,0 +1,326 @@
+import matplotlib.pyplot as plt
+
+from renderers.base import ChartRenderer
+
+
+class PieRenderer(ChartRenderer):
+    """Pie and expanded pie charts (Matplotlib)"""
+
+    defaults = {"figsize": (10, 8), "expanded_figsize": (15, 8), "startangle": 90}
+
+    def render(self, chart):
+        chart_meta, series_data, x_values, colors = chart.chart_meta, chart.series_data, chart.x_values, chart.colors
+        title, figsize, startangle = chart.title, chart.figsize, chart.startangle
+        font_color, font_size = chart.font_color, chart.font_size
+        chart_background, plot_background = chart.chart_background, chart.plot_background
+        legend_position, legend_font_size, show_legend = chart.legend_position, chart.legend_font_size, chart.show_legend
+        ax1 = ax2 = None
+
+        # Check if this is an expanded pie chart
+        expanded_segment = chart_meta.get("expanded_segment")
+
+        if expanded_segment and len(series_data) == 1:
+            # Create subplot for expanded pie chart
+            mpl_figsize = figsize if figsize else self.defaults["expanded_figsize"]
+            fig_mpl, (ax1, ax2) = plt.subplots(1, 2, figsize=mpl_figsize, dpi=200)
+
+            # Apply background colors to Matplotlib figure
+            if chart_background:
+                fig_mpl.patch.set_facecolor(chart_background)
+            if plot_background:
+                ax1.set_facecolor(plot_background)
+                ax2.set_facecolor(plot_background)
+
+            series = series_data[0]
+            labels = series.get("labels", x_values)
+            values = series.get("values", [])
+            color = series.get("marker", {}).get("colors") if "marker" in series else colors
+            marker_line = series.get("marker", {}).get("line", {}) if "marker" in series else {}
+            explode = series.get("pull")
+            opacity = series.get("opacity", chart_meta.get("opacity"))
+            textinfo = series.get("textinfo", chart_meta.get("textinfo", "percent"))
+            textposition = series.get("textposition", chart_meta.get("textposition", "inside")).lower()
+            value_format_str = chart_meta.get("value_format", ".1f")
+            data_labels_enabled = bool(chart_meta.get("data_labels", True))
+            data_label_font_size = chart_meta.get("data_label_font_size", font_size or 10)
+            data_label_color = chart_meta.get("data_label_color", font_color or "#000000")
+            start_angle = startangle if startangle is not None else self.defaults["startangle"]
+            sort_order = chart_meta.get("sort_order")
+
+            # Optional sorting
+            if sort_order in ("ascending", "descending") and values:
+                zipped = list(zip(values, labels, color if isinstance(color, list) else [color]*len(labels), explode if isinstance(explode, list) else [0]*len(labels)))
+                reverse = sort_order == "descending"
+                zipped.sort(key=lambda t: (t[0] if t[0] is not None else 0), reverse=reverse)
+                values, labels, color_list, explode_list = zip(*zipped)
+                values = list(values)
+                labels = list(labels)
+                color = list(color_list)
+                explode = list(explode_list)
+
+            # Build autopct based on textinfo/value_format
+            def make_autopct(fmt:str, include_percent:bool, include_value:bool):
+                # Capture the current values in the closure
+                current_values = values.copy() if isinstance(values, list) else list(values) if values else []
+
+                def _inner(pct):
+                    # Ensure values are numeric before calculating total
+                    numeric_values = []
+                    for v in current_values:
+                        if v is not None:
+                            try:
+                                numeric_values.append(float(v))
+                            except (ValueError, TypeError):
+                                # Skip non-numeric values
+                                continue
+
+                    total = sum(numeric_values) if numeric_values else 0
+                    val = pct * total / 100.0
+                    parts = []
+                    if include_value:
+                        try:
+                            parts.append(f"{val:{fmt}}")
+                        except Exception:
+                            parts.append(f"{val:.1f}")
+                    if include_percent:
+                        parts.append(f"{pct:.1f}%")
+                    return " ".join(parts)
+                return _inner
+
+            include_label = "label" in (textinfo or "")
+            include_percent = "percent" in (textinfo or "")
+            include_value = "value" in (textinfo or "")
+
+            autopct_callable = None
+            if data_labels_enabled and (include_percent or include_value):
+                autopct_callable = make_autopct(value_format_str, include_percent, include_value)
+
+            # Wedge and text props
+            wedgeprops = {}
+            if isinstance(marker_line, dict):
+                if marker_line.get("color"):
+                    wedgeprops["edgecolor"] = marker_line.get("color")
+                if marker_line.get("width") is not None:
+                    wedgeprops["linewidth"] = marker_line.get("width")
+            if opacity is not None:
+                wedgeprops["alpha"] = opacity
+
+            textprops = {"color": data_label_color, "fontsize": data_label_font_size}
+            if chart_meta.get("font_family"):
+                textprops["fontfamily"] = chart_meta.get("font_family")
+
+            # Positioning
+            pctdistance = 0.6 if textposition == "inside" else 1.15
+            labeldistance = 1.1 if textposition != "inside" else 1.05
+
+            # Create pie chart
+            wedges, texts, autotexts = ax1.pie(
+                values,
+                labels=labels if include_label else None,
+                autopct=autopct_callable,
+                colors=color,
+                startangle=start_angle,
+                explode=explode,
+                wedgeprops=wedgeprops,
+                pctdistance=pctdistance,
+                labeldistance=labeldistance,
+                textprops=textprops,
+            )
+
+            # Style the autopct texts
+            for autotext in autotexts or []:
+                autotext.set_color(data_label_color)
+                autotext.set_fontsize(data_label_font_size)
+                autotext.set_fontweight('bold')
+                if chart_meta.get("font_family"):
+                    autotext.set_fontfamily(chart_meta.get("font_family"))
+
+            if title and title.strip():
+                ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20, color=font_color if font_color else None, fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
+
+            # Add legend for pie chart
+            show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
+            # Convert string "false"/"true" to boolean if needed
+            if isinstance(show_legend_raw, str):
+                show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
+            else:
+                show_legend = bool(show_legend_raw)
+            if show_legend:
+                # Initialize legend_loc for pie charts
+                legend_loc = 'best'  # default
+                if legend_position:
+                    loc_map = {
+                        "top": "upper center",
+                        "bottom": "lower center", 
+                        "left": "center left",
+                        "right": "center right"
+                    }
+                    legend_loc = loc_map.get(legend_position, 'best')
+
+                # Force legend to bottom if specified
+                if legend_position == "bottom":
+                    ax1.legend(wedges, labels, loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
+                else:
+                    ax1.legend(wedges, labels, loc=legend_loc, fontsize=legend_font_size)
+
+            # Create bar chart for expanded segment
+            if expanded_segment in labels:
+                segment_idx = labels.index(expanded_segment)
+                segment_value = values[segment_idx]
+                segment_color = color[segment_idx] if isinstance(color, list) and segment_idx < len(color) else color
+
+                ax2.bar([expanded_segment], [segment_value], color=segment_color, alpha=0.7)
+                ax2.set_title(f"{expanded_segment} Details", fontsize=font_size or 12, weight='bold')
+                ax2.set_ylabel("Value")
+
+                # Add value label on bar
+                ax2.text(0, segment_value, f"{segment_value}", ha='center', va='bottom', fontweight='bold')
+
+        else:
+            # Regular pie chart
+            mpl_figsize = figsize if figsize else self.defaults["figsize"]
+            fig_mpl, ax = plt.subplots(figsize=mpl_figsize, dpi=200)
+
+            # Apply background colors to Matplotlib figure
+            if chart_background:
+                fig_mpl.patch.set_facecolor(chart_background)
+            if plot_background:
+                ax.set_facecolor(plot_background)
+
+            if len(series_data) == 1:
+                series = series_data[0]
+                labels = series.get("labels", x_values)
+                values = series.get("values", [])
+                color = series.get("marker", {}).get("colors") if "marker" in series else colors
+                marker_line = series.get("marker", {}).get("line", {}) if "marker" in series else {}
+                explode = series.get("pull")
+                opacity = series.get("opacity", chart_meta.get("opacity"))
+                textinfo = series.get("textinfo", chart_meta.get("textinfo", "percent"))
+                textposition = series.get("textposition", chart_meta.get("textposition", "inside")).lower()
+                value_format_str = chart_meta.get("value_format", ".1f")
+                data_labels_enabled = bool(chart_meta.get("data_labels", True))
+                data_label_font_size = chart_meta.get("data_label_font_size", font_size or 10)
+                data_label_color = chart_meta.get("data_label_color", font_color or "#000000")
+                start_angle = startangle if startangle is not None else self.defaults["startangle"]
+                sort_order = chart_meta.get("sort_order")
+
+                # Optional sorting
+                if sort_order in ("ascending", "descending") and values:
+                    zipped = list(zip(values, labels, color if isinstance(color, list) else [color]*len(labels), explode if isinstance(explode, list) else [0]*len(labels)))
+                    reverse = sort_order == "descending"
+                    zipped.sort(key=lambda t: (t[0] if t[0] is not None else 0), reverse=reverse)
+                    values, labels, color_list, explode_list = zip(*zipped)
+                    values = list(values)
+                    labels = list(labels)
+                    color = list(color_list)
+                    explode = list(explode_list)
+
+                # Build autopct based on textinfo/value_format
+                def make_autopct(fmt:str, include_percent:bool, include_value:bool):
+                    # Capture the current values in the closure
+                    current_values = values.copy() if isinstance(values, list) else list(values) if values else []
+
+                    def _inner(pct):
+                        # Ensure values are numeric before calculating total
+                        numeric_values = []
+                        for v in current_values:
+                            if v is not None:
+                                try:
+                                    numeric_values.append(float(v))
+                                except (ValueError, TypeError):
+                                    # Skip non-numeric values
+                                    continue
+
+                        total = sum(numeric_values) if numeric_values else 0
+                        val = pct * total / 100.0
+                        parts = []
+                        if include_value:
+                            try:
+                                parts.append(f"{val:{fmt}}")
+                            except Exception:
+                                parts.append(f"{val:.1f}")
+                        if include_percent:
+                            parts.append(f"{pct:.1f}%")
+                        return " ".join(parts)
+                    return _inner
+
+                include_label = "label" in (textinfo or "")
+                include_percent = "percent" in (textinfo or "")
+                include_value = "value" in (textinfo or "")
+
+                autopct_callable = None
+                if data_labels_enabled and (include_percent or include_value):
+                    autopct_callable = make_autopct(value_format_str, include_percent, include_value)
+
+                # Wedge and text props
+                wedgeprops = {}
+                if isinstance(marker_line, dict):
+                    if marker_line.get("color"):
+                        wedgeprops["edgecolor"] = marker_line.get("color")
+                    if marker_line.get("width") is not None:
+                        wedgeprops["linewidth"] = marker_line.get("width")
+                if opacity is not None:
+                    wedgeprops["alpha"] = opacity
+
+                textprops = {"color": data_label_color, "fontsize": data_label_font_size}
+                if chart_meta.get("font_family"):
+                    textprops["fontfamily"] = chart_meta.get("font_family")
+
+                # Positioning
+                pctdistance = 0.6 if textposition == "inside" else 1.15
+                labeldistance = 1.1 if textposition != "inside" else 1.05
+
+                # Create pie chart
+                wedges, texts, autotexts = ax.pie(
+                    values,
+                    labels=labels if include_label else None,
+                    autopct=autopct_callable,
+                    colors=color,
+                    startangle=start_angle,
+                    explode=explode,
+                    wedgeprops=wedgeprops,
+                    pctdistance=pctdistance,
+                    labeldistance=labeldistance,
+                    textprops=textprops,
+                )
+
+                # Style the text
+                for autotext in autotexts or []:
+                    autotext.set_color(data_label_color)
+                    autotext.set_fontsize(data_label_font_size)
+                    autotext.set_fontweight('bold')
+                    if chart_meta.get("font_family"):
+                        autotext.set_fontfamily(chart_meta.get("font_family"))
+
+                if title and title.strip():
+                    ax.set_title(title, fontsize=font_size or 14, weight='bold', pad=20, color=font_color if font_color else None, fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
+
+                # Add legend for regular pie chart
+                show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
+                # Convert string "false"/"true" to boolean if needed
+                if isinstance(show_legend_raw, str):
+                    show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
+                else:
+                    show_legend = bool(show_legend_raw)
+                if show_legend:
+                    # Initialize legend_loc for pie charts
+                    legend_loc = 'best'  # default
+                    if legend_position:
+                        loc_map = {
+                            "top": "upper center",
+                            "bottom": "lower center", 
+                            "left": "center left",
+                            "right": "center right"
+                        }
+                        legend_loc = loc_map.get(legend_position, 'best')
+
+                    # Force legend to bottom if specified
+                    if legend_position == "bottom":
+                        ax.legend(wedges, labels, loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
+                    else:
+                        ax.legend(wedges, labels, loc=legend_loc, fontsize=legend_font_size)
+
+        if ax1 is None:
+            ax1 = ax
+        chart.update(show_legend=show_legend)
+        return fig_mpl, ax1, ax2
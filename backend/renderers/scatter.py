@@ -0,0 +1,316 @@
+import numpy as np
+from flask import current_app
+
+from renderers.helpers import axis_title_style, calculate_optimal_label_distance, text_alignment
+from renderers.series import SeriesRenderer
+
+
+class ScatterRenderer(SeriesRenderer):
+    """Scatter and bubble charts (Matplotlib)"""
+
+    def draw_scatter(self, chart, plot, i, series, label, color):
+        if series.get("type", "bar").lower() == "bubble":
+            self._draw_bubble(chart, plot, i, series, label, color)
+        else:
+            self._draw_markers(chart, plot, i, series, label, color)
+
+    def _draw_bubble(self, chart, plot, i, series, label, color):
+        chart_meta, chart_config, series_data = chart.chart_meta, chart.chart_config, chart.series_data
+        figsize, font_size, font_color = chart.figsize, chart.font_size, chart.font_color
+        x_axis_min_max, y_axis_min_max = chart.x_axis_min_max, chart.y_axis_min_max
+        x_axis_label_distance, y_axis_label_distance = chart.x_axis_label_distance, chart.y_axis_label_distance
+        show_data_labels, axis_tick_format, value_format = chart.show_data_labels, chart.axis_tick_format, chart.value_format
+        data_label_font_size, data_label_color = chart.data_label_font_size, chart.data_label_color
+        ax1, x_values, y_vals = plot.ax1, plot.x_values, plot.y_vals
+
+        # Enhanced bubble chart with better styling
+        # Creating bubble chart for series: {label}
+
+        # Get sizes from the series data structure
+        sizes = series.get("size", [20] * len(y_vals)) if y_vals else [20]
+        # Bubble chart data processed
+
+        # Ensure all arrays have the same length
+        min_length = min(len(x_values) if x_values else 0, len(y_vals) if y_vals else 0, len(sizes) if sizes else 0)
+        if min_length > 0 and (min_length < len(x_values) or min_length < len(y_vals) or min_length < len(sizes)):
+            #pass  # Suppress warning logs: f"⚠️ Array length mismatch! Truncating to {min_length}")
+            x_values = x_values[:min_length] if x_values else []
+            y_vals = y_vals[:min_length] if y_vals else []
+            sizes = sizes[:min_length] if sizes else []
+            if isinstance(color, list):
+                color = color[:min_length]
+
+        # Scale sizes for better visual impact (bubble charts need much larger sizes)
+        scaled_sizes = [s * 20 for s in sizes]  # Much larger scale for better visibility
+        # Scaled sizes calculated
+
+        # Colors
+        bubble_colors = color
+        if isinstance(color, list):
+            bubble_colors = color
+        elif color:
+            import matplotlib.cm as cm
+            size_array = np.array(sizes)
+            normalized_sizes = (size_array - size_array.min()) / (size_array.max() - size_array.min() + 1e-8)
+            cmap = cm.viridis if color == 'auto' else cm.get_cmap('viridis')
+            bubble_colors = [cmap(norm_size) for norm_size in normalized_sizes]
+        else:
+            bubble_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F']
+
+        # Marker styles from config
+        marker_cfg = series.get("marker", {}) if isinstance(series.get("marker"), dict) else {}
+        marker_line_cfg = marker_cfg.get("line", {}) if isinstance(marker_cfg.get("line"), dict) else {}
+        alpha_val = marker_cfg.get("opacity", series.get("opacity", chart_meta.get("opacity", 0.8)))
+        edge_color = marker_line_cfg.get("color", 'white')
+        edge_width = marker_line_cfg.get("width", 2)
+
+        # Create bubble chart with enhanced styling
+        scatter = ax1.scatter(
+            x_values, y_vals, 
+                             s=scaled_sizes, 
+                             c=bubble_colors, 
+            alpha=alpha_val,
+            edgecolors=edge_color,
+            linewidth=edge_width,
+                             label=label,
+            zorder=3)
+
+        # Keep a reference for legend building
+        try:
+            if not hasattr(ax1, "_bubble_handles"):
+                ax1._bubble_handles = []
+                ax1._bubble_labels = []
+            ax1._bubble_handles.append(scatter)
+            ax1._bubble_labels.append(label)
+        except Exception:
+            pass
+
+        # Create an explicit proxy handle so legend always renders
+        try:
+            from matplotlib.lines import Line2D
+            if isinstance(bubble_colors, list) and len(bubble_colors) > 0:
+                legend_facecolor = bubble_colors[0]
+            else:
+                legend_facecolor = bubble_colors if bubble_colors else '#1f77b4'
+            proxy = Line2D([0], [0], marker='o', linestyle='None', label=label,
+                           markerfacecolor=legend_facecolor, markeredgecolor=edge_color,
+                           markeredgewidth=edge_width, markersize=10, alpha=alpha_val)
+            ax1._bubble_proxy = proxy
+        except Exception:
+            pass
+
+        # Add subtle shadow effect for depth
+        ax1.scatter(
+            x_values, y_vals, 
+                  s=scaled_sizes, 
+                  c='black', 
+                  alpha=0.1, 
+                  zorder=1)
+
+        # Add data labels for bubble chart if enabled
+        if show_data_labels:
+            for j, (x, y, value_num) in enumerate(zip(x_values, y_vals, y_vals)):
+                if j < len(x_values):
+                    # Format value for label using value_format and axis_tick_format
+                    try:
+                        if axis_tick_format and "$" in axis_tick_format:
+                            num = float(value_num)
+                            formatted_value = f"${num:,.0f}" if value_format in (".0f", None) else f"${num:,.0f}" if value_format == ".0f" else f"${num:,.0f}"
+                            # Simplify: currency with thousands, ignore decimals beyond .0f for labels
+                        else:
+                            num = float(value_num)
+                            if value_format == ".0f":
+                                formatted_value = f"{num:.0f}"
+                            elif value_format == ".1f":
+                                formatted_value = f"{num:.1f}"
+                            elif value_format == ".2f":
+                                formatted_value = f"{num:.2f}"
+                            else:
+                                formatted_value = f"{num:.0f}"
+                    except:
+                        formatted_value = str(value_num)
+
+                    # Add text label inside bubble
+                    ax1.text(x, y, formatted_value, 
+                            ha='center', va='center', 
+                            fontsize=data_label_font_size or 10,
+                            color=data_label_color or '#000000',
+                            fontweight='bold',
+                            zorder=4)
+
+        # Fix axis ranges for bubble charts to prevent layout shifts
+        if i == len(series_data) - 1:  # Only set once after all series
+            # Always set fixed x-axis range for bubble charts to prevent layout shifts
+            if x_axis_min_max and isinstance(x_axis_min_max, list) and len(x_axis_min_max) == 2:
+                # Use explicit range from config
+                ax1.set_xlim(x_axis_min_max[0], x_axis_min_max[1])
+            else:
+                # Set auto-calculated range with padding
+                x_min, x_max = min(x_values), max(x_values)
+                x_padding = (x_max - x_min) * 0.1
+                ax1.set_xlim(x_min - x_padding, x_max + x_padding)
+
+            # Always set fixed y-axis range for bubble charts to prevent layout shifts
+            if y_axis_min_max and isinstance(y_axis_min_max, list) and len(y_axis_min_max) == 2:
+                # Use explicit range from config
+                ax1.set_ylim(y_axis_min_max[0], y_axis_min_max[1])
+            else:
+                # Set auto-calculated range with padding
+                y_min, y_max = min(y_vals), max(y_vals)
+                y_padding = (y_max - y_min) * 0.1
+                ax1.set_ylim(y_min - y_padding, y_max + y_padding)
+
+            # Apply axis label distances specifically for bubble charts
+            if x_axis_label_distance is not None or y_axis_label_distance is not None:
+                # Handle "auto" values by calculating optimal distances
+                if x_axis_label_distance == "auto" or y_axis_label_distance == "auto":
+                    # Calculate optimal label distances for bubble chart
+                    # Use the current series data for calculation
+                    current_series_data = [{"labels": series.get("labels", []), "values": y_vals}]
+                    auto_x_distance, auto_y_distance = calculate_optimal_label_distance(
+                        "scatter", current_series_data, x_values, y_vals, figsize, font_size
+                    )
+
+                    if x_axis_label_distance == "auto":
+                        x_axis_label_distance = auto_x_distance
+                    if y_axis_label_distance == "auto":
+                        y_axis_label_distance = auto_y_distance
+
+                # Calculate labelpad values with more aggressive multiplication for better spacing
+                figsize = chart_meta.get("figsize", [12, 8])
+                chart_width, chart_height = figsize
+
+                # More aggressive multiplication factors for better label separation
+                x_multiplier = max(20, chart_width * 3.0)
+                y_multiplier = max(20, chart_height * 3.0)
+
+                x_labelpad = (x_axis_label_distance * x_multiplier) if x_axis_label_distance is not None else 50.0
+                y_labelpad = (y_axis_label_distance * y_multiplier) if y_axis_label_distance is not None else 50.0
+
+                # Get axis titles
+                x_axis_title = chart_meta.get("x_label", chart_config.get("x_axis_title", ""))
+                y_axis_title = chart_meta.get("primary_y_label", chart_config.get("primary_y_label", ""))
+
+                # Debug logging for bubble chart axis label distance
+                current_app.logger.debug(f"🎈 Bubble Chart Processing - X Distance: {x_axis_label_distance} → {x_labelpad}, Y Distance: {y_axis_label_distance} → {y_labelpad}")
+                current_app.logger.debug(f"🎈 Bubble Chart Titles - X: '{x_axis_title}', Y: '{y_axis_title}'")
+
+                # Set axis labels with distance
+                if x_axis_title:
+                    ax1.set_xlabel(x_axis_title, labelpad=x_labelpad, **axis_title_style(chart_meta, font_size, font_color))
+                    current_app.logger.debug(f"🎈 Set X-axis label with labelpad: {x_labelpad}")
+                if y_axis_title:
+                    ax1.set_ylabel(y_axis_title, labelpad=y_labelpad, **axis_title_style(chart_meta, font_size, font_color))
+                    current_app.logger.debug(f"🎈 Set Y-axis label with labelpad: {y_labelpad}")
+
+                # Additional spacing techniques for y-axis
+                if y_axis_label_distance and y_axis_label_distance > 50:
+                    # Force more space by adjusting the left margin
+                    current_app.logger.debug("🎈 Applying additional y-axis spacing techniques")
+                    # Adjust the plot position to create more left margin
+                    ax1.set_position([0.15, 0.1, 0.75, 0.8])  # [left, bottom, width, height]
+
+                current_app.logger.debug("🎈 Bubble Chart Axis Label Distance Applied Successfully")
+
+                # Store the labelpad values for later use to prevent override
+                ax1._bubble_x_labelpad = x_labelpad
+                ax1._bubble_y_labelpad = y_labelpad
+                ax1._bubble_x_title = x_axis_title
+                ax1._bubble_y_title = y_axis_title
+            else:
+                current_app.logger.debug("🎈 Bubble Chart - No axis label distance values found")
+
+        # Later series and the shared axis styling see the trimmed values and the distances worked out here
+        plot.x_values, plot.y_vals = x_values, y_vals
+        chart.update(figsize=figsize, x_axis_label_distance=x_axis_label_distance, y_axis_label_distance=y_axis_label_distance)
+
+    def _draw_markers(self, chart, plot, i, series, label, color):
+        # Enhanced scatter plot with custom styling
+        data_label_font_size, data_label_color = chart.data_label_font_size, chart.data_label_color
+        ax1, x_values, y_vals = plot.ax1, plot.x_values, plot.y_vals
+
+        # Extract marker properties from series
+        marker_size = series.get("marker", {}).get("size", 50)
+        marker_color = series.get("marker", {}).get("color", color)
+        marker_opacity = series.get("marker", {}).get("opacity", 0.8)
+        text_labels = series.get("text", [])
+        text_position = series.get("textposition", "top center")
+
+        # Extract line properties from series
+        line_config = series.get("line", {})
+        line_color = line_config.get("color", marker_color)
+        line_width = line_config.get("width", 2)
+        line_dash = line_config.get("dash", "solid")
+
+        # Handle mode setting
+        mode = series.get("mode", "markers")
+
+        # Handle marker size (can be single value or list)
+        if isinstance(marker_size, list):
+            sizes = marker_size
+        else:
+            sizes = [marker_size] * len(y_vals)
+
+        # Scale sizes for better visibility
+        scaled_sizes = [s * 2 for s in sizes]
+
+        # Create enhanced scatter plot
+        ax1.scatter(x_values, y_vals, 
+                   s=scaled_sizes, 
+                   c=marker_color, 
+                   alpha=marker_opacity,
+                   edgecolors='white',
+                   linewidth=1.5,
+                   label=label,
+                   zorder=3)
+
+        # Add line if mode includes lines or if line properties are specified
+        if "lines" in mode or "line" in mode or line_config:
+            # Convert dash style to matplotlib format
+            if line_dash == "dash":
+                linestyle = "--"
+            elif line_dash == "dot":
+                linestyle = ":"
+            elif line_dash == "dashdot":
+                linestyle = "-."
+            else:
+                linestyle = "-"  # solid
+
+            ax1.plot(x_values, y_vals, 
+                    color=line_color, 
+                    linewidth=line_width, 
+                    linestyle=linestyle,
+                    alpha=marker_opacity,
+                    zorder=2)
+
+        # Add subtle shadow effect for depth
+        ax1.scatter(x_values, y_vals, 
+                  s=scaled_sizes, 
+                  c='black', 
+                  alpha=0.1, 
+                  zorder=1)
+
+        # Add data labels if text is provided
+        if text_labels and len(text_labels) == len(y_vals):
+            # Determine label position based on textposition
+            if "top" in text_position:
+                y_offset = 2
+            elif "bottom" in text_position:
+                y_offset = -2
+            else:
+                y_offset = 0
+            ha = text_alignment(text_position)
+            label_color = data_label_color or '#000000'
+
+            for x, y, text in zip(x_values, y_vals, text_labels):
+                if text is not None:
+                    ax1.text(x, y + y_offset, str(text), 
+                            ha=ha, va='bottom' if y_offset > 0 else 'top',
+                            fontsize=data_label_font_size or 10,
+                            color=label_color,
+                            fontweight='bold',
+                            bbox=dict(boxstyle="round,pad=0.3", 
+                                     facecolor='white', 
+                                     alpha=0.9,
+                                     edgecolor='gray',
+                                     linewidth=0.5))
@@ -0,0 +1,15 @@
+import matplotlib.pyplot as plt
+
+from renderers.series import SeriesRenderer
+
+
+class StatisticalRenderer(SeriesRenderer):
+    """Histogram, box and violin charts (Matplotlib); violin series are drawn by the scatter fallback"""
+
+    def draw_hist(self, chart, plot, i, series, label, color):
+        plot.ax1.hist(plot.y_vals, bins=10, label=label, color=color, alpha=0.7)
+
+    def draw_boxplot(self, chart, plot, i, series, label, color):
+        plot.ax1.boxplot(plot.y_vals, labels=[label], patch_artist=True)
+        if color:
+            plot.ax1.findobj(plt.matplotlib.patches.Patch)[-1].set_facecolor(color)
@@ -0,0 +1,828 @@
+import re
+
+import matplotlib
+import matplotlib.pyplot as plt
+import squarify
+from flask import current_app
+
+from renderers.helpers import legend_visible
+from renderers.series import SeriesRenderer
+
+
+def _format_size(size, value_format):
+    """Treemap value label; formats other than .1f, .0f and .0% show one decimal"""
+    try:
+        return f"{size:{value_format if value_format in ('.1f', '.0f', '.0%') else '.1f'}}"
+    except (TypeError, ValueError):
+        return str(size)
+
+
+def _remove_center_annotations(ax):
+    """Remove the total that squarify may write in the middle of the plot"""
+    texts_to_remove = []
+    for text_obj in ax.texts:
+        if hasattr(text_obj, 'get_position'):
+            pos = text_obj.get_position()
+            text_content = text_obj.get_text()
+
+            # More robust center annotation detection:
+            # 1. Positioned in center area (0.3 to 0.7 range)
+            # 2. Contains numbers or is longer than normal labels
+            # 3. Or contains specific patterns like "Economic 25.0"
+            is_center_annotation = (
+                (0.3 <= pos[0] <= 0.7 and 0.3 <= pos[1] <= 0.7) and (
+                    len(text_content) > 8 or  # Longer than normal labels
+                    any(char.isdigit() for char in text_content) or  # Contains numbers
+                    ' ' in text_content and any(char.isdigit() for char in text_content)  # Pattern like "Economic 25.0"
+                )
+            )
+
+            if is_center_annotation:
+                current_app.logger.debug(f"🔍 Removing center annotation: '{text_content}' at position {pos}")
+                texts_to_remove.append(text_obj)
+
+    for text_obj in texts_to_remove:
+        text_obj.remove()
+
+
+def _clear_artist_labels(ax):
+    """Blank the labels of the plot elements so no legend entry can be made from them"""
+    for artist in ax.get_children():
+        # Only process objects that are not Axis objects and have label methods
+        if (hasattr(artist, 'get_label') and
+            hasattr(artist, 'set_label') and
+            not isinstance(artist, (matplotlib.axis.Axis, matplotlib.axis.XAxis, matplotlib.axis.YAxis)) and
+            artist.get_label()):
+            try:
+                artist.set_label('')
+            except Exception as e:
+                # Skip if set_label fails (e.g., for Axis objects)
+                current_app.logger.debug(f"🔍 Skipped setting label on {type(artist).__name__}: {e}")
+        if hasattr(artist, '_label') and artist._label:
+            artist._label = ''
+
+
+class TreemapRenderer(SeriesRenderer):
+    """Treemap (squarify) and waterfall charts (Matplotlib); waterfall series are drawn as bars by the bar family"""
+
+    def draw_treemap(self, chart, plot, i, series, label, color):
+        chart_meta, title, margin = chart.chart_meta, chart.title, chart.margin
+        font_size, font_color, fill_opacity = chart.font_size, chart.font_color, chart.fill_opacity
+        chart_background, plot_background = chart.chart_background, chart.plot_background
+        show_gridlines, gridline_color, gridline_style = chart.show_gridlines, chart.gridline_color, chart.gridline_style
+        show_x_ticks, show_y_ticks = chart.show_x_ticks, chart.show_y_ticks
+        show_legend, legend_position, legend_font_size = chart.show_legend, chart.legend_position, chart.legend_font_size
+        data_labels, show_data_labels, value_format = chart.data_labels, chart.show_data_labels, chart.value_format
+        data_label_font_size, data_label_color = chart.data_label_font_size, chart.data_label_color
+        fig_mpl, ax1, x_values = plot.fig, plot.ax1, plot.x_values
+
+        # For treemaps, get data directly from series
+        values = series.get("values", [])
+        labels = series.get("labels", [])
+
+        # Debug logging for chart metadata
+        current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - Full chart_meta: {chart_meta}")
+        current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - showlegend value: {chart_meta.get('showlegend')}")
+        current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - showlegend type: {type(chart_meta.get('showlegend'))}")
+        current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - showlegend converted: {show_legend}")
+
+        # Debug logging
+        current_app.logger.debug(f"🔍 Treemap Debug - Series: {series}")
+        current_app.logger.debug(f"🔍 Treemap Debug - Values: {values} (type: {type(values)})")
+        current_app.logger.debug(f"🔍 Treemap Debug - Labels: {labels} (type: {type(labels)})")
+        current_app.logger.debug(f"🔍 Treemap Debug - X_values: {x_values}")
+
+        # Additional debugging for raw data
+        if isinstance(values, list):
+            current_app.logger.debug(f"🔍 Treemap Debug - Values list items: {[f'{v} (type: {type(v)})' for v in values]}")
+        if isinstance(labels, list):
+            current_app.logger.debug(f"🔍 Treemap Debug - Labels list items: {[f'{l} (type: {type(l)})' for l in labels]}")
+            # Additional debugging for label content
+            for i, label in enumerate(labels):
+                current_app.logger.debug(f"🔍 Treemap Debug - Label {i}: '{label}' (repr: {repr(label)})")
+
+        # NO FALLBACKS - Only use data from series to prevent mixing data sources
+        if not values:
+            current_app.logger.error("❌ Treemap: No values found in series data")
+            values = []
+
+        if not labels:
+            current_app.logger.error("❌ Treemap: No labels found in series data")
+            labels = []
+
+
+        # Ensure we have valid data for treemap
+        if values and labels and len(values) == len(labels):
+            # Convert values to numeric and filter out invalid data
+            valid_data = []
+            valid_labels = []
+            valid_colors = []
+
+            # Enhanced color palette for better visual appeal
+            enhanced_colors = [
+                '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7',
+                '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9',
+                '#F8C471', '#82E0AA', '#F1948A', '#85C1E9', '#D7BDE2'
+            ]
+
+            for i, (label, value) in enumerate(zip(labels, values)):
+                try:
+                    numeric_value = float(value)
+                    if numeric_value > 0:  # Only include positive values
+                        # Clean and format the label text
+                        clean_label = str(label).strip()
+
+                        # Debug the original label
+                        current_app.logger.debug(f"🔍 Treemap label cleaning - Original: '{label}' (repr: {repr(label)})")
+
+                        # Light cleaning for treemap labels - only remove control characters
+                        # Remove control characters and non-printable characters
+                        clean_label = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', clean_label)
+                        # Remove extra whitespace
+                        clean_label = re.sub(r'\s+', ' ', clean_label).strip()
+
+                        # If label is empty after cleaning, keep it empty (no fallback)
+                        if not clean_label:
+                            clean_label = ""
+
+                        # Debug the cleaned label
+                        current_app.logger.debug(f"🔍 Treemap label cleaning - Cleaned: '{clean_label}' (repr: {repr(clean_label)})")
+
+                        # CRITICAL: Skip only truly problematic labels (not valid category names)
+                        if (clean_label and 
+                            (clean_label.lower() in ['e', 'c', '15.0']) or
+                            (re.match(r'^[0-9\.]+$', clean_label)) or
+                            (len(clean_label) < 2) or
+                            ('budget' in clean_label.lower() and len(clean_label) < 8 and 'budget' != clean_label.lower())):
+                            current_app.logger.warning(f"⚠️ SKIPPING problematic label: '{clean_label}' with value: {numeric_value}")
+                            continue
+
+                        valid_data.append(numeric_value)
+                        valid_labels.append(clean_label)
+
+                        # Debug logging for label cleaning
+                        if str(label) != clean_label:
+                            current_app.logger.debug(f"🔍 Treemap label cleaned: '{label}' -> '{clean_label}'")
+
+                        # Use custom color if available, otherwise use enhanced palette
+                        if isinstance(color, list) and i < len(color):
+                            valid_colors.append(color[i])
+                        elif color:
+                            valid_colors.append(color)
+                        else:
+                            # Use enhanced color palette for better visual appeal
+                            color_index = i % len(enhanced_colors)
+                            valid_colors.append(enhanced_colors[color_index])
+                except (ValueError, TypeError):
+                    continue
+
+            if valid_data:
+                # Ensure we have the same number of labels as data points
+                if len(valid_labels) != len(valid_data):
+                    current_app.logger.warning(f"⚠️ Treemap: Mismatch between data ({len(valid_data)}) and labels ({len(valid_labels)})")
+                    # Trim or pad labels to match data length (no fallback generation)
+                    if len(valid_labels) < len(valid_data):
+                        # Pad with empty strings if we have fewer labels
+                        valid_labels.extend([""] * (len(valid_data) - len(valid_labels)))
+                    else:
+                        # Trim excess labels
+                        valid_labels = valid_labels[:len(valid_data)]
+
+                # Final validation - remove any remaining problematic entries
+                final_data = []
+                final_labels = []
+                final_colors = []
+
+                for i, (label, value, color) in enumerate(zip(valid_labels, valid_data, valid_colors)):
+                    # Skip only truly problematic entries (not valid category names)
+                    if (label and 
+                        (label.lower() in ['e', 'c', '15.0']) or
+                        (re.match(r'^[0-9\.]+$', label)) or
+                        (len(label) < 2) or
+                        ('budget' in label.lower() and len(label) < 8 and 'budget' != label.lower())):
+                        current_app.logger.warning(f"⚠️ FINAL FILTER: Skipping problematic entry {i}: '{label}' with value: {value}")
+                        continue
+
+                    final_data.append(value)
+                    final_labels.append(label)
+                    final_colors.append(color)
+
+                # Remove duplicates to prevent multiple entries of the same category
+                seen_labels = set()
+                unique_data = []
+                unique_labels = []
+                unique_colors = []
+
+                for i, (label, value, color) in enumerate(zip(final_labels, final_data, final_colors)):
+                    if label and label.lower() not in seen_labels:
+                        seen_labels.add(label.lower())
+                        unique_data.append(value)
+                        unique_labels.append(label)
+                        unique_colors.append(color)
+                    else:
+                        current_app.logger.warning(f"⚠️ DUPLICATE REMOVED: '{label}' with value: {value}")
+
+                # Use the unique data
+                valid_data = unique_data
+                valid_labels = unique_labels
+                valid_colors = unique_colors
+
+                current_app.logger.debug(f"🔍 Treemap: Final unique data - {len(valid_data)} items")
+                current_app.logger.debug(f"🔍 Treemap: Final labels: {valid_labels}")
+                current_app.logger.debug(f"🔍 Treemap: Final data: {valid_data}")
+
+                # Get customization options
+                treemap_alpha = fill_opacity if fill_opacity is not None else 0.8
+                treemap_font_size = data_label_font_size if data_label_font_size else 10
+                treemap_font_weight = 'bold'
+
+                # Handle root_visible attribute - map from hide_center_box
+                hide_center_box = chart_meta.get("hide_center_box", False)
+                root_visible = not hide_center_box  # root_visible is opposite of hide_center_box
+                current_app.logger.debug(f"🔍 Treemap: hide_center_box = {hide_center_box}, root_visible = {root_visible}")
+
+                # Check legend visibility early to determine plot labels
+                show_legend = legend_visible(chart_meta)
+                current_app.logger.debug(f"🔍 Treemap Legend Decision: {show_legend}")
+
+                # Create enhanced treemap with customizable styling
+                # Always pass labels to squarify.plot() to avoid axis label errors
+                # But disable automatic legend creation by setting showlegend=False on the axis
+                ax1.set_visible(True)  # Ensure axis is visible
+
+                # CRITICAL: Disable automatic legend creation at the matplotlib level
+                # This prevents squarify from creating legends automatically
+                if not show_legend:
+                    # Disable legend creation on the axis
+                    try:
+                        ax1.set_legend_handles([])
+                    except:
+                        pass
+
+                    # CRITICAL: Override matplotlib's global legend settings
+                    # This prevents any automatic legend creation across the entire plot
+                    try:
+                        # Disable legend frame and visibility
+                        plt.rcParams['legend.frameon'] = False
+                        # Also try to disable legend creation on the axis
+                        ax1.legend_ = None
+                        if hasattr(ax1, '_legend'):
+                            ax1._legend = None
+                    except:
+                        pass
+
+                # For treemaps, we need to separate data labels from legend labels
+                # Data labels should show when data_labels=true, regardless of legend setting
+                if data_labels:
+                    # Show data labels on the treemap rectangles
+                    current_app.logger.debug(f"🔍 Treemap: Showing data labels with font size {treemap_font_size}")
+                    current_app.logger.debug(f"🔍 Treemap: Valid labels: {valid_labels}")
+                    current_app.logger.debug(f"🔍 Treemap: Valid data: {valid_data}")
+                    current_app.logger.debug(f"🔍 Treemap: Valid colors: {valid_colors}")
+
+                    # Final validation before plotting
+                    if len(valid_labels) != len(valid_data):
+                        current_app.logger.error(f"❌ CRITICAL: Label/data mismatch - Labels: {len(valid_labels)}, Data: {len(valid_data)}")
+                        current_app.logger.error(f"❌ Labels: {valid_labels}")
+                        current_app.logger.error(f"❌ Data: {valid_data}")
+
+                    # Configure squarify based on root_visible setting
+                    if root_visible:
+                        # Normal treemap with all rectangles visible
+                        # Use squarify.plot() but then remove any center annotations
+                        # Prepare labels: show label + value when data_labels is True
+                        if data_labels:
+                            display_labels = []
+                            for size, lbl in zip(valid_data, valid_labels):
+                                formatted_val = _format_size(size, value_format)
+                                display_labels.append(f"{lbl}\n{formatted_val}")
+                        else:
+                            display_labels = [''] * len(valid_labels)
+
+                        squarify.plot(
+                            sizes=valid_data,
+                            label=display_labels,
+                            color=valid_colors,
+                            alpha=treemap_alpha,
+                            ax=ax1,
+                            text_kwargs={
+                                'fontsize': treemap_font_size, 
+                                'fontweight': treemap_font_weight,
+                                'color': data_label_color if data_label_color else '#000000'
+                            }
+                        )
+
+                        # Remove any center annotations that squarify might have created
+                        _remove_center_annotations(ax1)
+                    else:
+                        # Treemap without root rectangle - use squarify.normalize_sizes and manual plotting
+                        current_app.logger.debug("🔍 Treemap: Creating treemap without root rectangle")
+
+                        # Normalize sizes to fit the plot area
+                        normalized_sizes = squarify.normalize_sizes(valid_data, 1, 1)
+
+                        # Get rectangles without root
+                        rectangles = squarify.squarify(normalized_sizes, 0, 0, 1, 1)
+
+                        # Plot rectangles manually without root
+                        for i, (rect, label, color) in enumerate(zip(rectangles, valid_labels, valid_colors)):
+                            # Scale rectangle to plot area
+                            x, y, dx, dy = rect['x'], rect['y'], rect['dx'], rect['dy']
+
+                            # Create rectangle patch
+                            from matplotlib.patches import Rectangle
+                            rect_patch = Rectangle((x, y), dx, dy, 
+                                                  facecolor=color, 
+                                                  alpha=treemap_alpha,
+                                                  edgecolor='black',
+                                                  linewidth=0.5)
+                            ax1.add_patch(rect_patch)
+
+                            # Add label if data_labels is enabled
+                            if data_labels and label:
+                                # Center the label in the rectangle
+                                label_x = x + dx/2
+                                label_y = y + dy/2
+                                ax1.text(label_x, label_y, label,
+                                       ha='center', va='center',
+                                       fontsize=treemap_font_size,
+                                       fontweight=treemap_font_weight,
+                                       color=data_label_color if data_label_color else '#000000')
+                else:
+                    # No data labels requested
+                    current_app.logger.debug("🔍 Treemap: Data labels disabled")
+
+                    if root_visible:
+                        # Normal treemap with no labels
+                        # Use squarify.plot() but then remove any center annotations
+                        squarify.plot(
+                            sizes=valid_data,
+                            label=[''] * len(valid_labels),  # Empty labels when data_labels=false
+                            color=valid_colors,
+                            alpha=treemap_alpha,
+                            ax=ax1,
+                            text_kwargs={'fontsize': treemap_font_size, 'fontweight': treemap_font_weight}
+                        )
+
+                        # Remove any center annotations that squarify might have created
+                        _remove_center_annotations(ax1)
+                    else:
+                        # Treemap without root rectangle and no labels
+                        current_app.logger.debug("🔍 Treemap: Creating treemap without root rectangle and no labels")
+
+                        # Normalize sizes to fit the plot area
+                        normalized_sizes = squarify.normalize_sizes(valid_data, 1, 1)
+
+                        # Get rectangles without root
+                        rectangles = squarify.squarify(normalized_sizes, 0, 0, 1, 1)
+
+                        # Plot rectangles manually without root and without labels
+                        for i, (rect, color) in enumerate(zip(rectangles, valid_colors)):
+                            # Scale rectangle to plot area
+                            x, y, dx, dy = rect['x'], rect['y'], rect['dx'], rect['dy']
+
+                            # Create rectangle patch
+                            from matplotlib.patches import Rectangle
+                            rect_patch = Rectangle((x, y), dx, dy, 
+                                                  facecolor=color, 
+                                                  alpha=treemap_alpha,
+                                                  edgecolor='black',
+                                                  linewidth=0.5)
+                            ax1.add_patch(rect_patch)
+
+                # CRITICAL: After plotting, prevent legend creation if showlegend=false
+                # This applies regardless of whether data labels are shown
+                if not show_legend:
+                    current_app.logger.debug("🔍 Treemap: Post-plot legend prevention")
+
+                    # Prevent legend creation without removing data labels
+                    # The key is to prevent matplotlib from creating a legend, not to remove the labels themselves
+                    try:
+                        # Clear any existing legend
+                        if ax1.get_legend():
+                            ax1.get_legend().remove()
+                        ax1.legend_ = None
+
+                        # Prevent automatic legend creation by clearing legend handles
+                        ax1.legend_handles = []
+                    except Exception as e:
+                        current_app.logger.debug(f"🔍 Legend prevention error: {e}")
+
+                    # Debug: log what plot elements were created
+                    current_app.logger.debug(f"🔍 Treemap Debug - Plot elements after squarify: {[type(artist).__name__ for artist in ax1.get_children()]}")
+                    current_app.logger.debug(f"🔍 Treemap Debug - Plot elements with labels: {[artist.get_label() for artist in ax1.get_children() if hasattr(artist, 'get_label') and artist.get_label()]}")
+
+                    # Check if squarify automatically created a legend
+                    current_app.logger.debug(f"🔍 Treemap Debug - Axis legend after squarify: {ax1.get_legend()}")
+                    current_app.logger.debug(f"🔍 Treemap Debug - Figure legends after squarify: {fig_mpl.legends if hasattr(fig_mpl, 'legends') else 'No legends attribute'}")
+
+                    # CRITICAL: Check if squarify created any plot elements that might automatically create legends
+                    # This is often the root cause of automatic legend creation
+                    for i, artist in enumerate(ax1.get_children()):
+                        if (hasattr(artist, 'get_label') and 
+                            hasattr(artist, 'set_label') and 
+                            not isinstance(artist, (matplotlib.axis.Axis, matplotlib.axis.XAxis, matplotlib.axis.YAxis)) and
+                            artist.get_label()):
+                            current_app.logger.warning(f"⚠️ Treemap: Found plot element with label '{artist.get_label()}' that might create legend")
+                            # Force remove the label to prevent legend creation
+                            try:
+                                artist.set_label('')
+                            except Exception as e:
+                                # Skip if set_label fails (e.g., for Axis objects)
+                                current_app.logger.debug(f"🔍 Skipped setting label on {type(artist).__name__}: {e}")
+
+                    # Additional safety: try to prevent matplotlib from creating legends
+                    # by setting the axis to not show legends
+                    try:
+                        # This is a more direct approach to prevent legend creation
+                        ax1.set_legend_handles([])
+                    except:
+                        pass
+
+                    # Also try to clear any legend handles that might exist
+                    try:
+                        ax1.legend_handles = []
+                    except:
+                        pass
+
+                    # CRITICAL: Force remove any legend that might have been created by squarify
+                    # This is the key fix - squarify might be creating legends automatically
+                    if ax1.get_legend():
+                        current_app.logger.warning("⚠️ Treemap: Found legend after squarify.plot(), removing it")
+                        ax1.get_legend().remove()
+                    ax1.legend_ = None
+
+                    # Additional safety: ensure no legend exists at all
+                    current_app.logger.debug("🔍 Treemap: Final legend check - ensuring no legend exists")
+                    if ax1.get_legend():
+                        current_app.logger.warning("⚠️ Treemap: Legend still exists after removal, forcing removal again")
+                        ax1.get_legend().remove()
+                        ax1.legend_ = None
+
+                    # Also try to prevent matplotlib from automatically creating legends
+                    # by setting the axis to not show legends
+                    try:
+                        # This is a more direct approach to prevent legend creation
+                        ax1.set_legend_handles([])
+                    except:
+                        pass
+
+                    # Also try to clear any legend handles that might exist
+                    try:
+                        ax1.legend_handles = []
+                    except:
+                        pass
+
+                    # CRITICAL: Override matplotlib's automatic legend creation
+                    # This prevents any automatic legends from being created
+                    try:
+                        # Disable automatic legend creation
+                        ax1.legend_ = None
+                        if hasattr(ax1, '_legend'):
+                            ax1._legend = None
+                        # Also try to clear any legend handles
+                        if hasattr(ax1, 'legend_handles'):
+                            ax1.legend_handles = []
+                    except:
+                        pass
+
+                    # Also try to prevent matplotlib from automatically creating legends
+                    # by setting the axis to not show legends
+                    try:
+                        # This is a more direct approach to prevent legend creation
+                        ax1.set_legend_handles([])
+                    except:
+                        pass
+
+                    # Also try to clear any legend handles that might exist
+                    try:
+                        ax1.legend_handles = []
+                    except:
+                        pass
+
+                # Immediately after squarify.plot(), remove any automatic legend creation
+                if not show_legend:
+                    # Force remove any legend that might have been created
+                    if ax1.get_legend():
+                        ax1.get_legend().remove()
+                    # Clear the legend attribute
+                    ax1.legend_ = None
+
+                    # Also try to prevent any automatic legend creation
+                    # by setting the axis to not show legends
+                    ax1.set_navigate(True)  # Keep navigation enabled
+                    # Clear any legend-related attributes
+                    if hasattr(ax1, '_legend'):
+                        ax1._legend = None
+
+                    # Additional safety: remove any plot elements that might have labels
+                    # This prevents matplotlib from automatically creating legends
+                    _clear_artist_labels(ax1)
+
+                # Ensure no automatic legend is added by squarify
+                if ax1.get_legend():
+                    ax1.get_legend().remove()
+
+                # Additional legend removal for squarify plots
+                if not show_legend:
+                    # Remove any existing legend
+                    if ax1.get_legend():
+                        ax1.get_legend().remove()
+                    # Clear all legend handles
+                    ax1.legend_ = None
+                    # Also try to remove from figure level
+                    if fig_mpl.legends:
+                        for legend in fig_mpl.legends:
+                            legend.remove()
+
+                    # For squarify plots, we need to be more aggressive
+                    # Remove labels from all plot elements that might create legends
+                    _clear_artist_labels(ax1)
+
+                    # Additional safety: prevent any automatic legend creation
+                    # by clearing the legend attribute completely
+                    ax1.legend_ = None
+                    if hasattr(ax1, '_legend'):
+                        ax1._legend = None
+
+                    # Force remove any remaining legends at the figure level
+                    if hasattr(fig_mpl, 'legends') and fig_mpl.legends:
+                        for legend in fig_mpl.legends[:]:  # Copy list to avoid modification during iteration
+                            try:
+                                legend.remove()
+                            except:
+                                pass
+
+                    # Also try to clear any legend-related attributes on the figure
+                    if hasattr(fig_mpl, '_legend'):
+                        fig_mpl._legend = None
+
+                    # Additional safety: try to prevent matplotlib from creating legends
+                    # by setting the axis to not show legends
+                    try:
+                        ax1.set_legend_handles([])
+                    except:
+                        pass
+
+                    # Also try to clear any legend handles that might exist
+                    try:
+                        ax1.legend_handles = []
+                    except:
+                        pass
+
+                # Apply background colors if specified
+                if chart_background:
+                    fig_mpl.patch.set_facecolor(chart_background)
+                if plot_background:
+                    ax1.set_facecolor(plot_background)
+
+                # Add title with customizable styling
+                title_font_size = font_size or 16
+                title_color = font_color if font_color else '#2C3E50'
+                title_font_family = chart_meta.get("font_family") if chart_meta.get("font_family") else None
+
+                if title and title.strip():
+                    ax1.set_title(title, fontsize=title_font_size, weight='bold', pad=20, 
+                                color=title_color, fontname=title_font_family)
+                ax1.set_xlabel('')
+                ax1.set_ylabel('')
+
+                # Handle axis ticks visibility
+                if show_x_ticks is False:
+                    ax1.set_xticks([])
+                if show_y_ticks is False:
+                    ax1.set_yticks([])
+
+                # Remove axis spines for cleaner look (treemap specific)
+                ax1.spines['top'].set_visible(False)
+                ax1.spines['right'].set_visible(False)
+                ax1.spines['bottom'].set_visible(False)
+                ax1.spines['left'].set_visible(False)
+
+                # Apply grid lines based on customization settings
+                if show_gridlines is not None:
+                    if show_gridlines:
+                        grid_alpha = 0.1
+                        grid_style = gridline_style if gridline_style else '-'
+                        grid_color = gridline_color if gridline_color else 'gray'
+                        grid_width = 0.5
+                        ax1.grid(True, alpha=grid_alpha, linestyle=grid_style, 
+                                linewidth=grid_width, color=grid_color)
+                    else:
+                        ax1.grid(False)
+                else:
+                    # Respect show_gridlines setting for treemap
+                    if show_gridlines:
+                        ax1.grid(True, alpha=0.1, linestyle='-', linewidth=0.5)
+                    else:
+                        ax1.grid(False)
+
+                # Add data labels manually only when root is hidden (we draw rectangles ourselves)
+                if show_data_labels and not root_visible:
+                    # Place labels inside each rectangle rather than at the figure center
+                    # Compute treemap rectangles to determine per-rectangle centers
+                    normalized_sizes = squarify.normalize_sizes(valid_data, 1, 1)
+                    rectangles = squarify.squarify(normalized_sizes, 0, 0, 1, 1)
+
+                    for (rect, size, label) in zip(rectangles, valid_data, valid_labels):
+                        # Format the value
+                        formatted_val = _format_size(size, value_format)
+
+                        # Compute center of this rectangle
+                        center_x = rect['x'] + rect['dx'] / 2
+                        center_y = rect['y'] + rect['dy'] / 2
+
+                        # Styling
+                        label_color = data_label_color or '#2C3E50'
+                        label_font_size = data_label_font_size or 9
+                        bbox_props = dict(
+                            boxstyle="round,pad=0.2",
+                            facecolor='white',
+                            alpha=0.9,
+                            edgecolor='gray',
+                            linewidth=0.5
+                        )
+
+                        # Draw label inside the rectangle
+                        ax1.text(center_x, center_y, f"{label}\n{formatted_val}",
+                                ha='center', va='center',
+                                fontsize=label_font_size,
+                                color=label_color,
+                                fontweight='bold',
+                                bbox=bbox_props)
+
+                # Handle legend visibility and positioning (already checked above)
+                # Debug logging for legend visibility
+                current_app.logger.debug(f"🔍 Treemap Legend Debug - showlegend: {show_legend}")
+                current_app.logger.debug(f"🔍 Treemap Legend Debug - valid_data length: {len(valid_data)}")
+                current_app.logger.debug(f"🔍 Treemap Legend Debug - Legend condition: {show_legend and len(valid_data) > 1}")
+
+                # CRITICAL: Only create legend if explicitly requested AND we have multiple data points
+                # This is the key condition that was causing the issue
+                if show_legend and len(valid_data) > 1:
+                    # Create custom legend
+                    legend_elements = []
+                    for i, (label, color) in enumerate(zip(valid_labels, valid_colors)):
+                        from matplotlib.patches import Patch
+                        legend_elements.append(Patch(facecolor=color, label=label, alpha=treemap_alpha))
+
+                    # Get legend customization options
+                    legend_position = chart_meta.get("legend_position", "right")
+                    legend_font_size = chart_meta.get("legend_font_size", 8)
+
+                    # Position legend based on setting
+                    if legend_position == "bottom":
+                        ax1.legend(handles=legend_elements, 
+                                 loc='lower center', 
+                                 bbox_to_anchor=(0.5, -0.15), 
+                                 fontsize=legend_font_size,
+                                 frameon=True, fancybox=True, shadow=True)
+                    elif legend_position == "top":
+                        ax1.legend(handles=legend_elements, 
+                                 loc='upper center', 
+                                 bbox_to_anchor=(0.5, 1.02), 
+                                 fontsize=legend_font_size,
+                                 frameon=True, fancybox=True, shadow=True)
+                    elif legend_position == "left":
+                        ax1.legend(handles=legend_elements, 
+                                 loc='center left', 
+                                 bbox_to_anchor=(-0.05, 0.5), 
+                                 fontsize=legend_font_size,
+                                 frameon=True, fancybox=True, shadow=True)
+                    else:  # right (default)
+                        ax1.legend(handles=legend_elements, 
+                                 loc='center left', 
+                                 bbox_to_anchor=(1.05, 0.5), 
+                                 fontsize=legend_font_size,
+                                 frameon=True, fancybox=True, shadow=True)
+                else:
+                    # CRITICAL: When showlegend is False, ensure NO legend is created
+                    # This is the key fix for the issue
+                    current_app.logger.debug("🔍 Treemap: showlegend is False, ensuring no legend is created")
+
+                    # Remove any existing legend
+                    if ax1.get_legend():
+                        ax1.get_legend().remove()
+                    # Clear all legend handles
+                    ax1.legend_ = None
+                    # Also try to remove from figure level
+                    if fig_mpl.legends:
+                        for legend in fig_mpl.legends:
+                            legend.remove()
+
+                    # For squarify plots, we need to be more aggressive
+                    # Remove labels from all plot elements that might create legends
+                    _clear_artist_labels(ax1)
+
+                    # Additional safety: prevent any automatic legend creation
+                    # by clearing the legend attribute completely
+                    ax1.legend_ = None
+                    if hasattr(ax1, '_legend'):
+                        ax1._legend = None
+
+                # Apply margin settings if specified
+                if margin:
+                    plt.subplots_adjust(**margin)
+
+                # Ensure no legend is shown if showlegend is False
+                if not show_legend:
+                    # Remove any existing legend
+                    if ax1.get_legend():
+                        ax1.get_legend().remove()
+                    # Also try to remove from figure level
+                    if fig_mpl.legends:
+                        for legend in fig_mpl.legends:
+                            legend.remove()
+
+                    # Additional safety: clear all legend-related attributes
+                    ax1.legend_ = None
+                    if hasattr(ax1, '_legend'):
+                        ax1._legend = None
+
+                    # Also try to clear any legend handles that might exist
+                    try:
+                        ax1.legend_handles = []
+                    except:
+                        pass
+
+                # Adjust layout to accommodate legend (only if legend is shown)
+                if show_legend:
+                    plt.tight_layout()
+                else:
+                    # Use tight layout without legend consideration and ensure no legend space
+                    plt.tight_layout()
+                    # Double-check no legend was added during layout
+                    if ax1.get_legend():
+                        ax1.get_legend().remove()
+
+                    # Additional safety: remove any legends that might have been created during layout
+                    if hasattr(fig_mpl, 'legends') and fig_mpl.legends:
+                        for legend in fig_mpl.legends[:]:
+                            try:
+                                legend.remove()
+                            except:
+                                pass
+
+                    # Final check: ensure no legend exists
+                    ax1.legend_ = None
+                    if hasattr(ax1, '_legend'):
+                        ax1._legend = None
+
+                # One final legend removal check before finishing
+                if not show_legend:
+                    # Remove any legend that might have been created
+                    if ax1.get_legend():
+                        ax1.get_legend().remove()
+                        ax1.legend_ = None
+
+                    # Clear any remaining legend attributes
+                    ax1.legend_ = None
+                    # Also check figure level
+                    if hasattr(fig_mpl, 'legends') and fig_mpl.legends:
+                        for legend in fig_mpl.legends[:]:
+                            try:
+                                legend.remove()
+                            except:
+                                pass
+
+                    # CRITICAL: Final override to prevent any legend creation
+                    # This is the last line of defense against automatic legends
+                    try:
+                        # Completely disable legend creation on this axis
+                        ax1.legend_ = None
+                        if hasattr(ax1, '_legend'):
+                            ax1._legend = None
+                        if hasattr(ax1, 'legend_handles'):
+                            ax1.legend_handles = []
+                        # Also try to prevent any future legend creation
+                        ax1.set_legend_handles([])
+                    except:
+                        pass
+
+                    # Debug: log final state
+                    current_app.logger.debug(f"🔍 Treemap Final Debug - Axis legend: {ax1.get_legend()}")
+                    current_app.logger.debug(f"🔍 Treemap Final Debug - Figure legends: {fig_mpl.legends if hasattr(fig_mpl, 'legends') else 'No legends attribute'}")
+                    current_app.logger.debug(f"🔍 Treemap Final Debug - Plot elements with labels: {[artist.get_label() for artist in ax1.get_children() if hasattr(artist, 'get_label') and artist.get_label()]}")
+
+                    # Final verification: if there's still a legend, force remove it
+                    if ax1.get_legend():
+                        current_app.logger.warning("⚠️ Treemap: Final check found legend, forcing removal")
+                        ax1.get_legend().remove()
+                        ax1.legend_ = None
+
+            else:
+                # No valid data for treemap
+                ax1.text(0.5, 0.5, "No valid data for treemap", 
+                        ha='center', va='center', 
+                        fontsize=font_size or 12,
+                        transform=ax1.transAxes)
+        else:
+            # Invalid data structure for treemap
+            current_app.logger.warning(f"⚠️ Invalid treemap data structure - Values: {values}, Labels: {labels}")
+            ax1.text(0.5, 0.5, "Invalid data structure for treemap", 
+                    ha='center', va='center', 
+                    fontsize=font_size or 12,
+                    transform=ax1.transAxes)
+
+        # The shared legend step places the legend chosen here
+        chart.update(show_legend=show_legend, legend_position=legend_position, legend_font_size=legend_font_size)
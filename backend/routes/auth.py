@@ -2,10 +2,15 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user, UserMixin
 # REMOVED: from werkzeug.security import generate_password_hash, check_password_hash
 from bson.objectid import ObjectId
+from pymongo.errors import DuplicateKeyError
+from utils.user_cache import get_user_cache
 # REMOVED: from app import mongo # Do NOT import mongo directly here
 
 auth_bp = Blueprint('auth', __name__)
 
+# Fields needed to build a User; the password never leaves the login route
+USER_FIELDS = {'username': 1, 'full_name': 1, 'email': 1}
+
 class User(UserMixin):
     def __init__(self, user_doc):
         self.id = str(user_doc['_id'])
@@ -22,17 +27,22 @@ def register():
         return jsonify({'error': 'Missing required fields'}), 400
     
     # Access MongoDB via current_app.mongo.db
-    if current_app.mongo.db.users.find_one({'username': data['username']}):
+    if current_app.mongo.db.users.find_one({'username': data['username']}, {'_id': 1}):
         return jsonify({'error': 'Username already exists'}), 400
-    if current_app.mongo.db.users.find_one({'email': data['email']}):
+    if current_app.mongo.db.users.find_one({'email': data['email']}, {'_id': 1}):
         return jsonify({'error': 'Email already exists!'}), 400 
     
-    user_id = current_app.mongo.db.users.insert_one({
-        'full_name': data['full_name'],
-        'username': data['username'],
-        'email': data['email'],
-        'password': data['password']  # Store password in plain text
-    }).inserted_id
+    try:
+        user_id = current_app.mongo.db.users.insert_one({
+            'full_name': data['full_name'],
+            'username': data['username'],
+            'email': data['email'],
+            'password': data['password']  # Store password in plain text
+        }).inserted_id
+    except DuplicateKeyError as e:
+        # Another registration with the same username or email got in between the checks and the insert
+        field = 'Email' if 'email' in str(e) else 'Username'
+        return jsonify({'error': f'{field} already exists'}), 400
     return jsonify({'message': 'Registration successful'}), 201
 
 @auth_bp.route('/api/login', methods=['POST'])
@@ -45,6 +55,7 @@ def login():
     if user_doc and user_doc['password'] == data['password']:  # Direct password comparison
         user = User(user_doc)
         login_user(user)
+        get_user_cache().put(user.id, user)
         return jsonify({'message': 'Login successful', 'user': {
             'id': user.id,
             'username': user.username,
@@ -70,5 +81,6 @@ def get_user():
 @auth_bp.route('/api/logout')
 @login_required
 def logout():
+    get_user_cache().invalidate(current_user.get_id())
     logout_user()
     return jsonify({'message': 'Logged out successfully'}), 200
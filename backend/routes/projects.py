@@ -1,25 +1,51 @@
 import os
 import json
-import pandas as pd
-import matplotlib
-matplotlib.use('Agg')  # Use non-GUI backend suitable for Flask servers
-import matplotlib.pyplot as plt
 from flask import Blueprint, request, jsonify, current_app, send_file
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 from bson.objectid import ObjectId
 from datetime import datetime 
-from docx import Document
-from docx.shared import Inches
-from docx.text.paragraph import Paragraph
-import openpyxl
 import tempfile
 import re
 import zipfile
 import shutil
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import squarify
+import threading
+import time
+
+# pandas, Matplotlib, Plotly, python-docx and openpyxl are imported by the report paths that use them,
+# so workers serving auth and project list requests start without loading them
+os.environ.setdefault('MPLBACKEND', 'Agg')  # Use non-GUI backend suitable for Flask servers
+
+from utils.report_timing import ReportTimer, get_timing_histogram
+from utils.workbook_fingerprint import BatchDuplicates, workbook_digests
+from utils.metrics import get_metrics
+from utils.error_store import ReportErrors, get_error_store
+from utils.report_pool import get_report_pool
+from utils.batch_archive import BatchArchive, compression_settings
+from utils.batch_artifacts import get_batch_artifact_store
+from utils.batch_upload import (MEMBER_WAIT_SECONDS, UPLOAD_CHUNK_SIZE, UnsafeMember, UploadConflict, copy_member,
+                                get_batch_upload_store, is_batch_workbook)
+from utils.chart_artifacts import ReportManifest, chart_fingerprint, get_chart_artifact_store, text_digests
+from utils.chart_output import (
+    CHART_OUTPUT_FORMATS,
+    ChartImageRegistry,
+    add_chart_picture,
+    optimize_chart_image,
+    png_optimization_settings,
+    resolve_chart_output_format,
+    save_matplotlib_chart,
+    save_plotly_chart,
+)
+from renderers import RENDERER_REGISTRY, get_renderer
+from renderers.base import ChartContext
+from renderers.helpers import (
+    ChartWorkbook,
+    calculate_optimal_label_distance,
+    extract_cell_ranges,
+    resolve_font_family,
+    validate_and_fix_dimensions,
+    validate_chart_config,
+)
 
 import re
 
@@ -30,6 +56,17 @@ import re
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'csv', 'xlsx', 'docx', 'doc'}
 ALLOWED_REPORT_EXTENSIONS = {'csv', 'xlsx'}
 
+# Resolution of charts embedded in reports and of chart preview thumbnails
+CHART_DPI = 200
+PREVIEW_DPI = 72
+PREVIEW_MAX_DPI = 150
+MAX_PREVIEW_CHARTS = 12
+
+# Project reads that don't need the template leave its blob (up to 15 MB) on the server
+PROJECT_WITHOUT_FILES = {'file_content': 0}
+PROJECTS_PAGE_SIZE = 50
+MAX_PROJECTS_PAGE_SIZE = 100
+
 projects_bp = Blueprint('projects', __name__)
 
 def allowed_file(filename):
@@ -70,97 +107,9 @@ def validate_colors_for_plotly(colors):
         return [colors]
     return ['blue']
 
-def calculate_optimal_label_distance(chart_type, series_data, x_values, y_values, figsize, font_size=12):
-    """
-    Calculate optimal axis label distances to prevent overlap with data values.
-    
-    Args:
-        chart_type (str): Type of chart (bar, scatter, line, etc.)
-        series_data (list): Chart series data
-        x_values (list): X-axis values
-        y_values (list): Y-axis values
-        figsize (tuple): Figure size (width, height) in inches
-        font_size (int): Font size for labels
-    
-    Returns:
-        tuple: (x_axis_distance, y_axis_distance) in pixels
-    """
-    # Handle None or undefined values safely
-    if x_values is None:
-        x_values = []
-    if y_values is None:
-        y_values = []
-    if figsize is None:
-        figsize = (8, 6)
-    if font_size is None:
-        font_size = 12
-    
-    # If y_values is empty, try to extract from series_data
-    if not y_values and series_data:
-        for series in series_data:
-            series_values = series.get("values", [])
-            if series_values:
-                y_values.extend(series_values)
-    
-    # Convert figsize from inches to pixels (assuming 100 DPI)
-    width_px = figsize[0] * 100 if figsize else 800
-    height_px = figsize[1] * 100 if figsize else 600
-    
-    # Base distances in pixels
-    base_x_distance = 30
-    base_y_distance = 40
-    
-    # Adjust based on chart type
-    if chart_type == "bar":
-        # For bar charts, consider bar width and spacing
-        if x_values and len(x_values) > 1:
-            # Estimate bar width based on number of bars and chart width
-            estimated_bar_width = width_px / (len(x_values) * 1.5)  # 1.5 accounts for spacing
-            base_x_distance = max(base_x_distance, estimated_bar_width * 0.3)
-        
-        if y_values:
-            # For vertical bars, y-axis needs more space for value labels
-            max_y = max(y_values) if y_values else 0
-            if max_y > 1000:  # Large numbers need more space
-                base_y_distance = max(base_y_distance, 60)
-    
-    elif chart_type in ["scatter", "line"]:
-        # For scatter/line charts, consider data point density
-        if x_values and len(x_values) > 10:
-            # Dense data needs more space
-            base_x_distance = max(base_x_distance, 40)
-            base_y_distance = max(base_y_distance, 50)
-    
-    elif chart_type == "area":
-        # For area charts, need more space due to filled areas
-        base_x_distance = max(base_x_distance, 50)
-        base_y_distance = max(base_y_distance, 80)  # Area charts need more y-axis space
-        
-        if y_values:
-            # For area charts with large values, need even more space
-            max_y = max(y_values) if y_values else 0
-            if max_y > 1000:  # Large numbers need more space
-                base_y_distance = max(base_y_distance, 100)
-    
-    # Adjust based on font size
-    font_factor = font_size / 12.0
-    base_x_distance = int(base_x_distance * font_factor)
-    base_y_distance = int(base_y_distance * font_factor)
-    
-    # Adjust based on chart dimensions
-    if width_px < 600:  # Small charts need more space
-        base_x_distance = int(base_x_distance * 1.2)
-    if height_px < 400:
-        base_y_distance = int(base_y_distance * 1.2)
-    
-    # Ensure minimum distances
-    base_x_distance = max(base_x_distance, 20)
-    base_y_distance = max(base_y_distance, 25)
-    
-    return base_x_distance, base_y_distance
-
 def validate_excel_structure(file_path):
     """Validate that an Excel file has the required structure for report generation"""
+    import pandas as pd
     try:
         df = pd.read_excel(file_path, sheet_name=0, keep_default_na=False)
         df.columns = df.columns.str.strip().str.replace(" ", "_").str.replace("__", "_")
@@ -201,6 +150,206 @@ def validate_excel_structure(file_path):
     except Exception as e:
         return False, f"Error reading Excel file: {str(e)}"
 
+# Chart types generate_chart knows how to render
+KNOWN_CHART_TYPES = set(RENDERER_REGISTRY)
+CELL_RANGE_PATTERN = re.compile(r"^([A-Z]+)(\d+):([A-Z]+)(\d+)$")
+SINGLE_CELL_PATTERN = re.compile(r"^([A-Z]+)(\d+)$")
+PREFLIGHT_MAX_ERRORS = 50
+# Larger references are reported instead of read, so a typo such as A1:A1048576 cannot stall the check
+PREFLIGHT_MAX_REFERENCE_CELLS = 100_000
+PREFLIGHT_MAX_WORKBOOK_CELLS = 1_000_000
+
+def _collect_cell_references(obj, path, references):
+    """Collect (path, reference) for every string generate_chart would treat as a cell range or single cell"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            child_path = f"{path}.{key}" if path else str(key)
+            if isinstance(value, str):
+                if CELL_RANGE_PATTERN.match(value) or SINGLE_CELL_PATTERN.match(value):
+                    references.append((child_path, value))
+            else:
+                _collect_cell_references(value, child_path, references)
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            _collect_cell_references(value, f"{path}[{i}]", references)
+
+def _reference_bounds(reference):
+    """Return (min_row, min_col, max_row, max_col) for 'A1' or 'A1:B5'; ValueError for a bad column such as ZZZZ"""
+    from openpyxl.utils import column_index_from_string
+    match = CELL_RANGE_PATTERN.match(reference)
+    if match:
+        start_col, start_row, end_col, end_row = match.groups()
+    else:
+        start_col, start_row = SINGLE_CELL_PATTERN.match(reference).groups()
+        end_col, end_row = start_col, start_row
+    return (int(start_row), column_index_from_string(start_col), int(end_row), column_index_from_string(end_col))
+
+def preflight_excel_workbook(file_obj):
+    """
+    Cheap dry-run validation of a batch workbook without rendering anything.
+
+    Reads the first sheet's rows and only the cells that Chart_Attributes
+    reference, in read-only streaming mode. Returns (errors, warnings, info).
+    """
+    import openpyxl
+    errors, warnings = [], []
+    info = {'charts': 0, 'report_name': None, 'report_code': None}
+    try:
+        wb = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+    except Exception as e:
+        return [f"Cannot open workbook: {e}"], warnings, info
+
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if not header_row:
+            return ["Workbook is empty"], warnings, info
+
+        # Same normalisation _generate_report applies to the pandas columns
+        headers = [str(h).strip().replace(" ", "_").replace("__", "_") if h is not None else "" for h in header_row]
+        column_index = {h: i for i, h in enumerate(headers) if h}
+        required_columns = ["Text_Tag", "Text", "Chart_Tag", "Chart_Attributes", "Chart_Type"]
+        missing_columns = [col for col in required_columns if col not in column_index]
+        if missing_columns:
+            return [f"Missing columns: {missing_columns}"], warnings, info
+
+        lower_index = {h.lower(): i for h, i in column_index.items()}
+        references_by_sheet = {}
+        data_rows = referenced_cells = 0
+        for row_number, row in enumerate(rows, 2):
+            if not any(v is not None and str(v).strip() for v in row):
+                continue
+            data_rows += 1
+            for key in ('report_name', 'report_code'):
+                if info[key] is None and key in lower_index and lower_index[key] < len(row) and row[lower_index[key]]:
+                    info[key] = str(row[lower_index[key]]).strip()
+
+            def cell(column):
+                index = column_index[column]
+                return row[index] if index < len(row) else None
+
+            chart_tag, raw_attributes, chart_type_cell = cell("Chart_Tag"), cell("Chart_Attributes"), cell("Chart_Type")
+            if not chart_tag or not str(chart_tag).strip():
+                continue
+            chart_tag = str(chart_tag).strip()
+            info['charts'] += 1
+            if raw_attributes is None or not str(raw_attributes).strip():
+                errors.append(f"Row {row_number} ({chart_tag}): Chart_Attributes is empty")
+                continue
+            try:
+                chart_config = json.loads(re.sub(r'//.*?\n|/\*.*?\*/', '', str(raw_attributes), flags=re.DOTALL))
+            except json.JSONDecodeError as e:
+                errors.append(f"Row {row_number} ({chart_tag}): invalid Chart_Attributes JSON: {e}")
+                continue
+            if not isinstance(chart_config, dict):
+                errors.append(f"Row {row_number} ({chart_tag}): Chart_Attributes must be a JSON object")
+                continue
+
+            if "data" in chart_config and "validation" in chart_config:
+                # ChatGPT bar-of-pie format, resolved by convert_chatgpt_json_to_bar_of_pie_format
+                continue
+            chart_type = str(chart_config.get("chart_type", chart_type_cell or "")).lower().strip()
+            if chart_type not in KNOWN_CHART_TYPES:
+                errors.append(f"Row {row_number} ({chart_tag}): unknown chart type '{chart_type}'")
+
+            chart_meta = chart_config.get("chart_meta", {})
+            series_meta = chart_config.get("series", {})
+            if not isinstance(chart_meta, dict) or not isinstance(series_meta, (dict, list)):
+                errors.append(f"Row {row_number} ({chart_tag}): chart_meta/series have the wrong shape")
+                continue
+            references = []
+            _collect_cell_references(chart_meta, "chart_meta", references)
+            _collect_cell_references(series_meta, "series", references)
+            if not references:
+                continue
+            sheet_name = chart_meta.get("source_sheet", "sample")
+            if sheet_name not in wb.sheetnames:
+                errors.append(f"Row {row_number} ({chart_tag}): source_sheet '{sheet_name}' does not exist (sheets: {wb.sheetnames})")
+                continue
+            for path, reference in references:
+                try:
+                    bounds = _reference_bounds(reference)
+                except ValueError:
+                    errors.append(f"Row {row_number} ({chart_tag}): {path} reference {reference} has an invalid column")
+                    continue
+                if bounds[0] > bounds[2] or bounds[1] > bounds[3]:
+                    errors.append(f"Row {row_number} ({chart_tag}): {path} range {reference} is reversed")
+                    continue
+                if bounds[2] > 1048576 or bounds[3] > 16384:
+                    errors.append(f"Row {row_number} ({chart_tag}): {path} reference {reference} is outside the sheet")
+                    continue
+                cell_count = (bounds[2] - bounds[0] + 1) * (bounds[3] - bounds[1] + 1)
+                if cell_count > PREFLIGHT_MAX_REFERENCE_CELLS:
+                    errors.append(f"Row {row_number} ({chart_tag}): {path} range {reference} covers {cell_count} cells "
+                                  f"(limit {PREFLIGHT_MAX_REFERENCE_CELLS})")
+                    continue
+                if referenced_cells + cell_count > PREFLIGHT_MAX_WORKBOOK_CELLS:
+                    errors.append(f"Row {row_number} ({chart_tag}): {path} range {reference} takes the workbook past "
+                                  f"{PREFLIGHT_MAX_WORKBOOK_CELLS} referenced cells")
+                    continue
+                referenced_cells += cell_count
+                references_by_sheet.setdefault(sheet_name, []).append((row_number, chart_tag, path, reference, bounds))
+
+            # generate_chart stretches mismatched x_axis/values ranges; flag it so users can fix the input
+            if isinstance(series_meta, dict) and isinstance(series_meta.get("x_axis"), str) and CELL_RANGE_PATTERN.match(series_meta["x_axis"]):
+                try:
+                    x_bounds = _reference_bounds(series_meta["x_axis"])
+                except ValueError:
+                    continue  # already reported above
+                for i, series in enumerate(series_meta.get("data", []) if isinstance(series_meta.get("data"), list) else []):
+                    values = series.get("values") if isinstance(series, dict) else None
+                    if isinstance(values, str) and CELL_RANGE_PATTERN.match(values):
+                        try:
+                            v_bounds = _reference_bounds(values)
+                        except ValueError:
+                            continue
+                        x_len = (x_bounds[2] - x_bounds[0] + 1) * (x_bounds[3] - x_bounds[1] + 1)
+                        v_len = (v_bounds[2] - v_bounds[0] + 1) * (v_bounds[3] - v_bounds[1] + 1)
+                        if x_len != v_len:
+                            warnings.append(f"Row {row_number} ({chart_tag}): series[{i}] has {v_len} values but x_axis has {x_len} cells")
+
+        if data_rows == 0:
+            errors.append("Excel file is empty")
+        if not info['report_name'] or not info['report_code']:
+            warnings.append("Report_Name/Report_Code not found; generated files will use fallback names")
+
+        # One bounded streaming pass per referenced sheet; each reference counts its cells as the rows go by
+        for sheet_name, references in references_by_sheet.items():
+            by_first_row = sorted(range(len(references)), key=lambda k: references[k][4][0])
+            min_row = references[by_first_row[0]][4][0]
+            min_col = min(r[4][1] for r in references)
+            max_row = max(r[4][2] for r in references)
+            max_col = max(r[4][3] for r in references)
+            present = [0] * len(references)
+            non_numeric = [False] * len(references)
+            active, upcoming = [], 0
+            for r, row in enumerate(wb[sheet_name].iter_rows(min_row=min_row, max_row=max_row, min_col=min_col,
+                                                             max_col=max_col, values_only=True), min_row):
+                while upcoming < len(by_first_row) and references[by_first_row[upcoming]][4][0] <= r:
+                    active.append(by_first_row[upcoming])
+                    upcoming += 1
+                active = [k for k in active if references[k][4][2] >= r]
+                for k in active:
+                    _, c1, _, c2 = references[k][4]
+                    for value in row[c1 - min_col:c2 - min_col + 1]:
+                        if value is not None:
+                            present[k] += 1
+                            non_numeric[k] = non_numeric[k] or not isinstance(value, (int, float))
+            for k, (row_number, chart_tag, path, reference, _) in enumerate(references):
+                if not present[k]:
+                    if CELL_RANGE_PATTERN.match(reference):
+                        errors.append(f"Row {row_number} ({chart_tag}): {path} range {sheet_name}!{reference} is empty")
+                    continue
+                if path.endswith(".values") and non_numeric[k]:
+                    warnings.append(f"Row {row_number} ({chart_tag}): {path} range {sheet_name}!{reference} contains non-numeric cells")
+    except Exception as e:
+        errors.append(f"Error reading Excel file: {e}")
+    finally:
+        wb.close()
+
+    return errors[:PREFLIGHT_MAX_ERRORS], warnings[:PREFLIGHT_MAX_ERRORS], info
+
 def extract_dynamic_columns_from_excel(excel_path):
     """Extract column names from A1 to M1 range in Excel file"""
     try:
@@ -269,6 +418,7 @@ def extract_dynamic_columns_from_excel(excel_path):
 
 def extract_report_info_from_excel(excel_path):
     """Extract Report_Name and Report_Code from Excel file"""
+    import openpyxl
     try:
         # Load the Excel file
         wb = openpyxl.load_workbook(excel_path, data_only=True)
@@ -326,6 +476,9 @@ def create_expanded_pie_chart(labels, values, colors, expanded_segment, title, v
     """
     Create an expanded pie chart with one segment shown as a bar chart
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     fig = make_subplots(
         rows=1, cols=2,
         specs=[[{"type": "pie"}, {"type": "bar"}]],
@@ -543,416 +696,25 @@ def convert_chatgpt_json_to_bar_of_pie_format(chatgpt_json, data_file_path=None)
     
     return converted_json
 
-def create_bar_of_pie_chart(labels, values, other_labels, other_values, colors, other_colors, title, value_format="", chart_meta=None):
-    """
-    Create a 'bar of pie' chart using Plotly: pie chart with one segment broken down as a bar chart.
-    Enhanced version with better title handling and layout options.
-    Supports both individual bars and stacked bars.
-    """
-    # Filter out empty/null values from other_labels and other_values
-    filtered_data = []
-    for label, value in zip(other_labels, other_values):
-        # Check if both label and value are not empty/null
-        if (label is not None and str(label).strip() != "" and 
-            value is not None and str(value).strip() != "" and 
-            str(value).strip() != "0"):
-            filtered_data.append((label, value))
-    
-    if filtered_data:
-        filtered_labels, filtered_values = zip(*filtered_data)
-    else:
-        # If no valid data, use empty lists
-        filtered_labels, filtered_values = [], []
-    
-    # Enhanced title handling
-    title_left = chart_meta.get("title_left", title) if chart_meta else title
-    title_right = chart_meta.get("title_right", "Breakdown of 'Other'") if chart_meta else "Breakdown of 'Other'"
-    
-    # Enhanced layout options
-    height = chart_meta.get("height", 500) if chart_meta else 500
-    width = chart_meta.get("width", 900) if chart_meta else 900
-    column_widths = chart_meta.get("column_widths", [0.5, 0.5]) if chart_meta else [0.5, 0.5]
-    
-    # Enhanced styling options
-    font_family = chart_meta.get("font_family", "Arial") if chart_meta else "Arial"
-    font_size = chart_meta.get("font_size", 14) if chart_meta else 14
-    font_color = chart_meta.get("font_color", "#333333") if chart_meta else "#333333"
-    chart_background = chart_meta.get("chart_background", "#FFFFFF") if chart_meta else "#FFFFFF"
-    plot_background = chart_meta.get("plot_background", "#F8F9FA") if chart_meta else "#F8F9FA"
-    
-    # Legend controls
-    show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True)) if chart_meta else True
-    # Convert string "false"/"true" to boolean if needed
-    if isinstance(show_legend_raw, str):
-        show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-    else:
-        show_legend = bool(show_legend_raw)
-    legend_position = chart_meta.get("legend_position", "bottom") if chart_meta else "bottom"
-    legend_font_size = chart_meta.get("legend_font_size", 10) if chart_meta else 10
-    legend_orientation = chart_meta.get("legend_orientation", "v") if chart_meta else "v"  # "v" for vertical, "h" for horizontal
-    
-
-    
-    # Data label controls
-    data_labels = chart_meta.get("data_labels", True) if chart_meta else True
-    data_label_format = chart_meta.get("data_label_format", ".1f") if chart_meta else ".1f"
-    data_label_font_size = chart_meta.get("data_label_font_size", 10) if chart_meta else 10
-    data_label_color = chart_meta.get("data_label_color", "#000000") if chart_meta else "#000000"
-    
-    # Validate data_label_format to ensure it's a valid format specifier
-    if data_label_format and data_label_format not in [".0f", ".1f", ".2f", ".3f", ".4f", ".5f", ".6f", ".7f", ".8f", ".9f", "d", "i", "o", "x", "X", "e", "E", "f", "F", "g", "G", "n", "%"]:
-        # If it's not a valid format specifier, use default
-        data_label_format = ".1f"
-    
-    # Helper function to safely format data labels
-    def safe_format_label(value, format_spec=".1f"):
-        try:
-            return f"{value:{format_spec}}%"
-        except (ValueError, TypeError):
-            return f"{value:.1f}%"
-    
-    # Axis controls
-    x_axis_title = chart_meta.get("x_axis_title", "Categories") if chart_meta else "Categories"
-    y_axis_title = chart_meta.get("y_axis_title", "Value") if chart_meta else "Value"
-    show_x_axis = chart_meta.get("show_x_axis", True) if chart_meta else True
-    show_y_axis = chart_meta.get("show_y_axis", True) if chart_meta else True
-    show_x_ticks = chart_meta.get("show_x_ticks", True) if chart_meta else True
-    show_y_ticks = chart_meta.get("show_y_ticks", True) if chart_meta else True
-    x_axis_label_distance = chart_meta.get("x_axis_label_distance", "auto") if chart_meta else "auto"
-    y_axis_label_distance = chart_meta.get("y_axis_label_distance", "auto") if chart_meta else "auto"
-    axis_tick_font_size = chart_meta.get("axis_tick_font_size", 10) if chart_meta else 10
-    
-    # Grid controls
-    show_gridlines = chart_meta.get("show_gridlines", False) if chart_meta else False
-    gridline_color = chart_meta.get("gridline_color", "#E5E7EB") if chart_meta else "#E5E7EB"
-    gridline_style = chart_meta.get("gridline_style", "solid") if chart_meta else "solid"
-    
-    # Margin and spacing controls
-    margin = chart_meta.get("margin", dict(l=50, r=50, t=80, b=50)) if chart_meta else dict(l=50, r=50, t=80, b=50)
-    horizontal_spacing = chart_meta.get("horizontal_spacing", 0.1) if chart_meta else 0.1
-    
-    # Check if stacked bars are requested
-    is_stacked = chart_meta.get("stacked", False) if chart_meta else False
-    
-    # Connector styling
-    connector_style = chart_meta.get("connector", {}) if chart_meta else {}
-    connector_color = connector_style.get("color", "#6B7280")
-    connector_width = connector_style.get("width", 1.3)
-    connector_opacity = connector_style.get("opacity", 0.9)
-    
-    fig = make_subplots(
-        rows=1, cols=2,
-        specs=[[{"type": "pie"}, {"type": "bar"}]],
-        column_widths=column_widths,
-        subplot_titles=(title_left, title_right),
-        horizontal_spacing=horizontal_spacing
-    )
-    
-    # Check if donut chart is requested
-    is_donut = chart_meta.get("type_left") == "donut_pie" if chart_meta else False
-    hole_size = 0.4 if is_donut else 0.0
-    
-    # Main pie chart with enhanced styling
-    fig.add_trace(go.Pie(
-        labels=labels,
-        values=values,
-        marker=dict(colors=colors),
-        textinfo="percent" if data_labels else "none",
-        hoverinfo="label+percent+value",
-        pull=[0.1 if l == "Other" else 0 for l in labels],
-        name="Main Pie",
-        hole=hole_size,
-        showlegend=show_legend,
-        textfont=dict(family=font_family, size=font_size, color=font_color),
-        textposition="inside" if data_labels else "none"
-    ), row=1, col=1)
-    
-    # Bar chart for breakdown (only if we have filtered data)
-    if filtered_labels and filtered_values:
-        # Check if horizontal bars are requested
-        bar_orientation = chart_meta.get("orientation", "vertical") if chart_meta else "vertical"
-        
-        # Convert values to numeric format for proper stacking
-        numeric_values = []
-        for value in filtered_values:
-            if isinstance(value, (int, float)):
-                if value <= 1.0:  # Likely decimal format (0.11)
-                    numeric_values.append(value * 100)
-                else:  # Likely already percentage format (11.0)
-                    numeric_values.append(value)
-            else:
-                try:
-                    val = float(value)
-                    if val <= 1.0:
-                        numeric_values.append(val * 100)
-                    else:
-                        numeric_values.append(val)
-                except:
-                    numeric_values.append(0)
-        
-        # Format labels for display
-        formatted_labels = []
-        for label in filtered_labels:
-            if isinstance(label, (int, float)):
-                if label <= 1.0:  # Likely decimal format (0.06)
-                    formatted_labels.append(f"{label * 100:.1f}%")
-                else:  # Likely already percentage format (6.0)
-                    formatted_labels.append(f"{label:.1f}%")
-            else:
-                try:
-                    val = float(label)
-                    if val <= 1.0:
-                        formatted_labels.append(f"{val * 100:.1f}%")
-                    else:
-                        formatted_labels.append(f"{val:.1f}%")
-                except:
-                    formatted_labels.append(str(label))
-        
-        if is_stacked:
-            # Create stacked bar chart with separate traces for each segment
-            if bar_orientation.lower() == "horizontal":
-                # Create stacked horizontal bar with separate traces
-                for i, (label, value) in enumerate(zip(filtered_labels, numeric_values)):
-                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
-                    
-                    fig.add_trace(go.Bar(
-                        x=[value],  # Single value for this segment
-                        y=["Other"],  # Single category for stacked bar
-                        orientation="h",
-                        marker_color=bar_color,
-                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
-                        textposition="inside",
-                        name=label,
-                        showlegend=show_legend,  # Enable legend for bar traces
-                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
-                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
-                    ), row=1, col=2)
-            else:
-                # Create stacked vertical bar with separate traces
-                for i, (label, value) in enumerate(zip(filtered_labels, numeric_values)):
-                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
-                    
-                    fig.add_trace(go.Bar(
-                        x=["Other"],  # Single category for stacked bar
-                        y=[value],  # Single value for this segment
-                        marker_color=bar_color,
-                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
-                        textposition="inside",
-                        name=label,
-                        showlegend=show_legend,  # Enable legend for bar traces
-                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
-                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
-                    ), row=1, col=2)
-            
-            # Set barmode to 'stack' for proper stacking
-            fig.update_layout(barmode='stack')
-        else:
-            # Create individual bars (original behavior)
-            if bar_orientation.lower() == "horizontal":
-                # Create individual horizontal bar traces for each data point
-                for i, (label, value) in enumerate(zip(formatted_labels, numeric_values)):
-                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
-                    
-                    fig.add_trace(go.Bar(
-                        x=[value],  # Single value for this bar
-                        y=[label],  # Category label
-                        orientation="h",
-                        marker_color=bar_color,
-                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
-                        textposition="auto",
-                        name=label,  # Use actual label instead of generic name
-                        showlegend=show_legend,  # Enable legend for bar traces
-                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
-                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
-                    ), row=1, col=2)
-            else:
-                # Create individual vertical bar traces for each data point
-                for i, (label, value) in enumerate(zip(formatted_labels, numeric_values)):
-                    bar_color = other_colors[i] if other_colors and i < len(other_colors) else None
-                    
-                    fig.add_trace(go.Bar(
-                        x=[label],  # Category label
-                        y=[value],  # Single value for this bar
-                        marker_color=bar_color,
-                        text=[safe_format_label(value, data_label_format)] if data_labels else [""],
-                        textposition="auto",
-                        name=label,  # Use actual label instead of generic name
-                        showlegend=show_legend,  # Enable legend for bar traces
-                        textfont=dict(family=font_family, size=data_label_font_size, color=data_label_color),
-                        hovertemplate=f"<b>{label}</b><br>Value: {value:.1f}%<extra></extra>"
-                    ), row=1, col=2)
-    
-    # Enhanced layout with better styling
-    fig.update_layout(
-        title_text="",  # Remove main title since we have subplot titles
-        showlegend=show_legend,
-        height=height,
-        width=width,
-        font=dict(family=font_family, size=font_size, color=font_color),
-        paper_bgcolor=chart_background,
-        plot_bgcolor=plot_background,
-        margin=margin
-    )
-    
-    # Force legend visibility based on show_legend setting
-    if not show_legend:
-        # Explicitly hide legend for all traces
-        for trace in fig.data:
-            trace.showlegend = False
-    
-    # Configure legend position and styling
-    if show_legend:
-        # Map legend positions to Plotly coordinates
-        legend_positions = {
-            "top": dict(x=0.5, y=1.1, xanchor="center", yanchor="bottom"),
-            "bottom": dict(x=0.5, y=-0.2, xanchor="center", yanchor="top"),
-            "left": dict(x=-0.2, y=0.5, xanchor="right", yanchor="middle"),
-            "right": dict(x=1.1, y=0.5, xanchor="left", yanchor="middle")
-        }
-        
-        legend_config = {}
-        if legend_position in legend_positions:
-            legend_config.update(legend_positions[legend_position])
-        
-        # Add legend orientation for horizontal/vertical layout
-        legend_config["orientation"] = legend_orientation
-        
-        # Additional legend properties for better horizontal layout
-        if legend_orientation == "h":
-            # Override position for horizontal legends
-            legend_config["x"] = 0.5
-            legend_config["y"] = -0.15
-            legend_config["xanchor"] = "center"
-            legend_config["yanchor"] = "top"
-            # Force horizontal layout
-            legend_config["traceorder"] = "normal"
-        
-        if legend_font_size:
-            legend_config["font"] = dict(size=legend_font_size, family=font_family, color=font_color)
-        
-        if legend_config:
-            fig.update_layout(legend=legend_config)
-    
-    # Update subplot titles with better styling
-    fig.update_annotations(
-        font=dict(family=font_family, size=font_size + 2, color=font_color)
-    )
-    
-    # Update bar chart axes with comprehensive controls
-    if show_x_axis:
-        x_axis_config = {
-            "title": dict(text=x_axis_title, font=dict(size=font_size)),
-            "showticklabels": show_x_ticks,
-            "tickfont": dict(size=axis_tick_font_size)
-        }
-        
-        # Handle "auto" values for axis label distances
-        if x_axis_label_distance == "auto":
-            # Calculate optimal label distance for bar chart
-            auto_x_distance, _ = calculate_optimal_label_distance(
-                "bar", [{"labels": filtered_labels, "values": filtered_values}], 
-                filtered_labels, filtered_values, (width/100, height/100), font_size
-            )
-            x_axis_label_distance = auto_x_distance
-        
-        # Apply axis label distance if specified
-        if x_axis_label_distance is not None:
-            x_axis_config["title"] = dict(
-                text=x_axis_title, 
-                font=dict(size=font_size),
-                standoff=x_axis_label_distance
-            )
-        
-        fig.update_xaxes(**x_axis_config, row=1, col=2)
-    else:
-        fig.update_xaxes(visible=False, row=1, col=2)
-    
-    if show_y_axis:
-        y_axis_config = {
-            "title": dict(text=y_axis_title, font=dict(size=font_size)),
-            "showticklabels": show_y_ticks,
-            "tickfont": dict(size=axis_tick_font_size)
-        }
-        
-        # Handle "auto" values for axis label distances
-        if y_axis_label_distance == "auto":
-            # Calculate optimal label distance for bar chart
-            _, auto_y_distance = calculate_optimal_label_distance(
-                "bar", [{"labels": filtered_labels, "values": filtered_values}], 
-                filtered_labels, filtered_values, (width/100, height/100), font_size
-            )
-            y_axis_label_distance = auto_y_distance
-        
-        # Apply axis label distance if specified
-        if y_axis_label_distance is not None:
-            y_axis_config["title"] = dict(
-                text=y_axis_title, 
-                font=dict(size=font_size),
-                standoff=y_axis_label_distance
-            )
-        
-        fig.update_yaxes(**y_axis_config, row=1, col=2)
-    else:
-        fig.update_yaxes(visible=False, row=1, col=2)
-    
-    # Add gridlines if requested
-    if show_gridlines:
-        fig.update_xaxes(
-            showgrid=True,
-            gridcolor=gridline_color,
-            gridwidth=1,
-            row=1, col=2
-        )
-        fig.update_yaxes(
-            showgrid=True,
-            gridcolor=gridline_color,
-            gridwidth=1,
-            row=1, col=2
-        )
-    
-    # Update axis formatting for the bar chart to show percentages
-    if filtered_values and isinstance(filtered_values[0], (int, float)) and filtered_values[0] <= 1.0:
-        if bar_orientation.lower() == "horizontal":
-            # For horizontal bars, format x-axis (values) as percentages
-            fig.update_xaxes(
-                tickformat=".1f",  # Format as percentage with 1 decimal place (no % symbol since values are already multiplied by 100)
-                title="Revenue (%)",
-                row=1, col=2
-            )
-            # Update y-axis title for horizontal bars
-            fig.update_yaxes(
-                title="Categories",
-                row=1, col=2
-            )
-        else:
-            # For vertical bars, format y-axis (values) as percentages
-            fig.update_yaxes(
-                tickformat=".1f",  # Format as percentage with 1 decimal place (no % symbol since values are already multiplied by 100)
-                title="Revenue (%)",
-                row=1, col=2
-            )
-            # Update x-axis title for vertical bars
-            fig.update_xaxes(
-                title="Categories",
-                row=1, col=2
-            )
-    
-    # Add connector line between pie and bar chart (if connector is enabled)
-    if connector_style.get("style") == "elbow" and filtered_labels:
-        # Calculate connector line coordinates
-        # This is a simplified connector - you can enhance this for more complex paths
-        fig.add_shape(
-            type="line",
-            x0=0.45, y0=0.5,  # Start from pie chart
-            x1=0.55, y1=0.5,  # End at bar chart
-            line=dict(color=connector_color, width=connector_width),
-            opacity=connector_opacity,
-            xref="paper", yref="paper"
-        )
-    
-    return fig
+def _record_report_metrics(report_timer, success):
+    """Feed a finished report into the timing histogram and the /metrics counters"""
+    get_timing_histogram().observe_report(report_timer)
+    metrics = get_metrics()
+    metrics.inc('graph_reports_generated_total', status='success' if success else 'failed')
+    for chart in report_timer.charts:
+        metrics.inc('graph_charts_generated_total', chart_type=chart['chart_type'], status='success' if chart['success'] else 'failed')
+    metrics.flush()
+
+def _save_report_errors(project_id, report_errors, chart_errors, success):
+    """Write a report's chart errors to the shared store; a store outage must not fail the report"""
+    try:
+        get_error_store(current_app.mongo.db).save_report(project_id, report_errors, chart_errors, success=success)
+    except Exception as e:
+        current_app.logger.warning(f"⚠️ Could not store chart errors for {project_id}: {e}")
 
-def _generate_report(project_id, template_path, data_file_path):
+def _generate_report(project_id, template_path, data_file_path, report_timer=None, chart_output_format=None,
+                     png_optimization=None, preview_tags=None, preview_dpi=PREVIEW_DPI, incremental=False,
+                     report_errors=None):
     import pandas as pd
     import json
     import tempfile
@@ -960,6 +722,7 @@ def _generate_report(project_id, template_path, data_file_path):
     from matplotlib.ticker import FuncFormatter
     from docx import Document
     from docx.shared import Inches
+    from docx.text.paragraph import Paragraph
     import re
     import os
     import gc  # Add garbage collection
@@ -968,6 +731,30 @@ def _generate_report(project_id, template_path, data_file_path):
     plt.switch_backend('Agg')
     plt.style.use('ggplot')  # 👈 Apply a cleaner visual style
 
+    # Per-stage timings are returned to the caller through report_timer and fed to the rolling histogram
+    if report_timer is None:
+        report_timer = ReportTimer()
+    report_timer.reset_lap()
+    # Chart failures are collected here and written to the shared error store once the report finishes
+    if report_errors is None:
+        report_errors = ReportErrors()
+    get_metrics().add_gauge('graph_queue_depth', 1, queue='reports_in_progress')
+    # The data workbook is opened once per report and shared by every chart's cell range extraction
+    chart_workbook = ChartWorkbook(data_file_path)
+    # Chart PNGs are re-encoded between generate_chart and insertion when the project enables it
+    try:
+        png_settings = png_optimization_settings(png_optimization)
+    except ValueError as e:
+        current_app.logger.warning(f"⚠️ Ignoring invalid png_optimization setting for {project_id}: {e}")
+        png_settings = None
+    image_registry = ChartImageRegistry()
+    # Chart previews (preview_tags) render only those charts, at thumbnail resolution, and skip the document
+    chart_dpi = preview_dpi if preview_tags is not None else CHART_DPI
+    # Incremental regeneration reuses the images of charts whose inputs match the project's last report
+    artifact_store = get_chart_artifact_store() if incremental and preview_tags is None else None
+    manifest = None
+    chart_fingerprints = {}
+
     try:
         # Report generation started
 
@@ -1014,6 +801,7 @@ def _generate_report(project_id, template_path, data_file_path):
             dynamic_columns = ['report_name', 'currency', 'country', 'report_code']
         
         current_app.logger.debug(f"Using dynamic columns: {dynamic_columns}")
+        report_timer.lap("excel_parsing")
         
         # First pass: Process global metadata columns from ALL rows
         for _, row in df.iterrows():
@@ -1258,8 +1046,7 @@ def _generate_report(project_id, template_path, data_file_path):
         current_app.logger.debug(f"🔍 DEBUG: ALL keys in flat_data_map: {sorted(flat_data_map.keys())}")
         
         # Data mapping completed silently
-
-        doc = Document(template_path)
+        report_timer.lap("flat_data_map")
 
         def replace_text_in_paragraph(paragraph):
             nonlocal flat_data_map, text_map  # Access variables from outer scope
@@ -1501,6 +1288,7 @@ def _generate_report(project_id, template_path, data_file_path):
             
             # Process Table of Contents specifically - Direct XML string replacement
             # This MUST happen BEFORE the main content replacement to preserve tags in XML
+            toc_rewrite_started = time.perf_counter()
             try:
                 # Processing TOC entries before main replacement
                 
@@ -2054,6 +1842,7 @@ def _generate_report(project_id, template_path, data_file_path):
                     os.unlink(tmp_path)
             except Exception as e:
                 pass  # Suppress warning logs
+            report_timer.add_stage("toc_xml_rewrite", time.perf_counter() - toc_rewrite_started)
             
             # Now replace ALL placeholders everywhere they appear
             # Replacing all placeholders everywhere
@@ -2376,10 +2165,7 @@ def _generate_report(project_id, template_path, data_file_path):
 
         def generate_chart(data_dict, chart_tag):
             current_app.logger.info(f"🚀 GENERATE_CHART CALLED with tag: {chart_tag}")
-            import plotly.graph_objects as go
             import matplotlib.pyplot as plt
-            from openpyxl.utils import column_index_from_string
-            import numpy as np
             import os
             import tempfile
             import json
@@ -2392,6 +2178,7 @@ def _generate_report(project_id, template_path, data_file_path):
             
             # Force matplotlib to use non-interactive backend
             plt.switch_backend('Agg')
+            figures_before = set(plt.get_fignums())
 
             try:
                 chart_tag_lower = chart_tag.lower()
@@ -2442,6 +2229,8 @@ def _generate_report(project_id, template_path, data_file_path):
                     current_app.logger.debug(f"🔥 Chart type detection - chart_type_map.get(chart_tag_lower): {chart_type_map.get(chart_tag_lower, '')}")
                     current_app.logger.debug(f"🔥 Chart type detection - Final chart_type: {chart_type}")
 
+                report_timer.note_chart_type(chart_tag, chart_type)
+
                 # --- Comprehensive attribute detection logging ---
                 #current_app.logger.info(f"🔍 COMPREHENSIVE CHART ATTRIBUTE DETECTION STARTED")
                 #current_app.logger.info(f"📊 Chart Type: {chart_type}")
@@ -2478,42 +2267,6 @@ def _generate_report(project_id, template_path, data_file_path):
                 
                 # Chart attribute detection completed (logging removed for cleaner output)
 
-                # --- Define chart type mappings for Matplotlib ---
-                chart_type_mapping_mpl = {
-                    # Bar charts
-                    "bar": "bar",
-                    "column": "bar", 
-                    "stacked_column": "bar",
-                    "horizontal_bar": "barh",
-                    
-                    # Line charts
-                    "line": "plot",
-                    "scatter": "scatter",
-                    "scatter_line": "plot",
-                    
-                    # Area charts
-                    "area": "fill_between",
-                    "filled_area": "fill_between",
-                    
-                    # Statistical charts
-                    "histogram": "hist",
-                    "box": "boxplot",
-                    "violin": "violinplot",
-                    
-                    # Other charts
-                    "bubble": "scatter",
-                    "heatmap": "imshow",
-                    "contour": "contour",
-                    "waterfall": "bar",
-                    "funnel": "bar",
-                    "sunburst": "pie",
-                    "icicle": "bar",
-                    "sankey": "bar",
-                    "table": "table",
-                    "indicator": "bar",
-                    "treemap": "treemap"
-                }
-
                 # --- Extract custom fields from chart_config ---
                 bar_colors = chart_config.get("bar_colors")
                 bar_width = data_dict.get("bar_width") or chart_config.get("bar_width") or chart_meta.get("bar_width")
@@ -2521,28 +2274,8 @@ def _generate_report(project_id, template_path, data_file_path):
                 bar_border_color = data_dict.get("bar_border_color") or chart_config.get("bar_border_color") or chart_meta.get("bar_border_color")
                 bar_border_width = data_dict.get("bar_border_width") or chart_config.get("bar_border_width") or chart_meta.get("bar_border_width")
                 font_family = data_dict.get("font_family") or chart_config.get("font_family") or chart_meta.get("font_family")
-                # Add font fallback for macOS compatibility
-                if font_family:
-                    # Check if the font is available, otherwise use a fallback
-                    import matplotlib.font_manager as fm
-                    # Suppress font warnings by setting log level
-                    import logging
-                    original_level = logging.getLogger('matplotlib.font_manager').level
-                    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
-                    
-                    try:
-                        available_fonts = [f.name for f in fm.fontManager.ttflist]
-                        if font_family not in available_fonts:
-                            # Use system-appropriate fallback fonts
-                            if font_family.lower() in ['calibri', 'arial']:
-                                font_family = 'Helvetica'  # macOS equivalent
-                            elif font_family.lower() in ['times new roman', 'times']:
-                                font_family = 'Times'  # macOS equivalent
-                            else:
-                                font_family = 'Helvetica'  # Default fallback
-                    finally:
-                        # Restore original logging level
-                        logging.getLogger('matplotlib.font_manager').setLevel(original_level)
+                # Fall back to an installed font (the font list is scanned once per process)
+                font_family = resolve_font_family(font_family)
                 font_size = data_dict.get("font_size") or chart_config.get("font_size") or chart_meta.get("font_size")
                 font_color = data_dict.get("font_color") or chart_config.get("font_color") or chart_meta.get("font_color")
                 legend_position = data_dict.get("legend_position") or chart_config.get("legend_position") or chart_meta.get("legend_position")
@@ -2570,27 +2303,6 @@ def _generate_report(project_id, template_path, data_file_path):
                 disable_secondary_y = data_dict.get("disable_secondary_y") or chart_config.get("disable_secondary_y") or chart_meta.get("disable_secondary_y", False)
                 # current_app.logger.info(f"🔧 disable_secondary_y setting: {disable_secondary_y}")
                 
-                # --- Safe ax2 operation wrapper ---
-                def safe_ax2_operation(operation, *args, **kwargs):
-                    """Safely execute ax2 operations, skipping if ax2 is None or disabled"""
-                    if ax2 is not None and not disable_secondary_y:
-                        try:
-                            return operation(*args, **kwargs)
-                        except Exception as e:
-                            current_app.logger.debug(f"Safe ax2 operation failed: {e}")
-                            return None
-                    return None
-                
-                # --- Global ax2 safety check ---
-                def safe_ax2_text(*args, **kwargs):
-                    """Safely call ax2.text(), skipping if ax2 is None"""
-                    if ax2 is not None:
-                        try:
-                            return ax2.text(*args, **kwargs)
-                        except Exception as e:
-                            current_app.logger.debug(f"ax2.text() failed: {e}")
-                            return None
-                    return None
                 sort_order = data_dict.get("sort_order") or chart_config.get("sort_order") or chart_meta.get("sort_order")
                 data_grouping = data_dict.get("data_grouping") or chart_config.get("data_grouping") or chart_meta.get("data_grouping")
                 annotations = data_dict.get("annotations", []) or chart_config.get("annotations", []) or chart_meta.get("annotations", [])
@@ -2644,117 +2356,8 @@ def _generate_report(project_id, template_path, data_file_path):
                 pull = data_dict.get("pull") or chart_config.get("pull") or chart_meta.get("pull")
                 barmode = data_dict.get("barmode") or chart_config.get("barmode") or chart_meta.get("barmode")
 
-                # --- Excel range extraction helpers ---
-                def extract_excel_range(sheet, cell_range):
-                    # cell_range: e.g., 'E23:E29' or 'AA20:AA23'
-                    try:
-                        current_app.logger.debug(f"🔍 Extracting Excel range: {cell_range}")
-                        values = []
-                        for row in sheet[cell_range]:
-                            for cell in row:
-                                if cell.value is not None:
-                                    # Debug each cell value
-                                    current_app.logger.debug(f"🔍 Cell {cell.coordinate}: '{cell.value}' (type: {type(cell.value)}, repr: {repr(cell.value)})")
-                                    values.append(cell.value)
-                        current_app.logger.debug(f"🔍 Extracted values: {values}")
-                        return values
-                    except Exception as e:
-                        current_app.logger.error(f"❌ Error extracting range {cell_range}: {e}")
-                        return []
-
-                # --- Robust recursive Excel cell range and single cell extraction for all chart types and fields ---
-                def extract_cell_ranges(obj, sheet):
-                    """Recursively walk through nested dicts/lists and extract cell ranges and single cells from strings"""
-                    if isinstance(obj, dict):
-                        for k, v in obj.items():
-                            if isinstance(v, str):
-                                # Check for cell range pattern (e.g., "A1:B10")
-                                if re.match(r"^[A-Z]+\d+:[A-Z]+\d+$", v):
-                                    try:
-                                        extracted = extract_excel_range(sheet, v)
-                                        obj[k] = extracted
-                                        current_app.logger.debug(f"🔍 Excel extraction: {k} = {v} -> {extracted}")
-                                    except Exception as e:
-                                        # Failed to extract data from cell range
-                                        current_app.logger.error(f"❌ Failed to extract Excel range {v} for key {k}: {e}")
-                                        pass
-                                # Check for single cell pattern (e.g., "U13")
-                                elif re.match(r"^[A-Z]+\d+$", v):
-                                    try:
-                                        cell_value = sheet[v].value
-                                        if cell_value is not None:
-                                            obj[k] = cell_value
-                                        else:
-                                            # Keep original value if cell is empty
-                                            pass
-                                    except Exception as e:
-                                        # Failed to extract data from single cell
-                                        pass
-                            else:
-                                extract_cell_ranges(v, sheet)
-                    elif isinstance(obj, list):
-                        for i, v in enumerate(obj):
-                            extract_cell_ranges(v, sheet)
-                
                 if "source_sheet" in chart_meta:
-                    wb = openpyxl.load_workbook(data_file_path, data_only=True)
-                    sheet = wb[chart_meta["source_sheet"]]
-                    
-                    # Validate chart configuration before extraction
-                    def validate_chart_config(config):
-                        """Validate chart configuration for dimension consistency"""
-                        if "series" in config and isinstance(config["series"], dict):
-                            series_config = config["series"]
-                            x_axis_range = series_config.get("x_axis", "")
-                            
-                            if x_axis_range and isinstance(x_axis_range, str) and ":" in x_axis_range:
-                                # Parse x_axis range to get length
-                                try:
-                                    start_cell, end_cell = x_axis_range.split(":")
-                                    start_col, start_row = re.match(r"([A-Z]+)(\d+)", start_cell).groups()
-                                    end_col, end_row = re.match(r"([A-Z]+)(\d+)", end_cell).groups()
-                                    
-                                    if start_col == end_col:  # Same column
-                                        x_length = int(end_row) - int(start_row) + 1
-                                        current_app.logger.info(f"🔍 X-axis range {x_axis_range} has {x_length} cells")
-                                        
-                                        # Check each series data
-                                        series_data = series_config.get("data", [])
-                                        for i, series in enumerate(series_data):
-                                            series_name = series.get("name", f"Series {i+1}")
-                                            values_range = series.get("values", "")
-                                            
-                                            if values_range and isinstance(values_range, str) and ":" in values_range:
-                                                try:
-                                                    start_cell, end_cell = values_range.split(":")
-                                                    start_col, start_row = re.match(r"([A-Z]+)(\d+)", start_cell).groups()
-                                                    end_col, end_row = re.match(r"([A-Z]+)(\d+)", end_cell).groups()
-                                                    
-                                                    if start_col == end_col:  # Same column
-                                                        y_length = int(end_row) - int(start_row) + 1
-                                                        current_app.logger.info(f"📊 Series '{series_name}' range {values_range} has {y_length} cells")
-                                                        
-                                                        if x_length != y_length:
-                                                            pass  # Suppress warning logs: f"⚠️ Dimension mismatch detected: x_axis={x_length}, {series_name}={y_length}")
-                                                            
-                                                            # Fix by adjusting the shorter range
-                                                            if x_length > y_length:
-                                                                # Extend y_values range
-                                                                new_end_row = int(start_row) + x_length - 1
-                                                                new_end_cell = f"{start_col}{new_end_row}"
-                                                                series["values"] = f"{start_cell}:{new_end_cell}"
-                                                                current_app.logger.info(f"🔧 Extended {series_name} range to {series['values']}")
-                                                            else:
-                                                                # Truncate x_axis range
-                                                                new_end_row = int(start_row) + y_length - 1
-                                                                new_end_cell = f"{start_col}{new_end_row}"
-                                                                series_config["x_axis"] = f"{start_cell}:{new_end_cell}"
-                                                                current_app.logger.info(f"🔧 Truncated x_axis range to {series_config['x_axis']}")
-                                                                break  # Only need to fix once
-                                                except Exception as e:
-                                                    current_app.logger.error(f"❌ Error parsing values range {values_range}: {e}")
-                                except Exception as e:
-                                    current_app.logger.error(f"❌ Error parsing x_axis range {x_axis_range}: {e}")
+                    sheet = chart_workbook.sheet(chart_meta["source_sheet"])
                     
                     # Validate chart configuration
                     validate_chart_config(chart_meta)
@@ -2767,7 +2370,6 @@ def _generate_report(project_id, template_path, data_file_path):
                     extract_cell_ranges(chart_meta, sheet)
                     current_app.logger.debug(f"🔍 Extracting from series_meta...")
                     extract_cell_ranges(series_meta, sheet)
-                    wb.close()
                     
                     # Log the extracted data for debugging
                     current_app.logger.debug(f"🔍 Chart meta after extraction: {chart_meta}")
@@ -2789,15 +2391,13 @@ def _generate_report(project_id, template_path, data_file_path):
                 if series_data and data_file_path:
                     try:
                         current_app.logger.debug(f"🔍 Extracting Excel cell ranges from series data...")
-                        wb = openpyxl.load_workbook(data_file_path, data_only=True)
-                        sheet = wb[chart_meta.get("source_sheet", "sample")]
+                        sheet = chart_workbook.sheet(chart_meta.get("source_sheet", "sample"))
                         # Extract cell ranges from the series data
                         for i, series in enumerate(series_data):
                             if isinstance(series, dict):
                                 current_app.logger.debug(f"🔍 Processing series {i+1}: {series}")
                                 extract_cell_ranges(series, sheet)
                                 current_app.logger.debug(f"🔍 Series {i+1} after extraction: {series}")
-                        wb.close()
                         current_app.logger.debug(f"🔍 Extracted Excel cell ranges from series data")
                     except Exception as e:
                         current_app.logger.error(f"❌ Error extracting Excel cell ranges from series data: {e}")
@@ -2841,42 +2441,6 @@ def _generate_report(project_id, template_path, data_file_path):
                     x_values = []
                     # No x_values found, using empty list as fallback
                 
-                # Validate and fix dimension mismatches
-                def validate_and_fix_dimensions(x_vals, series_data):
-                    """Validate that all series have the same length as x_axis and fix if needed"""
-                    if not x_vals or not series_data:
-                        return x_vals, series_data
-                    
-                    x_length = len(x_vals)
-                    current_app.logger.debug(f"🔍 Validating dimensions: x_axis length = {x_length}")
-                    
-                    for i, series in enumerate(series_data):
-                        series_name = series.get("name", f"Series {i+1}")
-                        y_vals = series.get("values", [])
-                        y_length = len(y_vals)
-                        
-                        current_app.logger.debug(f"📊 Series '{series_name}': {y_length} values")
-                        
-                        if x_length != y_length:
-                            pass  # Suppress warning logs: f"⚠️ Dimension mismatch in '{series_name}': x_axis={x_length}, y_values={y_length}")
-                            
-                            # Fix by truncating to the minimum length
-                            min_length = min(x_length, y_length)
-                            if min_length > 0:
-                                # Truncate x_axis if it's longer
-                                if x_length > min_length:
-                                    x_vals = x_vals[:min_length]
-                                    current_app.logger.debug(f"✂️ Truncated x_axis to {min_length} values")
-                                
-                                # Truncate y_values if they're longer
-                                if y_length > min_length:
-                                    series["values"] = y_vals[:min_length]
-                                    current_app.logger.debug(f"✂️ Truncated '{series_name}' values to {min_length}")
-                            else:
-                                current_app.logger.error(f"❌ Cannot fix dimensions: both arrays are empty")
-                    
-                    return x_vals, series_data
-                
                 # Apply dimension validation (skip for heatmaps)
                 if chart_type not in ["heatmap"]:
                     x_values, series_data = validate_and_fix_dimensions(x_values, series_data)
@@ -2912,4552 +2476,88 @@ def _generate_report(project_id, template_path, data_file_path):
                     
                     # Series attribute detection completed (logging removed for cleaner output)
 
-                # --- Plotly interactive chart generation ---
-                fig = go.Figure()
-
-                # --- Bar of Pie chart special handling ---
-                if chart_type in ["bar of pie", "bar_of_pie"]:
-                    # Extract cell ranges for other_labels and other_values if they are cell ranges
-                    other_labels = chart_meta.get("other_labels", [])
-                    other_values = chart_meta.get("other_values", [])
-                    other_colors = chart_meta.get("other_colors", [])
-                    
-                    # If other_labels and other_values are cell ranges, extract them
-                    if isinstance(other_labels, str) and re.match(r"^[A-Z]+\d+:[A-Z]+\d+$", other_labels):
-                        try:
-                            wb = openpyxl.load_workbook(data_file_path, data_only=True)
-                            sheet = wb[chart_meta.get("source_sheet", "sample")]
-                            other_labels = extract_excel_range(sheet, other_labels)
-                            wb.close()
-                            # Extracted other_labels successfully
-                            pass
-                        except Exception as e:
-                            # Failed to extract other_labels
-                            pass
-                    
-                    if isinstance(other_values, str) and re.match(r"^[A-Z]+\d+:[A-Z]+\d+$", other_values):
-                        try:
-                            wb = openpyxl.load_workbook(data_file_path, data_only=True)
-                            sheet = wb[chart_meta.get("source_sheet", "sample")]
-                            other_values = extract_excel_range(sheet, other_values)
-                            wb.close()
-                            # Extracted other_values successfully
-                            print(f"DEBUG: other_values extracted from {other_values} = {other_values}")
-                            pass
-                        except Exception as e:
-                            # Failed to extract other_values
-                            pass
-                    
-                    # Log the extracted data for debugging
-                    #current_app.logger.info(f"🔍 Bar of Pie Chart Data:")
-                    #current_app.logger.info(f"   Other Labels: {other_labels}")
-                    #current_app.logger.info(f"   Other Values: {other_values}")
-                    #current_app.logger.info(f"   Other Colors: {other_colors}")
-                    
-                    # Check if values are percentages in decimal form and convert them
-                    y_axis_title = chart_meta.get("y_axis_title", "")
-                    if other_values and y_axis_title and "%" in y_axis_title:
-                        # Check if all values are between 0-1 (likely percentages in decimal form)
-                        if all(isinstance(v, (int, float)) and 0 <= v <= 1 for v in other_values if v is not None):
-                            print(f"DEBUG: Converting decimal values to percentages: {other_values}")
-                            other_values = [v * 100 if v is not None and isinstance(v, (int, float)) else v for v in other_values]
-                            print(f"DEBUG: Converted to: {other_values}")
-                        else:
-                            # Handle string values that might be percentages
-                            converted_values = []
-                            for v in other_values:
-                                if v is not None:
-                                    try:
-                                        if isinstance(v, str):
-                                            # Try to convert string to float
-                                            float_val = float(v)
-                                            if 0 <= float_val <= 1:
-                                                converted_values.append(float_val * 100)
-                                            else:
-                                                converted_values.append(float_val)
-                                        else:
-                                            converted_values.append(v)
-                                    except (ValueError, TypeError):
-                                        converted_values.append(v)
-                                else:
-                                    converted_values.append(v)
-                            other_values = converted_values
-                    
-                    # Check for empty/null values
-                    if other_labels and other_values:
-                        empty_count = sum(1 for label, value in zip(other_labels, other_values) 
-                                        if (label is None or str(label).strip() == "" or 
-                                            value is None or str(value).strip() == "" or 
-                                            str(value).strip() == "0"))
-                        if empty_count > 0:
-                            # Found empty/null values in bar chart data (will cause missing bars)
-                            pass
-                        
-                        # Data analysis completed (logging removed for cleaner output)
-                    
-                    value_format = chart_meta.get("value_format", "")
-                    # For bar of pie charts, use labels from series_meta, fallback to x_values
-                    labels = series_meta.get("labels", x_values)
-                    values = series_meta.get("values", [])
-                    colors = series_meta.get("colors", [])
-                    
-                    # Chart data prepared
-                    fig = create_bar_of_pie_chart(
-                        labels=labels,
-                        values=values,
-                        other_labels=other_labels,
-                        other_values=other_values,
-                        colors=colors,
-                        other_colors=other_colors if other_colors else colors,
-                        title=title,
-                        value_format=value_format,
-                        chart_meta=chart_meta
-                    )
+                # A chart's own chart_output_format overrides the project's; previews are always PNG
+                output_format = resolve_chart_output_format(chart_meta.get("chart_output_format"), chart_output_format)
+                if preview_tags is not None:
+                    output_format = "png"
+
+                # --- Renderer lookup (renderer modules are imported the first time their chart type is drawn) ---
+                renderer = get_renderer(chart_type)
+                if renderer.backend == "plotly":
+                    fig = renderer.render(ChartContext(chart_meta=chart_meta, series_meta=series_meta, x_values=x_values,
+                                                       title=title, workbook=chart_workbook))
+                    if preview_tags is not None:
+                        # Previews hand the Plotly figure back as-is; the client draws it
+                        report_timer.note_chart_build(chart_tag, figures=len(set(plt.get_fignums()) - figures_before), traces=len(fig.data))
+                        plt.close('all')
+                        return fig
                     
-                    # Save Plotly figure as PNG file for Word document insertion
-                    tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-                    fig.write_image(tmpfile.name, width=900, height=500, scale=2)
+                    # Save Plotly figure for Word document insertion
+                    chart_path = save_plotly_chart(fig, output_format, width=900, height=500, scale=2)
+                    report_timer.note_chart_build(chart_tag, figures=1 + len(set(plt.get_fignums()) - figures_before), traces=len(fig.data))
                     plt.close('all')  # Close any matplotlib figures
                     gc.collect()  # Force garbage collection
                     
-                    return tmpfile.name
-                
-                def extract_values_from_range(cell_range):
-                    start_cell, end_cell = cell_range.split(":")
-                    start_col, start_row = re.match(r"([A-Z]+)(\d+)", start_cell).groups()
-                    end_col, end_row = re.match(r"([A-Z]+)(\d+)", end_cell).groups()
-
-                    start_col_idx = column_index_from_string(start_col) - 1
-                    end_col_idx = column_index_from_string(end_col) - 1
-                    start_row_idx = int(start_row) - 1  # Fixed: pandas is 0-indexed, Excel is 1-indexed
-                    end_row_idx = int(end_row) - 1      # Fixed: pandas is 0-indexed, Excel is 1-indexed
-
-                    if start_col_idx == end_col_idx:
-                        return df.iloc[start_row_idx:end_row_idx + 1, start_col_idx].tolist()
-                    else:
-                        return df.iloc[start_row_idx:end_row_idx + 1, start_col_idx:end_col_idx + 1].values.flatten().tolist()
-
-                # --- Data grouping and sorting logic ---
-                # If data_grouping is present, filter x/y values to only those groups
-                def group_and_sort(x_vals, y_vals, group_names=None, sort_order=None):
-                    # Grouping: only keep x/y where x in group_names (if group_names provided)
-                    if group_names:
-                        filtered = [(x, y) for x, y in zip(x_vals, y_vals) if x in group_names]
-                        if filtered:
-                            x_vals, y_vals = zip(*filtered)
-                        else:
-                            x_vals, y_vals = [], []
-                    # Sorting: sort by y-value
-                    if sort_order == "ascending":
-                        sorted_pairs = sorted(zip(x_vals, y_vals), key=lambda pair: pair[1])
-                        if sorted_pairs:
-                            x_vals, y_vals = zip(*sorted_pairs)
-                    elif sort_order == "descending":
-                        sorted_pairs = sorted(zip(x_vals, y_vals), key=lambda pair: pair[1], reverse=True)
-                        if sorted_pairs:
-                            x_vals, y_vals = zip(*sorted_pairs)
-                    return list(x_vals), list(y_vals)
-
-                # Special handling for pie charts and treemaps (single trace)
-                if (chart_type == "pie" or chart_type == "treemap") and len(series_data) == 1:
-                    series = series_data[0]
-                    label = series.get("name", "Pie Chart")
-                    labels = series.get("labels", x_values)
-                    values = series.get("values", [])
-                    color = series.get("marker", {}).get("colors") if "marker" in series else colors
-                    
-                    # Apply value format if specified
-                    value_format = chart_meta.get("value_format", "")
-                    if value_format:
-                        # Convert values to percentage format for display
-                        try:
-                            formatted_values = [f"{float(v):{value_format}}" if v is not None else "0" for v in values]
-                        except:
-                            formatted_values = values
-                    else:
-                        formatted_values = values
-                    
-                    # Check if this is an expanded pie chart (pie with one segment expanded to column)
-                    expanded_segment = chart_meta.get("expanded_segment")
-                    
-                    if expanded_segment:
-                        # Use the helper function for expanded pie charts
-                        fig = create_expanded_pie_chart(
-                            labels=labels,
-                            values=values,
-                            colors=color if isinstance(color, list) else [color],
-                            expanded_segment=expanded_segment,
-                            title=title,
-                            value_format=value_format
-                        )
-                        
-                    else:
-                        # Regular pie chart
-                        pie_kwargs = {
-                            "labels": labels,
-                            "values": values,
-                            "name": label,
-                            "textinfo": "label+percent+value" if chart_meta.get("data_labels", True) else "none",
-                            "textposition": "outside",
-                            "hole": 0.0  # Solid pie chart
-                        }
-                        
-                        # Pie colors
-                        if color:
-                            if isinstance(color, list):
-                                safe_colors = [c for c in color if c is not None]
-                                if safe_colors:
-                                    pie_kwargs["marker"] = dict(colors=safe_colors)
-                            elif color is not None:
-                                pie_kwargs["marker"] = dict(colors=[color])
-                        
-                        # Add pull effect for specific segments if needed
-                        if "pull" in chart_meta:
-                            pie_kwargs["pull"] = chart_meta["pull"]
-                        
-                        fig.add_trace(go.Pie(**pie_kwargs,
-                            hovertemplate=f"<b>{label}</b><br>%{{label}}: %{{value}}{str(value_format) if value_format else ''}<extra></extra>"
-                        ))
-                
-                elif chart_type == "heatmap":
-                    # Special handling for heatmaps
-                    current_app.logger.debug(f"🔥 Heatmap chart type detected, processing series data")
-                    if series_data and len(series_data) > 0:
-                        series = series_data[0]
-                        current_app.logger.debug(f"🔥 Heatmap series data: {series}")
-                        
-                        # Validate heatmap data structure
-                        z_data = series.get("z", [])
-                        x_labels = series.get("x", [])
-                        y_labels = series.get("y", [])
-                        
-                        if z_data and x_labels and y_labels:
-                            current_app.logger.debug(f"🔥 Heatmap data validation passed - Z: {len(z_data)}x{len(z_data[0]) if z_data else 0}, X: {len(x_labels)}, Y: {len(y_labels)}")
-                        else:
-                            current_app.logger.warning(f"🔥 Heatmap data validation failed - Z: {z_data}, X: {x_labels}, Y: {y_labels}")
-                    else:
-                        current_app.logger.warning(f"🔥 No series data found for heatmap")
+                    return chart_path
                 
-                elif chart_type == "treemap":
-                    series = series_data[0]
-                    label = series.get("name", "Treemap Chart")
-                    labels = series.get("labels", x_values)
-                    values = series.get("values", [])
-                    color = series.get("marker", {}).get("colors") if "marker" in series else colors
-                    
-                    # Debug logging for treemap data
-                    current_app.logger.debug(f"🔍 Treemap data - series: {series}")
-                    current_app.logger.debug(f"🔍 Treemap data - labels: {labels} (type: {type(labels)})")
-                    current_app.logger.debug(f"🔍 Treemap data - values: {values} (type: {type(values)})")
-                    
-                    
-                    # Get data label settings from JSON configuration
+                # --- Display settings shared by the Matplotlib renderers ---
+                # Treemap label/opacity defaults
+                if chart_type == "treemap" or any(isinstance(s, dict) and str(s.get("type", "")).lower() == "treemap" for s in series_data):
                     data_labels = chart_meta.get("data_labels", True)
                     data_label_font_size = chart_meta.get("data_label_font_size", 12)
                     data_label_color = chart_meta.get("data_label_color", "#000000")
                     fill_opacity = chart_meta.get("fill_opacity", 0.8)
-                    hide_center_box = chart_meta.get("hide_center_box", False)
-                    current_app.logger.debug(f"🔍 Treemap: hide_center_box parameter: {hide_center_box}")
-                    current_app.logger.debug(f"🔍 Treemap: chart_meta keys: {list(chart_meta.keys())}")
-                    current_app.logger.debug(f"🔍 Treemap: chart_meta: {chart_meta}")
-                    
-                    # Determine textinfo based on data_labels setting (independent of center box)
-                    if data_labels:
-                        textinfo_setting = "label"  # Show labels
-                        current_app.logger.debug(f"🔍 Treemap: data_labels=True, setting textinfo to 'label'")
-                    else:
-                        textinfo_setting = "none"  # Hide labels
-                        current_app.logger.debug(f"🔍 Treemap: data_labels=False, setting textinfo to 'none'")
-                    
-                    # Treemap specific settings - separate center box control from data labels
-                    treemap_kwargs = {
-                        "labels": labels,
-                        "values": values,
-                        "name": label,
-                        "textinfo": textinfo_setting,
-                        "textposition": "middle center",
-                        "branchvalues": "total",
-                        "pathbar": dict(visible=not hide_center_box),  # Hide center box if hide_center_box is True
-                        "tiling": dict(packing="squarify", squarifyratio=1),
-                        "texttemplate": None,
-                        "hoverinfo": "label+value"
-                    }
-                    
-                    # Add text font configuration from JSON
-                    if data_labels:
-                        treemap_kwargs["textfont"] = {
-                            "family": font_family,
-                            "size": data_label_font_size,
-                            "color": data_label_color
-                        }
-                    
-                    # Add hierarchical data support
-                    if "parent" in series:
-                        treemap_kwargs["parents"] = series["parent"]
-                    
-                    # Add enhanced colors if available
-                    if color:
-                        if isinstance(color, list):
-                            treemap_kwargs["marker"] = dict(colors=color, opacity=fill_opacity)
-                        else:
-                            treemap_kwargs["marker"] = dict(colors=[color], opacity=fill_opacity)
-                    else:
-                        # Use enhanced color palette for better visual appeal
-                        enhanced_colors = [
-                            '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7',
-                            '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9',
-                            '#F8C471', '#82E0AA', '#F1948A', '#85C1E9', '#D7BDE2'
-                        ]
-                        # Apply colors based on data length
-                        if len(labels) <= len(enhanced_colors):
-                            treemap_kwargs["marker"] = dict(colors=enhanced_colors[:len(labels)], opacity=fill_opacity)
-                    
-                    # Add hover template with enhanced information
-                    hover_template = f"<b>{label}</b><br>"
-                    hover_template += "Category: %{label}<br>"
-                    hover_template += "Value: %{value}<br>"
-                    if "parent" in series:
-                        hover_template += "Parent: %{parent}<br>"
-                    hover_template += "Percentage: %{percentParent:.1f}%<extra></extra>"
-                    
-                    # Add showlegend parameter to the treemap trace
-                    current_app.logger.debug(f"🔍 Treemap: Final treemap_kwargs: {treemap_kwargs}")
-                    
-                    treemap_trace = go.Treemap(**treemap_kwargs,
-                        hovertemplate=hover_template
-                    )
-                    
-                    # Apply showlegend setting from chart_meta
-                    show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                    if isinstance(show_legend_raw, str):
-                        show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                    else:
-                        show_legend = bool(show_legend_raw)
-                    
-                    treemap_trace.showlegend = show_legend
-                    fig.add_trace(treemap_trace)
-                
-                # Handle stacked column, area, and other multi-series charts
-                else:
-                    for i, series in enumerate(series_data):
-                        label = series.get("name", f"Series {i+1}")
-                        series_type = series.get("type", "bar").lower()
-                        
-                        # Map heatmap to imshow for Matplotlib
-                        if series_type == "heatmap":
-                            mpl_chart_type = "imshow"
-                        else:
-                            mpl_chart_type = chart_type_mapping_mpl.get(series_type, "scatter")
-                        
-                        color = None
-                        if "marker" in series and isinstance(series["marker"], dict) and "color" in series["marker"]:
-                            color = series["marker"]["color"]
-                        elif bar_colors:
-                            color = bar_colors
-                        elif i < len(colors):
-                            color = colors[i]
-
-                        y_vals = series.get("values")
-                        value_range = series.get("value_range")
-                        if value_range:
-                            # Check if value_range is already extracted (list) or still a string
-                            if isinstance(value_range, list):
-                                y_vals = value_range
-                            else:
-                                y_vals = extract_values_from_range(value_range)
-
-                        # --- Apply grouping and sorting ---
-                        x_vals = x_values
-                        if y_vals is not None and x_vals is not None:
-                            x_vals, y_vals = group_and_sort(x_vals, y_vals, data_grouping, sort_order)
-
-                        trace_kwargs = {
-                            "x": x_vals,
-                            "y": y_vals,
-                            "name": label,
-                        }
-                        
-                        # Handle colors
-                        if color:
-                            if isinstance(color, list) and series_type == "bar":
-                                trace_kwargs["marker"] = dict(color=color)
-                            elif isinstance(color, str):
-                                trace_kwargs["marker_color"] = color
-                        
-                        # Handle bar-specific properties
-                        if bar_width and series_type == "bar":
-                            trace_kwargs["width"] = bar_width
-                        if orientation and series_type == "bar":
-                            trace_kwargs["orientation"] = orientation[0].lower() if isinstance(orientation, str) else orientation
-                        if bar_border_color and series_type == "bar":
-                            trace_kwargs["marker_line_color"] = bar_border_color
-                        if bar_border_width and series_type == "bar":
-                            trace_kwargs["marker_line_width"] = bar_border_width
-                        
-                        # Handle line-specific properties
-                        if line_width and series_type in ["line", "scatter", "scatter_line"]:
-                            trace_kwargs["line_width"] = line_width
-                        if marker_size and series_type in ["line", "scatter", "scatter_line"]:
-                            trace_kwargs["marker_size"] = marker_size
-                        if line_style and series_type in ["line", "scatter", "scatter_line"]:
-                            # Map line styles to Plotly format
-                            line_style_map = {
-                                "solid": "solid",
-                                "dashed": "dash",
-                                "dotted": "dot",
-                                "dashdot": "dashdot"
-                            }
-                            trace_kwargs["line_dash"] = line_style_map.get(line_style, "solid")
-                        
-                        # Handle opacity
-                        if fill_opacity:
-                            trace_kwargs["opacity"] = fill_opacity
-
-                        # Add traces based on chart type - REPLACE THE RESTRICTIVE IF/ELIF BLOCKS
-                        # Generic chart type handling for Plotly
-                        chart_type_mapping = {
-                            # Bar charts
-                            "bar": go.Bar,
-                            "column": go.Bar,
-                            "stacked_column": go.Bar,
-                            "horizontal_bar": go.Bar,
-                            
-                            # Line charts
-                            "line": go.Scatter,
-                            "scatter": go.Scatter,
-                            "scatter_line": go.Scatter,
-                            
-                            # Area charts
-                            "area": go.Scatter,
-                            "filled_area": go.Scatter,
-                            
-                            # Pie charts
-                            "pie": go.Pie,
-                            "donut": go.Pie,
-                            
-                            # 3D charts
-                            "scatter3d": go.Scatter3d,
-                            "surface": go.Surface,
-                            "mesh3d": go.Mesh3d,
-                            
-                            # Statistical charts
-                            "histogram": go.Histogram,
-                            "box": go.Box,
-                            "violin": go.Violin,
-                            
-                            # Financial charts
-                            "candlestick": go.Candlestick,
-                            "ohlc": go.Ohlc,
-                            
-                            # Geographic charts
-                            "scattergeo": go.Scattergeo,
-                            "choropleth": go.Choropleth,
-                            
-                            # Other charts
-                            "bubble": go.Scatter,
-                            "heatmap": go.Heatmap,
-                            "contour": go.Contour,
-                            "waterfall": go.Waterfall,
-                            "funnel": go.Funnel,
-                            "sunburst": go.Sunburst,
-                            "icicle": go.Icicle,
-                            "sankey": go.Sankey,
-                            "treemap": go.Treemap,
-                            "table": go.Table,
-                            "indicator": go.Indicator
-                        }
-                        
-                        # Get the appropriate Plotly chart class
-                        plotly_chart_class = chart_type_mapping.get(series_type)
-                        
-                        if plotly_chart_class:
-                            # Prepare trace arguments based on chart type
-                            if series_type in ["bar", "column", "stacked_column", "horizontal_bar"]:
-                                # Bar chart specific settings
-                                # REMOVE: if chart_type == "stacked_column": trace_kwargs["barmode"] = "stack"
-                                if orientation and orientation.lower() == "horizontal":
-                                    trace_kwargs["orientation"] = "h"
-                                    # Swap x and y for horizontal bars
-                                    trace_kwargs["x"], trace_kwargs["y"] = trace_kwargs["y"], trace_kwargs["x"]
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["line", "scatter", "scatter_line"]:
-                                # Line/Scatter chart specific settings
-                                mode = "lines+markers" if series_type == "scatter_line" else "markers" if series_type == "scatter" else "lines"
-                                trace_kwargs["mode"] = mode
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["area", "filled_area"]:
-                                # Area chart specific settings
-                                trace_kwargs["mode"] = "lines"
-                                trace_kwargs["fill"] = "tozeroy"
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                                ))
-                                
-                            elif series_type == "pie":
-                                # Pie chart specific settings
-                                pie_kwargs = {
-                                    "labels": x_vals,
-                                    "values": y_vals,
-                                    "name": label,
-                                    "textinfo": "label" if data_labels and not chart_meta.get("hide_center_box", False) else "none",
-                                    "textposition": "outside",
-                                    "hole": hole if hole is not None else (0.4 if series_type == "donut" else 0.0)
-                                }
-                                
-                                # Add pie chart specific attributes
-                                if startangle is not None:
-                                    pie_kwargs["rotation"] = startangle
-                                if pull is not None:
-                                    # pull can be a single value or a list
-                                    if isinstance(pull, (int, float)):
-                                        pie_kwargs["pull"] = [pull] * len(y_vals)
-                                    elif isinstance(pull, list):
-                                        pie_kwargs["pull"] = pull
-                                
-                                if color:
-                                    pie_kwargs["marker"] = dict(colors=color) if isinstance(color, list) else dict(colors=[color])
-                                
-                                fig.add_trace(plotly_chart_class(**pie_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>%{{label}}: %{{value}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["scatter3d", "surface", "mesh3d"]:
-                                # 3D chart specific settings
-                                if "z" not in trace_kwargs and len(y_vals) > 0:
-                                    # Create a simple z-axis if not provided
-                                    trace_kwargs["z"] = [i for i in range(len(y_vals))]
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>X: %{{x}}<br>Y: %{{y}}<br>Z: %{{z}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["histogram", "box", "violin"]:
-                                # Statistical chart specific settings
-                                if series_type == "histogram":
-                                    trace_kwargs["x"] = y_vals  # Histogram uses x for values
-                                    del trace_kwargs["y"]
-                                elif series_type in ["box", "violin"]:
-                                    trace_kwargs["y"] = y_vals
-                                    trace_kwargs["x"] = [label] * len(y_vals) if len(y_vals) > 0 else [label]
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Value: %{{y if series_type in ['box', 'violin'] else 'x'}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["bubble"]:
-                                # Bubble chart specific settings
-                                sizes = series.get("size", [20] * len(y_vals))
-                                trace_kwargs["mode"] = "markers"
-                                trace_kwargs["marker"] = {"size": sizes}
-                                if color:
-                                    trace_kwargs["marker"]["color"] = color
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>X: %{{x}}<br>Y: %{{y}}<br>Size: %{{marker.size}}<extra></extra>"
-                                ))
-                                
-                            elif series_type == "heatmap":
-                                # Heatmap specific settings
-                                heatmap_kwargs = {
-                                    "z": series.get("z", y_vals),  # Use z data if provided, otherwise y_vals
-                                    "x": series.get("x", x_vals),  # Use x data if provided, otherwise x_vals
-                                    "y": series.get("y", [label]),  # Use y data if provided, otherwise label
-                                    "name": label,
-                                    "colorscale": series.get("colorscale", "Viridis"),
-                                    "showscale": series.get("showscale", True)
-                                }
-                                
-                                # Handle text data safely (convert to strings to avoid concatenation errors)
-                                if "text" in series:
-                                    try:
-                                        heatmap_kwargs["text"] = [[str(cell) for cell in row] for row in series["text"]]
-                                    except:
-                                        pass  # Suppress warning logs: f"⚠️ Could not process heatmap text data for {label}")
-                                
-                                # Handle colorbar settings
-                                if "colorbar" in series:
-                                    heatmap_kwargs["colorbar"] = series["colorbar"]
-                                
-                                # Handle zmin/zmax
-                                if "zmin" in series:
-                                    heatmap_kwargs["zmin"] = series["zmin"]
-                                if "zmax" in series:
-                                    heatmap_kwargs["zmax"] = series["zmax"]
-                                
-                                fig.add_trace(go.Heatmap(**heatmap_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>X: %{{x}}<br>Y: %{{y}}<br>Value: %{{z}}<extra></extra>"
-                                ))
-                                
-                            elif series_type == "treemap":
-                                # Get data label settings from JSON configuration
-                                data_labels = chart_meta.get("data_labels", True)
-                                data_label_font_size = chart_meta.get("data_label_font_size", 12)
-                                data_label_color = chart_meta.get("data_label_color", "#000000")
-                                fill_opacity = chart_meta.get("fill_opacity", 0.8)
-                                
-                                # Treemap specific settings
-                                hide_center_box = chart_meta.get("hide_center_box", False)
-                                current_app.logger.debug(f"🔍 Treemap (multi-series): hide_center_box parameter: {hide_center_box}")
-                                current_app.logger.debug(f"🔍 Treemap (multi-series): chart_meta: {chart_meta}")
-                                # Determine textinfo based on data_labels setting (independent of center box)
-                                textinfo_setting = "label" if data_labels else "none"
-                                
-                                treemap_kwargs = {
-                                    "labels": x_vals,
-                                    "values": y_vals,
-                                    "name": label,
-                                    "textinfo": textinfo_setting,
-                                    "textposition": "middle center",
-                                    "branchvalues": "total",
-                                    "pathbar": dict(visible=not hide_center_box),  # Hide center box if hide_center_box is True
-                                    "texttemplate": None,
-                                    "hoverinfo": "label+value"
-                                }
-                                
-                                # Add text font configuration from JSON
-                                if data_labels:
-                                    treemap_kwargs["textfont"] = {
-                                        "family": font_family,
-                                        "size": data_label_font_size,
-                                        "color": data_label_color
-                                    }
-                                
-                                # Add treemap specific attributes
-                                if color:
-                                    treemap_kwargs["marker"] = dict(colors=color, opacity=fill_opacity) if isinstance(color, list) else dict(colors=[color], opacity=fill_opacity)
-                                
-                                # Debug logging for final treemap configuration
-                                current_app.logger.debug(f"🔍 Treemap (multi-series): Final treemap_kwargs: {treemap_kwargs}")
-                                
-                                fig.add_trace(go.Treemap(**treemap_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>%{{label}}: %{{value}}<extra></extra>"
-                                ))
-                                
-                            else:
-                                # Generic handling for other chart types
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Value: %{{y}}<extra></extra>"
-                                ))
-                        else:
-                            # Fallback to scatter if chart type not recognized
-                            #pass  # Suppress warning logs: f"⚠️ Unknown chart type '{series_type}', falling back to scatter")
-                            fig.add_trace(go.Scatter(**trace_kwargs,
-                                mode='markers',
-                                hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                            ))
-
-                # --- Layout updates ---
-                layout_updates = {}
-                
-                # Title and axis labels
-                layout_updates["title"] = title
-                
-                # Handle axis labels based on chart type
-                if chart_type != "pie":
-                    layout_updates["xaxis_title"] = chart_meta.get("x_label", chart_config.get("x_axis_title", "X"))
-                    layout_updates["yaxis_title"] = chart_meta.get("primary_y_label", chart_config.get("primary_y_label", "Y"))
-                
-                # Font
-                if font_family or font_size or font_color:
-                    layout_updates["font"] = {}
-                    if font_family:
-                        layout_updates["font"]["family"] = font_family
-                    if font_size:
-                        layout_updates["font"]["size"] = font_size
-                    if font_color:
-                        layout_updates["font"]["color"] = font_color
-                
-                # Backgrounds
-                if chart_background:
-                    layout_updates["paper_bgcolor"] = chart_background
-                if plot_background:
-                    layout_updates["plot_bgcolor"] = plot_background
-                
-                # Legend configuration
-                show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                # Convert string "false"/"true" to boolean if needed
-                if isinstance(show_legend_raw, str):
-                    show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                else:
-                    show_legend = bool(show_legend_raw)
-                # current_app.logger.debug(f"Legend setting: {chart_meta.get('legend')}")
-                # current_app.logger.debug(f"Showlegend setting: {chart_meta.get('showlegend')}")
-                # current_app.logger.debug(f"Final show_legend: {show_legend}")
-                
-                if show_legend:
-                    # current_app.logger.debug("Configuring legend for Plotly")
-                    if legend_position:
-                        # Map 'top', 'bottom', 'left', 'right' to valid Plotly legend positions
-                        pos_map = {
-                            "top":    dict(x=0.5, y=1.1, xanchor="center", yanchor="top"),
-                            "bottom": dict(x=0.5, y=-0.2, xanchor="center", yanchor="bottom"),
-                            "left":   dict(x=-0.2, y=0.5, xanchor="left", yanchor="middle"),
-                            "right":  dict(x=1.1, y=0.5, xanchor="right", yanchor="middle"),
-                        }
-                        if legend_position in pos_map:
-                            layout_updates["legend"] = pos_map[legend_position]
-                            # current_app.logger.debug(f"Set legend position: {legend_position}")
-                    if legend_font_size:
-                        layout_updates.setdefault("legend", {})["font"] = {"size": legend_font_size}
-                        # current_app.logger.debug(f"Set legend font size: {legend_font_size}")
-                else:
-                    layout_updates["showlegend"] = False
-                    # current_app.logger.debug("Legend disabled for Plotly")
-                
-                # Bar mode for stacked charts
-                if barmode:
-                    layout_updates["barmode"] = barmode
-                elif chart_type == "stacked_column":
-                    layout_updates["barmode"] = "stack"
-                
-                # Axis min/max and tick format (only for non-pie charts)
-                if chart_type != "pie":
-                    if y_axis_min_max:
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        # Handle "auto" value for y-axis min/max
-                        if y_axis_min_max == "auto":
-                            # Don't set range for auto - let Plotly auto-scale
-                            pass
-                        else:
-                            layout_updates["yaxis"]["range"] = y_axis_min_max
-                            # Also set autorange to false to ensure the range is respected
-                            layout_updates["yaxis"]["autorange"] = False
-                            # Force the range to be applied
-                            layout_updates["yaxis"]["fixedrange"] = False
-                            # Ensure the range is properly set
-                            # current_app.logger.debug(f"Setting Y-axis range to: {y_axis_min_max}")
-                    if axis_tick_format:
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["yaxis"]["tickformat"] = axis_tick_format
-                        # Also apply to secondary y-axis if it's a currency format
-                        if "$" in axis_tick_format:
-                            layout_updates["yaxis2"] = layout_updates.get("yaxis2", {})
-                            layout_updates["yaxis2"]["tickformat"] = axis_tick_format
-                    
-                    # Secondary y-axis formatting
-                    if secondary_y_axis_format:
-                        layout_updates["yaxis2"] = layout_updates.get("yaxis2", {})
-                        layout_updates["yaxis2"]["tickformat"] = secondary_y_axis_format
-                    if secondary_y_axis_min_max:
-                        layout_updates["yaxis2"] = layout_updates.get("yaxis2", {})
-                        # Handle "auto" value for secondary y-axis min/max
-                        if secondary_y_axis_min_max == "auto":
-                            # Don't set range for auto - let Matplotlib auto-scale
-                            pass
-                        elif isinstance(secondary_y_axis_min_max, list) and len(secondary_y_axis_min_max) == 2:
-                            layout_updates["yaxis2"]["range"] = secondary_y_axis_min_max
-                        else:
-                            pass  # Suppress warning logs: f"Invalid secondary_y_axis_min_max format: {secondary_y_axis_min_max}")
-                    
-                    # Axis tick font size
-                    if axis_tick_font_size:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["tickfont"] = {"size": axis_tick_font_size}
-                        layout_updates["yaxis"]["tickfont"] = {"size": axis_tick_font_size}
-                    # Gridlines
-                    if show_gridlines is not None:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["showgrid"] = bool(show_gridlines)
-                        layout_updates["yaxis"]["showgrid"] = bool(show_gridlines)
-                    if gridline_color:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["gridcolor"] = gridline_color
-                        layout_updates["yaxis"]["gridcolor"] = gridline_color
-                    if gridline_style:
-                        # Map gridline styles to valid Plotly dash styles
-                        dash_map = {
-                            "solid": "solid", 
-                            "dashed": "dash",
-                            "dash": "dash",  # Map 'dash' to 'dash'
-                            "dashdot": "dashdot", 
-                            "dotted": "dot",
-                            "dot": "dot",
-                            "dotdash": "dashdot"
-                        }
-                        dash_style = dash_map.get(gridline_style, "solid")
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["griddash"] = dash_style
-                        layout_updates["yaxis"]["griddash"] = dash_style
-                
-                # Data labels (for bar/line traces)
-                show_data_labels = chart_meta.get("data_labels", True)
-                value_format = chart_meta.get("value_format", "")
-                
-                # Only enable data labels if explicitly set to True AND any data label settings are provided
-                if show_data_labels and (data_label_format or data_label_font_size or data_label_color):
-                    show_data_labels = True
-                elif not show_data_labels:
-                    # If data_labels is explicitly set to False, respect that setting
-                    show_data_labels = False
-                
-                # Debug logging for data labels
-                # current_app.logger.debug(f"Original data_labels setting: {chart_meta.get('data_labels')}")
-                # current_app.logger.debug(f"Final show_data_labels: {show_data_labels}")
-                # current_app.logger.debug(f"Data label format: {data_label_format}")
-                # current_app.logger.debug(f"Data label font size: {data_label_font_size}")
-                # current_app.logger.debug(f"Data label color: {data_label_color}")
-                # current_app.logger.debug(f"Value format: {value_format}")
-                # current_app.logger.debug(f"Chart config keys: {list(chart_config.keys())}")
-                # current_app.logger.debug(f"Chart meta keys: {list(chart_meta.keys())}")
-                
-                if show_data_labels and (data_label_format or value_format or data_label_font_size or data_label_color):
-                    # current_app.logger.debug(f"Processing {len(fig.data)} traces for data labels")
-                    for i, trace in enumerate(fig.data):
-                        # current_app.logger.debug(f"Trace {i}: type={trace.type}, mode={getattr(trace, 'mode', 'N/A')}")
-                        # Handle both bar and line charts (line charts are scatter with mode='lines')
-                        if trace.type in ['bar', 'scatter']:
-                            # Use value_format from chart_meta if available, otherwise use data_label_format
-                            format_to_use = value_format if value_format else data_label_format
-                            
-                            # Determine if this is a line chart (scatter with lines mode)
-                            is_line_chart = trace.type == 'scatter' and trace.mode and 'lines' in trace.mode
-                            
-                            if format_to_use:
-                                if trace.type == 'bar':
-                                    trace.update(texttemplate=f"%{{y:{format_to_use}}}", textposition="auto")
-                                elif trace.type == 'scatter':
-                                    if is_line_chart:
-                                        # For line charts, show labels at the data points
-                                        trace.update(texttemplate=f"%{{y:{format_to_use}}}", textposition="top center")
-                                    else:
-                                        # For scatter plots
-                                        trace.update(texttemplate=f"%{{y:{format_to_use}}}", textposition="top center")
-                            else:
-                                # If no format specified, still show data labels
-                                if trace.type == 'bar':
-                                    trace.update(texttemplate="%{y}", textposition="auto")
-                                elif trace.type == 'scatter':
-                                    if is_line_chart:
-                                        # For line charts, show labels at the data points
-                                        trace.update(texttemplate="%{y}", textposition="top center")
-                                    else:
-                                        # For scatter plots
-                                        trace.update(texttemplate="%{y}", textposition="top center")
-                            
-                            # Apply font styling
-                            if data_label_font_size or data_label_color:
-                                trace.update(textfont={})
-                                if data_label_font_size:
-                                    trace.textfont["size"] = data_label_font_size
-                                if data_label_color:
-                                    trace.textfont["color"] = data_label_color
-
-                # Annotations
-                if annotations:
-                    layout_updates["annotations"] = []
-                    for ann in annotations:
-                        ann_dict = {
-                            "text": ann.get("text", ""),
-                            "x": ann.get("x_value", ann.get("x")),
-                            "y": ann.get("y_value", ann.get("y")),
-                            "showarrow": True
-                        }
-                        layout_updates["annotations"].append(ann_dict)
-                
-                # --- Apply margin settings ---
-                if margin:
-                    layout_updates["margin"] = margin
-                
-                # Apply figure size if specified
-                if figsize:
-                    layout_updates["width"] = figsize[0] * 100  # Convert to pixels
-                    layout_updates["height"] = figsize[1] * 100  # Convert to pixels
-                    # current_app.logger.debug(f"Applied Plotly figsize: {figsize} -> width={figsize[0]*100}, height={figsize[1]*100}")
-                
-                # Apply axis label distances
-                if chart_type != "pie":
-                    if x_axis_label_distance == "auto" or y_axis_label_distance == "auto":
-                        # Calculate optimal label distances
-                        x_axis_label_distance, y_axis_label_distance = calculate_optimal_label_distance(
-                            chart_type, series_data, x_values, [], figsize, font_size
-                        )
-                    
-                    if x_axis_label_distance or y_axis_label_distance or axis_tick_distance:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        
-                        if x_axis_label_distance:
-                            layout_updates["xaxis"]["title"] = layout_updates["xaxis"].get("title", {})
-                            layout_updates["xaxis"]["title"]["standoff"] = x_axis_label_distance
-                            # Also apply to tick distance for better control
-                            layout_updates["xaxis"]["ticklen"] = x_axis_label_distance
-                        
-                        if y_axis_label_distance:
-                            layout_updates["yaxis"]["title"] = layout_updates["yaxis"].get("title", {})
-                            layout_updates["yaxis"]["title"]["standoff"] = y_axis_label_distance
-                        
-                        if axis_tick_distance:
-                            layout_updates["xaxis"]["ticklen"] = axis_tick_distance
-                            layout_updates["yaxis"]["ticklen"] = axis_tick_distance
-
-                # Tick mark control for Plotly
-                if show_x_ticks is not None or show_y_ticks is not None:
-                    layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                    layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                    if show_x_ticks is not None:
-                        layout_updates["xaxis"]["showticklabels"] = bool(show_x_ticks)
-                        layout_updates["xaxis"]["ticks"] = "" if not show_x_ticks else "outside"
-                    if show_y_ticks is not None:
-                        layout_updates["yaxis"]["showticklabels"] = bool(show_y_ticks)
-                        layout_updates["yaxis"]["ticks"] = "" if not show_y_ticks else "outside"
-
-                fig.update_layout(**layout_updates)
-
-                # --- Matplotlib static chart for DOCX ---
-                if chart_type == "pie":
-                    # Check if this is an expanded pie chart
-                    expanded_segment = chart_meta.get("expanded_segment")
-                    
-                    if expanded_segment and len(series_data) == 1:
-                        # Create subplot for expanded pie chart
-                        mpl_figsize = figsize if figsize else (15, 8)
-                        fig_mpl, (ax1, ax2) = plt.subplots(1, 2, figsize=mpl_figsize, dpi=200)
-                        
-                        # Apply background colors to Matplotlib figure
-                        if chart_background:
-                            fig_mpl.patch.set_facecolor(chart_background)
-                        if plot_background:
-                            ax1.set_facecolor(plot_background)
-                            ax2.set_facecolor(plot_background)
-                        
-                        series = series_data[0]
-                        labels = series.get("labels", x_values)
-                        values = series.get("values", [])
-                        color = series.get("marker", {}).get("colors") if "marker" in series else colors
-                        marker_line = series.get("marker", {}).get("line", {}) if "marker" in series else {}
-                        explode = series.get("pull")
-                        opacity = series.get("opacity", chart_meta.get("opacity"))
-                        textinfo = series.get("textinfo", chart_meta.get("textinfo", "percent"))
-                        textposition = series.get("textposition", chart_meta.get("textposition", "inside")).lower()
-                        value_format_str = chart_meta.get("value_format", ".1f")
-                        data_labels_enabled = bool(chart_meta.get("data_labels", True))
-                        data_label_font_size = chart_meta.get("data_label_font_size", font_size or 10)
-                        data_label_color = chart_meta.get("data_label_color", font_color or "#000000")
-                        start_angle = startangle if 'startangle' in locals() and startangle is not None else 90
-                        sort_order = chart_meta.get("sort_order")
-
-                        # Optional sorting
-                        if sort_order in ("ascending", "descending") and values:
-                            zipped = list(zip(values, labels, color if isinstance(color, list) else [color]*len(labels), explode if isinstance(explode, list) else [0]*len(labels)))
-                            reverse = sort_order == "descending"
-                            zipped.sort(key=lambda t: (t[0] if t[0] is not None else 0), reverse=reverse)
-                            values, labels, color_list, explode_list = zip(*zipped)
-                            values = list(values)
-                            labels = list(labels)
-                            color = list(color_list)
-                            explode = list(explode_list)
-
-                        # Build autopct based on textinfo/value_format
-                        def make_autopct(fmt:str, include_percent:bool, include_value:bool):
-                            # Capture the current values in the closure
-                            current_values = values.copy() if isinstance(values, list) else list(values) if values else []
-                            
-                            def _inner(pct):
-                                # Ensure values are numeric before calculating total
-                                numeric_values = []
-                                for v in current_values:
-                                    if v is not None:
-                                        try:
-                                            numeric_values.append(float(v))
-                                        except (ValueError, TypeError):
-                                            # Skip non-numeric values
-                                            continue
-                                
-                                total = sum(numeric_values) if numeric_values else 0
-                                val = pct * total / 100.0
-                                parts = []
-                                if include_value:
-                                    try:
-                                        parts.append(f"{val:{fmt}}")
-                                    except Exception:
-                                        parts.append(f"{val:.1f}")
-                                if include_percent:
-                                    parts.append(f"{pct:.1f}%")
-                                return " ".join(parts)
-                            return _inner
-
-                        include_label = "label" in (textinfo or "")
-                        include_percent = "percent" in (textinfo or "")
-                        include_value = "value" in (textinfo or "")
-
-                        autopct_callable = None
-                        if data_labels_enabled and (include_percent or include_value):
-                            autopct_callable = make_autopct(value_format_str, include_percent, include_value)
-
-                        # Wedge and text props
-                        wedgeprops = {}
-                        if isinstance(marker_line, dict):
-                            if marker_line.get("color"):
-                                wedgeprops["edgecolor"] = marker_line.get("color")
-                            if marker_line.get("width") is not None:
-                                wedgeprops["linewidth"] = marker_line.get("width")
-                        if opacity is not None:
-                            wedgeprops["alpha"] = opacity
-
-                        textprops = {"color": data_label_color, "fontsize": data_label_font_size}
-                        if chart_meta.get("font_family"):
-                            textprops["fontfamily"] = chart_meta.get("font_family")
-
-                        # Positioning
-                        pctdistance = 0.6 if textposition == "inside" else 1.15
-                        labeldistance = 1.1 if textposition != "inside" else 1.05
-                        
-                        # Create pie chart
-                        wedges, texts, autotexts = ax1.pie(
-                            values,
-                            labels=labels if include_label else None,
-                            autopct=autopct_callable,
-                            colors=color,
-                            startangle=start_angle,
-                            explode=explode,
-                            wedgeprops=wedgeprops,
-                            pctdistance=pctdistance,
-                            labeldistance=labeldistance,
-                            textprops=textprops,
-                        )
-
-                        # Style the autopct texts
-                        for autotext in autotexts or []:
-                            autotext.set_color(data_label_color)
-                            autotext.set_fontsize(data_label_font_size)
-                            autotext.set_fontweight('bold')
-                            if chart_meta.get("font_family"):
-                                autotext.set_fontfamily(chart_meta.get("font_family"))
-                        
-                        if title and title.strip():
-                            ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20, color=font_color if font_color else None, fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
-                        
-                        # Add legend for pie chart
-                        show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                        # Convert string "false"/"true" to boolean if needed
-                        if isinstance(show_legend_raw, str):
-                            show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                        else:
-                            show_legend = bool(show_legend_raw)
-                        if show_legend:
-                            # Initialize legend_loc for pie charts
-                            legend_loc = 'best'  # default
-                            if legend_position:
-                                loc_map = {
-                                    "top": "upper center",
-                                    "bottom": "lower center", 
-                                    "left": "center left",
-                                    "right": "center right"
-                                }
-                                legend_loc = loc_map.get(legend_position, 'best')
-                            
-                            # Force legend to bottom if specified
-                            if legend_position == "bottom":
-                                ax1.legend(wedges, labels, loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
-                            else:
-                                ax1.legend(wedges, labels, loc=legend_loc, fontsize=legend_font_size)
-                        
-                        # Create bar chart for expanded segment
-                        if expanded_segment in labels:
-                            segment_idx = labels.index(expanded_segment)
-                            segment_value = values[segment_idx]
-                            segment_color = color[segment_idx] if isinstance(color, list) and segment_idx < len(color) else color
-                            
-                            ax2.bar([expanded_segment], [segment_value], color=segment_color, alpha=0.7)
-                            ax2.set_title(f"{expanded_segment} Details", fontsize=font_size or 12, weight='bold')
-                            ax2.set_ylabel("Value")
-                            
-                            # Add value label on bar
-                            ax2.text(0, segment_value, f"{segment_value}", ha='center', va='bottom', fontweight='bold')
-                        
-                    else:
-                        # Regular pie chart
-                        mpl_figsize = figsize if figsize else (10, 8)
-                        fig_mpl, ax = plt.subplots(figsize=mpl_figsize, dpi=200)
-                        
-                        # Apply background colors to Matplotlib figure
-                        if chart_background:
-                            fig_mpl.patch.set_facecolor(chart_background)
-                        if plot_background:
-                            ax.set_facecolor(plot_background)
-                        
-                        if len(series_data) == 1:
-                            series = series_data[0]
-                            labels = series.get("labels", x_values)
-                            values = series.get("values", [])
-                            color = series.get("marker", {}).get("colors") if "marker" in series else colors
-                            marker_line = series.get("marker", {}).get("line", {}) if "marker" in series else {}
-                            explode = series.get("pull")
-                            opacity = series.get("opacity", chart_meta.get("opacity"))
-                            textinfo = series.get("textinfo", chart_meta.get("textinfo", "percent"))
-                            textposition = series.get("textposition", chart_meta.get("textposition", "inside")).lower()
-                            value_format_str = chart_meta.get("value_format", ".1f")
-                            data_labels_enabled = bool(chart_meta.get("data_labels", True))
-                            data_label_font_size = chart_meta.get("data_label_font_size", font_size or 10)
-                            data_label_color = chart_meta.get("data_label_color", font_color or "#000000")
-                            start_angle = startangle if 'startangle' in locals() and startangle is not None else 90
-                            sort_order = chart_meta.get("sort_order")
-
-                            # Optional sorting
-                            if sort_order in ("ascending", "descending") and values:
-                                zipped = list(zip(values, labels, color if isinstance(color, list) else [color]*len(labels), explode if isinstance(explode, list) else [0]*len(labels)))
-                                reverse = sort_order == "descending"
-                                zipped.sort(key=lambda t: (t[0] if t[0] is not None else 0), reverse=reverse)
-                                values, labels, color_list, explode_list = zip(*zipped)
-                                values = list(values)
-                                labels = list(labels)
-                                color = list(color_list)
-                                explode = list(explode_list)
-
-                            # Build autopct based on textinfo/value_format
-                            def make_autopct(fmt:str, include_percent:bool, include_value:bool):
-                                # Capture the current values in the closure
-                                current_values = values.copy() if isinstance(values, list) else list(values) if values else []
-                                
-                                def _inner(pct):
-                                    # Ensure values are numeric before calculating total
-                                    numeric_values = []
-                                    for v in current_values:
-                                        if v is not None:
-                                            try:
-                                                numeric_values.append(float(v))
-                                            except (ValueError, TypeError):
-                                                # Skip non-numeric values
-                                                continue
-                                    
-                                    total = sum(numeric_values) if numeric_values else 0
-                                    val = pct * total / 100.0
-                                    parts = []
-                                    if include_value:
-                                        try:
-                                            parts.append(f"{val:{fmt}}")
-                                        except Exception:
-                                            parts.append(f"{val:.1f}")
-                                    if include_percent:
-                                        parts.append(f"{pct:.1f}%")
-                                    return " ".join(parts)
-                                return _inner
-
-                            include_label = "label" in (textinfo or "")
-                            include_percent = "percent" in (textinfo or "")
-                            include_value = "value" in (textinfo or "")
-
-                            autopct_callable = None
-                            if data_labels_enabled and (include_percent or include_value):
-                                autopct_callable = make_autopct(value_format_str, include_percent, include_value)
-
-                            # Wedge and text props
-                            wedgeprops = {}
-                            if isinstance(marker_line, dict):
-                                if marker_line.get("color"):
-                                    wedgeprops["edgecolor"] = marker_line.get("color")
-                                if marker_line.get("width") is not None:
-                                    wedgeprops["linewidth"] = marker_line.get("width")
-                            if opacity is not None:
-                                wedgeprops["alpha"] = opacity
-
-                            textprops = {"color": data_label_color, "fontsize": data_label_font_size}
-                            if chart_meta.get("font_family"):
-                                textprops["fontfamily"] = chart_meta.get("font_family")
-
-                            # Positioning
-                            pctdistance = 0.6 if textposition == "inside" else 1.15
-                            labeldistance = 1.1 if textposition != "inside" else 1.05
-                            
-                            # Create pie chart
-                            wedges, texts, autotexts = ax.pie(
-                                values,
-                                labels=labels if include_label else None,
-                                autopct=autopct_callable,
-                                colors=color,
-                                startangle=start_angle,
-                                explode=explode,
-                                wedgeprops=wedgeprops,
-                                pctdistance=pctdistance,
-                                labeldistance=labeldistance,
-                                textprops=textprops,
-                            )
-                            
-                            # Style the text
-                            for autotext in autotexts or []:
-                                autotext.set_color(data_label_color)
-                                autotext.set_fontsize(data_label_font_size)
-                                autotext.set_fontweight('bold')
-                                if chart_meta.get("font_family"):
-                                    autotext.set_fontfamily(chart_meta.get("font_family"))
-                            
-                            if title and title.strip():
-                                ax.set_title(title, fontsize=font_size or 14, weight='bold', pad=20, color=font_color if font_color else None, fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
-                            
-                            # Add legend for regular pie chart
-                            show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                            # Convert string "false"/"true" to boolean if needed
-                            if isinstance(show_legend_raw, str):
-                                show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                            else:
-                                show_legend = bool(show_legend_raw)
-                            if show_legend:
-                                # Initialize legend_loc for pie charts
-                                legend_loc = 'best'  # default
-                                if legend_position:
-                                    loc_map = {
-                                        "top": "upper center",
-                                        "bottom": "lower center", 
-                                        "left": "center left",
-                                        "right": "center right"
-                                    }
-                                    legend_loc = loc_map.get(legend_position, 'best')
-                                
-                                # Force legend to bottom if specified
-                                if legend_position == "bottom":
-                                    ax.legend(wedges, labels, loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
-                                else:
-                                    ax.legend(wedges, labels, loc=legend_loc, fontsize=legend_font_size)
-                        
-                elif chart_type in ["bar of pie", "bar_of_pie"]:
-                    # Matplotlib version of bar of pie
-                    mpl_figsize = figsize if figsize else (10, 5)
-                    fig_mpl, (ax1, ax2) = plt.subplots(1, 2, figsize=mpl_figsize, dpi=200, gridspec_kw={'width_ratios': [2, 1]})
-                    
-                    # Apply background colors to Matplotlib figure
-                    if chart_background:
-                        fig_mpl.patch.set_facecolor(chart_background)
-                    if plot_background:
-                        ax1.set_facecolor(plot_background)
-                        ax2.set_facecolor(plot_background)
-                    labels = series_meta.get("labels", x_values)
-                    values = series_meta.get("values", [])
-                    colors = series_meta.get("colors", [])
-                    other_labels = chart_meta.get("other_labels", [])
-                    other_values = chart_meta.get("other_values", [])
-                    other_colors = chart_meta.get("other_colors", [])
-                    if not (other_labels and other_values):
-                        if "other_label_range" in chart_meta and "other_value_range" in chart_meta and "source_sheet" in chart_meta:
-                            wb = openpyxl.load_workbook(data_file_path, data_only=True)
-                            sheet = wb[chart_meta["source_sheet"]]
-                            other_labels = extract_excel_range(sheet, chart_meta["other_label_range"])
-                            other_values = extract_excel_range(sheet, chart_meta["other_value_range"])
-                    # Pie chart
-                    if colors:
-                        wedges, texts, autotexts = ax1.pie(values, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
-                    else:
-                        wedges, texts, autotexts = ax1.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
-                    for autotext in autotexts:
-                        autotext.set_color('white')
-                        autotext.set_fontweight('bold')
-                    if title and title.strip():
-                        ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20)
-                    # Move legend outside
-                    show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                    # Convert string "false"/"true" to boolean if needed
-                    if isinstance(show_legend_raw, str):
-                        show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                    else:
-                        show_legend = bool(show_legend_raw)
-                    legend_font_size = chart_meta.get("legend_font_size", 8)
-                    if show_legend:
-                        ax1.legend(wedges, labels, loc='center left', bbox_to_anchor=(1, 0.5), fontsize=legend_font_size)
-                    
-                    # Bar chart - Filter out empty/null values first
-                    filtered_data = []
-                    for label, value in zip(other_labels, other_values):
-                        if (label is not None and str(label).strip() != "" and 
-                            value is not None and str(value).strip() != "" and 
-                            str(value).strip() != "0"):
-                            filtered_data.append((label, value))
-                    
-                    if filtered_data:
-                        filtered_labels, filtered_values = zip(*filtered_data)
-                    else:
-                        filtered_labels, filtered_values = [], []
-                    
-                    # Create individual bars (not stacked)
-                    if filtered_labels and filtered_values:
-                        # Use individual colors for each bar
-                        bar_colors = []
-                        for i in range(len(filtered_labels)):
-                            if other_colors and i < len(other_colors):
-                                bar_colors.append(other_colors[i])
-                            elif colors and i < len(colors):
-                                bar_colors.append(colors[i])
-                            else:
-                                bar_colors.append('#1f77b4')  # Default blue
-                        
-                        bars = ax2.bar(range(len(filtered_labels)), filtered_values, color=bar_colors, alpha=0.7)
-                    else:
-                        bars = []
-                    
-                    expanded_segment = chart_meta.get("expanded_segment", "Other")
-                    ax2.set_title(f"Breakdown of '{expanded_segment}'", fontsize=font_size or 12, weight='bold')
-                    # Use proper Y-axis label from configuration
-                    y_axis_title = chart_meta.get("y_axis_title", "Value")
-                    ax2.set_ylabel(y_axis_title, fontsize=label_fontsize if 'label_fontsize' in locals() else 10)
-                    # Set X-axis label
-                    x_axis_title = chart_meta.get("x_axis_title", "Categories")
-                    ax2.set_xlabel(x_axis_title, fontsize=label_fontsize if 'label_fontsize' in locals() else 10)
-                    # Set x-tick labels for filtered data
-                    if filtered_labels:
-                        ax2.set_xticks(range(len(filtered_labels)))
-                        # Format x-axis labels as percentages
-                        formatted_x_labels = []
-                        for label in filtered_labels:
-                            if label is not None:
-                                if isinstance(label, (int, float)):
-                                    if label <= 1.0:  # Likely decimal format (0.06)
-                                        formatted_x_labels.append(f"{label * 100:.1f}%")
-                                    else:  # Likely already percentage format (6.0)
-                                        formatted_x_labels.append(f"{label:.1f}%")
-                                else:
-                                    # Convert string to float and handle
-                                    try:
-                                        val = float(label)
-                                        if val <= 1.0:
-                                            formatted_x_labels.append(f"{val * 100:.1f}%")
-                                        else:
-                                            formatted_x_labels.append(f"{val:.1f}%")
-                                    except (ValueError, TypeError):
-                                        formatted_x_labels.append(str(label))
-                            else:
-                                formatted_x_labels.append("")
-                        ax2.set_xticklabels(formatted_x_labels, rotation=0, fontsize=axis_tick_font_size or 10)
-                    # Add data labels with proper formatting
-                    value_format = chart_meta.get("value_format", ".2f")
-                    data_label_font_size = chart_meta.get("data_label_font_size", 10)
-                    data_label_color = chart_meta.get("data_label_color", "#000000")
-                    for bar, v in zip(bars, filtered_values):
-                        # Format percentage values as XX.X% instead of 0.XXX
-                        if v is not None:
-                            if isinstance(v, (int, float)):
-                                if v <= 1.0:  # Likely decimal format (0.11)
-                                    formatted_value = f"{v * 100:.1f}%"
-                                else:  # Likely already percentage format (11.0)
-                                    formatted_value = f"{v:.1f}%"
-                            else:
-                                    # Convert string to float and handle
-                                try:
-                                    val = float(v)
-                                    if val <= 1.0:
-                                        formatted_value = f"{val * 100:.1f}%"
-                                    else:
-                                        formatted_value = f"{val:.1f}%"
-                                except:
-                                    formatted_value = str(v)
-                            ax2.text(bar.get_x() + bar.get_width()/2, v, formatted_value, ha='center', va='bottom', fontweight='bold', fontsize=data_label_font_size, color=data_label_color)
-
-                else:
-                    # Bar, line, area charts
-                    mpl_figsize = figsize if figsize else (10, 6)
-                    # current_app.logger.debug(f"Applied Matplotlib figsize: {mpl_figsize}")
-                    fig_mpl, ax1 = plt.subplots(figsize=mpl_figsize, dpi=200)
-                    
-                    # Disable gridlines globally if show_gridlines is False
-                    if not show_gridlines:
-                        plt.rcParams['axes.grid'] = False
-                    
-                    # Only create secondary y-axis if not disabled
-                    ax2 = None
-                    if not disable_secondary_y:
-                        ax2 = ax1.twinx()
-                    
-                    # Apply background colors to Matplotlib figure
-                    if chart_background:
-                        fig_mpl.patch.set_facecolor(chart_background)
-                    if plot_background:
-                        ax1.set_facecolor(plot_background)
-                        if ax2:
-                            ax2.set_facecolor(plot_background)
-
-                    # Define colors array for matplotlib section
-                    colors = series_meta.get("colors", [])
-
-                    for i, series in enumerate(series_data):
-                        label = series.get("name", f"Series {i+1}")
-                        series_type = series.get("type", "bar").lower()
-                        
-                        # Map heatmap to imshow for Matplotlib
-                        if series_type == "heatmap":
-                            mpl_chart_type = "imshow"
-                        else:
-                            mpl_chart_type = chart_type_mapping_mpl.get(series_type, "scatter")
-                        
-                        color = None
-                        if "marker" in series and isinstance(series["marker"], dict) and "color" in series["marker"]:
-                            color = series["marker"]["color"]
-                        elif bar_colors:
-                            color = bar_colors
-                        elif i < len(colors) and colors[i] is not None:
-                            color = colors[i]
-
-                        y_vals = series.get("values")
-                        value_range = series.get("value_range")
-                        if value_range:
-                            # Check if value_range is already extracted (list) or still a string
-                            if isinstance(value_range, list):
-                                y_vals = value_range
-                            else:
-                                y_vals = extract_values_from_range(value_range)
-
-                        # --- Apply grouping and sorting ---
-                        x_vals = x_values
-                        if y_vals is not None and x_vals is not None:
-                            x_vals, y_vals = group_and_sort(x_vals, y_vals, data_grouping, sort_order)
-
-                        trace_kwargs = {
-                            "x": x_vals,
-                            "y": y_vals,
-                            "name": label,
-                        }
-                        
-                        # Handle colors
-                        if color:
-                            if isinstance(color, list) and series_type == "bar":
-                                trace_kwargs["marker"] = dict(color=color)
-                            elif isinstance(color, str):
-                                trace_kwargs["marker_color"] = color
-                        
-                        # Handle bar-specific properties
-                        if bar_width and series_type == "bar":
-                            trace_kwargs["width"] = bar_width
-                        if orientation and series_type == "bar":
-                            trace_kwargs["orientation"] = orientation[0].lower() if isinstance(orientation, str) else orientation
-                        if bar_border_color and series_type == "bar":
-                            trace_kwargs["marker_line_color"] = bar_border_color
-                        if bar_border_width and series_type == "bar":
-                            trace_kwargs["marker_line_width"] = bar_border_width
-                        
-                        # Handle line-specific properties
-                        if line_width and series_type in ["line", "scatter", "scatter_line"]:
-                            trace_kwargs["line_width"] = line_width
-                        if marker_size and series_type in ["line", "scatter", "scatter_line"]:
-                            trace_kwargs["marker_size"] = marker_size
-                        if line_style and series_type in ["line", "scatter", "scatter_line"]:
-                            # Map line styles to Plotly format
-                            line_style_map = {
-                                "solid": "solid",
-                                "dashed": "dash",
-                                "dotted": "dot",
-                                "dashdot": "dashdot"
-                            }
-                            trace_kwargs["line_dash"] = line_style_map.get(line_style, "solid")
-                        
-                        # Handle opacity
-                        if fill_opacity:
-                            trace_kwargs["opacity"] = fill_opacity
-
-                        # Add traces based on chart type - REPLACE THE RESTRICTIVE IF/ELIF BLOCKS
-                        # Generic chart type handling for Plotly
-                        chart_type_mapping = {
-                            # Bar charts
-                            "bar": go.Bar,
-                            "column": go.Bar,
-                            "stacked_column": go.Bar,
-                            "horizontal_bar": go.Bar,
-                            
-                            # Line charts
-                            "line": go.Scatter,
-                            "scatter": go.Scatter,
-                            "scatter_line": go.Scatter,
-                            
-                            # Area charts
-                            "area": go.Scatter,
-                            "filled_area": go.Scatter,
-                            
-                            # Pie charts
-                            "pie": go.Pie,
-                            "donut": go.Pie,
-                            
-                            # 3D charts
-                            "scatter3d": go.Scatter3d,
-                            "surface": go.Surface,
-                            "mesh3d": go.Mesh3d,
-                            
-                            # Statistical charts
-                            "histogram": go.Histogram,
-                            "box": go.Box,
-                            "violin": go.Violin,
-                            
-                            # Financial charts
-                            "candlestick": go.Candlestick,
-                            "ohlc": go.Ohlc,
-                            
-                            # Geographic charts
-                            "scattergeo": go.Scattergeo,
-                            "choropleth": go.Choropleth,
-                            
-                            # Other charts
-                            "bubble": go.Scatter,
-                            "heatmap": go.Heatmap,
-                            "contour": go.Contour,
-                            "waterfall": go.Waterfall,
-                            "funnel": go.Funnel,
-                            "sunburst": go.Sunburst,
-                            "icicle": go.Icicle,
-                            "sankey": go.Sankey,
-                            "treemap": go.Treemap,
-                            "table": go.Table,
-                            "indicator": go.Indicator
-                        }
-                        
-                        # Get the appropriate Plotly chart class
-                        plotly_chart_class = chart_type_mapping.get(series_type)
-                        
-                        if plotly_chart_class:
-                            # Prepare trace arguments based on chart type
-                            if series_type in ["bar", "column", "stacked_column", "horizontal_bar"]:
-                                # Bar chart specific settings
-                                # REMOVE: if chart_type == "stacked_column": trace_kwargs["barmode"] = "stack"
-                                if orientation and orientation.lower() == "horizontal":
-                                    trace_kwargs["orientation"] = "h"
-                                    # Swap x and y for horizontal bars
-                                    trace_kwargs["x"], trace_kwargs["y"] = trace_kwargs["y"], trace_kwargs["x"]
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["line", "scatter", "scatter_line"]:
-                                # Line/Scatter chart specific settings
-                                mode = "lines+markers" if series_type == "scatter_line" else "markers" if series_type == "scatter" else "lines"
-                                trace_kwargs["mode"] = mode
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["area", "filled_area"]:
-                                # Area chart specific settings
-                                trace_kwargs["mode"] = "lines"
-                                trace_kwargs["fill"] = "tozeroy"
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                                ))
-                                
-                            elif series_type == "pie":
-                                # Pie chart specific settings
-                                pie_kwargs = {
-                                    "labels": x_vals,
-                                    "values": y_vals,
-                                    "name": label,
-                                    "textinfo": "label" if data_labels and not chart_meta.get("hide_center_box", False) else "none",
-                                    "textposition": "outside",
-                                    "hole": hole if hole is not None else (0.4 if series_type == "donut" else 0.0)
-                                }
-                                
-                                # Add pie chart specific attributes
-                                if startangle is not None:
-                                    pie_kwargs["rotation"] = startangle
-                                if pull is not None:
-                                    # pull can be a single value or a list
-                                    if isinstance(pull, (int, float)):
-                                        pie_kwargs["pull"] = [pull] * len(y_vals)
-                                    elif isinstance(pull, list):
-                                        pie_kwargs["pull"] = pull
-                                
-                                if color:
-                                    pie_kwargs["marker"] = dict(colors=color) if isinstance(color, list) else dict(colors=[color])
-                                
-                                fig.add_trace(plotly_chart_class(**pie_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>%{{label}}: %{{value}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["scatter3d", "surface", "mesh3d"]:
-                                # 3D chart specific settings
-                                if "z" not in trace_kwargs and len(y_vals) > 0:
-                                    # Create a simple z-axis if not provided
-                                    trace_kwargs["z"] = [i for i in range(len(y_vals))]
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>X: %{{x}}<br>Y: %{{y}}<br>Z: %{{z}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["histogram", "box", "violin"]:
-                                # Statistical chart specific settings
-                                if series_type == "histogram":
-                                    trace_kwargs["x"] = y_vals  # Histogram uses x for values
-                                    del trace_kwargs["y"]
-                                elif series_type in ["box", "violin"]:
-                                    trace_kwargs["y"] = y_vals
-                                    trace_kwargs["x"] = [label] * len(y_vals) if len(y_vals) > 0 else [label]
-                                
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Value: %{{y if series_type in ['box', 'violin'] else 'x'}}<extra></extra>"
-                                ))
-                                
-                            elif series_type in ["bubble"]:
-                                # Bubble chart specific settings
-                                sizes = series.get("size", [20] * len(y_vals))
-                                trace_kwargs["mode"] = "markers"
-                                trace_kwargs["marker"] = {"size": sizes}
-                                if color:
-                                    trace_kwargs["marker"]["color"] = color
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>X: %{{x}}<br>Y: %{{y}}<br>Size: %{{marker.size}}<extra></extra>"
-                                ))
-                                
-                            elif series_type == "heatmap":
-                                # Heatmap specific settings
-                                heatmap_kwargs = {
-                                    "z": series.get("z", y_vals),  # Use z data if provided, otherwise y_vals
-                                    "x": series.get("x", x_vals),  # Use x data if provided, otherwise x_vals
-                                    "y": series.get("y", [label]),  # Use y data if provided, otherwise label
-                                    "name": label,
-                                    "colorscale": series.get("colorscale", "Viridis"),
-                                    "showscale": series.get("showscale", True)
-                                }
-                                
-                                # Handle text data safely (convert to strings to avoid concatenation errors)
-                                if "text" in series:
-                                    try:
-                                        heatmap_kwargs["text"] = [[str(cell) for cell in row] for row in series["text"]]
-                                    except:
-                                        pass  # Suppress warning logs: f"⚠️ Could not process heatmap text data for {label}")
-                                
-                                # Handle colorbar settings
-                                if "colorbar" in series:
-                                    heatmap_kwargs["colorbar"] = series["colorbar"]
-                                
-                                # Handle zmin/zmax
-                                if "zmin" in series:
-                                    heatmap_kwargs["zmin"] = series["zmin"]
-                                if "zmax" in series:
-                                    heatmap_kwargs["zmax"] = series["zmax"]
-                                
-                                fig.add_trace(go.Heatmap(**heatmap_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>X: %{{x}}<br>Y: %{{y}}<br>Value: %{{z}}<extra></extra>"
-                                ))
-                                
-                            elif series_type == "treemap":
-                                # Get data label settings from JSON configuration
-                                data_labels = chart_meta.get("data_labels", True)
-                                data_label_font_size = chart_meta.get("data_label_font_size", 12)
-                                data_label_color = chart_meta.get("data_label_color", "#000000")
-                                fill_opacity = chart_meta.get("fill_opacity", 0.8)
-                                
-                                # Treemap specific settings
-                                hide_center_box = chart_meta.get("hide_center_box", False)
-                                current_app.logger.debug(f"🔍 Treemap (multi-series): hide_center_box parameter: {hide_center_box}")
-                                current_app.logger.debug(f"🔍 Treemap (multi-series): chart_meta: {chart_meta}")
-                                # Determine textinfo based on data_labels setting (independent of center box)
-                                textinfo_setting = "label" if data_labels else "none"
-                                
-                                treemap_kwargs = {
-                                    "labels": x_vals,
-                                    "values": y_vals,
-                                    "name": label,
-                                    "textinfo": textinfo_setting,
-                                    "textposition": "middle center",
-                                    "branchvalues": "total",
-                                    "pathbar": dict(visible=not hide_center_box),  # Hide center box if hide_center_box is True
-                                    "texttemplate": None,
-                                    "hoverinfo": "label+value"
-                                }
-                                
-                                # Add text font configuration from JSON
-                                if data_labels:
-                                    treemap_kwargs["textfont"] = {
-                                        "family": font_family,
-                                        "size": data_label_font_size,
-                                        "color": data_label_color
-                                    }
-                                
-                                # Add treemap specific attributes
-                                if color:
-                                    treemap_kwargs["marker"] = dict(colors=color, opacity=fill_opacity) if isinstance(color, list) else dict(colors=[color], opacity=fill_opacity)
-                                
-                                # Debug logging for final treemap configuration
-                                current_app.logger.debug(f"🔍 Treemap (multi-series): Final treemap_kwargs: {treemap_kwargs}")
-                                
-                                fig.add_trace(go.Treemap(**treemap_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>%{{label}}: %{{value}}<extra></extra>"
-                                ))
-                                
-                            else:
-                                # Generic handling for other chart types
-                                fig.add_trace(plotly_chart_class(**trace_kwargs,
-                                    hovertemplate=f"<b>{label}</b><br>Value: %{{y}}<extra></extra>"
-                                ))
-                        else:
-                            # Fallback to scatter if chart type not recognized
-                            #pass  # Suppress warning logs: f"⚠️ Unknown chart type '{series_type}', falling back to scatter")
-                            fig.add_trace(go.Scatter(**trace_kwargs,
-                                mode='markers',
-                                hovertemplate=f"<b>{label}</b><br>Category: %{{x}}<br>Value: %{{y}}<extra></extra>"
-                            ))
-
-                # --- Process heatmap charts separately ---
-                # Heatmaps need special handling because they have x, y, z, text data directly
-                for i, series in enumerate(series_data):
-                    label = series.get("name", f"Series {i+1}")
-                    series_type = series.get("type", "bar").lower()
-                    
-                    if series_type == "heatmap":
-                        # Heatmap specific settings
-                        heatmap_kwargs = {
-                            "z": series.get("z", []),  # Use z data directly
-                            "x": series.get("x", []),  # Use x data directly
-                            "y": series.get("y", []),  # Use y data directly
-                            "name": label,
-                            "colorscale": series.get("colorscale", "Viridis"),
-                            "showscale": series.get("showscale", True)
-                        }
-                        
-                        # Handle text data safely (convert to strings to avoid concatenation errors)
-                        if "text" in series:
-                            try:
-                                heatmap_kwargs["text"] = [[str(cell) for cell in row] for row in series["text"]]
-                            except:
-                                pass  # Suppress warning logs: f"⚠️ Could not process heatmap text data for {label}")
-                        
-                        # Handle colorbar settings
-                        if "colorbar" in series:
-                            heatmap_kwargs["colorbar"] = series["colorbar"]
-                        
-                        # Handle zmin/zmax
-                        if "zmin" in series:
-                            heatmap_kwargs["zmin"] = series["zmin"]
-                        if "zmax" in series:
-                            heatmap_kwargs["zmax"] = series["zmax"]
-                        
-                        fig.add_trace(go.Heatmap(**heatmap_kwargs,
-                            hovertemplate=f"<b>{label}</b><br>X: %{{x}}<br>Y: %{{y}}<br>Value: %{{z}}<extra></extra>"
-                        ))
-
-                # --- Layout updates ---
-                layout_updates = {}
-                
-                # Title and axis labels
-                layout_updates["title"] = title
-                
-                # Handle axis labels based on chart type
-                if chart_type != "pie":
-                    layout_updates["xaxis_title"] = chart_meta.get("x_label", chart_config.get("x_axis_title", "X"))
-                    layout_updates["yaxis_title"] = chart_meta.get("primary_y_label", chart_config.get("primary_y_label", "Y"))
-                
-                # Font
-                if font_family or font_size or font_color:
-                    layout_updates["font"] = {}
-                    if font_family:
-                        layout_updates["font"]["family"] = font_family
-                    if font_size:
-                        layout_updates["font"]["size"] = font_size
-                    if font_color:
-                        layout_updates["font"]["color"] = font_color
-                
-                # Backgrounds
-                if chart_background:
-                    layout_updates["paper_bgcolor"] = chart_background
-                if plot_background:
-                    layout_updates["plot_bgcolor"] = plot_background
-                
-                # Legend configuration
-                show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                # Convert string "false"/"true" to boolean if needed
-                if isinstance(show_legend_raw, str):
-                    show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                else:
-                    show_legend = bool(show_legend_raw)
-                # current_app.logger.debug(f"Legend setting: {chart_meta.get('legend')}")
-                # current_app.logger.debug(f"Showlegend setting: {chart_meta.get('showlegend')}")
-                # current_app.logger.debug(f"Final show_legend: {show_legend}")
-                
-                if show_legend:
-                    # current_app.logger.debug("Configuring legend for Plotly")
-                    if legend_position:
-                        # Map 'top', 'bottom', 'left', 'right' to valid Plotly legend positions
-                        pos_map = {
-                            "top":    dict(x=0.5, y=1.1, xanchor="center", yanchor="top"),
-                            "bottom": dict(x=0.5, y=-0.2, xanchor="center", yanchor="bottom"),
-                            "left":   dict(x=-0.2, y=0.5, xanchor="left", yanchor="middle"),
-                            "right":  dict(x=1.1, y=0.5, xanchor="right", yanchor="middle"),
-                        }
-                        if legend_position in pos_map:
-                            layout_updates["legend"] = pos_map[legend_position]
-                            # current_app.logger.debug(f"Set legend position: {legend_position}")
-                    if legend_font_size:
-                        layout_updates.setdefault("legend", {})["font"] = {"size": legend_font_size}
-                        # current_app.logger.debug(f"Set legend font size: {legend_font_size}")
-                else:
-                    layout_updates["showlegend"] = False
-                    # current_app.logger.debug("Legend disabled for Plotly")
-                
-                # Bar mode for stacked charts
-                if barmode:
-                    layout_updates["barmode"] = barmode
-                elif chart_type == "stacked_column":
-                    layout_updates["barmode"] = "stack"
-                
-                # Axis min/max and tick format (only for non-pie charts)
-                if chart_type != "pie":
-                    if y_axis_min_max:
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        # Handle "auto" value for y-axis min/max
-                        if y_axis_min_max == "auto":
-                            # Don't set range for auto - let Plotly auto-scale
-                            pass
-                        else:
-                            layout_updates["yaxis"]["range"] = y_axis_min_max
-                            # Also set autorange to false to ensure the range is respected
-                            layout_updates["yaxis"]["autorange"] = False
-                            # Force the range to be applied
-                            layout_updates["yaxis"]["fixedrange"] = False
-                            # Ensure the range is properly set
-                            # current_app.logger.debug(f"Setting Y-axis range to: {y_axis_min_max}")
-                    if axis_tick_format:
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["yaxis"]["tickformat"] = axis_tick_format
-                        # Also apply to secondary y-axis if it's a currency format
-                        if "$" in axis_tick_format:
-                            layout_updates["yaxis2"] = layout_updates.get("yaxis2", {})
-                            layout_updates["yaxis2"]["tickformat"] = axis_tick_format
-                    
-                    # Secondary y-axis formatting
-                    if secondary_y_axis_format:
-                        layout_updates["yaxis2"] = layout_updates.get("yaxis2", {})
-                        layout_updates["yaxis2"]["tickformat"] = secondary_y_axis_format
-                    if secondary_y_axis_min_max:
-                        layout_updates["yaxis2"] = layout_updates.get("yaxis2", {})
-                        # Handle "auto" value for secondary y-axis min/max
-                        if secondary_y_axis_min_max == "auto":
-                            # Don't set range for auto - let Matplotlib auto-scale
-                            pass
-                        elif isinstance(secondary_y_axis_min_max, list) and len(secondary_y_axis_min_max) == 2:
-                            layout_updates["yaxis2"]["range"] = secondary_y_axis_min_max
-                        else:
-                            pass  # Suppress warning logs: f"Invalid secondary_y_axis_min_max format: {secondary_y_axis_min_max}")
-                    
-                    # Axis tick font size
-                    if axis_tick_font_size:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["tickfont"] = {"size": axis_tick_font_size}
-                        layout_updates["yaxis"]["tickfont"] = {"size": axis_tick_font_size}
-                    # Gridlines
-                    if show_gridlines is not None:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["showgrid"] = bool(show_gridlines)
-                        layout_updates["yaxis"]["showgrid"] = bool(show_gridlines)
-                    if gridline_color:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["gridcolor"] = gridline_color
-                        layout_updates["yaxis"]["gridcolor"] = gridline_color
-                    if gridline_style:
-                        # Map gridline styles to valid Plotly dash styles
-                        dash_map = {
-                            "solid": "solid", 
-                            "dashed": "dash",
-                            "dash": "dash",  # Map 'dash' to 'dash'
-                            "dashdot": "dashdot", 
-                            "dotted": "dot",
-                            "dot": "dot",
-                            "dotdash": "dashdot"
-                        }
-                        dash_style = dash_map.get(gridline_style, "solid")
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        layout_updates["xaxis"]["griddash"] = dash_style
-                        layout_updates["yaxis"]["griddash"] = dash_style
-                
-                # Data labels (for bar/line traces)
-                show_data_labels = chart_meta.get("data_labels", True)
-                value_format = chart_meta.get("value_format", "")
-                
-                # Only enable data labels if explicitly set to True AND any data label settings are provided
-                if show_data_labels and (data_label_format or data_label_font_size or data_label_color):
-                    show_data_labels = True
-                elif not show_data_labels:
-                    # If data_labels is explicitly set to False, respect that setting
-                    show_data_labels = False
-                
-                # Debug logging for data labels
-                # current_app.logger.debug(f"Original data_labels setting: {chart_meta.get('data_labels')}")
-                # current_app.logger.debug(f"Final show_data_labels: {show_data_labels}")
-                # current_app.logger.debug(f"Data label format: {data_label_format}")
-                # current_app.logger.debug(f"Data label font size: {data_label_font_size}")
-                # current_app.logger.debug(f"Data label color: {data_label_color}")
-                # current_app.logger.debug(f"Value format: {value_format}")
-                # current_app.logger.debug(f"Chart config keys: {list(chart_config.keys())}")
-                # current_app.logger.debug(f"Chart meta keys: {list(chart_meta.keys())}")
-                
-                if show_data_labels and (data_label_format or value_format or data_label_font_size or data_label_color):
-                    # current_app.logger.debug(f"Processing {len(fig.data)} traces for data labels")
-                    for i, trace in enumerate(fig.data):
-                        # current_app.logger.debug(f"Trace {i}: type={trace.type}, mode={getattr(trace, 'mode', 'N/A')}")
-                        # Handle both bar and line charts (line charts are scatter with mode='lines')
-                        if trace.type in ['bar', 'scatter']:
-                            # Use value_format from chart_meta if available, otherwise use data_label_format
-                            format_to_use = value_format if value_format else data_label_format
-                            
-                            # Determine if this is a line chart (scatter with lines mode)
-                            is_line_chart = trace.type == 'scatter' and trace.mode and 'lines' in trace.mode
-                            
-                            if format_to_use:
-                                if trace.type == 'bar':
-                                    trace.update(texttemplate=f"%{{y:{format_to_use}}}", textposition="auto")
-                                elif trace.type == 'scatter':
-                                    if is_line_chart:
-                                        # For line charts, show labels at the data points
-                                        trace.update(texttemplate=f"%{{y:{format_to_use}}}", textposition="top center")
-                                    else:
-                                        # For scatter plots
-                                        trace.update(texttemplate=f"%{{y:{format_to_use}}}", textposition="top center")
-                            else:
-                                # If no format specified, still show data labels
-                                if trace.type == 'bar':
-                                    trace.update(texttemplate="%{y}", textposition="auto")
-                                elif trace.type == 'scatter':
-                                    if is_line_chart:
-                                        # For line charts, show labels at the data points
-                                        trace.update(texttemplate="%{y}", textposition="top center")
-                                    else:
-                                        # For scatter plots
-                                        trace.update(texttemplate="%{y}", textposition="top center")
-                            
-                            # Apply font styling
-                            if data_label_font_size or data_label_color:
-                                trace.update(textfont={})
-                                if data_label_font_size:
-                                    trace.textfont["size"] = data_label_font_size
-                                if data_label_color:
-                                    trace.textfont["color"] = data_label_color
-
-                # Annotations
-                if annotations:
-                    layout_updates["annotations"] = []
-                    for ann in annotations:
-                        ann_dict = {
-                            "text": ann.get("text", ""),
-                            "x": ann.get("x_value", ann.get("x")),
-                            "y": ann.get("y_value", ann.get("y")),
-                            "showarrow": True
-                        }
-                        layout_updates["annotations"].append(ann_dict)
-                
-                # --- Apply margin settings ---
-                if margin:
-                    layout_updates["margin"] = margin
-                
-                # Apply figure size if specified
-                if figsize:
-                    layout_updates["width"] = figsize[0] * 100  # Convert to pixels
-                    layout_updates["height"] = figsize[1] * 100  # Convert to pixels
-                    # current_app.logger.debug(f"Applied Plotly figsize: {figsize} -> width={figsize[0]*100}, height={figsize[1]*100}")
-                
-                # Apply axis label distances
-                if chart_type != "pie":
-                    if x_axis_label_distance == "auto" or y_axis_label_distance == "auto":
-                        # Calculate optimal label distances
-                        x_axis_label_distance, y_axis_label_distance = calculate_optimal_label_distance(
-                            chart_type, series_data, x_values, [], figsize, font_size
-                        )
-                    
-                    if x_axis_label_distance or y_axis_label_distance or axis_tick_distance:
-                        layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                        layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                        
-                        if x_axis_label_distance:
-                            layout_updates["xaxis"]["title"] = layout_updates["xaxis"].get("title", {})
-                            layout_updates["xaxis"]["title"]["standoff"] = x_axis_label_distance
-                            # Also apply to tick distance for better control
-                            layout_updates["xaxis"]["ticklen"] = x_axis_label_distance
-                        
-                        if y_axis_label_distance:
-                            layout_updates["yaxis"]["title"] = layout_updates["yaxis"].get("title", {})
-                            layout_updates["yaxis"]["title"]["standoff"] = y_axis_label_distance
-                        
-                        if axis_tick_distance:
-                            layout_updates["xaxis"]["ticklen"] = axis_tick_distance
-                            layout_updates["yaxis"]["ticklen"] = axis_tick_distance
-
-                # Tick mark control for Plotly
-                if show_x_ticks is not None or show_y_ticks is not None:
-                    layout_updates["xaxis"] = layout_updates.get("xaxis", {})
-                    layout_updates["yaxis"] = layout_updates.get("yaxis", {})
-                    if show_x_ticks is not None:
-                        layout_updates["xaxis"]["showticklabels"] = bool(show_x_ticks)
-                        layout_updates["xaxis"]["ticks"] = "" if not show_x_ticks else "outside"
-                    if show_y_ticks is not None:
-                        layout_updates["yaxis"]["showticklabels"] = bool(show_y_ticks)
-                        layout_updates["yaxis"]["ticks"] = "" if not show_y_ticks else "outside"
-
-                fig.update_layout(**layout_updates)
-
-                # --- Matplotlib static chart for DOCX ---
-                if chart_type == "pie":
-                    # Check if this is an expanded pie chart
-                    expanded_segment = chart_meta.get("expanded_segment")
-                    
-                    if expanded_segment and len(series_data) == 1:
-                        # Create subplot for expanded pie chart
-                        mpl_figsize = figsize if figsize else (15, 8)
-                        fig_mpl, (ax1, ax2) = plt.subplots(1, 2, figsize=mpl_figsize, dpi=200)
-                        
-                        # Apply background colors to Matplotlib figure
-                        if chart_background:
-                            fig_mpl.patch.set_facecolor(chart_background)
-                        if plot_background:
-                            ax1.set_facecolor(plot_background)
-                            ax2.set_facecolor(plot_background)
-                        
-                        series = series_data[0]
-                        labels = series.get("labels", x_values)
-                        values = series.get("values", [])
-                        color = series.get("marker", {}).get("colors") if "marker" in series else colors
-                        marker_line = series.get("marker", {}).get("line", {}) if "marker" in series else {}
-                        explode = series.get("pull")
-                        opacity = series.get("opacity", chart_meta.get("opacity"))
-                        textinfo = series.get("textinfo", chart_meta.get("textinfo", "percent"))
-                        textposition = series.get("textposition", chart_meta.get("textposition", "inside")).lower()
-                        value_format_str = chart_meta.get("value_format", ".1f")
-                        data_labels_enabled = bool(chart_meta.get("data_labels", True))
-                        data_label_font_size = chart_meta.get("data_label_font_size", font_size or 10)
-                        data_label_color = chart_meta.get("data_label_color", font_color or "#000000")
-                        start_angle = startangle if 'startangle' in locals() and startangle is not None else 90
-                        sort_order = chart_meta.get("sort_order")
-
-                        # Optional sorting
-                        if sort_order in ("ascending", "descending") and values:
-                            zipped = list(zip(values, labels, color if isinstance(color, list) else [color]*len(labels), explode if isinstance(explode, list) else [0]*len(labels)))
-                            reverse = sort_order == "descending"
-                            zipped.sort(key=lambda t: (t[0] if t[0] is not None else 0), reverse=reverse)
-                            values, labels, color_list, explode_list = zip(*zipped)
-                            values = list(values)
-                            labels = list(labels)
-                            color = list(color_list)
-                            explode = list(explode_list)
-
-                        # Build autopct based on textinfo/value_format
-                        def make_autopct(fmt:str, include_percent:bool, include_value:bool):
-                            # Capture the current values in the closure
-                            current_values = values.copy() if isinstance(values, list) else list(values) if values else []
-                            
-                            def _inner(pct):
-                                # Ensure values are numeric before calculating total
-                                numeric_values = []
-                                for v in current_values:
-                                    if v is not None:
-                                        try:
-                                            numeric_values.append(float(v))
-                                        except (ValueError, TypeError):
-                                            # Skip non-numeric values
-                                            continue
-                                
-                                total = sum(numeric_values) if numeric_values else 0
-                                val = pct * total / 100.0
-                                parts = []
-                                if include_value:
-                                    try:
-                                        parts.append(f"{val:{fmt}}")
-                                    except Exception:
-                                        parts.append(f"{val:.1f}")
-                                if include_percent:
-                                    parts.append(f"{pct:.1f}%")
-                                return " ".join(parts)
-                            return _inner
-
-                        include_label = "label" in (textinfo or "")
-                        include_percent = "percent" in (textinfo or "")
-                        include_value = "value" in (textinfo or "")
-
-                        autopct_callable = None
-                        if data_labels_enabled and (include_percent or include_value):
-                            autopct_callable = make_autopct(value_format_str, include_percent, include_value)
-
-                        # Wedge and text props
-                        wedgeprops = {}
-                        if isinstance(marker_line, dict):
-                            if marker_line.get("color"):
-                                wedgeprops["edgecolor"] = marker_line.get("color")
-                            if marker_line.get("width") is not None:
-                                wedgeprops["linewidth"] = marker_line.get("width")
-                        if opacity is not None:
-                            wedgeprops["alpha"] = opacity
-
-                        textprops = {"color": data_label_color, "fontsize": data_label_font_size}
-                        if chart_meta.get("font_family"):
-                            textprops["fontfamily"] = chart_meta.get("font_family")
-
-                        # Positioning
-                        pctdistance = 0.6 if textposition == "inside" else 1.15
-                        labeldistance = 1.1 if textposition != "inside" else 1.05
-                        
-                        # Create pie chart
-                        wedges, texts, autotexts = ax1.pie(
-                            values,
-                            labels=labels if include_label else None,
-                            autopct=autopct_callable,
-                            colors=color,
-                            startangle=start_angle,
-                            explode=explode,
-                            wedgeprops=wedgeprops,
-                            pctdistance=pctdistance,
-                            labeldistance=labeldistance,
-                            textprops=textprops,
-                        )
-
-                        # Style the autopct texts
-                        for autotext in autotexts or []:
-                            autotext.set_color(data_label_color)
-                            autotext.set_fontsize(data_label_font_size)
-                            autotext.set_fontweight('bold')
-                            if chart_meta.get("font_family"):
-                                autotext.set_fontfamily(chart_meta.get("font_family"))
-                        
-                        if title and title.strip():
-                            ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20, color=font_color if font_color else None, fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
-                        
-                        # Add legend for pie chart
-                        show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                        # Convert string "false"/"true" to boolean if needed
-                        if isinstance(show_legend_raw, str):
-                            show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                        else:
-                            show_legend = bool(show_legend_raw)
-                        if show_legend:
-                            # Initialize legend_loc for pie charts
-                            legend_loc = 'best'  # default
-                            if legend_position:
-                                loc_map = {
-                                    "top": "upper center",
-                                    "bottom": "lower center", 
-                                    "left": "center left",
-                                    "right": "center right"
-                                }
-                                legend_loc = loc_map.get(legend_position, 'best')
-                            
-                            # Force legend to bottom if specified
-                            if legend_position == "bottom":
-                                ax1.legend(wedges, labels, loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
-                            else:
-                                ax1.legend(wedges, labels, loc=legend_loc, fontsize=legend_font_size)
-                        
-                        # Create bar chart for expanded segment
-                        if expanded_segment in labels:
-                            segment_idx = labels.index(expanded_segment)
-                            segment_value = values[segment_idx]
-                            segment_color = color[segment_idx] if isinstance(color, list) and segment_idx < len(color) else color
-                            
-                            ax2.bar([expanded_segment], [segment_value], color=segment_color, alpha=0.7)
-                            ax2.set_title(f"{expanded_segment} Details", fontsize=font_size or 12, weight='bold')
-                            ax2.set_ylabel("Value")
-                            
-                            # Add value label on bar
-                            ax2.text(0, segment_value, f"{segment_value}", ha='center', va='bottom', fontweight='bold')
-                        
-                    else:
-                        # Regular pie chart
-                        mpl_figsize = figsize if figsize else (10, 8)
-                        fig_mpl, ax = plt.subplots(figsize=mpl_figsize, dpi=200)
-                        
-                        # Apply background colors to Matplotlib figure
-                        if chart_background:
-                            fig_mpl.patch.set_facecolor(chart_background)
-                        if plot_background:
-                            ax.set_facecolor(plot_background)
-                        
-                        if len(series_data) == 1:
-                            series = series_data[0]
-                            labels = series.get("labels", x_values)
-                            values = series.get("values", [])
-                            color = series.get("marker", {}).get("colors") if "marker" in series else colors
-                            marker_line = series.get("marker", {}).get("line", {}) if "marker" in series else {}
-                            explode = series.get("pull")
-                            opacity = series.get("opacity", chart_meta.get("opacity"))
-                            textinfo = series.get("textinfo", chart_meta.get("textinfo", "percent"))
-                            textposition = series.get("textposition", chart_meta.get("textposition", "inside")).lower()
-                            value_format_str = chart_meta.get("value_format", ".1f")
-                            data_labels_enabled = bool(chart_meta.get("data_labels", True))
-                            data_label_font_size = chart_meta.get("data_label_font_size", font_size or 10)
-                            data_label_color = chart_meta.get("data_label_color", font_color or "#000000")
-                            start_angle = startangle if 'startangle' in locals() and startangle is not None else 90
-                            sort_order = chart_meta.get("sort_order")
-
-                            # Optional sorting
-                            if sort_order in ("ascending", "descending") and values:
-                                zipped = list(zip(values, labels, color if isinstance(color, list) else [color]*len(labels), explode if isinstance(explode, list) else [0]*len(labels)))
-                                reverse = sort_order == "descending"
-                                zipped.sort(key=lambda t: (t[0] if t[0] is not None else 0), reverse=reverse)
-                                values, labels, color_list, explode_list = zip(*zipped)
-                                values = list(values)
-                                labels = list(labels)
-                                color = list(color_list)
-                                explode = list(explode_list)
-
-                            # Build autopct based on textinfo/value_format
-                            def make_autopct(fmt:str, include_percent:bool, include_value:bool):
-                                # Capture the current values in the closure
-                                current_values = values.copy() if isinstance(values, list) else list(values) if values else []
-                                
-                                def _inner(pct):
-                                    # Ensure values are numeric before calculating total
-                                    numeric_values = []
-                                    for v in current_values:
-                                        if v is not None:
-                                            try:
-                                                numeric_values.append(float(v))
-                                            except (ValueError, TypeError):
-                                                # Skip non-numeric values
-                                                continue
-                                    
-                                    total = sum(numeric_values) if numeric_values else 0
-                                    val = pct * total / 100.0
-                                    parts = []
-                                    if include_value:
-                                        try:
-                                            parts.append(f"{val:{fmt}}")
-                                        except Exception:
-                                            parts.append(f"{val:.1f}")
-                                    if include_percent:
-                                        parts.append(f"{pct:.1f}%")
-                                    return " ".join(parts)
-                                return _inner
-
-                            include_label = "label" in (textinfo or "")
-                            include_percent = "percent" in (textinfo or "")
-                            include_value = "value" in (textinfo or "")
-
-                            autopct_callable = None
-                            if data_labels_enabled and (include_percent or include_value):
-                                autopct_callable = make_autopct(value_format_str, include_percent, include_value)
-
-                            # Wedge and text props
-                            wedgeprops = {}
-                            if isinstance(marker_line, dict):
-                                if marker_line.get("color"):
-                                    wedgeprops["edgecolor"] = marker_line.get("color")
-                                if marker_line.get("width") is not None:
-                                    wedgeprops["linewidth"] = marker_line.get("width")
-                            if opacity is not None:
-                                wedgeprops["alpha"] = opacity
-
-                            textprops = {"color": data_label_color, "fontsize": data_label_font_size}
-                            if chart_meta.get("font_family"):
-                                textprops["fontfamily"] = chart_meta.get("font_family")
-
-                            # Positioning
-                            pctdistance = 0.6 if textposition == "inside" else 1.15
-                            labeldistance = 1.1 if textposition != "inside" else 1.05
-                            
-                            # Create pie chart
-                            wedges, texts, autotexts = ax.pie(
-                                values,
-                                labels=labels if include_label else None,
-                                autopct=autopct_callable,
-                                colors=color,
-                                startangle=start_angle,
-                                explode=explode,
-                                wedgeprops=wedgeprops,
-                                pctdistance=pctdistance,
-                                labeldistance=labeldistance,
-                                textprops=textprops,
-                            )
-                            
-                            # Style the text
-                            for autotext in autotexts or []:
-                                autotext.set_color(data_label_color)
-                                autotext.set_fontsize(data_label_font_size)
-                                autotext.set_fontweight('bold')
-                                if chart_meta.get("font_family"):
-                                    autotext.set_fontfamily(chart_meta.get("font_family"))
-                            
-                            if title and title.strip():
-                                ax.set_title(title, fontsize=font_size or 14, weight='bold', pad=20, color=font_color if font_color else None, fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
-                            
-                            # Add legend for regular pie chart
-                            show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                            # Convert string "false"/"true" to boolean if needed
-                            if isinstance(show_legend_raw, str):
-                                show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                            else:
-                                show_legend = bool(show_legend_raw)
-                            if show_legend:
-                                # Initialize legend_loc for pie charts
-                                legend_loc = 'best'  # default
-                                if legend_position:
-                                    loc_map = {
-                                        "top": "upper center",
-                                        "bottom": "lower center", 
-                                        "left": "center left",
-                                        "right": "center right"
-                                    }
-                                    legend_loc = loc_map.get(legend_position, 'best')
-                                
-                                # Force legend to bottom if specified
-                                if legend_position == "bottom":
-                                    ax.legend(wedges, labels, loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
-                                else:
-                                    ax.legend(wedges, labels, loc=legend_loc, fontsize=legend_font_size)
-                        
-                elif chart_type in ["bar of pie", "bar_of_pie"]:
-                    # Matplotlib version of bar of pie
-                    mpl_figsize = figsize if figsize else (10, 5)
-                    fig_mpl, (ax1, ax2) = plt.subplots(1, 2, figsize=mpl_figsize, dpi=200, gridspec_kw={'width_ratios': [2, 1]})
-                    
-                    # Apply background colors to Matplotlib figure
-                    if chart_background:
-                        fig_mpl.patch.set_facecolor(chart_background)
-                    if plot_background:
-                        ax1.set_facecolor(plot_background)
-                        ax2.set_facecolor(plot_background)
-                    labels = series_meta.get("labels", x_values)
-                    values = series_meta.get("values", [])
-                    colors = series_meta.get("colors", [])
-                    other_labels = chart_meta.get("other_labels", [])
-                    other_values = chart_meta.get("other_values", [])
-                    other_colors = chart_meta.get("other_colors", [])
-                    if not (other_labels and other_values):
-                        if "other_label_range" in chart_meta and "other_value_range" in chart_meta and "source_sheet" in chart_meta:
-                            wb = openpyxl.load_workbook(data_file_path, data_only=True)
-                            sheet = wb[chart_meta["source_sheet"]]
-                            other_labels = extract_excel_range(sheet, chart_meta["other_label_range"])
-                            other_values = extract_excel_range(sheet, chart_meta["other_value_range"])
-                    # Pie chart
-                    if colors:
-                        wedges, texts, autotexts = ax1.pie(values, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
-                    else:
-                        wedges, texts, autotexts = ax1.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
-                    for autotext in autotexts:
-                        autotext.set_color('white')
-                        autotext.set_fontweight('bold')
-                    if title and title.strip():
-                        ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20)
-                    # Move legend outside
-                    show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                    # Convert string "false"/"true" to boolean if needed
-                    if isinstance(show_legend_raw, str):
-                        show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                    else:
-                        show_legend = bool(show_legend_raw)
-                    legend_font_size = chart_meta.get("legend_font_size", 8)
-                    if show_legend:
-                        ax1.legend(wedges, labels, loc='center left', bbox_to_anchor=(1, 0.5), fontsize=legend_font_size)
-                    
-                    # Bar chart - Filter out empty/null values first
-                    filtered_data = []
-                    for label, value in zip(other_labels, other_values):
-                        if (label is not None and str(label).strip() != "" and 
-                            value is not None and str(value).strip() != "" and 
-                            str(value).strip() != "0"):
-                            filtered_data.append((label, value))
-                    
-                    if filtered_data:
-                        filtered_labels, filtered_values = zip(*filtered_data)
-                    else:
-                        filtered_labels, filtered_values = [], []
-                    
-                    # Create individual bars (not stacked)
-                    if filtered_labels and filtered_values:
-                        # Use individual colors for each bar
-                        bar_colors = []
-                        for i in range(len(filtered_labels)):
-                            if other_colors and i < len(other_colors):
-                                bar_colors.append(other_colors[i])
-                            elif colors and i < len(colors):
-                                bar_colors.append(colors[i])
-                            else:
-                                bar_colors.append('#1f77b4')  # Default blue
-                        
-                        bars = ax2.bar(range(len(filtered_labels)), filtered_values, color=bar_colors, alpha=0.7)
-                    else:
-                        bars = []
-                    
-                    expanded_segment = chart_meta.get("expanded_segment", "Other")
-                    ax2.set_title(f"Breakdown of '{expanded_segment}'", fontsize=font_size or 12, weight='bold')
-                    # Use proper Y-axis label from configuration
-                    y_axis_title = chart_meta.get("y_axis_title", "Value")
-                    ax2.set_ylabel(y_axis_title, fontsize=label_fontsize if 'label_fontsize' in locals() else 10)
-                    # Set X-axis label
-                    x_axis_title = chart_meta.get("x_axis_title", "Categories")
-                    ax2.set_xlabel(x_axis_title, fontsize=label_fontsize if 'label_fontsize' in locals() else 10)
-                    # Set x-tick labels for filtered data
-                    if filtered_labels:
-                        ax2.set_xticks(range(len(filtered_labels)))
-                        # Format x-axis labels as percentages
-                        formatted_x_labels = []
-                        for label in filtered_labels:
-                            if label is not None:
-                                if isinstance(label, (int, float)):
-                                    if label <= 1.0:  # Likely decimal format (0.06)
-                                        formatted_x_labels.append(f"{label * 100:.1f}%")
-                                    else:  # Likely already percentage format (6.0)
-                                        formatted_x_labels.append(f"{label:.1f}%")
-                                else:
-                                    # Convert string to float and handle
-                                    try:
-                                        val = float(label)
-                                        if val <= 1.0:
-                                            formatted_x_labels.append(f"{val * 100:.1f}%")
-                                        else:
-                                            formatted_x_labels.append(f"{val:.1f}%")
-                                    except (ValueError, TypeError):
-                                        formatted_x_labels.append(str(label))
-                            else:
-                                formatted_x_labels.append("")
-                        ax2.set_xticklabels(formatted_x_labels, rotation=0, fontsize=axis_tick_font_size or 10)
-                    # Add data labels with proper formatting
-                    value_format = chart_meta.get("value_format", ".2f")
-                    data_label_font_size = chart_meta.get("data_label_font_size", 10)
-                    data_label_color = chart_meta.get("data_label_color", "#000000")
-                    for bar, v in zip(bars, filtered_values):
-                        # Format percentage values as XX.X% instead of 0.XXX
-                        if v is not None:
-                            if isinstance(v, (int, float)):
-                                if v <= 1.0:  # Likely decimal format (0.11)
-                                    formatted_value = f"{v * 100:.1f}%"
-                                else:  # Likely already percentage format (11.0)
-                                    formatted_value = f"{v:.1f}%"
-                            else:
-                                    # Convert string to float and handle
-                                try:
-                                    val = float(v)
-                                    if val <= 1.0:
-                                        formatted_value = f"{val * 100:.1f}%"
-                                    else:
-                                        formatted_value = f"{val:.1f}%"
-                                except:
-                                    formatted_value = str(v)
-                            ax2.text(bar.get_x() + bar.get_width()/2, v, formatted_value, ha='center', va='bottom', fontweight='bold', fontsize=data_label_font_size, color=data_label_color)
-
-                else:
-                    # Bar, line, area charts
-                    mpl_figsize = figsize if figsize else (10, 6)
-                    # current_app.logger.debug(f"Applied Matplotlib figsize: {mpl_figsize}")
-                    fig_mpl, ax1 = plt.subplots(figsize=mpl_figsize, dpi=200)
-                    
-                    # Disable gridlines globally if show_gridlines is False
-                    if not show_gridlines:
-                        plt.rcParams['axes.grid'] = False
-                    
-                    # Only create secondary y-axis if not disabled
-                    ax2 = None
-                    if not disable_secondary_y:
-                        ax2 = ax1.twinx()
-                    
-                    # Apply background colors to Matplotlib figure
-                    if chart_background:
-                        fig_mpl.patch.set_facecolor(chart_background)
-                    if plot_background:
-                        ax1.set_facecolor(plot_background)
-                        if ax2:
-                            ax2.set_facecolor(plot_background)
-
-                    # Define colors array for matplotlib section
-                    colors = series_meta.get("colors", [])
-
-                    for i, series in enumerate(series_data):
-                        label = series.get("name", f"Series {i+1}")
-                        series_type = series.get("type", "bar").lower()
-                        
-                        # Debug logging for series type detection
-                        current_app.logger.debug(f"🔍 Processing series {i}: {label}, type: {series_type}")
-                        
-                        # Map heatmap to imshow for Matplotlib
-                        if series_type == "heatmap":
-                            mpl_chart_type = "imshow"
-                            current_app.logger.debug(f"🔥 Heatmap detected, setting mpl_chart_type to: {mpl_chart_type}")
-                        else:
-                            mpl_chart_type = chart_type_mapping_mpl.get(series_type, "scatter")
-                            current_app.logger.debug(f"🔍 Regular chart type: {series_type} -> {mpl_chart_type}")
-                        
-                        color = None
-                        if "marker" in series and isinstance(series["marker"], dict) and "color" in series["marker"]:
-                            color = series["marker"]["color"]
-                        elif bar_colors:
-                            color = bar_colors
-                        elif i < len(colors) and colors[i] is not None:
-                            color = colors[i]
-
-                        # Skip regular data processing for heatmaps
-                        if series_type == "heatmap":
-                            # Heatmaps use z data directly, skip y_vals processing
-                            y_vals = []  # Not used for heatmaps
-                            mpl_chart_type = "imshow"
-                            # Debug logging for heatmap data
-                            current_app.logger.debug(f"🔥 Heatmap series detected: {series}")
-                            current_app.logger.debug(f"🔥 Heatmap x data: {series.get('x', [])}")
-                            current_app.logger.debug(f"🔥 Heatmap y data: {series.get('y', [])}")
-                            current_app.logger.debug(f"🔥 Heatmap z data: {series.get('z', [])}")
-                        else:
-                            # Regular series processing
-                            y_vals = series.get("values")
-                            value_range = series.get("value_range")
-                            if value_range:
-                                # Check if value_range is already extracted (list) or still a string
-                                if isinstance(value_range, list):
-                                    y_vals = value_range
-                                else:
-                                    y_vals = extract_values_from_range(value_range)
-                            
-                            # Ensure y_vals is not None
-                            if y_vals is None:
-                                y_vals = []
-                                current_app.logger.warning(f"⚠️ y_vals is None for series {label}, using empty list")
-                            
-                            # Ensure x_values is not None
-                            if x_values is None:
-                                x_values = []
-                                current_app.logger.warning(f"⚠️ x_values is None for series {label}, using empty list")
-
-                            # Generic chart type handling for Matplotlib
-                            mpl_chart_type = chart_type_mapping_mpl.get(series_type, "scatter")
-                        
-                        if mpl_chart_type == "bar":
-                            # Add bar border parameters
-                            edgecolor = bar_border_color if bar_border_color else 'none'
-                            linewidth = bar_border_width if bar_border_width else 0
-                            
-                            if chart_type == "stacked_column":
-                                # For stacked column, use bottom parameter
-                                bar_color = color if color is not None else 'blue'
-                                if i == 0:
-                                    ax1.bar(x_values, y_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
-                                    bottom_vals = y_vals
-                                else:
-                                    ax1.bar(x_values, y_vals, bottom=bottom_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
-                                    bottom_vals = [sum(x) for x in zip(bottom_vals, y_vals)]
-                            else:
-                                if isinstance(color, list):
-                                    for j, val in enumerate(y_vals):
-                                        bar_color = color[j % len(color)] if color[j % len(color)] is not None else 'blue'
-                                        ax1.bar(x_values[j], val, color=bar_color, alpha=0.7, label=label if j == 0 else "", edgecolor=edgecolor, linewidth=linewidth)
-                                else:
-                                    bar_color = color if color is not None else 'blue'
-                                    ax1.bar(x_values, y_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
-                                    
-                        elif mpl_chart_type == "barh":
-                            # Horizontal bar chart
-                            # Add bar border parameters
-                            edgecolor = bar_border_color if bar_border_color else 'none'
-                            linewidth = bar_border_width if bar_border_width else 0
-                            
-                            if isinstance(color, list):
-                                for j, val in enumerate(y_vals):
-                                    bar_color = color[j % len(color)] if color[j % len(color)] is not None else 'blue'
-                                    ax1.barh(x_values[j], val, color=bar_color, alpha=0.7, label=label if j == 0 else "", edgecolor=edgecolor, linewidth=linewidth)
-                            else:
-                                bar_color = color if color is not None else 'blue'
-                                ax1.barh(x_values, y_vals, label=label, color=bar_color, alpha=0.7, edgecolor=edgecolor, linewidth=linewidth)
-                                
-                        elif mpl_chart_type == "plot":
-                            # Line chart
-                            marker = 'o' if series_type == "scatter_line" else None
-                            line_color = color if color is not None else 'blue'
-                            if ax2:
-                                ax2.plot(x_values, y_vals, label=label, color=line_color, marker=marker, linewidth=2)
-                            else:
-                                ax1.plot(x_values, y_vals, label=label, color=line_color, marker=marker, linewidth=2)
-                            
-                        elif mpl_chart_type == "scatter":
-                            # Scatter plot and Bubble chart
-                            if series_type == "bubble":
-                                # Enhanced bubble chart with better styling
-                                # Creating bubble chart for series: {label}
-                                
-                                # Get sizes from the series data structure
-                                sizes = series.get("size", [20] * len(y_vals)) if y_vals else [20]
-                                # Bubble chart data processed
-                                
-                                # Ensure all arrays have the same length
-                                min_length = min(len(x_values) if x_values else 0, len(y_vals) if y_vals else 0, len(sizes) if sizes else 0)
-                                if min_length > 0 and (min_length < len(x_values) or min_length < len(y_vals) or min_length < len(sizes)):
-                                    #pass  # Suppress warning logs: f"⚠️ Array length mismatch! Truncating to {min_length}")
-                                    x_values = x_values[:min_length] if x_values else []
-                                    y_vals = y_vals[:min_length] if y_vals else []
-                                    sizes = sizes[:min_length] if sizes else []
-                                    if isinstance(color, list):
-                                        color = color[:min_length]
-                                
-                                # Scale sizes for better visual impact (bubble charts need much larger sizes)
-                                scaled_sizes = [s * 20 for s in sizes]  # Much larger scale for better visibility
-                                # Scaled sizes calculated
-                                
-                                # Colors
-                                bubble_colors = color
-                                if isinstance(color, list):
-                                    bubble_colors = color
-                                elif color:
-                                    import matplotlib.cm as cm
-                                    import numpy as np
-                                    size_array = np.array(sizes)
-                                    normalized_sizes = (size_array - size_array.min()) / (size_array.max() - size_array.min() + 1e-8)
-                                    cmap = cm.viridis if color == 'auto' else cm.get_cmap('viridis')
-                                    bubble_colors = [cmap(norm_size) for norm_size in normalized_sizes]
-                                else:
-                                    bubble_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F']
-                                
-                                # Marker styles from config
-                                marker_cfg = series.get("marker", {}) if isinstance(series.get("marker"), dict) else {}
-                                marker_line_cfg = marker_cfg.get("line", {}) if isinstance(marker_cfg.get("line"), dict) else {}
-                                alpha_val = marker_cfg.get("opacity", series.get("opacity", chart_meta.get("opacity", 0.8)))
-                                edge_color = marker_line_cfg.get("color", 'white')
-                                edge_width = marker_line_cfg.get("width", 2)
-                                
-                                # Create bubble chart with enhanced styling
-                                scatter = ax1.scatter(
-                                    x_values, y_vals, 
-                                                     s=scaled_sizes, 
-                                                     c=bubble_colors, 
-                                    alpha=alpha_val,
-                                    edgecolors=edge_color,
-                                    linewidth=edge_width,
-                                                     label=label,
-                                    zorder=3)
-                                
-                                # Keep a reference for legend building
-                                try:
-                                    if not hasattr(ax1, "_bubble_handles"):
-                                        ax1._bubble_handles = []
-                                        ax1._bubble_labels = []
-                                    ax1._bubble_handles.append(scatter)
-                                    ax1._bubble_labels.append(label)
-                                except Exception:
-                                    pass
-                                
-                                # Create an explicit proxy handle so legend always renders
-                                try:
-                                    from matplotlib.lines import Line2D
-                                    if isinstance(bubble_colors, list) and len(bubble_colors) > 0:
-                                        legend_facecolor = bubble_colors[0]
-                                    else:
-                                        legend_facecolor = bubble_colors if bubble_colors else '#1f77b4'
-                                    proxy = Line2D([0], [0], marker='o', linestyle='None', label=label,
-                                                   markerfacecolor=legend_facecolor, markeredgecolor=edge_color,
-                                                   markeredgewidth=edge_width, markersize=10, alpha=alpha_val)
-                                    ax1._bubble_proxy = proxy
-                                except Exception:
-                                    pass
-                                
-                                # Add subtle shadow effect for depth
-                                ax1.scatter(
-                                    x_values, y_vals, 
-                                          s=scaled_sizes, 
-                                          c='black', 
-                                          alpha=0.1, 
-                                          zorder=1)
-                                
-                                # Add data labels for bubble chart if enabled
-                                if show_data_labels:
-                                    for j, (x, y, value_num) in enumerate(zip(x_values, y_vals, y_vals)):
-                                        if j < len(x_values):
-                                            # Format value for label using value_format and axis_tick_format
-                                            try:
-                                                if axis_tick_format and "$" in axis_tick_format:
-                                                    num = float(value_num)
-                                                    formatted_value = f"${num:,.0f}" if value_format in (".0f", None) else f"${num:,.0f}" if value_format == ".0f" else f"${num:,.0f}"
-                                                    # Simplify: currency with thousands, ignore decimals beyond .0f for labels
-                                                else:
-                                                    num = float(value_num)
-                                                    if value_format == ".0f":
-                                                        formatted_value = f"{num:.0f}"
-                                                    elif value_format == ".1f":
-                                                        formatted_value = f"{num:.1f}"
-                                                    elif value_format == ".2f":
-                                                        formatted_value = f"{num:.2f}"
-                                                    else:
-                                                        formatted_value = f"{num:.0f}"
-                                            except:
-                                                formatted_value = str(value_num)
-                                            
-                                            # Add text label inside bubble
-                                            ax1.text(x, y, formatted_value, 
-                                                    ha='center', va='center', 
-                                                    fontsize=data_label_font_size or 10,
-                                                    color=data_label_color or '#000000',
-                                                    fontweight='bold',
-                                                    zorder=4)
-                                
-                                # Fix axis ranges for bubble charts to prevent layout shifts
-                                if i == len(series_data) - 1:  # Only set once after all series
-                                    # Always set fixed x-axis range for bubble charts to prevent layout shifts
-                                    if x_axis_min_max and isinstance(x_axis_min_max, list) and len(x_axis_min_max) == 2:
-                                        # Use explicit range from config
-                                        ax1.set_xlim(x_axis_min_max[0], x_axis_min_max[1])
-                                    else:
-                                        # Set auto-calculated range with padding
-                                        x_min, x_max = min(x_values), max(x_values)
-                                        x_padding = (x_max - x_min) * 0.1
-                                        ax1.set_xlim(x_min - x_padding, x_max + x_padding)
-                                    
-                                    # Always set fixed y-axis range for bubble charts to prevent layout shifts
-                                    if y_axis_min_max and isinstance(y_axis_min_max, list) and len(y_axis_min_max) == 2:
-                                        # Use explicit range from config
-                                        ax1.set_ylim(y_axis_min_max[0], y_axis_min_max[1])
-                                    else:
-                                        # Set auto-calculated range with padding
-                                        y_min, y_max = min(y_vals), max(y_vals)
-                                        y_padding = (y_max - y_min) * 0.1
-                                        ax1.set_ylim(y_min - y_padding, y_max + y_padding)
-                                    
-                                    # Apply axis label distances specifically for bubble charts
-                                    if x_axis_label_distance is not None or y_axis_label_distance is not None:
-                                        # Handle "auto" values by calculating optimal distances
-                                        if x_axis_label_distance == "auto" or y_axis_label_distance == "auto":
-                                            # Calculate optimal label distances for bubble chart
-                                            # Use the current series data for calculation
-                                            current_series_data = [{"labels": series.get("labels", []), "values": y_vals}]
-                                            auto_x_distance, auto_y_distance = calculate_optimal_label_distance(
-                                                "scatter", current_series_data, x_values, y_vals, figsize, font_size
-                                            )
-                                            
-                                            if x_axis_label_distance == "auto":
-                                                x_axis_label_distance = auto_x_distance
-                                            if y_axis_label_distance == "auto":
-                                                y_axis_label_distance = auto_y_distance
-                                        
-                                        # Calculate labelpad values with more aggressive multiplication for better spacing
-                                        figsize = chart_meta.get("figsize", [12, 8])
-                                        chart_width, chart_height = figsize
-                                        
-                                        # More aggressive multiplication factors for better label separation
-                                        x_multiplier = max(20, chart_width * 3.0)
-                                        y_multiplier = max(20, chart_height * 3.0)
-                                        
-                                        x_labelpad = (x_axis_label_distance * x_multiplier) if x_axis_label_distance is not None else 50.0
-                                        y_labelpad = (y_axis_label_distance * y_multiplier) if y_axis_label_distance is not None else 50.0
-                                        
-                                        # Get axis titles
-                                        x_axis_title = chart_meta.get("x_label", chart_config.get("x_axis_title", ""))
-                                        y_axis_title = chart_meta.get("primary_y_label", chart_config.get("primary_y_label", ""))
-                                        
-                                        # Debug logging for bubble chart axis label distance
-                                        current_app.logger.debug(f"🎈 Bubble Chart Processing - X Distance: {x_axis_label_distance} → {x_labelpad}, Y Distance: {y_axis_label_distance} → {y_labelpad}")
-                                        current_app.logger.debug(f"🎈 Bubble Chart Titles - X: '{x_axis_title}', Y: '{y_axis_title}'")
-                                        
-                                        # Set axis labels with distance
-                                        if x_axis_title:
-                                            ax1.set_xlabel(x_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                                        fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None,
-                                                        labelpad=x_labelpad)
-                                            current_app.logger.debug(f"🎈 Set X-axis label with labelpad: {x_labelpad}")
-                                        if y_axis_title:
-                                            ax1.set_ylabel(y_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                                        fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None,
-                                                        labelpad=y_labelpad)
-                                            current_app.logger.debug(f"🎈 Set Y-axis label with labelpad: {y_labelpad}")
-                                        
-                                        # Additional spacing techniques for y-axis
-                                        if y_axis_label_distance and y_axis_label_distance > 50:
-                                            # Force more space by adjusting the left margin
-                                            current_app.logger.debug(f"🎈 Applying additional y-axis spacing techniques")
-                                            # Adjust the plot position to create more left margin
-                                            ax1.set_position([0.15, 0.1, 0.75, 0.8])  # [left, bottom, width, height]
-                                        
-                                        current_app.logger.debug(f"🎈 Bubble Chart Axis Label Distance Applied Successfully")
-                                        
-                                        # Store the labelpad values for later use to prevent override
-                                        ax1._bubble_x_labelpad = x_labelpad
-                                        ax1._bubble_y_labelpad = y_labelpad
-                                        ax1._bubble_x_title = x_axis_title
-                                        ax1._bubble_y_title = y_axis_title
-                                    else:
-                                        current_app.logger.debug(f"🎈 Bubble Chart - No axis label distance values found")
-                            else:
-                                # Enhanced scatter plot with custom styling
-                                # Extract marker properties from series
-                                marker_size = series.get("marker", {}).get("size", 50)
-                                marker_color = series.get("marker", {}).get("color", color)
-                                marker_symbol = series.get("marker", {}).get("symbol", "o")
-                                marker_opacity = series.get("marker", {}).get("opacity", 0.8)
-                                text_labels = series.get("text", [])
-                                text_position = series.get("textposition", "top center")
-                                
-                                # Extract line properties from series
-                                line_config = series.get("line", {})
-                                line_color = line_config.get("color", marker_color)
-                                line_width = line_config.get("width", 2)
-                                line_dash = line_config.get("dash", "solid")
-                                
-                                # Handle mode setting
-                                mode = series.get("mode", "markers")
-                                
-                                # Handle marker size (can be single value or list)
-                                if isinstance(marker_size, list):
-                                    sizes = marker_size
-                                else:
-                                    sizes = [marker_size] * len(y_vals)
-                                
-                                # Scale sizes for better visibility
-                                scaled_sizes = [s * 2 for s in sizes]
-                                
-                                # Create enhanced scatter plot
-                                scatter = ax1.scatter(x_values, y_vals, 
-                                                     s=scaled_sizes, 
-                                                     c=marker_color, 
-                                                     alpha=marker_opacity,
-                                                     edgecolors='white',
-                                                     linewidth=1.5,
-                                                     label=label,
-                                                     zorder=3)
-                                
-                                # Add line if mode includes lines or if line properties are specified
-                                if "lines" in mode or "line" in mode or line_config:
-                                    # Convert dash style to matplotlib format
-                                    if line_dash == "dash":
-                                        linestyle = "--"
-                                    elif line_dash == "dot":
-                                        linestyle = ":"
-                                    elif line_dash == "dashdot":
-                                        linestyle = "-."
-                                    else:
-                                        linestyle = "-"  # solid
-                                    
-                                    ax1.plot(x_values, y_vals, 
-                                            color=line_color, 
-                                            linewidth=line_width, 
-                                            linestyle=linestyle,
-                                            alpha=marker_opacity,
-                                            zorder=2)
-                                
-                                # Add subtle shadow effect for depth
-                                ax1.scatter(x_values, y_vals, 
-                                          s=scaled_sizes, 
-                                          c='black', 
-                                          alpha=0.1, 
-                                          zorder=1)
-                                
-                                # Add data labels if text is provided
-                                if text_labels and len(text_labels) == len(y_vals):
-                                    for j, (x, y, text) in enumerate(zip(x_values, y_vals, text_labels)):
-                                        if j < len(text_labels):
-                                            # Determine label position based on textposition
-                                            if "top" in text_position:
-                                                y_offset = 2
-                                            elif "bottom" in text_position:
-                                                y_offset = -2
-                                            else:
-                                                y_offset = 0
-                                            
-                                            if "center" in text_position:
-                                                ha = 'center'
-                                            elif "left" in text_position:
-                                                ha = 'left'
-                                            elif "right" in text_position:
-                                                ha = 'right'
-                                            else:
-                                                ha = 'center'
-                                            
-                                            # Add text label
-                                            label_color = data_label_color or '#000000'
-                                            ax1.text(x, y + y_offset, str(text), 
-                                                    ha=ha, va='bottom' if y_offset > 0 else 'top',
-                                                    fontsize=data_label_font_size or 10,
-                                                    color=label_color,
-                                                    fontweight='bold',
-                                                    bbox=dict(boxstyle="round,pad=0.3", 
-                                                             facecolor='white', 
-                                                             alpha=0.9,
-                                                             edgecolor='gray',
-                                                             linewidth=0.5))
-                        elif mpl_chart_type == "fill_between":
-                            # Enhanced Area chart
-                            # current_app.logger.debug(f"Processing area chart for series: {label}")
-                            # current_app.logger.debug(f"X values: {x_vals}")
-                            # current_app.logger.debug(f"Y values: {y_vals}")
-                            
-                            # Extract area-specific properties from series
-                            fill_type = series.get("fill", "tozeroy")
-                            line_color = series.get("line", {}).get("color", color)
-                            line_width = series.get("line", {}).get("width", 2)
-                            line_shape = series.get("line", {}).get("shape", "linear")
-                            marker_symbol = series.get("marker", {}).get("symbol", "o")
-                            marker_size = series.get("marker", {}).get("size", 6)
-                            marker_color = series.get("marker", {}).get("color", line_color)
-                            area_opacity = series.get("opacity", 0.6)
-                            text_labels = series.get("text", [])
-                            text_position = series.get("textposition", "top center")
-                            
-                            # Handle line shape
-                            if line_shape == "spline":
-                                linestyle = "-"
-                                # For spline, we could add curve smoothing, but matplotlib doesn't have built-in splines
-                            elif line_shape == "hv":
-                                linestyle = "step"
-                            elif line_shape == "vh":
-                                linestyle = "step"
-                            else:
-                                linestyle = "-"  # linear
-                            
-                            # Create area fill based on fill type
-                            if fill_type == "tozeroy":
-                                # Fill from zero to y values
-                                ax1.fill_between(x_vals, y_vals, alpha=area_opacity, label=label, color=line_color)
-                            elif fill_type == "tonexty":
-                                # Fill to next y values (for stacked areas)
-                                if i == 0:
-                                    # First series - fill from zero
-                                    ax1.fill_between(x_vals, y_vals, alpha=area_opacity, label=label, color=line_color)
-                                    # Store the cumulative values for next series
-                                    if not hasattr(ax1, '_stacked_bottom'):
-                                        ax1._stacked_bottom = {}
-                                    ax1._stacked_bottom[label] = y_vals
-                                else:
-                                    # Get the bottom values from previous series
-                                    prev_bottom = getattr(ax1, '_stacked_bottom', {}).get(series_data[i-1].get('name', f'series_{i-1}'), [0] * len(y_vals))
-                                    # Calculate new bottom (cumulative)
-                                    new_bottom = [b + y for b, y in zip(prev_bottom, y_vals)]
-                                    # Fill between previous bottom and new bottom
-                                    ax1.fill_between(x_vals, prev_bottom, new_bottom, alpha=area_opacity, label=label, color=line_color)
-                                    # Store the new cumulative values
-                                    ax1._stacked_bottom[label] = new_bottom
-                            elif fill_type == "tonextx":
-                                # Fill to next x values (horizontal stacking)
-                                if i == 0:
-                                    # First series - fill from zero
-                                    ax1.fill_betweenx(y_vals, x_vals, alpha=area_opacity, label=label, color=line_color)
-                                    # Store the cumulative values for next series
-                                    if not hasattr(ax1, '_stacked_left'):
-                                        ax1._stacked_left = {}
-                                    ax1._stacked_left[label] = x_vals
-                                else:
-                                    # Get the left values from previous series
-                                    prev_left = getattr(ax1, '_stacked_left', {}).get(series_data[i-1].get('name', f'series_{i-1}'), [0] * len(x_vals))
-                                    # Calculate new left (cumulative)
-                                    new_left = [l + x for l, x in zip(prev_left, x_vals)]
-                                    # Fill between previous left and new left
-                                    ax1.fill_betweenx(y_vals, prev_left, new_left, alpha=area_opacity, label=label, color=line_color)
-                                    # Store the new cumulative values
-                                    ax1._stacked_left[label] = new_left
-                            else:
-                                # Default fill
-                                ax1.fill_between(x_vals, y_vals, alpha=area_opacity, label=label, color=line_color)
-                            
-                            # Add line on top of area
-                            ax1.plot(x_vals, y_vals, color=line_color, linewidth=line_width, linestyle=linestyle, zorder=3)
-                            
-                            # Add markers if specified
-                            if marker_symbol != "none":
-                                ax1.scatter(x_vals, y_vals, color=marker_color, s=marker_size*20, 
-                                          zorder=4, edgecolors='white', linewidth=1)
-                            
-                            # Add data labels if text is provided
-                            if text_labels and len(text_labels) == len(y_vals):
-                                for j, (x, y, text) in enumerate(zip(x_vals, y_vals, text_labels)):
-                                    if j < len(text_labels):
-                                        # Determine label position based on textposition
-                                        # Get custom label offset if specified, otherwise use defaults
-                                        custom_label_offset = chart_meta.get("data_label_offset", None)
-                                        
-                                        if "top" in text_position:
-                                            # Increase offset to prevent overlap with data points
-                                            y_offset = custom_label_offset if custom_label_offset is not None else 15
-                                        elif "bottom" in text_position:
-                                            y_offset = -custom_label_offset if custom_label_offset is not None else -15
-                                        else:
-                                            y_offset = 0
-                                        
-                                        if "center" in text_position:
-                                            ha = 'center'
-                                        elif "left" in text_position:
-                                            ha = 'left'
-                                        elif "right" in text_position:
-                                            ha = 'right'
-                                        else:
-                                            ha = 'center'
-                                        
-                                        # Add text label
-                                        label_color = data_label_color or '#000000'
-                                        
-                                        # Check if plain text labels are requested
-                                        plain_text_labels = chart_meta.get("plain_text_labels", False)
-                                        
-                                        if plain_text_labels:
-                                            # Plain text without background box
-                                            ax1.text(x, y + y_offset, str(text), 
-                                                   ha=ha, va='bottom' if y_offset > 0 else 'top',
-                                                   fontsize=data_label_font_size or 10,
-                                                   color=label_color,
-                                                   fontweight='bold',
-                                                   zorder=5)
-                                        else:
-                                            # Text with background box (original behavior)
-                                            ax1.text(x, y + y_offset, str(text), 
-                                                   ha=ha, va='bottom' if y_offset > 0 else 'top',
-                                                   fontsize=data_label_font_size or 10,
-                                                   color=label_color,
-                                                   fontweight='bold',
-                                                   bbox=dict(boxstyle="round,pad=0.3", 
-                                                            facecolor='white', 
-                                                            alpha=0.9,
-                                                            edgecolor='gray',
-                                                            linewidth=0.5),
-                                                   zorder=5)
-                        # Set axis labels, title, and legend for area chart (only once after all series)
-                        if i == len(series_data) - 1 and mpl_chart_type == "fill_between":  # Only for area charts
-                            # Set axis labels
-                            x_axis_title = chart_meta.get("x_label", chart_config.get("x_axis_title", ""))
-                            y_axis_title = chart_meta.get("primary_y_label", chart_config.get("primary_y_label", 
-                                chart_meta.get("y_label", chart_config.get("y_label", 
-                                chart_meta.get("y_axis_title", chart_config.get("y_axis_title", ""))))))
-                            if x_axis_title:
-                                # Handle "auto" values for axis label distances
-                                if x_axis_label_distance == "auto":
-                                    # Calculate optimal label distance for area chart
-                                    auto_x_distance, _ = calculate_optimal_label_distance(
-                                        "area", series_data, x_values, y_vals, figsize, font_size
-                                    )
-                                    x_axis_label_distance = auto_x_distance
-                                
-                                # Use the actual distance value directly, not divided by 10
-                                x_labelpad = x_axis_label_distance if x_axis_label_distance is not None else 5.0
-                                # Make the distance effect much more pronounced by multiplying the value
-                                x_labelpad = (x_axis_label_distance * 10) if x_axis_label_distance is not None else 50.0
-                                ax1.set_xlabel(x_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                             fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None,
-                                             labelpad=x_labelpad)
-                            if y_axis_title:
-                                # Handle "auto" values for axis label distances
-                                if y_axis_label_distance == "auto":
-                                    # Calculate optimal label distance for area chart
-                                    _, auto_y_distance = calculate_optimal_label_distance(
-                                        "area", series_data, x_values, y_vals, figsize, font_size
-                                    )
-                                    y_axis_label_distance = auto_y_distance
-                                
-                                # Use the actual distance value directly, not divided by 10
-                                y_labelpad = y_axis_label_distance if y_axis_label_distance is not None else 5.0
-                                # Make the distance effect much more pronounced by multiplying the value
-                                y_labelpad = (y_axis_label_distance * 10) if y_axis_label_distance is not None else 50.0
-                                ax1.set_ylabel(y_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                             fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None,
-                                             labelpad=y_labelpad)
-                             
-                             # Set chart title
-                            if title and title.strip():
-                                 ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20,
-                                             color=font_color if font_color else 'black',
-                                             fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
-                             
-                             # Set legend
-                            show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                            # Convert string "false"/"true" to boolean if needed
-                            if isinstance(show_legend_raw, str):
-                                show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                            else:
-                                show_legend = bool(show_legend_raw)
-                            if show_legend:
-                                 legend_position = chart_meta.get("legend_position", "top")
-                                 legend_font_size = chart_meta.get("legend_font_size", 10)
-                                 
-                                 if legend_position == "bottom":
-                                     ax1.legend(loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
-                                 elif legend_position == "top":
-                                     ax1.legend(loc='upper center', bbox_to_anchor=(0.5, 1.02), fontsize=legend_font_size)
-                                 else:
-                                     ax1.legend(loc='best', fontsize=legend_font_size)
-
-                            # Data labels are already added in the main series processing loop above
-                            # No need to add them again here to avoid duplication
-
-                            # Set axis labels, title, and legend for area chart (only once after all series)
-                            if i == len(series_data) - 1:  # Only set once after all series are processed
-                                # Set axis labels
-                                x_axis_title = chart_meta.get("x_label", chart_config.get("x_axis_title", ""))
-                                y_axis_title = chart_meta.get("primary_y_label", chart_config.get("primary_y_label", 
-                                    chart_meta.get("y_label", chart_config.get("y_label", 
-                                    chart_meta.get("y_axis_title", chart_config.get("y_axis_title", ""))))))
-                                if x_axis_title:
-                                    # Handle "auto" values for axis label distances
-                                    if x_axis_label_distance == "auto":
-                                        # Calculate optimal label distance for area chart
-                                        auto_x_distance, _ = calculate_optimal_label_distance(
-                                            "area", series_data, x_values, y_vals, figsize, font_size
-                                        )
-                                        x_axis_label_distance = auto_x_distance
-                                    
-                                    # Use the actual distance value directly, not divided by 10
-                                    x_labelpad = x_axis_label_distance if x_axis_label_distance is not None else 5.0
-                                    # Make the distance effect much more pronounced by multiplying the value
-                                    x_labelpad = (x_axis_label_distance * 10) if x_axis_label_distance is not None else 50.0
-                                    ax1.set_xlabel(x_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                                fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None,
-                                                labelpad=x_labelpad)
-                                if y_axis_title:
-                                    # Handle "auto" values for axis label distances
-                                    if y_axis_label_distance == "auto":
-                                        # Calculate optimal label distance for area chart
-                                        _, auto_y_distance = calculate_optimal_label_distance(
-                                            "area", series_data, x_values, y_vals, figsize, font_size
-                                        )
-                                        y_axis_label_distance = auto_y_distance
-                                    
-                                    # Use the actual distance value directly, not divided by 10
-                                    y_labelpad = y_axis_label_distance if y_axis_label_distance is not None else 5.0
-                                    # Make the distance effect much more pronounced by multiplying the value
-                                    y_labelpad = (y_axis_label_distance * 10) if y_axis_label_distance is not None else 50.0
-                                    ax1.set_ylabel(y_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                                fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None,
-                                                labelpad=y_labelpad)
-
-                            # Set chart title
-                            if title and title.strip():
-                                ax1.set_title(title, fontsize=font_size or 14, weight='bold', pad=20,
-                                            color=font_color if font_color else 'black',
-                                            fontname=chart_meta.get("font_family") if chart_meta.get("font_family") else None)
-                            
-                            # Set legend
-                            show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                            # Convert string "false"/"true" to boolean if needed
-                            if isinstance(show_legend_raw, str):
-                                show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                            else:
-                                show_legend = bool(show_legend_raw)
-                            if show_legend:
-                                legend_position = chart_meta.get("legend_position", "top")
-                                legend_font_size = chart_meta.get("legend_font_size", 10)
-                                
-                                if legend_position == "bottom":
-                                    ax1.legend(loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
-                                elif legend_position == "top":
-                                    ax1.legend(loc='upper center', bbox_to_anchor=(0.5, 1.02), fontsize=legend_font_size)
-                                else:
-                                    ax1.legend(loc='best', fontsize=legend_font_size)
-                                    
-                        elif mpl_chart_type == "hist":
-                            # Histogram
-                            ax1.hist(y_vals, bins=10, label=label, color=color, alpha=0.7)
-                            
-                        elif mpl_chart_type == "boxplot":
-                            # Box plot
-                            ax1.boxplot(y_vals, labels=[label], patch_artist=True)
-                            if color:
-                                ax1.findobj(plt.matplotlib.patches.Patch)[-1].set_facecolor(color)
-                                
-                        elif mpl_chart_type == "contour":
-                            # Contour plot (simplified)
-                            if len(y_vals) > 0:
-                                # Create a simple 2D array for contour
-                                contour_data = [y_vals] if len(y_vals) > 0 else [[0]]
-                                ax1.contour(contour_data)
-                                
-                        elif mpl_chart_type == "imshow":
-                            # Heatmap using matplotlib imshow
-                            current_app.logger.debug(f"🔥 Matplotlib heatmap processing started for series: {label}")
-                            
-                            # For heatmaps, get data directly from series
-                            z_data = series.get("z", [])
-                            x_labels = series.get("x", [])
-                            y_labels = series.get("y", [])
-                            colorscale = series.get("colorscale", "Blues")
-                            showscale = series.get("showscale", True)
-                            opacity = series.get("opacity", 1.0)
-                            
-                            # Debug logging
-                            current_app.logger.debug(f"🔥 Heatmap Debug - Series: {series}")
-                            current_app.logger.debug(f"🔥 Heatmap Debug - Z data: {z_data}")
-                            current_app.logger.debug(f"🔥 Heatmap Debug - X labels: {x_labels}")
-                            current_app.logger.debug(f"🔥 Heatmap Debug - Y labels: {y_labels}")
-                            
-                            # Ensure we have valid data for heatmap
-                            if z_data and x_labels and y_labels:
-                                # Convert z_data to numpy array for better handling
-                                import numpy as np
-                                z_array = np.array(z_data)
-                                
-                                # Validate z_array dimensions
-                                if z_array.size == 0:
-                                    current_app.logger.error(f"🔥 Heatmap Error: Z data is empty")
-                                    ax1.text(0.5, 0.5, "Empty heatmap data", 
-                                            ha='center', va='center', 
-                                            fontsize=font_size or 12,
-                                            transform=ax1.transAxes)
-                                    return
-                                
-                                # Ensure z_array is 2D
-                                if z_array.ndim == 1:
-                                    z_array = z_array.reshape(1, -1)
-                                    current_app.logger.debug(f"🔥 Heatmap: Reshaped 1D array to 2D: {z_array.shape}")
-                                
-                                current_app.logger.debug(f"🔥 Heatmap: Final z_array shape: {z_array.shape}")
-                                current_app.logger.debug(f"🔥 Heatmap: X labels count: {len(x_labels)}")
-                                current_app.logger.debug(f"🔥 Heatmap: Y labels count: {len(y_labels)}")
-                                
-                                # Disable gridlines globally for this heatmap
-                                import matplotlib.pyplot as plt
-                                import numpy as np
-                                plt.rcParams['axes.grid'] = False
-                                plt.rcParams['axes.linewidth'] = 0
-                                
-                                # Create heatmap using imshow with proper orientation and no lines
-                                current_app.logger.debug(f"🔥 Creating heatmap with imshow...")
-                                im = ax1.imshow(z_array, 
-                                               cmap=colorscale, 
-                                               aspect='auto',
-                                               alpha=opacity,
-                                               interpolation='nearest',
-                                               extent=[-0.5, len(x_labels)-0.5, -0.5, len(y_labels)-0.5])
-                                current_app.logger.debug(f"🔥 Heatmap imshow created successfully")
-                                
-                                # Completely disable all gridlines and minor gridlines for heatmaps BEFORE setting labels
-                                ax1.grid(False, which='both')
-                                ax1.set_axisbelow(False)
-                                
-                                # Hide tick marks to remove any visual grid-like elements
-                                ax1.tick_params(axis='both', length=0)
-                                
-                                # Disable all axis spines to remove the white border lines
-                                ax1.spines['top'].set_visible(False)
-                                ax1.spines['bottom'].set_visible(False)
-                                ax1.spines['left'].set_visible(False)
-                                ax1.spines['right'].set_visible(False)
-                                
-                                # Disable minor gridlines
-                                ax1.minorticks_off()
-                                
-                                # Additional grid removal for matplotlib heatmaps
-                                ax1.xaxis.grid(False)
-                                ax1.yaxis.grid(False)
-                                ax1.xaxis.set_tick_params(gridOn=False)
-                                ax1.yaxis.set_tick_params(gridOn=False)
-                                
-                                # Set x and y axis labels
-                                current_app.logger.debug(f"🔥 Setting heatmap axis labels...")
-                                ax1.set_xticks(range(len(x_labels)))
-                                ax1.set_yticks(range(len(y_labels)))
-                                ax1.set_xticklabels(x_labels, rotation=45, ha='right', fontsize=axis_tick_font_size or 10)
-                                ax1.set_yticklabels(y_labels, fontsize=axis_tick_font_size or 10)
-                                
-                                # Ensure the plot is properly displayed
-                                ax1.set_aspect('auto')
-                                
-                                # Final comprehensive tick line removal
-                                ax1.tick_params(axis='both', which='both', length=0, width=0)
-                                ax1.tick_params(axis='x', bottom=False, top=False, labelbottom=True)
-                                ax1.tick_params(axis='y', left=False, right=False, labelleft=True)
-                                
-                                # Ensure no tick lines are drawn
-                                for tick in ax1.xaxis.get_major_ticks():
-                                    tick.tick1line.set_visible(False)
-                                    tick.tick2line.set_visible(False)
-                                for tick in ax1.yaxis.get_major_ticks():
-                                    tick.tick1line.set_visible(False)
-                                    tick.tick2line.set_visible(False)
-                                
-                                # Remove any remaining tick lines
-                                ax1.tick_params(axis='both', which='both', length=0, width=0)
-                                ax1.tick_params(axis='both', which='major', length=0, width=0)
-                                ax1.tick_params(axis='both', which='minor', length=0, width=0)
-                                
-                                # Final gridline removal after all setup
-                                ax1.grid(False, which='both')
-                                ax1.xaxis.grid(False)
-                                ax1.yaxis.grid(False)
-                                ax1.xaxis.set_tick_params(gridOn=False)
-                                ax1.yaxis.set_tick_params(gridOn=False)
-                                ax1.figure.canvas.draw()
-                                
-                                # Add colorbar if showscale is True
-                                if showscale:
-                                    current_app.logger.debug(f"🔥 Adding colorbar...")
-                                    cbar = plt.colorbar(im, ax=ax1)
-                                    cbar.set_label('Value', rotation=270, labelpad=15)
-                                
-                                # Add text annotations on each cell if text data is provided
-                                text_data = series.get("text", [])
-                                if text_data and len(text_data) == len(z_data) and len(text_data[0]) == len(z_data[0]):
-                                    current_app.logger.debug(f"🔥 Adding text annotations...")
-                                    for i in range(len(z_data)):
-                                        for j in range(len(z_data[0])):
-                                            text = str(text_data[i][j])
-                                            ax1.text(j, i, text, ha='center', va='center', 
-                                                   color='white' if z_array[i, j] > z_array.max() * 0.5 else 'black',
-                                                   fontweight='bold')
-                                
-                                # Apply background colors if specified
-                                if chart_background:
-                                    fig_mpl.patch.set_facecolor(chart_background)
-                                if plot_background:
-                                    ax1.set_facecolor(plot_background)
-                                
-                                # Add title with customizable styling
-                                title_font_size = font_size or 16
-                                title_color = font_color if font_color else '#2C3E50'
-                                title_font_family = chart_meta.get("font_family") if chart_meta.get("font_family") else None
-                                
-                                if title and title.strip():
-                                    if title and title.strip():
-                                        ax1.set_title(title, fontsize=title_font_size, weight='bold', pad=20, 
-                                                    color=title_color, fontname=title_font_family)
-                                
-                                # Set axis labels
-                                x_axis_title = chart_meta.get("x_label", "")
-                                y_axis_title = chart_meta.get("primary_y_label", 
-                                    chart_meta.get("y_label", 
-                                    chart_meta.get("y_axis_title", "")))
-                                if x_axis_title:
-                                    ax1.set_xlabel(x_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                                fontname=title_font_family)
-                                if y_axis_title:
-                                    ax1.set_ylabel(y_axis_title, fontsize=font_size or 12, color=font_color if font_color else 'black',
-                                                fontname=title_font_family)
-                                
-                                # Handle gridlines and cell borders
-                                show_gridlines = chart_meta.get("show_gridlines", True)
-                                show_cell_borders = chart_meta.get("show_cell_borders", True)
-                                
-                                # For heatmaps, always disable gridlines completely
-                                ax1.grid(False, which='both')
-                                ax1.set_axisbelow(False)
-                                
-                                # Hide tick lines but keep tick labels
-                                ax1.tick_params(axis='both', length=0, width=0, which='both')
-                                ax1.tick_params(axis='x', bottom=False, top=False, labelbottom=True)
-                                ax1.tick_params(axis='y', left=False, right=False, labelleft=True)
-                                
-                                # Disable all axis spines to remove the white border lines
-                                ax1.spines['top'].set_visible(False)
-                                ax1.spines['bottom'].set_visible(False)
-                                ax1.spines['left'].set_visible(False)
-                                ax1.spines['right'].set_visible(False)
-                                
-                                # Disable minor gridlines
-                                ax1.minorticks_off()
-                                
-                                # Additional grid removal for matplotlib heatmaps
-                                ax1.xaxis.grid(False)
-                                ax1.yaxis.grid(False)
-                                ax1.xaxis.set_tick_params(gridOn=False)
-                                ax1.yaxis.set_tick_params(gridOn=False)
-                                
-                                # Ensure no tick lines are drawn
-                                for tick in ax1.xaxis.get_major_ticks():
-                                    tick.tick1line.set_visible(False)
-                                    tick.tick2line.set_visible(False)
-                                for tick in ax1.yaxis.get_major_ticks():
-                                    tick.tick1line.set_visible(False)
-                                    tick.tick2line.set_visible(False)
-                                
-                                # Remove any remaining tick lines
-                                ax1.tick_params(axis='both', which='both', length=0, width=0)
-                                ax1.tick_params(axis='both', which='major', length=0, width=0)
-                                ax1.tick_params(axis='both', which='minor', length=0, width=0)
-                                
-                                if show_cell_borders:
-                                    # Add cell borders with customizable color
-                                    border_color = chart_meta.get("cell_border_color", "black")
-                                    border_width = chart_meta.get("cell_border_width", 1.0)  # Increased default width
-                                    border_alpha = chart_meta.get("cell_border_alpha", 1.0)  # Increased default alpha
-                                    
-                                    for i in range(len(z_data) + 1):
-                                        ax1.axhline(y=i-0.5, color=border_color, linewidth=border_width, alpha=border_alpha)
-                                    if z_data and len(z_data[0]) > 0:
-                                        for j in range(len(z_data[0]) + 1):
-                                            ax1.axvline(x=j-0.5, color=border_color, linewidth=border_width, alpha=border_alpha)
-                                
-                                current_app.logger.debug(f"🔥 Heatmap created successfully with shape: {z_array.shape}")
-                            else:
-                                current_app.logger.warning(f"⚠️ Invalid heatmap data structure - Z: {z_data}, X: {x_labels}, Y: {y_labels}")
-                                ax1.text(0.5, 0.5, "Invalid data structure for heatmap", 
-                                        ha='center', va='center', 
-                                        fontsize=font_size or 12,
-                                        transform=ax1.transAxes)
-                                
 
-                        elif mpl_chart_type == "treemap":
-                            # Enhanced Treemap chart using squarify with full customization support
-                            # For treemaps, get data directly from series
-                            values = series.get("values", [])
-                            labels = series.get("labels", [])
-                            
-                            # Debug logging for chart metadata
-                            current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - Full chart_meta: {chart_meta}")
-                            current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - showlegend value: {chart_meta.get('showlegend')}")
-                            current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - showlegend type: {type(chart_meta.get('showlegend'))}")
-                            current_app.logger.debug(f"🔍 Treemap Chart Meta Debug - showlegend converted: {show_legend}")
-                            
-                            # Debug logging
-                            current_app.logger.debug(f"🔍 Treemap Debug - Series: {series}")
-                            current_app.logger.debug(f"🔍 Treemap Debug - Values: {values} (type: {type(values)})")
-                            current_app.logger.debug(f"🔍 Treemap Debug - Labels: {labels} (type: {type(labels)})")
-                            current_app.logger.debug(f"🔍 Treemap Debug - X_values: {x_values}")
-                            
-                            # Additional debugging for raw data
-                            if isinstance(values, list):
-                                current_app.logger.debug(f"🔍 Treemap Debug - Values list items: {[f'{v} (type: {type(v)})' for v in values]}")
-                            if isinstance(labels, list):
-                                current_app.logger.debug(f"🔍 Treemap Debug - Labels list items: {[f'{l} (type: {type(l)})' for l in labels]}")
-                                # Additional debugging for label content
-                                for i, label in enumerate(labels):
-                                    current_app.logger.debug(f"🔍 Treemap Debug - Label {i}: '{label}' (repr: {repr(label)})")
-                            
-                            # NO FALLBACKS - Only use data from series to prevent mixing data sources
-                            if not values:
-                                current_app.logger.error(f"❌ Treemap: No values found in series data")
-                                values = []
-                            
-                            if not labels:
-                                current_app.logger.error(f"❌ Treemap: No labels found in series data")
-                                labels = []
-                            
-                            
-                            # Ensure we have valid data for treemap
-                            if values and labels and len(values) == len(labels):
-                                # Convert values to numeric and filter out invalid data
-                                valid_data = []
-                                valid_labels = []
-                                valid_colors = []
-                                
-                                # Enhanced color palette for better visual appeal
-                                enhanced_colors = [
-                                    '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7',
-                                    '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9',
-                                    '#F8C471', '#82E0AA', '#F1948A', '#85C1E9', '#D7BDE2'
-                                ]
-                                
-                                for i, (label, value) in enumerate(zip(labels, values)):
-                                    try:
-                                        numeric_value = float(value)
-                                        if numeric_value > 0:  # Only include positive values
-                                            # Clean and format the label text
-                                            clean_label = str(label).strip()
-                                            
-                                            # Debug the original label
-                                            current_app.logger.debug(f"🔍 Treemap label cleaning - Original: '{label}' (repr: {repr(label)})")
-                                            
-                                            # Light cleaning for treemap labels - only remove control characters
-                                            # Remove control characters and non-printable characters
-                                            clean_label = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', clean_label)
-                                            # Remove extra whitespace
-                                            clean_label = re.sub(r'\s+', ' ', clean_label).strip()
-                                            
-                                            # If label is empty after cleaning, keep it empty (no fallback)
-                                            if not clean_label:
-                                                clean_label = ""
-                                            
-                                            # Debug the cleaned label
-                                            current_app.logger.debug(f"🔍 Treemap label cleaning - Cleaned: '{clean_label}' (repr: {repr(clean_label)})")
-                                            
-                                            # CRITICAL: Skip only truly problematic labels (not valid category names)
-                                            if (clean_label and 
-                                                (clean_label.lower() in ['e', 'c', '15.0']) or
-                                                (re.match(r'^[0-9\.]+$', clean_label)) or
-                                                (len(clean_label) < 2) or
-                                                ('budget' in clean_label.lower() and len(clean_label) < 8 and 'budget' != clean_label.lower())):
-                                                current_app.logger.warning(f"⚠️ SKIPPING problematic label: '{clean_label}' with value: {numeric_value}")
-                                                continue
-                                            
-                                            valid_data.append(numeric_value)
-                                            valid_labels.append(clean_label)
-                                            
-                                            # Debug logging for label cleaning
-                                            if str(label) != clean_label:
-                                                current_app.logger.debug(f"🔍 Treemap label cleaned: '{label}' -> '{clean_label}'")
-                                            
-                                            # Use custom color if available, otherwise use enhanced palette
-                                            if isinstance(color, list) and i < len(color):
-                                                valid_colors.append(color[i])
-                                            elif color:
-                                                valid_colors.append(color)
-                                            else:
-                                                # Use enhanced color palette for better visual appeal
-                                                color_index = i % len(enhanced_colors)
-                                                valid_colors.append(enhanced_colors[color_index])
-                                    except (ValueError, TypeError):
-                                        continue
-                                
-                                if valid_data:
-                                    # Ensure we have the same number of labels as data points
-                                    if len(valid_labels) != len(valid_data):
-                                        current_app.logger.warning(f"⚠️ Treemap: Mismatch between data ({len(valid_data)}) and labels ({len(valid_labels)})")
-                                        # Trim or pad labels to match data length (no fallback generation)
-                                        if len(valid_labels) < len(valid_data):
-                                            # Pad with empty strings if we have fewer labels
-                                            valid_labels.extend([""] * (len(valid_data) - len(valid_labels)))
-                                        else:
-                                            # Trim excess labels
-                                            valid_labels = valid_labels[:len(valid_data)]
-                                    
-                                    # Final validation - remove any remaining problematic entries
-                                    final_data = []
-                                    final_labels = []
-                                    final_colors = []
-                                    
-                                    for i, (label, value, color) in enumerate(zip(valid_labels, valid_data, valid_colors)):
-                                        # Skip only truly problematic entries (not valid category names)
-                                        if (label and 
-                                            (label.lower() in ['e', 'c', '15.0']) or
-                                            (re.match(r'^[0-9\.]+$', label)) or
-                                            (len(label) < 2) or
-                                            ('budget' in label.lower() and len(label) < 8 and 'budget' != label.lower())):
-                                            current_app.logger.warning(f"⚠️ FINAL FILTER: Skipping problematic entry {i}: '{label}' with value: {value}")
-                                            continue
-                                        
-                                        final_data.append(value)
-                                        final_labels.append(label)
-                                        final_colors.append(color)
-                                    
-                                    # Remove duplicates to prevent multiple entries of the same category
-                                    seen_labels = set()
-                                    unique_data = []
-                                    unique_labels = []
-                                    unique_colors = []
-                                    
-                                    for i, (label, value, color) in enumerate(zip(final_labels, final_data, final_colors)):
-                                        if label and label.lower() not in seen_labels:
-                                            seen_labels.add(label.lower())
-                                            unique_data.append(value)
-                                            unique_labels.append(label)
-                                            unique_colors.append(color)
-                                        else:
-                                            current_app.logger.warning(f"⚠️ DUPLICATE REMOVED: '{label}' with value: {value}")
-                                    
-                                    # Use the unique data
-                                    valid_data = unique_data
-                                    valid_labels = unique_labels
-                                    valid_colors = unique_colors
-                                    
-                                    current_app.logger.debug(f"🔍 Treemap: Final unique data - {len(valid_data)} items")
-                                    current_app.logger.debug(f"🔍 Treemap: Final labels: {valid_labels}")
-                                    current_app.logger.debug(f"🔍 Treemap: Final data: {valid_data}")
-                                    
-                                    # Get customization options
-                                    treemap_alpha = fill_opacity if fill_opacity is not None else 0.8
-                                    treemap_font_size = data_label_font_size if data_label_font_size else 10
-                                    treemap_font_weight = 'bold'
-                                    
-                                    # Handle root_visible attribute - map from hide_center_box
-                                    hide_center_box = chart_meta.get("hide_center_box", False)
-                                    root_visible = not hide_center_box  # root_visible is opposite of hide_center_box
-                                    current_app.logger.debug(f"🔍 Treemap: hide_center_box = {hide_center_box}, root_visible = {root_visible}")
-                                    
-                                    # Check legend visibility early to determine plot labels
-                                    show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                                    # Convert string "false"/"true" to boolean if needed
-                                    if isinstance(show_legend_raw, str):
-                                        show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                                    else:
-                                        show_legend = bool(show_legend_raw)
-                                    
-                                    # Debug: log the legend decision
-                                    current_app.logger.debug(f"🔍 Treemap Legend Decision - Raw: {show_legend_raw}, Converted: {show_legend}, Type: {type(show_legend_raw)}")
-                                    
-                                    # Create enhanced treemap with customizable styling
-                                    # Always pass labels to squarify.plot() to avoid axis label errors
-                                    # But disable automatic legend creation by setting showlegend=False on the axis
-                                    ax1.set_visible(True)  # Ensure axis is visible
-                                    
-                                    # CRITICAL: Disable automatic legend creation at the matplotlib level
-                                    # This prevents squarify from creating legends automatically
-                                    if not show_legend:
-                                        # Disable legend creation on the axis
-                                        try:
-                                            ax1.set_legend_handles([])
-                                        except:
-                                            pass
-                                        
-                                        # CRITICAL: Override matplotlib's global legend settings
-                                        # This prevents any automatic legend creation across the entire plot
-                                        try:
-                                            # Disable legend frame and visibility
-                                            plt.rcParams['legend.frameon'] = False
-                                            # Also try to disable legend creation on the axis
-                                            ax1.legend_ = None
-                                            if hasattr(ax1, '_legend'):
-                                                ax1._legend = None
-                                        except:
-                                            pass
-                                    
-                                    # For treemaps, we need to separate data labels from legend labels
-                                    # Data labels should show when data_labels=true, regardless of legend setting
-                                    if data_labels:
-                                        # Show data labels on the treemap rectangles
-                                        current_app.logger.debug(f"🔍 Treemap: Showing data labels with font size {treemap_font_size}")
-                                        current_app.logger.debug(f"🔍 Treemap: Valid labels: {valid_labels}")
-                                        current_app.logger.debug(f"🔍 Treemap: Valid data: {valid_data}")
-                                        current_app.logger.debug(f"🔍 Treemap: Valid colors: {valid_colors}")
-                                        
-                                        # Final validation before plotting
-                                        if len(valid_labels) != len(valid_data):
-                                            current_app.logger.error(f"❌ CRITICAL: Label/data mismatch - Labels: {len(valid_labels)}, Data: {len(valid_data)}")
-                                            current_app.logger.error(f"❌ Labels: {valid_labels}")
-                                            current_app.logger.error(f"❌ Data: {valid_data}")
-                                        
-                                        # Configure squarify based on root_visible setting
-                                        if root_visible:
-                                            # Normal treemap with all rectangles visible
-                                            # Use squarify.plot() but then remove any center annotations
-                                            # Prepare labels: show label + value when data_labels is True
-                                            if data_labels:
-                                                display_labels = []
-                                                for size, lbl in zip(valid_data, valid_labels):
-                                                    try:
-                                                        if value_format == ".1f":
-                                                            formatted_val = f"{size:.1f}"
-                                                        elif value_format == ".0f":
-                                                            formatted_val = f"{size:.0f}"
-                                                        elif value_format == ".0%":
-                                                            formatted_val = f"{size:.0%}"
-                                                        else:
-                                                            formatted_val = f"{size:.1f}"
-                                                    except:
-                                                        formatted_val = str(size)
-                                                    display_labels.append(f"{lbl}\n{formatted_val}")
-                                            else:
-                                                display_labels = [''] * len(valid_labels)
-
-                                            squarify.plot(
-                                                sizes=valid_data,
-                                                label=display_labels,
-                                                color=valid_colors,
-                                                alpha=treemap_alpha,
-                                                ax=ax1,
-                                                text_kwargs={
-                                                    'fontsize': treemap_font_size, 
-                                                    'fontweight': treemap_font_weight,
-                                                    'color': data_label_color if data_label_color else '#000000'
-                                                }
-                                            )
-                                            
-                                            # Remove any center annotations that squarify might have created
-                                            # Look for text objects that might be center annotations
-                                            texts_to_remove = []
-                                            for text_obj in ax1.texts:
-                                                # Check if this text object is a center annotation
-                                                if hasattr(text_obj, 'get_position'):
-                                                    pos = text_obj.get_position()
-                                                    text_content = text_obj.get_text()
-                                                    
-                                                    # More robust center annotation detection:
-                                                    # 1. Positioned in center area (0.3 to 0.7 range)
-                                                    # 2. Contains numbers or is longer than normal labels
-                                                    # 3. Or contains specific patterns like "Economic 25.0"
-                                                    is_center_annotation = (
-                                                        (0.3 <= pos[0] <= 0.7 and 0.3 <= pos[1] <= 0.7) and (
-                                                            len(text_content) > 8 or  # Longer than normal labels
-                                                            any(char.isdigit() for char in text_content) or  # Contains numbers
-                                                            ' ' in text_content and any(char.isdigit() for char in text_content)  # Pattern like "Economic 25.0"
-                                                        )
-                                                    )
-                                                    
-                                                    if is_center_annotation:
-                                                        current_app.logger.debug(f"🔍 Removing center annotation: '{text_content}' at position {pos}")
-                                                        texts_to_remove.append(text_obj)
-                                            
-                                            # Remove identified center annotations
-                                            for text_obj in texts_to_remove:
-                                                text_obj.remove()
-                                        else:
-                                            # Treemap without root rectangle - use squarify.normalize_sizes and manual plotting
-                                            current_app.logger.debug(f"🔍 Treemap: Creating treemap without root rectangle")
-                                            
-                                            # Normalize sizes to fit the plot area
-                                            normalized_sizes = squarify.normalize_sizes(valid_data, 1, 1)
-                                            
-                                            # Get rectangles without root
-                                            rectangles = squarify.squarify(normalized_sizes, 0, 0, 1, 1)
-                                            
-                                            # Plot rectangles manually without root
-                                            for i, (rect, label, color) in enumerate(zip(rectangles, valid_labels, valid_colors)):
-                                                # Scale rectangle to plot area
-                                                x, y, dx, dy = rect['x'], rect['y'], rect['dx'], rect['dy']
-                                                
-                                                # Create rectangle patch
-                                                from matplotlib.patches import Rectangle
-                                                rect_patch = Rectangle((x, y), dx, dy, 
-                                                                      facecolor=color, 
-                                                                      alpha=treemap_alpha,
-                                                                      edgecolor='black',
-                                                                      linewidth=0.5)
-                                                ax1.add_patch(rect_patch)
-                                                
-                                                # Add label if data_labels is enabled
-                                                if data_labels and label:
-                                                    # Center the label in the rectangle
-                                                    label_x = x + dx/2
-                                                    label_y = y + dy/2
-                                                    ax1.text(label_x, label_y, label,
-                                                           ha='center', va='center',
-                                                           fontsize=treemap_font_size,
-                                                           fontweight=treemap_font_weight,
-                                                           color=data_label_color if data_label_color else '#000000')
-                                    else:
-                                        # No data labels requested
-                                        current_app.logger.debug(f"🔍 Treemap: Data labels disabled")
-                                        
-                                        if root_visible:
-                                            # Normal treemap with no labels
-                                            # Use squarify.plot() but then remove any center annotations
-                                            squarify.plot(
-                                                sizes=valid_data,
-                                                label=[''] * len(valid_labels),  # Empty labels when data_labels=false
-                                                color=valid_colors,
-                                                alpha=treemap_alpha,
-                                                ax=ax1,
-                                                text_kwargs={'fontsize': treemap_font_size, 'fontweight': treemap_font_weight}
-                                            )
-                                            
-                                            # Remove any center annotations that squarify might have created
-                                            texts_to_remove = []
-                                            for text_obj in ax1.texts:
-                                                if hasattr(text_obj, 'get_position'):
-                                                    pos = text_obj.get_position()
-                                                    text_content = text_obj.get_text()
-                                                    
-                                                    # More robust center annotation detection:
-                                                    # 1. Positioned in center area (0.3 to 0.7 range)
-                                                    # 2. Contains numbers or is longer than normal labels
-                                                    # 3. Or contains specific patterns like "Economic 25.0"
-                                                    is_center_annotation = (
-                                                        (0.3 <= pos[0] <= 0.7 and 0.3 <= pos[1] <= 0.7) and (
-                                                            len(text_content) > 8 or  # Longer than normal labels
-                                                            any(char.isdigit() for char in text_content) or  # Contains numbers
-                                                            ' ' in text_content and any(char.isdigit() for char in text_content)  # Pattern like "Economic 25.0"
-                                                        )
-                                                    )
-                                                    
-                                                    if is_center_annotation:
-                                                        current_app.logger.debug(f"🔍 Removing center annotation: '{text_content}' at position {pos}")
-                                                        texts_to_remove.append(text_obj)
-                                            
-                                            # Remove identified center annotations
-                                            for text_obj in texts_to_remove:
-                                                text_obj.remove()
-                                        else:
-                                            # Treemap without root rectangle and no labels
-                                            current_app.logger.debug(f"🔍 Treemap: Creating treemap without root rectangle and no labels")
-                                            
-                                            # Normalize sizes to fit the plot area
-                                            normalized_sizes = squarify.normalize_sizes(valid_data, 1, 1)
-                                            
-                                            # Get rectangles without root
-                                            rectangles = squarify.squarify(normalized_sizes, 0, 0, 1, 1)
-                                            
-                                            # Plot rectangles manually without root and without labels
-                                            for i, (rect, color) in enumerate(zip(rectangles, valid_colors)):
-                                                # Scale rectangle to plot area
-                                                x, y, dx, dy = rect['x'], rect['y'], rect['dx'], rect['dy']
-                                                
-                                                # Create rectangle patch
-                                                from matplotlib.patches import Rectangle
-                                                rect_patch = Rectangle((x, y), dx, dy, 
-                                                                      facecolor=color, 
-                                                                      alpha=treemap_alpha,
-                                                                      edgecolor='black',
-                                                                      linewidth=0.5)
-                                                ax1.add_patch(rect_patch)
-                                    
-                                    # CRITICAL: After plotting, prevent legend creation if showlegend=false
-                                    # This applies regardless of whether data labels are shown
-                                    if not show_legend:
-                                        current_app.logger.debug(f"🔍 Treemap: Post-plot legend prevention")
-                                        
-                                        # Prevent legend creation without removing data labels
-                                        # The key is to prevent matplotlib from creating a legend, not to remove the labels themselves
-                                        try:
-                                            # Clear any existing legend
-                                            if ax1.get_legend():
-                                                ax1.get_legend().remove()
-                                            ax1.legend_ = None
-                                            
-                                            # Prevent automatic legend creation by clearing legend handles
-                                            ax1.legend_handles = []
-                                        except Exception as e:
-                                            current_app.logger.debug(f"🔍 Legend prevention error: {e}")
-                                        
-                                        # Debug: log what plot elements were created
-                                        current_app.logger.debug(f"🔍 Treemap Debug - Plot elements after squarify: {[type(artist).__name__ for artist in ax1.get_children()]}")
-                                        current_app.logger.debug(f"🔍 Treemap Debug - Plot elements with labels: {[artist.get_label() for artist in ax1.get_children() if hasattr(artist, 'get_label') and artist.get_label()]}")
-                                        
-                                        # Check if squarify automatically created a legend
-                                        current_app.logger.debug(f"🔍 Treemap Debug - Axis legend after squarify: {ax1.get_legend()}")
-                                        current_app.logger.debug(f"🔍 Treemap Debug - Figure legends after squarify: {fig_mpl.legends if hasattr(fig_mpl, 'legends') else 'No legends attribute'}")
-                                        
-                                        # CRITICAL: Check if squarify created any plot elements that might automatically create legends
-                                        # This is often the root cause of automatic legend creation
-                                        for i, artist in enumerate(ax1.get_children()):
-                                            if (hasattr(artist, 'get_label') and 
-                                                hasattr(artist, 'set_label') and 
-                                                not isinstance(artist, (matplotlib.axis.Axis, matplotlib.axis.XAxis, matplotlib.axis.YAxis)) and
-                                                artist.get_label()):
-                                                current_app.logger.warning(f"⚠️ Treemap: Found plot element with label '{artist.get_label()}' that might create legend")
-                                                # Force remove the label to prevent legend creation
-                                                try:
-                                                    artist.set_label('')
-                                                except Exception as e:
-                                                    # Skip if set_label fails (e.g., for Axis objects)
-                                                    current_app.logger.debug(f"🔍 Skipped setting label on {type(artist).__name__}: {e}")
-                                        
-                                        # Additional safety: try to prevent matplotlib from creating legends
-                                        # by setting the axis to not show legends
-                                        try:
-                                            # This is a more direct approach to prevent legend creation
-                                            ax1.set_legend_handles([])
-                                        except:
-                                            pass
-                                        
-                                        # Also try to clear any legend handles that might exist
-                                        try:
-                                            ax1.legend_handles = []
-                                        except:
-                                            pass
-                                        
-                                        # CRITICAL: Force remove any legend that might have been created by squarify
-                                        # This is the key fix - squarify might be creating legends automatically
-                                        if ax1.get_legend():
-                                            current_app.logger.warning(f"⚠️ Treemap: Found legend after squarify.plot(), removing it")
-                                            ax1.get_legend().remove()
-                                        ax1.legend_ = None
-                                        
-                                        # Additional safety: ensure no legend exists at all
-                                        current_app.logger.debug(f"🔍 Treemap: Final legend check - ensuring no legend exists")
-                                        if ax1.get_legend():
-                                            current_app.logger.warning(f"⚠️ Treemap: Legend still exists after removal, forcing removal again")
-                                            ax1.get_legend().remove()
-                                            ax1.legend_ = None
-                                        
-                                        # Also try to prevent matplotlib from automatically creating legends
-                                        # by setting the axis to not show legends
-                                        try:
-                                            # This is a more direct approach to prevent legend creation
-                                            ax1.set_legend_handles([])
-                                        except:
-                                            pass
-                                        
-                                        # Also try to clear any legend handles that might exist
-                                        try:
-                                            ax1.legend_handles = []
-                                        except:
-                                            pass
-                                        
-                                        # CRITICAL: Override matplotlib's automatic legend creation
-                                        # This prevents any automatic legends from being created
-                                        try:
-                                            # Disable automatic legend creation
-                                            ax1.legend_ = None
-                                            if hasattr(ax1, '_legend'):
-                                                ax1._legend = None
-                                            # Also try to clear any legend handles
-                                            if hasattr(ax1, 'legend_handles'):
-                                                ax1.legend_handles = []
-                                        except:
-                                            pass
-                                        
-                                        # Also try to prevent matplotlib from automatically creating legends
-                                        # by setting the axis to not show legends
-                                        try:
-                                            # This is a more direct approach to prevent legend creation
-                                            ax1.set_legend_handles([])
-                                        except:
-                                            pass
-                                        
-                                        # Also try to clear any legend handles that might exist
-                                        try:
-                                            ax1.legend_handles = []
-                                        except:
-                                            pass
-                                    
-                                    # Immediately after squarify.plot(), remove any automatic legend creation
-                                    if not show_legend:
-                                        # Force remove any legend that might have been created
-                                        if ax1.get_legend():
-                                            ax1.get_legend().remove()
-                                        # Clear the legend attribute
-                                        ax1.legend_ = None
-                                        
-                                        # Also try to prevent any automatic legend creation
-                                        # by setting the axis to not show legends
-                                        ax1.set_navigate(True)  # Keep navigation enabled
-                                        # Clear any legend-related attributes
-                                        if hasattr(ax1, '_legend'):
-                                            ax1._legend = None
-                                        
-                                        # Additional safety: remove any plot elements that might have labels
-                                        # This prevents matplotlib from automatically creating legends
-                                        for artist in ax1.get_children():
-                                            # Only process objects that are not Axis objects and have label methods
-                                            if (hasattr(artist, 'get_label') and 
-                                                hasattr(artist, 'set_label') and 
-                                                not isinstance(artist, (matplotlib.axis.Axis, matplotlib.axis.XAxis, matplotlib.axis.YAxis)) and
-                                                artist.get_label()):
-                                                try:
-                                                    artist.set_label('')
-                                                except Exception as e:
-                                                    # Skip if set_label fails (e.g., for Axis objects)
-                                                    current_app.logger.debug(f"🔍 Skipped setting label on {type(artist).__name__}: {e}")
-                                            if hasattr(artist, '_label') and artist._label:
-                                                artist._label = ''
-                                    
-                                    # Ensure no automatic legend is added by squarify
-                                    if ax1.get_legend():
-                                        ax1.get_legend().remove()
-                                    
-                                    # Additional legend removal for squarify plots
-                                    if not show_legend:
-                                        # Remove any existing legend
-                                        if ax1.get_legend():
-                                            ax1.get_legend().remove()
-                                        # Clear all legend handles
-                                        ax1.legend_ = None
-                                        # Also try to remove from figure level
-                                        if fig_mpl.legends:
-                                            for legend in fig_mpl.legends:
-                                                legend.remove()
-                                        
-                                        # For squarify plots, we need to be more aggressive
-                                        # Remove labels from all plot elements that might create legends
-                                        for artist in ax1.get_children():
-                                            # Only process objects that are not Axis objects and have label methods
-                                            if (hasattr(artist, 'get_label') and 
-                                                hasattr(artist, 'set_label') and 
-                                                not isinstance(artist, (matplotlib.axis.Axis, matplotlib.axis.XAxis, matplotlib.axis.YAxis)) and
-                                                artist.get_label()):
-                                                try:
-                                                    artist.set_label('')
-                                                except Exception as e:
-                                                    # Skip if set_label fails (e.g., for Axis objects)
-                                                    current_app.logger.debug(f"🔍 Skipped setting label on {type(artist).__name__}: {e}")
-                                            if hasattr(artist, '_label') and artist._label:
-                                                artist._label = ''
-                                        
-                                        # Additional safety: prevent any automatic legend creation
-                                        # by clearing the legend attribute completely
-                                        ax1.legend_ = None
-                                        if hasattr(ax1, '_legend'):
-                                            ax1._legend = None
-                                        
-                                        # Force remove any remaining legends at the figure level
-                                        if hasattr(fig_mpl, 'legends') and fig_mpl.legends:
-                                            for legend in fig_mpl.legends[:]:  # Copy list to avoid modification during iteration
-                                                try:
-                                                    legend.remove()
-                                                except:
-                                                    pass
-                                        
-                                        # Also try to clear any legend-related attributes on the figure
-                                        if hasattr(fig_mpl, '_legend'):
-                                            fig_mpl._legend = None
-                                        
-                                        # Additional safety: try to prevent matplotlib from creating legends
-                                        # by setting the axis to not show legends
-                                        try:
-                                            ax1.set_legend_handles([])
-                                        except:
-                                            pass
-                                        
-                                        # Also try to clear any legend handles that might exist
-                                        try:
-                                            ax1.legend_handles = []
-                                        except:
-                                            pass
-                                    
-                                    # Apply background colors if specified
-                                    if chart_background:
-                                        fig_mpl.patch.set_facecolor(chart_background)
-                                    if plot_background:
-                                        ax1.set_facecolor(plot_background)
-                                    
-                                    # Add title with customizable styling
-                                    title_font_size = font_size or 16
-                                    title_color = font_color if font_color else '#2C3E50'
-                                    title_font_family = chart_meta.get("font_family") if chart_meta.get("font_family") else None
-                                    
-                                    if title and title.strip():
-                                        ax1.set_title(title, fontsize=title_font_size, weight='bold', pad=20, 
-                                                    color=title_color, fontname=title_font_family)
-                                    ax1.set_xlabel('')
-                                    ax1.set_ylabel('')
-                                    
-                                    # Handle axis ticks visibility
-                                    if show_x_ticks is False:
-                                        ax1.set_xticks([])
-                                    if show_y_ticks is False:
-                                        ax1.set_yticks([])
-                                    
-                                    # Remove axis spines for cleaner look (treemap specific)
-                                    ax1.spines['top'].set_visible(False)
-                                    ax1.spines['right'].set_visible(False)
-                                    ax1.spines['bottom'].set_visible(False)
-                                    ax1.spines['left'].set_visible(False)
-                                    
-                                    # Apply grid lines based on customization settings
-                                    if show_gridlines is not None:
-                                        if show_gridlines:
-                                            grid_alpha = 0.1
-                                            grid_style = gridline_style if gridline_style else '-'
-                                            grid_color = gridline_color if gridline_color else 'gray'
-                                            grid_width = 0.5
-                                            ax1.grid(True, alpha=grid_alpha, linestyle=grid_style, 
-                                                    linewidth=grid_width, color=grid_color)
-                                        else:
-                                            ax1.grid(False)
-                                    else:
-                                        # Respect show_gridlines setting for treemap
-                                        if show_gridlines:
-                                            ax1.grid(True, alpha=0.1, linestyle='-', linewidth=0.5)
-                                        else:
-                                            ax1.grid(False)
-                                    
-                                    # Add data labels manually only when root is hidden (we draw rectangles ourselves)
-                                    if show_data_labels and not root_visible:
-                                        # Place labels inside each rectangle rather than at the figure center
-                                        # Compute treemap rectangles to determine per-rectangle centers
-                                        normalized_sizes = squarify.normalize_sizes(valid_data, 1, 1)
-                                        rectangles = squarify.squarify(normalized_sizes, 0, 0, 1, 1)
-                                        
-                                        for (rect, size, label) in zip(rectangles, valid_data, valid_labels):
-                                            # Format the value
-                                            try:
-                                                if value_format == ".1f":
-                                                    formatted_val = f"{size:.1f}"
-                                                elif value_format == ".0f":
-                                                    formatted_val = f"{size:.0f}"
-                                                elif value_format == ".0%":
-                                                    formatted_val = f"{size:.0%}"
-                                                else:
-                                                    formatted_val = f"{size:.1f}"
-                                            except:
-                                                formatted_val = str(size)
-
-                                            # Compute center of this rectangle
-                                            center_x = rect['x'] + rect['dx'] / 2
-                                            center_y = rect['y'] + rect['dy'] / 2
-
-                                            # Styling
-                                            label_color = data_label_color or '#2C3E50'
-                                            label_font_size = data_label_font_size or 9
-                                            bbox_props = dict(
-                                                boxstyle="round,pad=0.2",
-                                                facecolor='white',
-                                                alpha=0.9,
-                                                edgecolor='gray',
-                                                linewidth=0.5
-                                            )
-
-                                            # Draw label inside the rectangle
-                                            ax1.text(center_x, center_y, f"{label}\n{formatted_val}",
-                                                    ha='center', va='center',
-                                                    fontsize=label_font_size,
-                                                    color=label_color,
-                                                    fontweight='bold',
-                                                    bbox=bbox_props)
-                                    
-                                    # Handle legend visibility and positioning (already checked above)
-                                    # Debug logging for legend visibility
-                                    current_app.logger.debug(f"🔍 Treemap Legend Debug - showlegend: {show_legend}")
-                                    current_app.logger.debug(f"🔍 Treemap Legend Debug - valid_data length: {len(valid_data)}")
-                                    current_app.logger.debug(f"🔍 Treemap Legend Debug - Legend condition: {show_legend and len(valid_data) > 1}")
-                                    
-                                    # CRITICAL: Only create legend if explicitly requested AND we have multiple data points
-                                    # This is the key condition that was causing the issue
-                                    if show_legend and len(valid_data) > 1:
-                                        # Create custom legend
-                                        legend_elements = []
-                                        for i, (label, color) in enumerate(zip(valid_labels, valid_colors)):
-                                            from matplotlib.patches import Patch
-                                            legend_elements.append(Patch(facecolor=color, label=label, alpha=treemap_alpha))
-                                        
-                                        # Get legend customization options
-                                        legend_position = chart_meta.get("legend_position", "right")
-                                        legend_font_size = chart_meta.get("legend_font_size", 8)
-                                        
-                                        # Position legend based on setting
-                                        if legend_position == "bottom":
-                                            ax1.legend(handles=legend_elements, 
-                                                     loc='lower center', 
-                                                     bbox_to_anchor=(0.5, -0.15), 
-                                                     fontsize=legend_font_size,
-                                                     frameon=True, fancybox=True, shadow=True)
-                                        elif legend_position == "top":
-                                            ax1.legend(handles=legend_elements, 
-                                                     loc='upper center', 
-                                                     bbox_to_anchor=(0.5, 1.02), 
-                                                     fontsize=legend_font_size,
-                                                     frameon=True, fancybox=True, shadow=True)
-                                        elif legend_position == "left":
-                                            ax1.legend(handles=legend_elements, 
-                                                     loc='center left', 
-                                                     bbox_to_anchor=(-0.05, 0.5), 
-                                                     fontsize=legend_font_size,
-                                                     frameon=True, fancybox=True, shadow=True)
-                                        else:  # right (default)
-                                            ax1.legend(handles=legend_elements, 
-                                                     loc='center left', 
-                                                     bbox_to_anchor=(1.05, 0.5), 
-                                                     fontsize=legend_font_size,
-                                                     frameon=True, fancybox=True, shadow=True)
-                                    else:
-                                        # CRITICAL: When showlegend is False, ensure NO legend is created
-                                        # This is the key fix for the issue
-                                        current_app.logger.debug(f"🔍 Treemap: showlegend is False, ensuring no legend is created")
-                                        
-                                        # Remove any existing legend
-                                        if ax1.get_legend():
-                                            ax1.get_legend().remove()
-                                        # Clear all legend handles
-                                        ax1.legend_ = None
-                                        # Also try to remove from figure level
-                                        if fig_mpl.legends:
-                                            for legend in fig_mpl.legends:
-                                                legend.remove()
-                                        
-                                        # For squarify plots, we need to be more aggressive
-                                        # Remove labels from all plot elements that might create legends
-                                        for artist in ax1.get_children():
-                                            # Only process objects that are not Axis objects and have label methods
-                                            if (hasattr(artist, 'get_label') and 
-                                                hasattr(artist, 'set_label') and 
-                                                not isinstance(artist, (matplotlib.axis.Axis, matplotlib.axis.XAxis, matplotlib.axis.YAxis)) and
-                                                artist.get_label()):
-                                                try:
-                                                    artist.set_label('')
-                                                except Exception as e:
-                                                    # Skip if set_label fails (e.g., for Axis objects)
-                                                    current_app.logger.debug(f"🔍 Skipped setting label on {type(artist).__name__}: {e}")
-                                            if hasattr(artist, '_label') and artist._label:
-                                                artist._label = ''
-                                        
-                                        # Additional safety: prevent any automatic legend creation
-                                        # by clearing the legend attribute completely
-                                        ax1.legend_ = None
-                                        if hasattr(ax1, '_legend'):
-                                            ax1._legend = None
-                                    
-                                    # Apply margin settings if specified
-                                    if margin:
-                                        plt.subplots_adjust(**margin)
-                                    
-                                    # Ensure no legend is shown if showlegend is False
-                                    if not show_legend:
-                                        # Remove any existing legend
-                                        if ax1.get_legend():
-                                            ax1.get_legend().remove()
-                                        # Also try to remove from figure level
-                                        if fig_mpl.legends:
-                                            for legend in fig_mpl.legends:
-                                                legend.remove()
-                                        
-                                        # Additional safety: clear all legend-related attributes
-                                        ax1.legend_ = None
-                                        if hasattr(ax1, '_legend'):
-                                            ax1._legend = None
-                                        
-                                        # Also try to clear any legend handles that might exist
-                                        try:
-                                            ax1.legend_handles = []
-                                        except:
-                                            pass
-                                    
-                                    # Adjust layout to accommodate legend (only if legend is shown)
-                                    if show_legend:
-                                        plt.tight_layout()
-                                    else:
-                                        # Use tight layout without legend consideration and ensure no legend space
-                                        plt.tight_layout()
-                                        # Double-check no legend was added during layout
-                                        if ax1.get_legend():
-                                            ax1.get_legend().remove()
-                                        
-                                        # Additional safety: remove any legends that might have been created during layout
-                                        if hasattr(fig_mpl, 'legends') and fig_mpl.legends:
-                                            for legend in fig_mpl.legends[:]:
-                                                try:
-                                                    legend.remove()
-                                                except:
-                                                    pass
-                                        
-                                        # Final check: ensure no legend exists
-                                        ax1.legend_ = None
-                                        if hasattr(ax1, '_legend'):
-                                            ax1._legend = None
-                                    
-                                    # One final legend removal check before finishing
-                                    if not show_legend:
-                                        # Remove any legend that might have been created
-                                        if ax1.get_legend():
-                                            ax1.get_legend().remove()
-                                            ax1.legend_ = None
-                                        
-                                        # Clear any remaining legend attributes
-                                        ax1.legend_ = None
-                                        # Also check figure level
-                                        if hasattr(fig_mpl, 'legends') and fig_mpl.legends:
-                                            for legend in fig_mpl.legends[:]:
-                                                try:
-                                                    legend.remove()
-                                                except:
-                                                    pass
-                                        
-                                        # CRITICAL: Final override to prevent any legend creation
-                                        # This is the last line of defense against automatic legends
-                                        try:
-                                            # Completely disable legend creation on this axis
-                                            ax1.legend_ = None
-                                            if hasattr(ax1, '_legend'):
-                                                ax1._legend = None
-                                            if hasattr(ax1, 'legend_handles'):
-                                                ax1.legend_handles = []
-                                            # Also try to prevent any future legend creation
-                                            ax1.set_legend_handles([])
-                                        except:
-                                            pass
-                                        
-                                        # Debug: log final state
-                                        current_app.logger.debug(f"🔍 Treemap Final Debug - Axis legend: {ax1.get_legend()}")
-                                        current_app.logger.debug(f"🔍 Treemap Final Debug - Figure legends: {fig_mpl.legends if hasattr(fig_mpl, 'legends') else 'No legends attribute'}")
-                                        current_app.logger.debug(f"🔍 Treemap Final Debug - Plot elements with labels: {[artist.get_label() for artist in ax1.get_children() if hasattr(artist, 'get_label') and artist.get_label()]}")
-                                        
-                                        # Final verification: if there's still a legend, force remove it
-                                        if ax1.get_legend():
-                                            current_app.logger.warning(f"⚠️ Treemap: Final check found legend, forcing removal")
-                                            ax1.get_legend().remove()
-                                            ax1.legend_ = None
-                                    
-                                else:
-                                    # No valid data for treemap
-                                    ax1.text(0.5, 0.5, "No valid data for treemap", 
-                                            ha='center', va='center', 
-                                            fontsize=font_size or 12,
-                                            transform=ax1.transAxes)
-                            else:
-                                # Invalid data structure for treemap
-                                current_app.logger.warning(f"⚠️ Invalid treemap data structure - Values: {values}, Labels: {labels}")
-                                ax1.text(0.5, 0.5, "Invalid data structure for treemap", 
-                                        ha='center', va='center', 
-                                        fontsize=font_size or 12,
-                                        transform=ax1.transAxes)
-                                
-                        else:
-                            # Fallback to scatter for unknown types
-                            #pass  # Suppress warning logs: f"⚠️ Unknown matplotlib chart type '{series_type}', falling back to scatter")
-                            ax1.scatter(x_values, y_vals, label=label, color=color, alpha=0.7)
+                # Legend configuration
+                show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
+                # Convert string "false"/"true" to boolean if needed
+                if isinstance(show_legend_raw, str):
+                    show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
+                else:
+                    show_legend = bool(show_legend_raw)
 
-                    # Add data labels to Matplotlib chart if enabled (skip for area charts as they have custom label handling)
-                    if show_data_labels and (data_label_format or value_format or data_label_font_size or data_label_color) and chart_type != "area":
-                        # current_app.logger.debug(f"Adding data labels to Matplotlib chart")
-                        for i, series in enumerate(series_data):
-                            series_type = series.get("type", "bar").lower()
-                            y_vals = series.get("values")
-                            value_range = series.get("value_range")
-                            if value_range:
-                                if isinstance(value_range, list):
-                                    y_vals = value_range
-                                else:
-                                    y_vals = extract_values_from_range(value_range)
-                            
-                            # Ensure y_vals is not None for data labels
-                            if y_vals is None:
-                                y_vals = []
-                            
-                            if y_vals and x_values:
-                                # Determine format to use
-                                format_to_use = value_format if value_format else data_label_format
-                                if not format_to_use:
-                                    format_to_use = ".1f"  # Default format
-                                
-                                # Add data labels based on chart type
-                                if series_type == "bar":
-                                    for j, val in enumerate(y_vals):
-                                        if j < len(x_values) if x_values else 0:
-                                            # Format the value
-                                            try:
-                                                if format_to_use == ".1f":
-                                                    formatted_val = f"{float(val):.1f}"
-                                                elif format_to_use == ".0f":
-                                                    formatted_val = f"{float(val):.0f}"
-                                                elif format_to_use == ".0%":
-                                                    formatted_val = f"{float(val):.0%}"
-                                                else:
-                                                    formatted_val = f"{float(val):{format_to_use}}"
-                                            except:
-                                                formatted_val = str(val)
-                                            
-                                            # Add text label on top of bar (ENHANCED VERSION)
-                                            label_color = data_label_color or '#000000'
-                                            ax1.text(j, val, formatted_val, 
-                                                    ha='center', va='bottom', 
-                                                    fontsize=data_label_font_size or int(title_fontsize * 0.9),  # Improved scaling
-                                                    color=label_color,
-                                                    fontweight='bold',
-                                                    bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.9))
-                                            # current_app.logger.debug(f"Added bar data label with color: {label_color}")
-                                
-                                elif series_type == "line":
-                                    for j, val in enumerate(y_vals):
-                                        if j < len(x_values) if x_values else 0:
-                                            # For line charts, use secondary y-axis format if available
-                                            line_format = secondary_y_axis_format if secondary_y_axis_format else format_to_use
-                                            if not line_format:
-                                                line_format = ".1f"  # Default format
-                                            
-                                            # Format the value
-                                            try:
-                                                if line_format == ".1f":
-                                                    formatted_val = f"{float(val):.1f}"
-                                                elif line_format == ".0f":
-                                                    formatted_val = f"{float(val):.0f}"
-                                                elif line_format == ".0%":
-                                                    formatted_val = f"{float(val):.0%}"
-                                                elif line_format == ".1%":
-                                                    formatted_val = f"{float(val):.1%}"
-                                                else:
-                                                    formatted_val = f"{float(val):{line_format}}"
-                                            except:
-                                                formatted_val = str(val)
-                                            
-                                            # Add text label above line point (ENHANCED VERSION)
-                                            label_color = data_label_color or '#000000'
-                                            if ax2:
-                                                ax2.text(j, val, formatted_val, 
-                                                        ha='center', va='bottom', 
-                                                        fontsize=data_label_font_size or int(title_fontsize * 0.9),  # Improved scaling
-                                                        color=label_color,
-                                                        fontweight='bold',
-                                                        bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.9))
-                                            # current_app.logger.debug(f"Added line data label with color: {label_color}")
-
-                                            # Set labels and styling
-                        # Check if this is a bubble chart to avoid overriding bubble chart axis label settings
-                        # This needs to be defined for all chart types since it's used later
-                        is_bubble_chart = any(series.get("type", "").lower() == "bubble" for series in series_data)
-                        current_app.logger.debug(f"🔍 General Section - is_bubble_chart: {is_bubble_chart}")
-                        
-                        # Improved font size scaling for Matplotlib (moved outside condition)
-                        # These need to be defined for all chart types since they're used later
-                        title_fontsize = font_size or 52  # Increased default title size
-                        label_fontsize = int((font_size or 52) * 0.9)  # Increased relative size for labels
-                        
-                        if chart_type != "pie" and chart_type != "area" and chart_type != "treemap":
-                            
-                            # Only apply general axis label settings if NOT a bubble chart
-                            if not is_bubble_chart:
-                                # Handle "auto" values for axis label distances
-                                if x_axis_label_distance == "auto" or y_axis_label_distance == "auto":
-                                    # Calculate optimal label distances for bar chart
-                                    auto_x_distance, auto_y_distance = calculate_optimal_label_distance(
-                                        "bar", series_data, x_values, y_vals, figsize, font_size
-                                    )
-                                    
-                                    if x_axis_label_distance == "auto":
-                                        x_axis_label_distance = auto_x_distance
-                                    if y_axis_label_distance == "auto":
-                                        y_axis_label_distance = auto_y_distance
-                                
-                                # Apply axis label distances using labelpad parameter
-                                x_labelpad = x_axis_label_distance if x_axis_label_distance else 5.0  # Use the value directly
-                                y_labelpad = y_axis_label_distance if y_axis_label_distance else 5.0  # Use the value directly
-                                # Make the distance effect much more pronounced by multiplying the values
-                                x_labelpad = (x_axis_label_distance * 10) if x_axis_label_distance is not None else 50.0
-                                y_labelpad = (y_axis_label_distance * 10) if y_axis_label_distance is not None else 50.0
-                                
-                                # Debug logging
-                                current_app.logger.debug(f"🔍 Axis Label Distance Debug - X: {x_axis_label_distance} → {x_labelpad}, Y: {y_axis_label_distance} → {y_labelpad}")
-                                
-                                ax1.set_xlabel(chart_meta.get("x_label", chart_config.get("x_axis_title", "X")), 
-                                             fontsize=label_fontsize, color=font_color, labelpad=x_labelpad)
-                                ax1.set_ylabel(chart_meta.get("primary_y_label", chart_config.get("primary_y_label", "Primary Y")), 
-                                             fontsize=label_fontsize, color=font_color, labelpad=y_labelpad)
-                                if "secondary_y_label" in chart_meta or "secondary_y_label" in chart_config:
-                                    if ax2:
-                                        # Use a much smaller labelpad for secondary y-axis to match primary axis distance
-                                        secondary_y_labelpad = y_labelpad * 0.1 if y_labelpad else 5.0
-                                        ax2.set_ylabel(chart_meta.get("secondary_y_label", chart_config.get("secondary_y_label", "Secondary Y")), 
-                                                     fontsize=label_fontsize, color=font_color, labelpad=secondary_y_labelpad)
-                            else:
-                                # For bubble charts, just set the font size without overriding the labelpad values
-                                current_app.logger.debug(f"🎈 Skipping general axis label settings for bubble chart - preserving bubble chart specific settings")
-                                
-                                # Check if bubble chart axis labels were already set and restore them
-                                if hasattr(ax1, '_bubble_x_labelpad') and hasattr(ax1, '_bubble_y_labelpad'):
-                                    current_app.logger.debug(f"🎈 Restoring bubble chart axis labels with stored labelpad values")
-                                    if hasattr(ax1, '_bubble_x_title') and ax1._bubble_x_title:
-                                        ax1.set_xlabel(ax1._bubble_x_title, fontsize=label_fontsize, color=font_color, labelpad=ax1._bubble_x_labelpad)
-                                        current_app.logger.debug(f"🎈 Restored X-axis label with labelpad: {ax1._bubble_x_labelpad}")
-                                    if hasattr(ax1, '_bubble_y_title') and ax1._bubble_y_title:
-                                        ax1.set_ylabel(ax1._bubble_y_title, fontsize=label_fontsize, color=font_color, labelpad=ax1._bubble_y_labelpad)
-                                        current_app.logger.debug(f"🎈 Restored Y-axis label with labelpad: {ax1._bubble_y_labelpad}")
-                                else:
-                                    current_app.logger.debug(f"🎈 No stored bubble chart labelpad values found")
-
-                            # Apply axis scale type if provided
-                            xaxis_type_cfg = chart_meta.get("xaxis_type")
-                            yaxis_type_cfg = chart_meta.get("yaxis_type")
-                            if xaxis_type_cfg in ("log", "log10"):
-                                ax1.set_xscale('log')
-                            if yaxis_type_cfg in ("log", "log10"):
-                                ax1.set_yscale('log')
-
-                        # is_bubble_chart is already defined above
-                        
-                        # Get secondary y-axis control for scatter charts and area charts
-                        # Use disable_secondary_y field to control secondary y-axis visibility for all chart types
-                        disable_secondary_y = chart_meta.get("disable_secondary_y", False)
-                        
-                        # AGGRESSIVE: If secondary y-axis is disabled for any chart type, remove it immediately
-                        if disable_secondary_y and 'ax2' in locals() and ax2 is not None:
-                            try:
-                                ax2.remove()  # Remove the axis completely
-                                ax2 = None    # Set to None to prevent further operations
-                            except:
-                                pass  # Ignore errors if removal fails
-
-                        # Set axis tick font size and control tick visibility
-                        tick_fontsize = axis_tick_font_size or int(title_fontsize * 0.8)  # Improved tick size calculation
-                        if axis_tick_font_size is not None:
-                            ax1.tick_params(axis='x', labelsize=axis_tick_font_size, colors=font_color)  # Removed rotation
-                            ax1.tick_params(axis='y', labelsize=axis_tick_font_size, colors=font_color)
-                            if ax2 and not is_bubble_chart and not disable_secondary_y:
-                                ax2.tick_params(axis='y', labelsize=axis_tick_font_size, colors=font_color)
-                        else:
-                            ax1.tick_params(axis='x', labelsize=tick_fontsize, colors=font_color)  # Removed rotation
-                            ax1.tick_params(axis='y', labelsize=tick_fontsize, colors=font_color)
-                            if ax2 and not is_bubble_chart and not disable_secondary_y:
-                                ax2.tick_params(axis='y', labelsize=tick_fontsize, colors=font_color)
-                        
-                        # Tick mark control for Matplotlib
-                        if show_x_ticks is not None or show_y_ticks is not None:
-                            if show_x_ticks is not None:
-                                if not show_x_ticks:
-                                    ax1.tick_params(axis='x', length=0)  # Hide tick marks
-                                    ax1.set_xticklabels([])  # Hide tick labels
-                                else:
-                                    ax1.tick_params(axis='x', length=5)  # Show tick marks
-                                    # Reapply font size after showing ticks
-                                    if axis_tick_font_size is not None:
-                                        ax1.tick_params(axis='x', labelsize=axis_tick_font_size, colors=font_color)
-                            if show_y_ticks is not None:
-                                if not show_y_ticks:
-                                    ax1.tick_params(axis='y', length=0)  # Hide tick marks
-                                    ax1.set_yticklabels([])  # Hide tick labels
-                                    if ax2 and not is_bubble_chart and not disable_secondary_y:
-                                        ax2.tick_params(axis='y', length=0)  # Hide secondary y-axis tick marks
-                                        ax2.set_yticklabels([])  # Hide secondary y-axis tick labels
-                                else:
-                                    ax1.tick_params(axis='y', length=5)  # Show tick marks
-                                    # Reapply font size after showing ticks
-                                    if axis_tick_font_size is not None:
-                                        ax1.tick_params(axis='y', labelsize=axis_tick_font_size, colors=font_color)
-                                    if ax2 and not is_bubble_chart and not disable_secondary_y:
-                                        ax2.tick_params(axis='y', length=5)  # Show secondary y-axis tick marks
-                                        if axis_tick_font_size is not None:
-                                            ax2.tick_params(axis='y', labelsize=axis_tick_font_size, colors=font_color)
-                        
-                        # Apply primary y-axis formatting for Matplotlib
-                        if axis_tick_format:
-                            from matplotlib.ticker import FuncFormatter
-                            if "$" in axis_tick_format:
-                                def currency_formatter(x, pos):
-                                    return f'${x:,.0f}'
-                                ax1.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
-                        if y_axis_min_max:
-                            # current_app.logger.debug(f"Setting Matplotlib Y-axis range to: {y_axis_min_max}")
-                            # Ensure the range is properly applied
-                            if isinstance(y_axis_min_max, list) and len(y_axis_min_max) == 2:
-                                # Check if the provided range is appropriate for the data
-                                all_y_values = []
-                                for series in series_data:
-                                    y_vals = series.get("values", [])
-                                    if y_vals:
-                                        all_y_values.extend(y_vals)
-                                
-                                if all_y_values:
-                                    data_min = min(all_y_values)
-                                    data_max = max(all_y_values)
-                                    data_range = data_max - data_min
-                                    
-                                    # Check if the provided range is reasonable (within 100x of data range for currency formatting)
-                                    provided_range = y_axis_min_max[1] - y_axis_min_max[0]
-                                    if provided_range > data_range * 100 and not axis_tick_format:
-                                        # Auto-calculate appropriate range only if no special formatting is requested
-                                        padding = data_range * 0.1  # 10% padding
-                                        auto_min = max(0, data_min - padding)
-                                        auto_max = data_max + padding
-                                        ax1.set_ylim(auto_min, auto_max)
-                                        # current_app.logger.debug(f"Auto-adjusted Y-axis range from {y_axis_min_max} to {[auto_min, auto_max]} (data range: {data_min}-{data_max})")
-                                    else:
-                                        # Use provided range (especially for currency formatting)
-                                        ax1.set_ylim(y_axis_min_max[0], y_axis_min_max[1])
-                                        # current_app.logger.debug(f"Applied Y-axis range: {y_axis_min_max[0]} to {y_axis_min_max[1]}")
-                                else:
-                                    # No data available, use provided range
-                                    ax1.set_ylim(y_axis_min_max[0], y_axis_min_max[1])
-                                    # current_app.logger.debug(f"Applied Y-axis range: {y_axis_min_max[0]} to {y_axis_min_max[1]}")
-                            else:
-                                pass  # Suppress warning logs: f"Invalid Y-axis range format: {y_axis_min_max}")
-                        
-                        # Apply secondary y-axis formatting for Matplotlib
-                        if ax2 and not disable_secondary_y:
-                            from matplotlib.ticker import FuncFormatter
-                            if secondary_y_axis_format:
-                                # Use explicit format if provided
-                                if "%" in secondary_y_axis_format:
-                                    def percentage_formatter(x, pos):
-                                        return f'{x:.0%}'
-                                    ax2.yaxis.set_major_formatter(FuncFormatter(percentage_formatter))
-                                elif "$" in secondary_y_axis_format:
-                                    def currency_formatter(x, pos):
-                                        return f'${x:,.0f}'
-                                    ax2.yaxis.set_major_formatter(FuncFormatter(currency_formatter))
-                                else:
-                                    # For other formats, use the format string directly
-                                    def custom_formatter(x, pos):
-                                        return f'{x:{secondary_y_axis_format}}'
-                                    ax2.yaxis.set_major_formatter(FuncFormatter(custom_formatter))
-                            else:
-                                # Default to percentage formatting if no explicit format is specified
-                                # This handles cases where secondary y-axis exists but no format is specified
-                                def default_percentage_formatter(x, pos):
-                                    return f'{x:.0%}'
-                                ax2.yaxis.set_major_formatter(FuncFormatter(default_percentage_formatter))
-                        
-                        # Set title with improved font size
-                        if title and title.strip():
-                            ax1.set_title(title, fontsize=title_fontsize, weight='bold', pad=20)
-                        
-                        # Legend
-                        show_legend_raw = chart_meta.get("showlegend", chart_meta.get("legend", True))
-                        # Convert string "false"/"true" to boolean if needed
-                        if isinstance(show_legend_raw, str):
-                            show_legend = show_legend_raw.lower() not in ['false', '0', 'no', 'off']
-                        else:
-                            show_legend = bool(show_legend_raw)
-                        
-                        legend_loc = 'best'
-                        if show_legend:
-                            handles = []
-                            labels_list = []
-                            # Use explicit proxy if present
-                            proxy = getattr(ax1, "_bubble_proxy", None)
-                            if proxy is not None:
-                                handles.append(proxy)
-                                labels_list.append(proxy.get_label())
-                            else:
-                                # Prefer stored bubble handles/labels
-                                handles = getattr(ax1, "_bubble_handles", []) or []
-                                labels_list = getattr(ax1, "_bubble_labels", []) or []
-                                if not handles:
-                                    handles, labels_list = ax1.get_legend_handles_labels()
-
-                            # Combine with secondary axis if present
-                            if 'ax2' in locals() and ax2 is not None:
-                                h2, l2 = ax2.get_legend_handles_labels()
-                                handles += h2
-                                labels_list += l2
-
-                            if legend_position:
-                                loc_map = {
-                                    "top": "upper center",
-                                    "bottom": "lower center", 
-                                    "left": "center left",
-                                    "right": "center right",
-                                }
-                                legend_loc = loc_map.get(legend_position, 'best')
-                            
-                            if legend_position == "bottom":
-                                ax1.legend(handles, labels_list, loc='lower center', bbox_to_anchor=(0.5, -0.15), fontsize=legend_font_size)
-                            elif legend_position == "top":
-                                ax1.legend(handles, labels_list, loc='upper center', bbox_to_anchor=(0.5, 1.02), fontsize=legend_font_size)
-                            else:
-                                ax1.legend(handles, labels_list, loc=legend_loc, fontsize=legend_font_size)
-                                
-                        # Set title with proper font attributes (ENHANCED VERSION)
+                # Data labels (for bar/line series)
+                show_data_labels = chart_meta.get("data_labels", True)
+                value_format = chart_meta.get("value_format", "")
+                if show_data_labels and (data_label_format or data_label_font_size or data_label_color):
+                    show_data_labels = True
+                elif not show_data_labels:
+                    # If data_labels is explicitly set to False, respect that setting
+                    show_data_labels = False
+
+                # --- Matplotlib static chart for DOCX ---
+                chart = ChartContext(
+                    chart_type=chart_type, chart_meta=chart_meta, chart_config=chart_config,
+                    series_meta=series_meta, series_data=series_data, x_values=x_values, y_vals=[], colors=colors,
+                    report_df=df, data_grouping=data_grouping, sort_order=sort_order,
+                    title=title, figsize=figsize, margin=margin, startangle=startangle,
+                    font_color=font_color, font_size=font_size, axis_tick_font_size=axis_tick_font_size,
+                    chart_background=chart_background, plot_background=plot_background,
+                    bar_colors=bar_colors, bar_border_color=bar_border_color, bar_border_width=bar_border_width,
+                    fill_opacity=fill_opacity,
+                    show_gridlines=show_gridlines, gridline_color=gridline_color, gridline_style=gridline_style,
+                    show_x_ticks=show_x_ticks, show_y_ticks=show_y_ticks,
+                    x_axis_min_max=x_axis_min_max, y_axis_min_max=y_axis_min_max,
+                    axis_tick_format=axis_tick_format, secondary_y_axis_format=secondary_y_axis_format,
+                    x_axis_label_distance=x_axis_label_distance, y_axis_label_distance=y_axis_label_distance,
+                    disable_secondary_y=disable_secondary_y,
+                    show_legend=show_legend, show_legend_raw=show_legend_raw,
+                    legend_position=legend_position, legend_font_size=legend_font_size,
+                    data_labels=data_labels, show_data_labels=show_data_labels, value_format=value_format,
+                    data_label_format=data_label_format, data_label_font_size=data_label_font_size,
+                    data_label_color=data_label_color,
+                )
+                rendered = renderer.render(chart)
+                if rendered is None:
+                    # Nothing to draw (e.g. empty heatmap data); no image is inserted for this chart
+                    report_timer.note_chart_build(chart_tag, figures=len(set(plt.get_fignums()) - figures_before), traces=0)
+                    plt.close('all')
+                    return None
+                fig_mpl, ax1, ax2 = rendered
+                # Renderers may change these while drawing; the layout and save steps below use the final values
+                x_values, y_vals, figsize = chart.x_values, chart.y_vals, chart.figsize
+                show_legend, legend_position, disable_secondary_y = chart.show_legend, chart.legend_position, chart.disable_secondary_y
+                x_axis_label_distance, y_axis_label_distance = chart.x_axis_label_distance, chart.y_axis_label_distance
 
                 # Apply axis label distances for Matplotlib (skip heatmaps as they're handled specifically)
                 # current_app.logger.debug(f"X-axis label distance: {x_axis_label_distance}")
@@ -7475,7 +2575,7 @@ def _generate_report(project_id, template_path, data_file_path):
                     
                     # Use safe data for calculation
                     auto_x_distance, auto_y_distance = calculate_optimal_label_distance(
-                        chart_type, safe_series_data, x_values, y_vals if 'y_vals' in locals() else [], figsize, font_size
+                        chart_type, safe_series_data, x_values, y_vals, figsize, font_size
                     )
                     
                     if x_axis_label_distance == "auto":
@@ -7709,29 +2809,22 @@ def _generate_report(project_id, template_path, data_file_path):
                         # Force redraw
                         fig_mpl.canvas.draw()
                 
-                tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
                 # Use different bbox_inches parameter based on legend position
                 if show_legend and legend_position == "bottom":
                     # For bottom legend, use 'tight' but with extra padding
-                    plt.savefig(tmpfile.name, bbox_inches='tight', pad_inches=0.3, dpi=200)
+                    chart_path = save_matplotlib_chart(fig_mpl, output_format, bbox_inches='tight', pad_inches=0.3, dpi=chart_dpi)
                     # current_app.logger.debug(f"Saved Matplotlib chart with bottom legend using extra padding")
                 else:
                     # For other positions, use standard tight layout
-                    plt.savefig(tmpfile.name, bbox_inches='tight', dpi=200)
-                                        # Only log legend position if legend_loc is defined (for charts that have legends)
-                    if 'legend_loc' in locals():
-                        # Chart saved with legend
-                        pass
-                    else:
-                        # current_app.logger.debug(f"Saved Matplotlib chart without legend")
-                        pass
-                    
-                    # ALWAYS close the figure to prevent memory leaks
-                    plt.close(fig_mpl)
-                    plt.close('all')  # Close all figures
-                    gc.collect()  # Force garbage collection
+                    chart_path = save_matplotlib_chart(fig_mpl, output_format, bbox_inches='tight', dpi=chart_dpi)
+                report_timer.note_chart_build(chart_tag, figures=len(set(plt.get_fignums()) - figures_before), traces=0)
 
-                return tmpfile.name
+                # ALWAYS close the figure to prevent memory leaks
+                plt.close(fig_mpl)
+                plt.close('all')  # Close all figures
+                gc.collect()  # Force garbage collection
+
+                return chart_path
 
             except Exception as e:
                 import traceback
@@ -7775,35 +2868,76 @@ def _generate_report(project_id, template_path, data_file_path):
                 
                 # Simple console logging
                 current_app.logger.error(f"❌ Chart '{chart_tag}' failed: {user_message}")
+                get_metrics().inc('graph_chart_failures_total', chart_type=error_details["chart_type"] or "unknown", error_type=error_type)
                 
                 # Store error details for frontend (project-specific)
-                if not hasattr(current_app, 'chart_errors'):
-                    current_app.chart_errors = {}
-                if project_id not in current_app.chart_errors:
-                    current_app.chart_errors[project_id] = {}
-                current_app.chart_errors[project_id][chart_tag] = error_details
-                
-                # Also store a simplified version for report generation errors
-                if not hasattr(current_app, 'report_generation_errors'):
-                    current_app.report_generation_errors = {}
-                if project_id not in current_app.report_generation_errors:
-                    current_app.report_generation_errors[project_id] = {}
-                current_app.report_generation_errors[project_id][chart_tag] = {
-                    "error": user_message,
-                    "chart_type": chart_type if 'chart_type' in locals() else "unknown",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
+                report_errors.add(chart_tag, error_details)
                 
                 # Clean up any remaining matplotlib figures
+                report_timer.note_chart_build(chart_tag, figures=len(set(plt.get_fignums()) - figures_before), traces=0)
                 plt.close('all')
                 gc.collect()
                 return None
 
+        def render_chart(tag):
+            """generate_chart and the PNG optimisation stage, or the last report's image when the chart is unchanged"""
+            fingerprint = None
+            if manifest is not None:
+                try:
+                    render_settings = {"format": chart_output_format, "dpi": chart_dpi, "png": png_settings}
+                    fingerprint = chart_fingerprint(chart_attr_map[tag.lower()], chart_type_map.get(tag.lower()),
+                                                    chart_workbook, df, render_settings)
+                except Exception as e:
+                    current_app.logger.warning(f"⚠️ Could not fingerprint chart {tag}: {e}")
+                if fingerprint and fingerprint == manifest.charts.get(tag.lower()):
+                    chart_img = artifact_store.checkout(project_id, fingerprint)
+                    if chart_img:
+                        report_timer.note_reused_chart(tag)
+                        chart_fingerprints[tag.lower()] = fingerprint
+                        return chart_img
+
+            with report_timer.stage("chart_rendering"):
+                chart_started = time.perf_counter()
+                chart_img = generate_chart({}, tag)
+                report_timer.record_chart(tag, time.perf_counter() - chart_started, chart_img is not None)
+            if chart_img and png_settings:
+                with report_timer.stage("png_optimization"):
+                    optimize_chart_image(chart_img, png_settings)
+            if chart_img and fingerprint:
+                try:
+                    artifact_store.put(project_id, fingerprint, chart_img)
+                    chart_fingerprints[tag.lower()] = fingerprint
+                except OSError as e:
+                    current_app.logger.warning(f"⚠️ Could not store chart {tag} for reuse: {e}")
+            return chart_img
+
+        if preview_tags is not None:
+            previews = {}
+            for tag in preview_tags:
+                if tag.lower() not in chart_attr_map:
+                    continue
+                with report_timer.stage("chart_rendering"):
+                    chart_started = time.perf_counter()
+                    previews[tag] = generate_chart({}, tag)
+                    report_timer.record_chart(tag, time.perf_counter() - chart_started, previews[tag] is not None)
+            return previews
+
+        if artifact_store is not None:
+            try:
+                manifest = ReportManifest(current_app.mongo.db, project_id)
+            except Exception as e:
+                current_app.logger.warning(f"⚠️ Report manifest unavailable, rendering every chart: {e}")
+
+        doc = Document(template_path)
+        report_timer.lap("template_load")
+
         # Insert charts into paragraphs
-        chart_errors = []
+        chart_errors = report_errors.report_errors
         
         # COMPREHENSIVE TEXT REPLACEMENT - Process ALL document elements
+        report_timer.reset_lap()
         process_entire_document()
+        report_timer.lap("process_entire_document")
         
         # Process charts in paragraphs
         for para_idx, para in enumerate(doc.paragraphs):
@@ -7812,25 +2946,26 @@ def _generate_report(project_id, template_path, data_file_path):
             for tag in chart_placeholders:
                 if tag.lower() in chart_attr_map:
                     try:
-                        current_app.logger.info(f"🔍 About to call generate_chart for tag: {tag}")
-                        chart_img = generate_chart({}, tag)
-                        current_app.logger.info(f"🔍 generate_chart returned: {chart_img is not None}")
+                        # A tag repeated in the template reuses the image rendered for its first occurrence
+                        chart_img = image_registry.rendered(tag)
+                        if chart_img:
+                            current_app.logger.info(f"🔍 Reusing rendered chart for tag: {tag}")
+                        else:
+                            current_app.logger.info(f"🔍 About to call generate_chart for tag: {tag}")
+                            chart_img = render_chart(tag)
+                            current_app.logger.info(f"🔍 generate_chart returned: {chart_img is not None}")
+                            image_registry.add_rendered(tag, chart_img)
                         if chart_img:
-                            para.text = re.sub(rf"\$\{{{tag}\}}", "", para.text, flags=re.IGNORECASE)
-                            para.add_run().add_picture(chart_img, width=Inches(5.5))
+                            with report_timer.stage("picture_insertion"):
+                                para.text = re.sub(rf"\$\{{{tag}\}}", "", para.text, flags=re.IGNORECASE)
+                                add_chart_picture(para.add_run(), chart_img, width=Inches(5.5), registry=image_registry)
                         else:
                             # Chart generation failed, add error placeholder
                             error_msg = f"[Chart failed: {tag}]"
                             para.text = re.sub(rf"\$\{{{tag}\}}", error_msg, para.text, flags=re.IGNORECASE)
                             
                             # Get the specific error from chart_errors if available
-                            specific_error = "Chart could not be generated"
-                            if hasattr(current_app, 'chart_errors') and project_id in current_app.chart_errors:
-                                if tag in current_app.chart_errors[project_id]:
-                                    specific_error = current_app.chart_errors[project_id][tag].get('user_message', specific_error)
-                            elif hasattr(current_app, 'report_generation_errors') and project_id in current_app.report_generation_errors:
-                                if tag in current_app.report_generation_errors[project_id]:
-                                    specific_error = current_app.report_generation_errors[project_id][tag].get('error', specific_error)
+                            specific_error = report_errors.user_message(tag, "Chart could not be generated")
                             
                             chart_errors.append({
                                 "tag": tag,
@@ -7859,25 +2994,26 @@ def _generate_report(project_id, template_path, data_file_path):
                         for tag in chart_placeholders:
                             if tag.lower() in chart_attr_map:
                                 try:
-                                    current_app.logger.info(f"🔍 About to call generate_chart for tag: {tag} (table)")
-                                    chart_img = generate_chart({}, tag)
-                                    current_app.logger.info(f"🔍 generate_chart returned: {chart_img is not None} (table)")
+                                    # A tag repeated in the template reuses the image rendered for its first occurrence
+                                    chart_img = image_registry.rendered(tag)
+                                    if chart_img:
+                                        current_app.logger.info(f"🔍 Reusing rendered chart for tag: {tag} (table)")
+                                    else:
+                                        current_app.logger.info(f"🔍 About to call generate_chart for tag: {tag} (table)")
+                                        chart_img = render_chart(tag)
+                                        current_app.logger.info(f"🔍 generate_chart returned: {chart_img is not None} (table)")
+                                        image_registry.add_rendered(tag, chart_img)
                                     if chart_img:
-                                        para.text = re.sub(rf"\$\{{{tag}\}}", "", para.text, flags=re.IGNORECASE)
-                                        para.add_run().add_picture(chart_img, width=Inches(5.5))
+                                        with report_timer.stage("picture_insertion"):
+                                            para.text = re.sub(rf"\$\{{{tag}\}}", "", para.text, flags=re.IGNORECASE)
+                                            add_chart_picture(para.add_run(), chart_img, width=Inches(5.5), registry=image_registry)
                                     else:
                                         # Chart generation failed, add error placeholder
                                         error_msg = f"[Chart failed: {tag}]"
                                         para.text = re.sub(rf"\$\{{{tag}\}}", error_msg, para.text, flags=re.IGNORECASE)
                                         
                                         # Get the specific error from chart_errors if available
-                                        specific_error = "Chart could not be generated"
-                                        if hasattr(current_app, 'chart_errors') and project_id in current_app.chart_errors:
-                                            if tag in current_app.chart_errors[project_id]:
-                                                specific_error = current_app.chart_errors[project_id][tag].get('user_message', specific_error)
-                                        elif hasattr(current_app, 'report_generation_errors') and project_id in current_app.report_generation_errors:
-                                            if tag in current_app.report_generation_errors[project_id]:
-                                                specific_error = current_app.report_generation_errors[project_id][tag].get('error', specific_error)
+                                        specific_error = report_errors.user_message(tag, "Chart could not be generated")
                                         
                                         chart_errors.append({
                                             "tag": tag,
@@ -7896,20 +3032,24 @@ def _generate_report(project_id, template_path, data_file_path):
         import tempfile
         temp_dir = tempfile.mkdtemp()
         output_path = os.path.join(temp_dir, f'output_report_{project_id}.docx')
-        doc.save(output_path)
+        with report_timer.stage("doc_save"):
+            doc.save(output_path)
         current_app.logger.info(f"✅ Report generated successfully")
+        _record_report_metrics(report_timer, success=True)
+
+        # Remember this run's inputs; images of charts that are gone or changed are dropped from the store
+        if manifest is not None:
+            try:
+                texts = text_digests({**flat_data_map, **text_map})
+                current_app.logger.info(f"♻️ Reused {len(report_timer.reused_charts)} chart images; "
+                                        f"{len(manifest.changed_texts(texts))} text placeholders changed since the last report")
+                manifest.save(chart_fingerprints, texts)
+                artifact_store.prune(project_id, chart_fingerprints.values())
+            except Exception as e:
+                current_app.logger.warning(f"⚠️ Could not update the report manifest for {project_id}: {e}")
         
-        # Store chart errors for this report generation
-        if not hasattr(current_app, 'report_errors'):
-            current_app.report_errors = {}
-        current_app.report_errors[project_id] = {
-            "chart_errors": chart_errors,
-            "generated_at": datetime.utcnow().isoformat()
-        }
-        
-        # Clear old chart errors for this project when new report is generated
-        if hasattr(current_app, 'chart_errors') and project_id in current_app.chart_errors:
-            current_app.chart_errors[project_id] = {}
+        # Store chart errors for this report generation (replacing the previous report's)
+        _save_report_errors(project_id, report_errors, chart_errors, success=True)
         
         return output_path
 
@@ -7917,22 +3057,108 @@ def _generate_report(project_id, template_path, data_file_path):
         current_app.logger.error(f"❌ Failed to generate report: {e}")
         import traceback
         current_app.logger.error(traceback.format_exc())
+        if preview_tags is None:
+            _record_report_metrics(report_timer, success=False)
+            _save_report_errors(project_id, report_errors, [], success=False)
         return None
+    finally:
+        # Rendered and reused chart images are in the saved document (and the artifact store) by now
+        image_registry.remove_images()
+        chart_workbook.close()
+        get_metrics().add_gauge('graph_queue_depth', -1, queue='reports_in_progress')
+
+def _generate_report_job(*args, report_timer=None, report_errors=None, **kwargs):
+    """_generate_report as a report pool job: also returns the timer and errors it filled in"""
+    report_timer = report_timer or ReportTimer()
+    report_errors = report_errors or ReportErrors()
+    output = _generate_report(*args, report_timer=report_timer, report_errors=report_errors, **kwargs)
+    return output, report_timer, report_errors
+
+def _run_generate_report(*args, **kwargs):
+    """
+    Run _generate_report in the report pool (see utils/report_pool.py).
+
+    Returns (output, report_timer, report_errors); output is None when the
+    report failed, including when its pool process died.
+    """
+    pool = get_report_pool(current_app._get_current_object())
+    metrics = get_metrics()
+    metrics.add_gauge('graph_queue_depth', 1, queue='report_pool')
+    try:
+        output, report_timer, report_errors = pool.call('routes.projects:_generate_report_job', *args, **kwargs)
+    except Exception as e:
+        current_app.logger.error(f"❌ Report pool job failed: {e}")
+        return None, kwargs.get('report_timer') or ReportTimer(), kwargs.get('report_errors') or ReportErrors()
+    finally:
+        metrics.add_gauge('graph_queue_depth', -1, queue='report_pool')
+    if not pool.inline and kwargs.get('preview_tags') is None:
+        # The pool process fed its own timing window; this worker's /metrics/timing needs the report too
+        get_timing_histogram().observe_report(report_timer)
+    return output, report_timer, report_errors
 
 # Helper function no longer needed - files are now stored in database
 
+def _png_optimization_form_value(value):
+    """A png_optimization form field (preset name or JSON object) as stored on the project"""
+    if value.strip().startswith('{'):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            raise ValueError("png_optimization is not valid JSON")
+    png_optimization_settings(value)
+    return value
+
+_project_indexes_created = False
+
+def _ensure_project_indexes(db):
+    """Create the project listing index once per process"""
+    global _project_indexes_created
+    if _project_indexes_created:
+        return
+    try:
+        db.projects.create_index([('user_id', 1), ('_id', -1)], name='user_id_created')
+        _project_indexes_created = True
+    except Exception as e:
+        current_app.logger.warning(f"⚠️ Could not create the project listing index: {e}")
+
 @projects_bp.route('/api/projects', methods=['GET'])
 @login_required
 def get_projects():
+    """
+    One page of the user's projects, newest first, without template blobs.
+
+    Query args: limit (default 50, max 100) and cursor (next_cursor of the
+    previous page). The first page also carries the user's project count.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', PROJECTS_PAGE_SIZE)), 1), MAX_PROJECTS_PAGE_SIZE)
+    except ValueError:
+        return jsonify({'error': 'limit must be a number'}), 400
+    query = {'user_id': current_user.get_id()}
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            query['_id'] = {'$lt': ObjectId(cursor)}
+        except Exception:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
     # Access MongoDB via current_app.mongo.db
-    projects = list(current_app.mongo.db.projects.find({'user_id': current_user.get_id()}))
+    db = current_app.mongo.db
+    _ensure_project_indexes(db)
+    # ObjectIds start with their creation time, so _id order is creation order
+    projects = list(db.projects.find(query, PROJECT_WITHOUT_FILES).sort('_id', -1).limit(limit + 1))
+    next_cursor = None
+    if len(projects) > limit:
+        projects = projects[:limit]
+        next_cursor = str(projects[-1]['_id'])
     for project in projects:
         project['id'] = str(project['_id'])
         del project['_id']
-        # Remove binary file content to prevent JSON serialization error
-        if 'file_content' in project:
-            del project['file_content']
-    return jsonify({'projects': projects})
+
+    response = {'projects': projects, 'next_cursor': next_cursor}
+    if not cursor:
+        response['total'] = db.projects.count_documents({'user_id': current_user.get_id()})
+    return jsonify(response)
 
 @projects_bp.route('/api/projects', methods=['POST'])
 @login_required
@@ -7944,6 +3170,14 @@ def create_project():
     if not name or not description:
         return jsonify({'error': 'Missing required fields (name or description)'}), 400
 
+    chart_output_format = request.form.get('chart_output_format') or 'png'
+    if chart_output_format not in CHART_OUTPUT_FORMATS:
+        return jsonify({'error': f"chart_output_format must be one of {', '.join(CHART_OUTPUT_FORMATS)}"}), 400
+    try:
+        png_optimization = _png_optimization_form_value(request.form.get('png_optimization') or 'off')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     file_name = None
     file_content = None
     if file:
@@ -7958,6 +3192,8 @@ def create_project():
         'user_id': current_user.get_id(),
         'file_name': file_name,
         'file_content': file_content,  # Store file content in database
+        'chart_output_format': chart_output_format,
+        'png_optimization': png_optimization,
         'created_at': datetime.utcnow().isoformat() 
     }
     # Access MongoDB via current_app.mongo.db
@@ -7970,14 +3206,48 @@ def create_project():
         'description': project['description'],
         'user_id': project['user_id'],
         'file_name': project['file_name'],
+        'chart_output_format': project['chart_output_format'],
+        'png_optimization': project['png_optimization'],
         'created_at': project['created_at']
     }
 
     return jsonify({'message': 'Project created successfully', 'project': project_response}), 201
 
+def _report_response_headers(report_timer, report_errors):
+    """Chart error counts and stage timings of a streamed report, sent as response headers"""
+    timings = report_timer.as_dict()
+    server_timing = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings["stages"].items()]
+    server_timing.append(f"total;dur={timings['total_seconds'] * 1000:.1f}")
+    return {
+        'X-Chart-Errors': str(len(report_errors.charts) + report_errors.dropped),
+        'X-Report-Errors': str(len(report_errors.report_errors)),
+        'X-Report-Timings': json.dumps({'total_seconds': timings['total_seconds'], 'stages': timings['stages'],
+                                        'reused_charts': len(timings['reused_charts'])}, separators=(',', ':')),
+        'Server-Timing': ', '.join(server_timing),
+    }
+
+def _remove_generated_report(report_path):
+    """Delete a generated report and its temporary directory"""
+    try:
+        if os.path.exists(report_path):
+            os.remove(report_path)
+        temp_dir = os.path.dirname(report_path)
+        if os.path.exists(temp_dir) and not os.listdir(temp_dir):
+            os.rmdir(temp_dir)
+    except OSError:
+        pass
+
 @projects_bp.route('/api/projects/<project_id>/upload_report', methods=['POST'])
 @login_required
 def upload_report(project_id):
+    """
+    Generate a report from an uploaded workbook.
+
+    By default the report is kept on the server for /api/reports/<id>/download.
+    With response=docx (form field or query parameter) the DOCX is sent back in
+    this response instead, with chart error counts and stage timings in the
+    X-Chart-Errors, X-Report-Errors, X-Report-Timings and Server-Timing headers.
+    """
     current_app.logger.debug(f"📤 Upload request received for project: {project_id}")
     
     if 'report_file' not in request.files:
@@ -8059,13 +3329,11 @@ def upload_report(project_id):
     temp_report_data_path = os.path.join(temp_dir, report_data_filename)
     report_file.save(temp_report_data_path)
 
-    # Clear any existing errors for this project before starting new generation
-    if hasattr(current_app, 'chart_errors') and project_id in current_app.chart_errors:
-        current_app.chart_errors[project_id] = {}
-
     # Generate the report
     current_app.logger.debug(f"🔄 Starting report generation...")
-    generated_report_path = _generate_report(project_id, temp_template_path, temp_report_data_path)
+    generated_report_path, report_timer, report_errors = _run_generate_report(
+        project_id, temp_template_path, temp_report_data_path, chart_output_format=project.get('chart_output_format'),
+        png_optimization=project.get('png_optimization'), incremental=True)
     
     # Clean up the temporary files and directories
     import shutil
@@ -8073,17 +3341,35 @@ def upload_report(project_id):
     shutil.rmtree(temp_template_dir)
     current_app.logger.debug(f"🧹 Temporary files cleaned up")
 
-    if generated_report_path:
+    if generated_report_path and request.values.get('response') == 'docx':
+        # Sent in this response, so nothing is left on this worker for the download route
+        current_app.mongo.db.projects.update_one(
+            {'_id': project_id_obj},
+            {'$set': {'report_generated_at': datetime.utcnow().isoformat()}, '$unset': {'generated_report_path': ''}}
+        )
+        # The open handle keeps the data until it is sent (send_file's passthrough skips call_on_close callbacks)
+        report_stream = open(generated_report_path, 'rb')
+        _remove_generated_report(generated_report_path)
+        response = send_file(report_stream, as_attachment=True,
+                             mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+                             download_name=f"{secure_filename(project.get('name', '')) or 'project'}_report.docx")
+        response.headers.update(_report_response_headers(report_timer, report_errors))
+        return response
+    elif generated_report_path:
         current_app.logger.debug(f"✅ Report generated successfully: {generated_report_path}")
         # Update project with generated report path
         current_app.mongo.db.projects.update_one(
             {'_id': project_id_obj},
             {'$set': {'generated_report_path': generated_report_path, 'report_generated_at': datetime.utcnow().isoformat()}}
         )
-        return jsonify({'message': 'Report generated successfully', 'report_path': generated_report_path}), 200
+        return jsonify({
+            'message': 'Report generated successfully',
+            'report_path': generated_report_path,
+            'timings': report_timer.as_dict()
+        }), 200
     else:
         current_app.logger.error(f"❌ Report generation failed")
-        return jsonify({'error': 'Failed to generate report'}), 500
+        return jsonify({'error': 'Failed to generate report', 'timings': report_timer.as_dict()}), 500
 
 @projects_bp.route('/api/reports/<project_id>/download', methods=['GET'])
 @login_required
@@ -8093,7 +3379,7 @@ def download_report(project_id):
     except:
         return jsonify({'error': 'Invalid project ID'}), 400
 
-    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()})
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
     if not project:
         return jsonify({'error': 'Project not found or unauthorized'}), 404
 
@@ -8139,55 +3425,97 @@ def download_chart_html(chart_filename):
     # Charts are embedded in Word documents, no separate HTML files needed
     return jsonify({'error': 'Chart HTML files are not available - charts are embedded in Word documents'}), 404
 
+def _send_batch(batch):
+    """The batch ZIP with Range / If-Range support, so an interrupted download can resume"""
+    store = get_batch_artifact_store(current_app.mongo.db)
+    response = send_file(
+        store.archive_path(batch['_id']),
+        as_attachment=True,
+        download_name=f"batch_reports_{batch['project_id']}_{batch['_id'][:8]}.zip",
+        mimetype='application/zip',
+        conditional=True,
+        etag=batch['_id']
+    )
+    # Werkzeug only sets this on range responses; download managers look for it on the first one
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
 @projects_bp.route('/api/reports/batch_reports_<project_id>.zip', methods=['GET'])
 @login_required
 def download_batch_reports(project_id):
-    """Download batch reports ZIP file"""
+    """Download the project's latest batch reports ZIP (see /api/batches/<batch_id>/download for a given batch)"""
     try:
         # Validate project ID
         project_id_obj = ObjectId(project_id)
         
         # Check if project exists and belongs to user
-        project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()})
+        project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
         if not project:
             return jsonify({'error': 'Project not found or unauthorized'}), 404
         
-        # Construct the ZIP file path
-        zip_filename = f'batch_reports_{project_id}.zip'
-        zip_path = os.path.join(tempfile.gettempdir(), zip_filename)
-        
-        # Check if file exists
-        if not os.path.exists(zip_path):
+        batch = get_batch_artifact_store(current_app.mongo.db).latest(project_id, current_user.get_id())
+        if not batch:
             return jsonify({'error': 'Batch reports file not found. Please regenerate the reports.'}), 404
         
-        # Send file
-        def cleanup_after_response(response):
-            try:
-                # Clean up the ZIP file after sending
-                if os.path.exists(zip_path):
-                    os.remove(zip_path)
-                    current_app.logger.info(f"Cleaned up batch reports ZIP: {zip_path}")
-            except Exception as e:
-                pass  # Suppress warning logs: f"Failed to clean up batch reports ZIP {zip_path}: {e}")
-            return response
-        
-        response = send_file(
-            zip_path,
-            as_attachment=True,
-            download_name=zip_filename,
-            mimetype='application/zip'
-        )
-        
-        # Add cleanup callback
-        response.call_on_close(lambda: cleanup_after_response(response))
-        
-        current_app.logger.info(f"Downloading batch reports ZIP: {zip_filename}")
-        return response
+        current_app.logger.info(f"Downloading batch reports ZIP: {batch['_id']}")
+        return _send_batch(batch)
         
     except Exception as e:
         current_app.logger.error(f"Error downloading batch reports: {e}")
         return jsonify({'error': 'Failed to download batch reports'}), 500
 
+@projects_bp.route('/api/projects/<project_id>/batches', methods=['GET'])
+@login_required
+def list_batches(project_id):
+    """Batches of a project that can still be downloaded, newest first"""
+    store = get_batch_artifact_store(current_app.mongo.db)
+    batches = [batch for batch in store.list(project_id, current_user.get_id())
+               if os.path.exists(store.archive_path(batch['_id']))]
+    return jsonify({'batches': [{
+        'batch_id': batch['_id'],
+        'created_at': batch['created_at'].isoformat(),
+        'expires_at': batch['expires_at'].isoformat(),
+        'size': batch['size'],
+        'total_files': batch['result']['total_files'],
+        'processed_files': batch['result']['processed_files'],
+        'download_url': batch['result']['download_url'],
+    } for batch in batches]})
+
+@projects_bp.route('/api/batches/<batch_id>', methods=['GET'])
+@login_required
+def get_batch(batch_id):
+    batch = get_batch_artifact_store(current_app.mongo.db).get(batch_id, current_user.get_id())
+    if not batch:
+        return jsonify({'error': 'Batch not found or expired'}), 404
+    return jsonify(dict(batch['result'], project_id=batch['project_id'], size=batch['size'],
+                        created_at=batch['created_at'].isoformat(), expires_at=batch['expires_at'].isoformat()))
+
+@projects_bp.route('/api/batches/<batch_id>/download', methods=['GET'])
+@login_required
+def download_batch(batch_id):
+    """Download a batch ZIP; repeatable until the batch expires, and resumable with Range requests"""
+    batch = get_batch_artifact_store(current_app.mongo.db).get(batch_id, current_user.get_id())
+    if not batch:
+        return jsonify({'error': 'Batch not found or expired. Please regenerate the reports.'}), 404
+    return _send_batch(batch)
+
+@projects_bp.route('/api/batches/<batch_id>', methods=['DELETE'])
+@login_required
+def delete_batch(batch_id):
+    store = get_batch_artifact_store(current_app.mongo.db)
+    if not store.get(batch_id, current_user.get_id()):
+        return jsonify({'error': 'Batch not found or expired'}), 404
+    store.delete(batch_id)
+    return jsonify({'message': 'Batch deleted'})
+
+@projects_bp.route('/api/metrics/report_timings', methods=['GET'])
+@login_required
+def get_report_timing_metrics():
+    """p50/p95 latencies per report stage and per chart type for this worker process"""
+    summary = get_timing_histogram().summary()
+    summary['pid'] = os.getpid()
+    return jsonify(summary)
+
 @projects_bp.route('/api/projects/<project_id>/chart_errors', methods=['GET'])
 @login_required
 def get_chart_errors(project_id):
@@ -8196,24 +3524,12 @@ def get_chart_errors(project_id):
     except:
         return jsonify({'error': 'Invalid project ID'}), 400
 
-    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()})
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
     if not project:
         return jsonify({'error': 'Project not found or unauthorized'}), 404
 
-    # Get chart errors for this project
-    chart_errors = getattr(current_app, 'chart_errors', {}).get(project_id, {})
-    report_errors = getattr(current_app, 'report_errors', {}).get(project_id, {})
-    report_generation_errors = getattr(current_app, 'report_generation_errors', {}).get(project_id, {})
-    
-    # Combine both types of errors
-    all_errors = {
-        "chart_generation_errors": chart_errors,
-        "report_generation_errors": report_errors.get("chart_errors", []),
-        "report_generation_errors_detailed": report_generation_errors,
-        "report_generated_at": report_errors.get("generated_at")
-    }
-    
-    return jsonify(all_errors)
+    # Errors of the project's last report, whichever worker generated it
+    return jsonify(get_error_store(current_app.mongo.db).get(project_id))
 
 @projects_bp.route('/api/projects/<project_id>/clear_errors', methods=['POST'])
 @login_required
@@ -8223,225 +3539,678 @@ def clear_project_errors(project_id):
     except:
         return jsonify({'error': 'Invalid project ID'}), 400
 
-    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()})
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
     if not project:
         return jsonify({'error': 'Project not found or unauthorized'}), 404
 
-    # Clear chart errors for this project
-    if hasattr(current_app, 'chart_errors') and project_id in current_app.chart_errors:
-        current_app.chart_errors[project_id] = {}
-    
-    # Clear report errors for this project
-    if hasattr(current_app, 'report_errors') and project_id in current_app.report_errors:
-        current_app.report_errors[project_id] = {}
+    # Clear chart and report errors for this project
+    get_error_store(current_app.mongo.db).clear(project_id)
     
     return jsonify({'message': 'Project errors cleared successfully'})
 
+@projects_bp.route('/api/projects/<project_id>/preflight_zip', methods=['POST'])
+@login_required
+def preflight_zip(project_id):
+    """
+    Dry-run check of every workbook in a batch ZIP: headers, Chart_Attributes JSON and cell references.
+
+    The ZIP is either posted as zip_file or, with upload_id, one fully
+    received through the chunked batch upload.
+    """
+    import io
+
+    upload_id = request.form.get('upload_id')
+    if upload_id:
+        store = get_batch_upload_store(current_app.mongo.db)
+        upload = store.get(upload_id, current_user.get_id())
+        if not upload or upload['project_id'] != project_id:
+            return jsonify({'error': 'Upload not found'}), 404
+        if upload['received'] != upload['size']:
+            return jsonify({'error': 'The upload is not complete', 'received': upload['received']}), 409
+        zip_source = store.archive_path(upload_id)
+    elif 'zip_file' not in request.files:
+        return jsonify({'error': 'No zip file provided'}), 400
+    else:
+        zip_file = request.files['zip_file']
+        if not zip_file.filename.endswith('.zip'):
+            return jsonify({'error': 'Only .zip files are allowed'}), 400
+        zip_source = zip_file.stream
+
+    try:
+        project_id_obj = ObjectId(project_id)
+    except Exception:
+        return jsonify({'error': 'Invalid project ID'}), 400
+
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
+    if not project:
+        return jsonify({'error': 'Project not found or unauthorized'}), 404
+
+    started = time.perf_counter()
+    files = []
+    try:
+        with zipfile.ZipFile(zip_source) as zip_ref:
+            members = [info for info in zip_ref.infolist() if is_batch_workbook(info.filename)]
+            for info in members:
+                file_started = time.perf_counter()
+                if info.filename.endswith('.xls'):
+                    errors, warnings, details = ["Legacy .xls workbooks are not supported, save the file as .xlsx"], [], {}
+                else:
+                    workbook = io.BytesIO()
+                    try:
+                        copy_member(zip_ref, info, workbook)
+                    except UnsafeMember as e:
+                        errors, warnings, details = [str(e)], [], {}
+                    else:
+                        workbook.seek(0)
+                        errors, warnings, details = preflight_excel_workbook(workbook)
+                files.append({
+                    'file': info.filename,
+                    'valid': not errors,
+                    'errors': errors,
+                    'warnings': warnings,
+                    'charts': details.get('charts', 0),
+                    'report_name': details.get('report_name'),
+                    'report_code': details.get('report_code'),
+                    'seconds': round(time.perf_counter() - file_started, 4)
+                })
+    except zipfile.BadZipFile:
+        return jsonify({'error': 'The uploaded ZIP file is corrupted or invalid'}), 400
+
+    if not files:
+        return jsonify({'error': 'No Excel files (.xlsx or .xls) found in the uploaded ZIP file'}), 400
+
+    valid_files = sum(1 for f in files if f['valid'])
+    current_app.logger.info(f"Preflight for project {project_id}: {valid_files}/{len(files)} workbooks valid")
+    return jsonify({
+        'total_files': len(files),
+        'valid_files': valid_files,
+        'invalid_files': len(files) - valid_files,
+        'files': files,
+        'seconds': round(time.perf_counter() - started, 4)
+    })
+
+@projects_bp.route('/api/projects/<project_id>/preview_charts', methods=['POST'])
+@login_required
+def preview_charts(project_id):
+    """Render selected charts of a workbook as low-DPI PNGs (Plotly charts as figure JSON) without building a report"""
+    import base64
+
+    report_file = request.files.get('report_file')
+    if not report_file or report_file.filename == '':
+        return jsonify({'error': 'No report file provided'}), 400
+    if not allowed_report_file(report_file.filename):
+        return jsonify({'error': 'Report file type not allowed. Only .xlsx or .csv are accepted.'}), 400
+
+    # chart_tags may be repeated or comma separated
+    chart_tags = list(dict.fromkeys(tag.strip() for value in request.form.getlist('chart_tags')
+                                    for tag in value.split(',') if tag.strip()))
+    if not chart_tags:
+        return jsonify({'error': 'No chart tags provided'}), 400
+    if len(chart_tags) > MAX_PREVIEW_CHARTS:
+        return jsonify({'error': f'At most {MAX_PREVIEW_CHARTS} charts can be previewed at once'}), 400
+    try:
+        dpi = min(max(int(request.form.get('dpi', PREVIEW_DPI)), 24), PREVIEW_MAX_DPI)
+    except ValueError:
+        return jsonify({'error': 'dpi must be a number'}), 400
+
+    try:
+        project_id_obj = ObjectId(project_id)
+    except Exception:
+        return jsonify({'error': 'Invalid project ID'}), 400
+
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
+    if not project:
+        return jsonify({'error': 'Project not found or unauthorized'}), 404
+
+    started = time.perf_counter()
+    temp_dir = tempfile.mkdtemp()
+    # Preview errors stay in memory and never replace the project's report errors
+    preview_id = f"{project_id}_preview"
+    charts = []
+    try:
+        data_path = os.path.join(temp_dir, secure_filename(report_file.filename))
+        report_file.save(data_path)
+        previews, report_timer, report_errors = _run_generate_report(preview_id, None, data_path,
+                                                                     preview_tags=chart_tags, preview_dpi=dpi)
+        seconds = {chart['tag']: chart['seconds'] for chart in report_timer.charts}
+        errors = report_errors.detailed()
+
+        for tag in chart_tags:
+            entry = {'tag': tag}
+            if previews is None:
+                entry['error'] = 'The workbook could not be read'
+            elif tag not in previews:
+                entry['error'] = 'Chart tag not found in the workbook'
+            elif previews[tag] is None:
+                entry['error'] = errors.get(tag, {}).get('error', 'Chart could not be generated')
+            elif isinstance(previews[tag], str):
+                with open(previews[tag], 'rb') as f:
+                    entry.update(format='png', image=base64.b64encode(f.read()).decode('ascii'))
+                os.remove(previews[tag])
+            else:
+                entry.update(format='plotly', figure=json.loads(previews[tag].to_json()))
+            if tag in seconds:
+                entry['seconds'] = seconds[tag]
+            charts.append(entry)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return jsonify({
+        'charts': charts,
+        'dpi': dpi,
+        'seconds': round(time.perf_counter() - started, 4)
+    })
+
+def _project_template(project):
+    """(file_name, content) of a project's Word template, or (None, None) if it has none"""
+    template_file_name = project.get('file_name')
+    template_file_content = project.get('file_content')
+
+    # Backward compatibility: if new format not found, try old format
+    if not template_file_name or not template_file_content:
+        old_file_path = project.get('file_path')
+        if not old_file_path:
+            current_app.logger.error(f"❌ No template file found for batch processing")
+            return None, None
+        abs_file_path = os.path.join(os.path.abspath(os.path.dirname(__file__)), old_file_path)
+        if not os.path.exists(abs_file_path):
+            current_app.logger.error(f"❌ Old template file not found for batch processing: {abs_file_path}")
+            return None, None
+        with open(abs_file_path, 'rb') as f:
+            template_file_content = f.read()
+        template_file_name = os.path.basename(old_file_path)
+    return template_file_name, template_file_content
+
+def _generate_batch_report(project_id, project, template_path, excel_path, idx, total_files, original_name=None):
+    """
+    Validate one workbook of a batch and generate its report.
+
+    Returns (entry, output_path) with the entry listed in the batch response,
+    or None when the workbook is skipped or its report fails.
+    """
+    import gc
+
+    original_name = original_name or os.path.basename(excel_path)
+    current_app.logger.info(f"🔍 Starting to process file {idx}/{total_files}: {original_name}")
+    # Force garbage collection before processing each file
+    gc.collect()
+
+    # Validate Excel structure first
+    is_valid, validation_message = validate_excel_structure(excel_path)
+    if not is_valid:
+        current_app.logger.error(f"❌ Invalid Excel structure in {original_name}: {validation_message}")
+        return None
+    current_app.logger.info(f"✅ Excel structure validated for {original_name}")
+
+    # Extract report name and code from Excel file
+    try:
+        report_name, report_code = extract_report_info_from_excel(excel_path)
+        current_app.logger.info(f"📋 Extracted info: {report_name} (Code: {report_code})")
+    except Exception as e:
+        current_app.logger.error(f"❌ Failed to extract report info from {original_name}: {e}")
+        return None
+
+    try:
+        output_path, report_timer, _ = _run_generate_report(
+            f"{project_id}_{idx}", template_path, excel_path,
+            chart_output_format=project.get('chart_output_format'), png_optimization=project.get('png_optimization'))
+    except Exception as e:
+        current_app.logger.error(f"❌ Error processing file {idx}/{total_files} ({original_name}): {e}")
+        return None
+    finally:
+        # Force cleanup after each report
+        gc.collect()
+
+    if not output_path:
+        current_app.logger.error(f"❌ Failed to generate report {idx}/{total_files}: {report_name}")
+        return None
+    current_app.logger.info(f"✅ Successfully generated report {idx}/{total_files}: {report_name} -> {report_code}")
+    return {
+        'name': report_name,
+        'code': report_code,
+        'original_file': os.path.splitext(original_name)[0],  # Original Excel filename without extension
+        'report_name': report_name,
+        'report_code': report_code,
+        'status': 'generated',
+        'timings': report_timer.as_dict()
+    }, output_path
+
+def _deduplicated_entry(entry, original_name):
+    """Batch entry of a workbook whose report is reused from an identical workbook earlier in the batch"""
+    return dict(entry, original_file=os.path.splitext(original_name)[0], status='deduplicated',
+                duplicate_of=entry['original_file'], timings={})
+
+def _open_batch_archive():
+    """
+    (BatchArchive, batch_id) for a new batch's download ZIP in the batch artifact store.
+
+    The ZIP is compressed per BATCH_ZIP_COMPRESSION / BATCH_ZIP_COMPRESSLEVEL while reports are generated.
+    """
+    compression, compresslevel = compression_settings(current_app.config)
+    store = get_batch_artifact_store(current_app.mongo.db)
+    batch_id = store.new_batch_id()
+    return BatchArchive(store.archive_path(batch_id), compression, compresslevel), batch_id
+
+def _batch_response(project_id, batch_id, generated_files, total_files, final_zip_path):
+    """Save the batch result under its batch id and return it"""
+    current_app.logger.info(f"Batch processing complete. Generated {len(generated_files)} out of {total_files} reports")
+
+    # Log summary of results
+    if len(generated_files) < total_files:
+        current_app.logger.info(f"✅ Successfully processed: {[f['name'] for f in generated_files]}")
+    else:
+        current_app.logger.info(f"✅ All {total_files} files processed successfully!")
+
+    result = {
+        'message': f'Generated {len(generated_files)} out of {total_files} reports.',
+        'batch_id': batch_id,
+        'download_url': f"/api/batches/{batch_id}/download",
+        'reports': generated_files,
+        'total_files': total_files,
+        'processed_files': len(generated_files),
+        'deduplicated_files': sum(1 for f in generated_files if f.get('status') == 'deduplicated'),
+        'success_rate': f"{len(generated_files)}/{total_files}"
+    }
+    batch = get_batch_artifact_store(current_app.mongo.db).save(batch_id, project_id, current_user.get_id(), result)
+    return jsonify(dict(result, download_zip=final_zip_path, expires_at=batch['expires_at'].isoformat()))
+
 @projects_bp.route('/api/projects/<project_id>/upload_zip', methods=['POST'])
 @login_required
 def upload_zip_and_generate_reports(project_id):
     import gc  # Add garbage collection import
-    import matplotlib.pyplot as plt  # Add matplotlib import
-    
+
     if 'zip_file' not in request.files:
         return jsonify({'error': 'No zip file provided'}), 400
 
     zip_file = request.files['zip_file']
     if not zip_file.filename.endswith('.zip'):
         return jsonify({'error': 'Only .zip files are allowed'}), 400
-    
+
     if zip_file.filename == '':
         return jsonify({'error': 'No ZIP file selected'}), 400
 
-    # Clear any existing errors for this project before starting new generation
-    if hasattr(current_app, 'chart_errors') and project_id in current_app.chart_errors:
-        current_app.chart_errors[project_id] = {}
-
     # Prepare temp directories
     temp_dir = tempfile.mkdtemp()
-    extracted_dir = os.path.join(temp_dir, 'extracted')
-    os.makedirs(extracted_dir, exist_ok=True)
+    members_dir = os.path.join(temp_dir, 'members')
+    os.makedirs(members_dir, exist_ok=True)
 
-    # Save and extract ZIP
+    # Save the ZIP; its Excel members are streamed out one at a time as they are processed
     zip_path = os.path.join(temp_dir, secure_filename(zip_file.filename))
     zip_file.save(zip_path)
     current_app.logger.info(f"ZIP file saved: {zip_path}")
-    
+
     try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # Test if ZIP is valid
-            zip_ref.testzip()
-            zip_ref.extractall(extracted_dir)
-            current_app.logger.info(f"ZIP extracted to: {extracted_dir}")
-            current_app.logger.info(f"ZIP contents: {zip_ref.namelist()}")
+        zip_ref = zipfile.ZipFile(zip_path, 'r')
     except zipfile.BadZipFile:
         current_app.logger.error(f"❌ Corrupted ZIP file: {zip_file.filename}")
         shutil.rmtree(temp_dir)
         return jsonify({'error': 'The uploaded ZIP file is corrupted or invalid'}), 400
-    except Exception as e:
-        current_app.logger.error(f"❌ Error extracting ZIP: {e}")
-        shutil.rmtree(temp_dir)
-        return jsonify({'error': f'Error extracting ZIP file: {str(e)}'}), 500
-
-    # Find all Excel files (including in subdirectories)
-    excel_files = []
-    for root, dirs, files in os.walk(extracted_dir):
-        for file in files:
-            if file.endswith('.xlsx') or file.endswith('.xls'):
-                excel_files.append(os.path.join(root, file))
-    
-    current_app.logger.info(f"Found {len(excel_files)} Excel files in ZIP: {[os.path.basename(f) for f in excel_files]}")
 
-    # Prepare temporary output folders
-    output_folder_name = os.path.join(temp_dir, 'reports_by_name')
-    output_folder_code = os.path.join(temp_dir, 'reports_by_code')
-    os.makedirs(output_folder_name, exist_ok=True)
-    os.makedirs(output_folder_code, exist_ok=True)
+    # The central directory lists every Excel file (including in subdirectories) without reading any data
+    excel_members = [info for info in zip_ref.infolist() if is_batch_workbook(info.filename)]
+    current_app.logger.info(f"Found {len(excel_members)} Excel files in ZIP: {[info.filename for info in excel_members]}")
+
+    generated = []
+    total_files = len(excel_members)
 
-    generated_files = []
-    total_files = len(excel_files)
-    
     if total_files == 0:
         current_app.logger.error(f"❌ No Excel files found in ZIP: {zip_file.filename}")
         # Clean up temp directory
+        zip_ref.close()
         shutil.rmtree(temp_dir)
         return jsonify({'error': 'No Excel files (.xlsx or .xls) found in the uploaded ZIP file'}), 400
-    
+
     current_app.logger.info(f"Starting batch processing of {total_files} Excel files")
-    
-    for idx, excel_path in enumerate(excel_files, 1):
-        current_app.logger.info(f"🔍 Starting to process file {idx}/{total_files}: {os.path.basename(excel_path)}")
-        
-        # Force garbage collection before processing each file
-        gc.collect()
-        plt.close('all')
-        
-        # Validate Excel structure first
-        is_valid, validation_message = validate_excel_structure(excel_path)
-        if not is_valid:
-            current_app.logger.error(f"❌ Invalid Excel structure in {os.path.basename(excel_path)}: {validation_message}")
-            continue
-        
-        current_app.logger.info(f"✅ Excel structure validated for {os.path.basename(excel_path)}")
-        
-        # Extract report name and code from Excel file
-        try:
-            report_name, report_code = extract_report_info_from_excel(excel_path)
-            current_app.logger.info(f"📋 Extracted info: {report_name} (Code: {report_code})")
-        except Exception as e:
-            current_app.logger.error(f"❌ Failed to extract report info from {os.path.basename(excel_path)}: {e}")
-            continue
 
-        # Generate report
-        project = current_app.mongo.db.projects.find_one({'_id': ObjectId(project_id)})
-        
-        # Handle both old and new project formats
-        template_file_name = project.get('file_name')
-        template_file_content = project.get('file_content')
-        
-        # Backward compatibility: if new format not found, try old format
-        if not template_file_name or not template_file_content:
-            old_file_path = project.get('file_path')
-            if old_file_path:
-                abs_file_path = os.path.join(os.path.abspath(os.path.dirname(__file__)), old_file_path)
-                if os.path.exists(abs_file_path):
-                    with open(abs_file_path, 'rb') as f:
-                        template_file_content = f.read()
-                    template_file_name = os.path.basename(old_file_path)
-                else:
-                    current_app.logger.error(f"❌ Old template file not found for batch processing: {abs_file_path}")
-                    continue
-            else:
-                current_app.logger.error(f"❌ No template file found for batch processing")
-                continue
-        
-        # Create temporary template file
-        temp_template_dir = tempfile.mkdtemp()
-        temp_template_path = os.path.join(temp_template_dir, template_file_name)
-        with open(temp_template_path, 'wb') as f:
-            f.write(template_file_content)
-        
-        try:
-            output_path = _generate_report(f"{project_id}_{idx}", temp_template_path, excel_path)
-            
-            # Clean up temporary template
-            shutil.rmtree(temp_template_dir)
-            
-            if output_path:
-                # Save in both folders with clean naming (using only report name/code)
-                base_filename = os.path.splitext(os.path.basename(excel_path))[0]  # Get original Excel filename without extension
-                name_file_path = os.path.join(output_folder_name, f"{report_name}.docx")
-                code_file_path = os.path.join(output_folder_code, f"{report_code}.docx")
-                
-                shutil.copy(output_path, name_file_path)
-                shutil.copy(output_path, code_file_path)
-                
-                generated_files.append({
-                    'name': report_name, 
-                    'code': report_code,
-                    'original_file': base_filename,
-                    'report_name': report_name,
-                    'report_code': report_code
-                })
-                current_app.logger.info(f"✅ Successfully generated report {idx}/{total_files}: {report_name} -> {report_code}")
+    project = current_app.mongo.db.projects.find_one({'_id': ObjectId(project_id)})
+    template_file_name, template_file_content = _project_template(project or {})
+    if not template_file_content:
+        zip_ref.close()
+        shutil.rmtree(temp_dir)
+        return jsonify({'error': 'Word template file not found for this project. Please upload it during project creation.'}), 400
+
+    # One template copy serves every file of the batch
+    temp_template_dir = os.path.join(temp_dir, 'template')
+    os.makedirs(temp_template_dir, exist_ok=True)
+    temp_template_path = os.path.join(temp_template_dir, template_file_name)
+    with open(temp_template_path, 'wb') as f:
+        f.write(template_file_content)
+
+    # Files of this batch that have not been started yet, exported as queue depth on /metrics
+    metrics = get_metrics()
+    pending_files = total_files
+    metrics.add_gauge('graph_queue_depth', pending_files, queue='batch_files_pending')
+
+    archive, batch_id = _open_batch_archive()
+    # Identical (or re-saved) workbooks are generated once
+    duplicates = BatchDuplicates()
+    try:
+        for idx, info in enumerate(excel_members, 1):
+            pending_files -= 1
+            metrics.add_gauge('graph_queue_depth', -1, queue='batch_files_pending')
+            original_name = os.path.basename(info.filename)
+            excel_path = os.path.join(members_dir, f"{idx}{os.path.splitext(original_name)[1]}")
+            try:
+                with open(excel_path, 'wb') as target:
+                    copy_member(zip_ref, info, target)
+            except Exception as e:
+                # Corrupt, encrypted or oversized members are skipped like any other failed file
+                current_app.logger.error(f"❌ Could not read {info.filename} from the ZIP: {e}")
+                result = None
             else:
-                current_app.logger.error(f"❌ Failed to generate report {idx}/{total_files}: {report_name}")
-        except Exception as e:
-            current_app.logger.error(f"❌ Error processing file {idx}/{total_files} ({os.path.basename(excel_path)}): {e}")
-            # Clean up temporary template if it exists
-            if os.path.exists(temp_template_dir):
-                shutil.rmtree(temp_template_dir)
-        
-        # Log progress
-        current_app.logger.info(f"Progress: {idx}/{total_files} reports processed")
-        
-        # Force cleanup after each report
-        gc.collect()
-        plt.close('all')
-
-    # Create zip file in temporary location with both folder structures
-    zip_output_path = os.path.join(temp_dir, f'batch_reports_{project_id}.zip')
-    with zipfile.ZipFile(zip_output_path, 'w') as zipf:
-        # Add files from both folders to maintain the folder structure
-        for file_info in generated_files:
-            # Add file from reports_by_name folder
-            name_file_path = os.path.join(output_folder_name, f"{file_info['name']}.docx")
-            if os.path.exists(name_file_path):
-                zipf.write(name_file_path, arcname=f"reports_by_name/{file_info['name']}.docx")
-            
-            # Add file from reports_by_code folder
-            code_file_path = os.path.join(output_folder_code, f"{file_info['code']}.docx")
-            if os.path.exists(code_file_path):
-                zipf.write(code_file_path, arcname=f"reports_by_code/{file_info['code']}.docx")
-
-    # Move zip to a temporary location that will be cleaned up after download
-    final_zip_path = os.path.join(tempfile.gettempdir(), f'batch_reports_{project_id}.zip')
-    shutil.move(zip_output_path, final_zip_path)
-    
+                digests = workbook_digests(excel_path)
+                earlier = duplicates.find(digests)
+                if earlier:
+                    current_app.logger.info(f"♻️ {original_name} is identical to {earlier[0]['original_file']}, reusing its report")
+                    result = (_deduplicated_entry(earlier[0], original_name), earlier[1])
+                else:
+                    result = _generate_batch_report(project_id, project, temp_template_path, excel_path, idx, total_files,
+                                                    original_name=original_name)
+                    if result:
+                        duplicates.add(digests, result)
+            finally:
+                if os.path.exists(excel_path):
+                    os.remove(excel_path)
+            if result:
+                generated.append(result)
+                # Compressed in the background while the next file is generated
+                archive.add_report(*result)
+            # Log progress
+            current_app.logger.info(f"Progress: {idx}/{total_files} reports processed")
+        final_zip_path = archive.close()
+    except BaseException:
+        archive.abort()
+        raise
+    finally:
+        zip_ref.close()
+        # Files skipped by an unexpected error are no longer pending
+        metrics.add_gauge('graph_queue_depth', -pending_files, queue='batch_files_pending')
+
     # Clean up temp directory
     shutil.rmtree(temp_dir)
-    
+    for _, output_path in generated:
+        _remove_generated_report(output_path)
+
     # Final cleanup after batch processing
     gc.collect()
-    plt.close('all')
 
-    current_app.logger.info(f"Batch processing complete. Generated {len(generated_files)} out of {total_files} reports")
-    
-    # Log summary of results
-    if len(generated_files) < total_files:
-        pass  # Suppress warning logs: f"⚠️  {total_files - len(generated_files)} files failed to process")
-        current_app.logger.info(f"✅ Successfully processed: {[f['name'] for f in generated_files]}")
-    else:
-        current_app.logger.info(f"✅ All {total_files} files processed successfully!")
+    return _batch_response(project_id, batch_id, [entry for entry, _ in generated], total_files, final_zip_path)
 
-    return jsonify({
-        'message': f'Generated {len(generated_files)} out of {total_files} reports.',
-        'download_zip': final_zip_path,
-        'reports': generated_files,
-        'total_files': total_files,
-        'processed_files': len(generated_files),
-        'success_rate': f"{len(generated_files)}/{total_files}"
-    })
+_member_generation = set()
+_member_generation_lock = threading.Lock()
+
+def _batch_upload_template(store, upload_id, project):
+    """Path of the project's template inside an upload's directory, written on first use"""
+    template_file_name, template_file_content = _project_template(project)
+    if not template_file_content:
+        return None
+    template_dir = os.path.join(store.upload_dir(upload_id), 'template')
+    template_path = os.path.join(template_dir, secure_filename(template_file_name) or 'template.docx')
+    if not os.path.exists(template_path):
+        os.makedirs(template_dir, exist_ok=True)
+        partial_path = f"{template_path}.{os.getpid()}.{threading.get_ident()}.partial"
+        with open(partial_path, 'wb') as f:
+            f.write(template_file_content)
+        os.replace(partial_path, template_path)
+    return template_path
+
+def _generate_upload_member(store, upload, project, template_path, member, position, total_files, zip_ref=None):
+    """Generate the report of one claimed member and record the outcome for every worker"""
+    upload_dir = store.upload_dir(upload['_id'])
+    os.makedirs(os.path.join(upload_dir, 'members'), exist_ok=True)
+    os.makedirs(os.path.join(upload_dir, 'reports'), exist_ok=True)
+    excel_path = os.path.join(upload_dir, 'members', f"{member['offset']}{os.path.splitext(member['name'])[1]}")
+    result, digests = None, {}
+    # The claim is refreshed while the report is generated, so only a dead worker's claim goes stale
+    with store.heartbeat(upload['_id'], member['offset']):
+        try:
+            if zip_ref is not None:
+                with open(excel_path, 'wb') as target:
+                    copy_member(zip_ref, zip_ref.getinfo(member['name']), target)
+            else:
+                store.extract_member(upload['_id'], member, excel_path)
+            original_name = os.path.basename(member['name'])
+            digests = workbook_digests(excel_path)
+            # Identical (or re-saved) workbooks already generated in this upload, by any worker, are reused
+            earlier = store.find_duplicate(upload['_id'], digests)
+            if earlier:
+                current_app.logger.info(f"♻️ {original_name} is identical to {earlier['entry']['original_file']}, reusing its report")
+                result = {'entry': _deduplicated_entry(earlier['entry'], original_name), 'report_path': earlier['report_path']}
+                # Only generated members are matched against, so duplicate_of always names the generated one
+                digests = {}
+            else:
+                generated = _generate_batch_report(upload['project_id'], project, template_path, excel_path, position,
+                                                   total_files, original_name=original_name)
+                if generated:
+                    entry, output_path = generated
+                    report_path = os.path.join(upload_dir, 'reports', f"{member['offset']}.docx")
+                    shutil.move(output_path, report_path)
+                    _remove_generated_report(output_path)
+                    result = {'entry': entry, 'report_path': report_path}
+        except Exception as e:
+            current_app.logger.error(f"❌ Error processing {member['name']} of upload {upload['_id']}: {e}")
+        finally:
+            if os.path.exists(excel_path):
+                os.remove(excel_path)
+    store.finish_member(upload['_id'], member['offset'], result, digests)
+    return result
+
+def _generate_arrived_members(app, upload_id, user_id):
+    """Background thread: generate members that have fully arrived while the upload continues"""
+    try:
+        with app.app_context():
+            store = get_batch_upload_store(current_app.mongo.db)
+            upload = store.get(upload_id, user_id)
+            project = current_app.mongo.db.projects.find_one({'_id': ObjectId(upload['project_id'])}) if upload else None
+            template_path = _batch_upload_template(store, upload_id, project) if project else None
+            while template_path:
+                upload = store.get(upload_id, user_id)
+                if not upload or upload['status'] != 'uploading':
+                    break
+                members = store.list_members(upload_id)
+                claimed = next(((position, member) for position, member in enumerate(members, 1)
+                                if member['status'] == 'arrived' and store.claim_member(upload_id, member['offset'], ('arrived',))),
+                               None)
+                if claimed is None:
+                    break
+                position, member = claimed
+                _generate_upload_member(store, upload, project, template_path, member, position, '?')
+    finally:
+        with _member_generation_lock:
+            _member_generation.discard(upload_id)
+
+def _start_member_generation(upload_id, user_id):
+    """Start generating arrived members in this worker unless it already is"""
+    with _member_generation_lock:
+        if upload_id in _member_generation:
+            return
+        _member_generation.add(upload_id)
+    threading.Thread(target=_generate_arrived_members, daemon=True,
+                     args=(current_app._get_current_object(), upload_id, user_id)).start()
+
+def _upload_status(upload, store):
+    members = store.list_members(upload['_id'])
+    return {
+        'upload_id': upload['_id'],
+        'filename': upload['filename'],
+        'size': upload['size'],
+        'received': upload['received'],
+        'status': upload['status'],
+        'chunk_size': UPLOAD_CHUNK_SIZE,
+        'members_arrived': len(members),
+        'members_generated': sum(1 for member in members if member['status'] in ('done', 'failed')),
+    }
+
+@projects_bp.route('/api/projects/<project_id>/batch_uploads', methods=['POST'])
+@login_required
+def create_batch_upload(project_id):
+    """
+    Start a chunked batch ZIP upload.
+
+    JSON body: filename, size (bytes) and optionally sha256 (hex). The bytes
+    are then sent in order with PUT /api/batch_uploads/<upload_id> and
+    Content-Range: bytes <first>-<last>/<size>; GET on the same URL returns
+    the number of bytes received, to resume from after a failure. POST
+    .../complete verifies the checksum and returns the upload_zip response.
+    """
+    data = request.get_json(silent=True) or {}
+    filename = data.get('filename') or ''
+    if not filename.endswith('.zip'):
+        return jsonify({'error': 'Only .zip files are allowed'}), 400
+    sha256 = data.get('sha256')
+    if sha256 and not re.fullmatch(r'[0-9a-fA-F]{64}', sha256):
+        return jsonify({'error': 'sha256 must be 64 hexadecimal characters'}), 400
+    try:
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'size must be the ZIP size in bytes'}), 400
+
+    try:
+        project_id_obj = ObjectId(project_id)
+    except Exception:
+        return jsonify({'error': 'Invalid project ID'}), 400
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
+    if not project:
+        return jsonify({'error': 'Project not found or unauthorized'}), 404
+
+    store = get_batch_upload_store(current_app.mongo.db)
+    try:
+        upload = store.create(project_id, current_user.get_id(), secure_filename(filename), size, sha256)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(_upload_status(upload, store)), 201
+
+@projects_bp.route('/api/batch_uploads/<upload_id>', methods=['GET'])
+@login_required
+def get_batch_upload(upload_id):
+    store = get_batch_upload_store(current_app.mongo.db)
+    upload = store.get(upload_id, current_user.get_id())
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify(_upload_status(upload, store))
+
+@projects_bp.route('/api/batch_uploads/<upload_id>', methods=['PUT'])
+@login_required
+def put_batch_upload_chunk(upload_id):
+    """Append one chunk; 409 with the bytes received so far when it does not start there"""
+    store = get_batch_upload_store(current_app.mongo.db)
+    upload = store.get(upload_id, current_user.get_id())
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+
+    match = re.fullmatch(r'bytes (\d+)-(\d+)/(\d+)', request.headers.get('Content-Range', ''))
+    if not match:
+        return jsonify({'error': 'Content-Range: bytes <first>-<last>/<size> is required'}), 400
+    first, last, total = (int(value) for value in match.groups())
+    if total != upload['size'] or last < first:
+        return jsonify({'error': 'Content-Range does not match the upload'}), 400
+
+    try:
+        received = store.write_chunk(upload, first, request.stream, last - first + 1)
+    except UploadConflict as e:
+        return jsonify({'error': str(e), 'received': e.received}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e), 'received': upload['received']}), 400
+
+    # Workbooks whose bytes are all here can be generated while the rest is uploaded
+    if store.scan_members(upload) or any(member['status'] == 'arrived' for member in store.list_members(upload_id)):
+        _start_member_generation(upload_id, current_user.get_id())
+    return jsonify({'upload_id': upload_id, 'received': received, 'size': upload['size']})
+
+@projects_bp.route('/api/batch_uploads/<upload_id>', methods=['DELETE'])
+@login_required
+def delete_batch_upload(upload_id):
+    store = get_batch_upload_store(current_app.mongo.db)
+    if not store.get(upload_id, current_user.get_id()):
+        return jsonify({'error': 'Upload not found'}), 404
+    store.delete(upload_id)
+    return jsonify({'message': 'Upload deleted'})
+
+@projects_bp.route('/api/batch_uploads/<upload_id>/complete', methods=['POST'])
+@login_required
+def complete_batch_upload(upload_id):
+    """Verify a fully received upload and generate the reports that are not done yet"""
+    import gc
+
+    store = get_batch_upload_store(current_app.mongo.db)
+    upload = store.get(upload_id, current_user.get_id())
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    if upload['status'] != 'uploading':
+        return jsonify({'error': f"Upload is already {upload['status']}"}), 409
+    try:
+        sha256 = store.verify(upload)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'received': upload['received']}), 400
+    store.set_status(upload_id, 'generating')
+    upload['status'] = 'generating'
+
+    project = current_app.mongo.db.projects.find_one({'_id': ObjectId(upload['project_id'])})
+    template_path = _batch_upload_template(store, upload_id, project) if project else None
+    if not template_path:
+        store.delete(upload_id)
+        return jsonify({'error': 'Word template file not found for this project. Please upload it during project creation.'}), 400
+
+    try:
+        zip_ref = zipfile.ZipFile(store.archive_path(upload_id))
+    except zipfile.BadZipFile:
+        store.delete(upload_id)
+        return jsonify({'error': 'The uploaded ZIP file is corrupted or invalid'}), 400
+
+    generated = []
+    archive, batch_id = _open_batch_archive()
+    try:
+        with zip_ref:
+            # The central directory lists every member, including those the header scan could not size
+            workbooks = {info.header_offset: info for info in zip_ref.infolist() if is_batch_workbook(info.filename)}
+            if not workbooks:
+                archive.abort()
+                return jsonify({'error': 'No Excel files (.xlsx or .xls) found in the uploaded ZIP file'}), 400
+            recorded = {member['offset'] for member in store.list_members(upload_id)}
+            for offset, info in workbooks.items():
+                if offset not in recorded:
+                    store.add_member(upload_id, offset, info.filename)
+            total_files = len(workbooks)
+            current_app.logger.info(f"Completing upload {upload_id} ({sha256[:12]}): {total_files} Excel files")
+
+            # Members another worker is generating are awaited until this deadline, then given up as failed
+            deadline = time.monotonic() + MEMBER_WAIT_SECONDS
+            for position, offset in enumerate(sorted(workbooks), 1):
+                # Members generated early are collected; others are generated here, or awaited if another worker has them
+                while True:
+                    member = next((m for m in store.list_members(upload_id) if m['offset'] == offset), None)
+                    if member is None:
+                        current_app.logger.error(f"❌ {workbooks[offset].filename} is no longer recorded for upload {upload_id}")
+                        result = None
+                        break
+                    if member['status'] in ('done', 'failed'):
+                        result = member.get('result')
+                        break
+                    if store.claim_member(upload_id, offset):
+                        result = _generate_upload_member(store, upload, project, template_path,
+                                                         dict(member, name=workbooks[offset].filename),
+                                                         position, total_files, zip_ref=zip_ref)
+                        break
+                    if time.monotonic() >= deadline:
+                        current_app.logger.error(f"❌ Gave up waiting for {workbooks[offset].filename} of upload {upload_id}")
+                        store.abandon_member(upload_id, offset)
+                        result = None
+                        break
+                    time.sleep(0.5)
+                if result and os.path.exists(result['report_path']):
+                    generated.append((result['entry'], result['report_path']))
+                    archive.add_report(result['entry'], result['report_path'])
+                current_app.logger.info(f"Progress: {position}/{total_files} reports processed")
+
+        final_zip_path = archive.close()
+    except BaseException:
+        archive.abort()
+        raise
+    finally:
+        store.delete(upload_id)
+        gc.collect()
+
+    return _batch_response(upload['project_id'], batch_id, [entry for entry, _ in generated], total_files, final_zip_path)
 
 @projects_bp.route('/api/projects/<project_id>', methods=['PUT'])
 @login_required
@@ -8462,7 +4231,7 @@ def update_project(project_id):
             return jsonify({'error': 'Database connection failed'}), 500
 
         # Check if project exists and belongs to user
-        project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()})
+        project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
         if not project:
             pass  # Suppress warning logs: f"Project not found or unauthorized: {project_id} for user {current_user.get_id()}")
             return jsonify({'error': 'Project not found or unauthorized'}), 404
@@ -8486,6 +4255,18 @@ def update_project(project_id):
             'updated_at': datetime.utcnow().isoformat()
         }
 
+        # Chart image format is optional; an omitted field keeps the current setting
+        chart_output_format = request.form.get('chart_output_format')
+        if chart_output_format:
+            if chart_output_format not in CHART_OUTPUT_FORMATS:
+                return jsonify({'error': f"chart_output_format must be one of {', '.join(CHART_OUTPUT_FORMATS)}"}), 400
+            update_data['chart_output_format'] = chart_output_format
+        if request.form.get('png_optimization'):
+            try:
+                update_data['png_optimization'] = _png_optimization_form_value(request.form.get('png_optimization'))
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+
         # Handle file upload if provided
         if file:
             if not allowed_file(file.filename):
@@ -8539,15 +4320,11 @@ def update_project(project_id):
                 return jsonify({'error': 'Failed to update project'}), 500
 
             # Get updated project
-            updated_project = current_app.mongo.db.projects.find_one({'_id': project_id_obj})
+            updated_project = current_app.mongo.db.projects.find_one({'_id': project_id_obj}, PROJECT_WITHOUT_FILES)
             if not updated_project:
                 current_app.logger.error(f"Failed to retrieve updated project {project_id}")
                 return jsonify({'error': 'Failed to retrieve updated project'}), 500
 
-            # Remove binary file_content to prevent JSON serialization error
-            if 'file_content' in updated_project:
-                del updated_project['file_content']
-
             updated_project['id'] = str(updated_project['_id'])
             del updated_project['_id']
 
@@ -8571,7 +4348,7 @@ def delete_project(project_id):
         return jsonify({'error': 'Invalid project ID'}), 400
 
     # Check if project exists and belongs to user
-    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()})
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
     if not project:
         return jsonify({'error': 'Project not found or unauthorized'}), 404
 
@@ -8594,14 +4371,10 @@ def get_project(project_id):
         return jsonify({'error': 'Invalid project ID'}), 400
 
     # Check if project exists and belongs to user
-    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()})
+    project = current_app.mongo.db.projects.find_one({'_id': project_id_obj, 'user_id': current_user.get_id()}, PROJECT_WITHOUT_FILES)
     if not project:
         return jsonify({'error': 'Project not found or unauthorized'}), 404
 
-    # Remove binary file_content to prevent JSON serialization error
-    if 'file_content' in project:
-        del project['file_content']
-
     project['id'] = str(project['_id'])
     del project['_id']
     
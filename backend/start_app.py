@@ -10,9 +10,13 @@ import subprocess
 from pathlib import Path
 
 # Set environment variables
-os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
 os.environ['FLASK_ENV'] = 'production'
 
+# Gunicorn reads and writes bytecode under this directory instead of __pycache__ folders
+sys.dont_write_bytecode = True
+from utils.bytecode import DEFAULT_PYCACHE_DIR, precompile
+os.environ.setdefault('PYTHONPYCACHEPREFIX', DEFAULT_PYCACHE_DIR)
+
 def find_gunicorn():
     """Find gunicorn executable"""
     # Check if we're in a virtual environment
@@ -41,6 +45,7 @@ def start_gunicorn():
     """Start Gunicorn with the Flask app"""
     try:
         gunicorn_path = find_gunicorn()
+        precompile()
         print(f"🔍 Using Gunicorn at: {gunicorn_path}")
         
         # Gunicorn command with increased timeout for batch processing
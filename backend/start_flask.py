@@ -7,9 +7,13 @@ import os
 import sys
 
 # Set environment variables
-os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
 os.environ['FLASK_ENV'] = 'production'
 
+# Cache bytecode under PYTHONPYCACHEPREFIX instead of __pycache__ folders
+sys.dont_write_bytecode = True
+from utils.bytecode import enable_bytecode_cache
+enable_bytecode_cache()
+
 # Import and run the Flask app
 from app import create_app
 
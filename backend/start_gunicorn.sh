@@ -12,9 +12,12 @@ if [ -d "venv" ]; then
 fi
 
 # Set environment variables
-export PYTHONDONTWRITEBYTECODE=1
 export FLASK_ENV=production
 
+# Cache bytecode outside the source tree and compile it before the workers start
+export PYTHONPYCACHEPREFIX="${PYTHONPYCACHEPREFIX:-/tmp/graph-project-pycache}"
+python -m utils.bytecode
+
 # Start Gunicorn with custom configuration
 echo "🔧 Starting Gunicorn with 5-minute timeout for batch processing..."
 gunicorn --config gunicorn.conf.py app:create_app()
@@ -1,21 +1,22 @@
 #!/usr/bin/env python3
 """
-Startup script for the Flask application that prevents __pycache__ generation
+Startup script for the Flask application that keeps __pycache__ out of the source tree
 """
 
 import sys
 import os
 
-# Disable Python bytecode generation
+# Cache bytecode under PYTHONPYCACHEPREFIX instead of __pycache__ folders
 sys.dont_write_bytecode = True
-os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
+from utils.bytecode import enable_bytecode_cache
+enable_bytecode_cache()
 
 # Import and run the Flask app
 from app import create_app
 
 if __name__ == '__main__':
     app = create_app()
-    print("🚀 Starting Flask server with __pycache__ disabled...")
+    print(f"🚀 Starting Flask server with bytecode cached in {sys.pycache_prefix}...")
     app.run(debug=True, host='0.0.0.0', port=5001)
 
 
@@ -18,9 +18,12 @@ else
 fi
 
 # Set environment variables
-export PYTHONDONTWRITEBYTECODE=1
 export FLASK_ENV=production
 
+# Cache bytecode outside the source tree and compile it before the workers start
+export PYTHONPYCACHEPREFIX="${PYTHONPYCACHEPREFIX:-/tmp/graph-project-pycache}"
+python -m utils.bytecode
+
 # Check if gunicorn is available
 if command -v gunicorn &> /dev/null; then
     echo "✅ Gunicorn found at: $(which gunicorn)"
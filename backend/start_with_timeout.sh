@@ -10,13 +10,17 @@ if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
+# Cache bytecode outside the source tree and compile it before the workers start
+export PYTHONPYCACHEPREFIX="${PYTHONPYCACHEPREFIX:-/tmp/graph-project-pycache}"
+python -m utils.bytecode
+
 # Start Gunicorn with increased timeout
 gunicorn \
     --bind 0.0.0.0:5001 \
     --workers 2 \
     --timeout 300 \
     --graceful-timeout 300 \
-    --keep-alive 2 \
+    --keep-alive 5 \
     --max-requests 1000 \
     --max-requests-jitter 50 \
     --preload \
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the compressed batch download ZIP
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from utils.batch_archive import BatchArchive, compression_settings
+
+def test_compression_settings():
+    """Config values map to zipfile methods and valid levels"""
+    assert compression_settings({}) == (zipfile.ZIP_DEFLATED, 1)
+    assert compression_settings({'BATCH_ZIP_COMPRESSION': 'Deflated', 'BATCH_ZIP_COMPRESSLEVEL': '9'}) == (zipfile.ZIP_DEFLATED, 9)
+    assert compression_settings({'BATCH_ZIP_COMPRESSION': 'stored', 'BATCH_ZIP_COMPRESSLEVEL': 9}) == (zipfile.ZIP_STORED, None)
+    assert compression_settings({'BATCH_ZIP_COMPRESSION': 'bzip2', 'BATCH_ZIP_COMPRESSLEVEL': 0}) == (zipfile.ZIP_BZIP2, 1)
+    assert compression_settings({'BATCH_ZIP_COMPRESSION': 'zstd'}) == (zipfile.ZIP_DEFLATED, 1)
+    print("✅ Compression settings parsed")
+
+def test_archive_writes_in_background():
+    """Queued reports are written by close(), which publishes the ZIP; abort() leaves nothing behind"""
+    directory = tempfile.mkdtemp()
+    report_path = os.path.join(directory, 'report.docx')
+    with open(report_path, 'wb') as f:
+        f.write(b"<w:document>" + b"<w:p>text</w:p>" * 5000 + b"</w:document>")
+    path = os.path.join(directory, 'batch.zip')
+
+    archive = BatchArchive(path, zipfile.ZIP_DEFLATED, 6)
+    archive.add_report({'name': 'Alpha', 'code': 'A-1'}, report_path)
+    archive.add_report({'name': 'Alpha', 'code': 'A-2'}, report_path)
+    assert not os.path.exists(path)
+    assert archive.close() == path
+    with zipfile.ZipFile(path) as zf:
+        assert zf.namelist() == ['reports_by_name/Alpha.docx', 'reports_by_code/A-1.docx', 'reports_by_code/A-2.docx']
+        info = zf.getinfo('reports_by_code/A-2.docx')
+        assert info.compress_type == zipfile.ZIP_DEFLATED and info.compress_size < info.file_size / 10
+        assert zf.testzip() is None
+
+    archive = BatchArchive(os.path.join(directory, 'aborted.zip'))
+    archive.add_report({'name': 'Beta', 'code': 'B-1'}, report_path)
+    archive.abort()
+    assert sorted(os.listdir(directory)) == ['batch.zip', 'report.docx']
+    print("✅ Batch archive written in the background")
+
+def test_upload_zip_uses_configured_compression():
+    """upload_zip writes its download ZIP with BATCH_ZIP_COMPRESSION"""
+    directory = tempfile.mkdtemp()
+    template_path = os.path.join(directory, "batch.docx")
+    workbook_path = os.path.join(directory, "batch.xlsx")
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    build_workbook(workbook_path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.write(workbook_path, arcname="batch.xlsx")
+
+    app = create_bench_app()
+    app.config['BATCH_ZIP_COMPRESSION'] = 'stored'
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'p', 'user_id': None, 'file_name': 'batch.docx', 'file_content': template,
+        }).inserted_id)
+
+    payload = app.test_client().post(f"/api/projects/{project_id}/upload_zip",
+                                     data={'zip_file': (io.BytesIO(archive.getvalue()), 'batch.zip')}).get_json()
+    assert payload['processed_files'] == 1
+    with zipfile.ZipFile(payload['download_zip']) as zf:
+        assert len(zf.namelist()) == 2
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in zf.infolist())
+    os.remove(payload['download_zip'])
+    print("✅ upload_zip uses the configured compression")
+
+if __name__ == "__main__":
+    test_compression_settings()
+    test_archive_writes_in_background()
+    test_upload_zip_uses_configured_compression()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for stored batch results (repeatable, resumable downloads)
+"""
+
+import io
+import os
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+import utils.batch_artifacts as batch_artifacts
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+
+def _batch_app():
+    directory = tempfile.mkdtemp()
+    template_path = os.path.join(directory, "batch.docx")
+    workbook_path = os.path.join(directory, "batch.xlsx")
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    build_workbook(workbook_path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.write(workbook_path, arcname="batch.xlsx")
+
+    app = create_bench_app()
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'p', 'user_id': None, 'file_name': 'batch.docx', 'file_content': template,
+        }).inserted_id)
+    return app, project_id, archive.getvalue()
+
+def _run_batch(client, project_id, archive):
+    response = client.post(f"/api/projects/{project_id}/upload_zip",
+                           data={'zip_file': (io.BytesIO(archive), 'batch.zip')})
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_batches_are_kept_per_batch_id():
+    """Concurrent batches of a project get their own ZIP, which can be downloaded repeatedly and in ranges"""
+    app, project_id, archive = _batch_app()
+    client = app.test_client()
+    first = _run_batch(client, project_id, archive)
+    second = _run_batch(client, project_id, archive)
+    assert first['batch_id'] != second['batch_id']
+    assert first['download_url'] == f"/api/batches/{first['batch_id']}/download"
+
+    downloads = [client.get(first['download_url']) for _ in range(2)]
+    assert all(response.status_code == 200 for response in downloads)
+    content = downloads[0].data
+    assert downloads[1].data == content and zipfile.ZipFile(io.BytesIO(content)).testzip() is None
+    assert downloads[0].headers['Accept-Ranges'] == 'bytes'
+
+    # Resume after the first 100 bytes, only if the batch is still the same one
+    etag = downloads[0].headers['ETag']
+    partial = client.get(first['download_url'], headers={'Range': 'bytes=100-', 'If-Range': etag})
+    assert partial.status_code == 206 and partial.data == content[100:]
+    assert partial.headers['Content-Range'] == f"bytes 100-{len(content) - 1}/{len(content)}"
+
+    # The project's download link serves the latest batch and stays available
+    for _ in range(2):
+        latest = client.get(f"/api/reports/batch_reports_{project_id}.zip")
+        assert latest.status_code == 200 and latest.headers['ETag'] == f'"{second["batch_id"]}"'
+
+    listed = client.get(f"/api/projects/{project_id}/batches").get_json()['batches']
+    assert [batch['batch_id'] for batch in listed] == [second['batch_id'], first['batch_id']]
+    assert client.get(f"/api/batches/{first['batch_id']}").get_json()['processed_files'] == 1
+
+    assert client.delete(f"/api/batches/{first['batch_id']}").status_code == 200
+    assert client.get(first['download_url']).status_code == 404
+    assert not os.path.exists(first['download_zip'])
+    print("✅ Batches kept per batch id with repeatable range downloads")
+
+def test_batches_expire():
+    """Expired batches are not served, and their files are removed by the next save"""
+    app, project_id, archive = _batch_app()
+    client = app.test_client()
+    batch = _run_batch(client, project_id, archive)
+    with app.app_context():
+        app.mongo.db.batch_results.update_one({'_id': batch['batch_id']},
+                                              {'$set': {'expires_at': datetime.utcnow() - timedelta(seconds=1)}})
+    assert client.get(batch['download_url']).status_code == 404
+    assert client.get(f"/api/reports/batch_reports_{project_id}.zip").status_code == 404
+
+    old = time.time() - batch_artifacts.BATCH_TTL_SECONDS - 60
+    os.utime(batch['download_zip'], (old, old))
+    _run_batch(client, project_id, archive)
+    assert not os.path.exists(batch['download_zip'])
+    print("✅ Expired batches are not served and are pruned")
+
+if __name__ == "__main__":
+    test_batches_are_kept_per_batch_id()
+    test_batches_expire()
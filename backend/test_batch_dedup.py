@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for deduplicating identical workbooks within a batch
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+
+import openpyxl
+from openpyxl.styles import Font
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from utils.workbook_fingerprint import cell_digest, file_digest
+
+def _workbooks(directory):
+    """Original, re-saved copy with a new style, a workbook with one changed value, and an unrelated one"""
+    paths = {name: os.path.join(directory, f"{name}.xlsx") for name in ('original', 'resaved', 'edited', 'other')}
+    build_workbook(paths['original'], sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0, seed=0)
+    build_workbook(paths['other'], sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0, seed=1)
+    wb = openpyxl.load_workbook(paths['original'])
+    wb.active['A1'].font = Font(bold=True)
+    wb.properties.creator = 'someone else'
+    wb.save(paths['resaved'])
+    wb = openpyxl.load_workbook(paths['original'])
+    sheet = wb.worksheets[-1]
+    sheet.cell(row=2, column=sheet.max_column).value = 12345
+    wb.save(paths['edited'])
+    return paths
+
+def _project(app, directory):
+    template_path = os.path.join(directory, "batch.docx")
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        return str(app.mongo.db.projects.insert_one({
+            'name': 'p', 'user_id': None, 'file_name': 'batch.docx', 'file_content': template,
+        }).inserted_id)
+
+def _zip(paths):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.write(paths['original'], arcname="a/original.xlsx")
+        zf.write(paths['original'], arcname="b/copy.xlsx")
+        zf.write(paths['resaved'], arcname="resaved.xlsx")
+        zf.write(paths['other'], arcname="other.xlsx")
+    return archive.getvalue()
+
+def test_cell_digest_ignores_resaving():
+    """A re-saved copy matches on cell data; a changed value does not"""
+    paths = _workbooks(tempfile.mkdtemp())
+    assert file_digest(paths['original']) != file_digest(paths['resaved'])
+    assert cell_digest(paths['original']) == cell_digest(paths['resaved'])
+    assert cell_digest(paths['original']) != cell_digest(paths['edited'])
+    assert cell_digest(paths['original']) != cell_digest(paths['other'])
+    print("✅ Cell digest ignores re-saving")
+
+def test_upload_zip_generates_duplicates_once():
+    """Copies and re-saved copies reuse the first report and are marked deduplicated"""
+    directory = tempfile.mkdtemp()
+    paths = _workbooks(directory)
+    app = create_bench_app()
+    project_id = _project(app, directory)
+
+    payload = app.test_client().post(f"/api/projects/{project_id}/upload_zip",
+                                     data={'zip_file': (io.BytesIO(_zip(paths)), 'batch.zip')}).get_json()
+    assert payload['processed_files'] == 4 and payload['deduplicated_files'] == 2
+    statuses = {entry['original_file']: (entry['status'], entry.get('duplicate_of')) for entry in payload['reports']}
+    assert statuses == {
+        'original': ('generated', None),
+        'copy': ('deduplicated', 'original'),
+        'resaved': ('deduplicated', 'original'),
+        'other': ('generated', None),
+    }
+    with zipfile.ZipFile(payload['download_zip']) as zf:
+        assert len(zf.namelist()) == 4
+    os.remove(payload['download_zip'])
+    print("✅ upload_zip generates duplicate workbooks once")
+
+def test_chunked_upload_generates_duplicates_once():
+    """Members of a chunked upload are deduplicated through their stored digests"""
+    directory = tempfile.mkdtemp()
+    app = create_bench_app()
+    project_id = _project(app, directory)
+    archive = _zip(_workbooks(directory))
+    client = app.test_client()
+    upload_id = client.post(f"/api/projects/{project_id}/batch_uploads",
+                            json={'filename': 'batch.zip', 'size': len(archive)}).get_json()['upload_id']
+    response = client.put(f"/api/batch_uploads/{upload_id}", data=archive,
+                          headers={'Content-Range': f"bytes 0-{len(archive) - 1}/{len(archive)}"})
+    assert response.status_code == 200
+    payload = client.post(f"/api/batch_uploads/{upload_id}/complete").get_json()
+    assert payload['processed_files'] == 4 and payload['deduplicated_files'] == 2
+    os.remove(payload['download_zip'])
+    print("✅ Chunked upload generates duplicate workbooks once")
+
+if __name__ == "__main__":
+    test_cell_digest_ignores_resaving()
+    test_upload_zip_generates_duplicates_once()
+    test_chunked_upload_generates_duplicates_once()
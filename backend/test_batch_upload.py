@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for chunked, resumable batch ZIP uploads
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import time
+import zipfile
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from routes import projects
+from utils import batch_upload
+from utils.batch_upload import get_batch_upload_store
+
+class _Unseekable(io.RawIOBase):
+    """Write-only stream, so zipfile puts member sizes in data descriptors"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+def _batch(files=3, data_descriptors=False):
+    directory = tempfile.mkdtemp()
+    template_path = os.path.join(directory, "batch.docx")
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    archive = _Unseekable() if data_descriptors else io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("readme.txt", "not a workbook")
+        for i in range(files):
+            workbook_path = os.path.join(directory, f"batch_{i}.xlsx")
+            build_workbook(workbook_path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0, seed=i)
+            with open(workbook_path, 'rb') as f:
+                content = f.read()
+            zf.writestr(f"folder/batch_{i}.xlsx", content)
+
+    app = create_bench_app()
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'p', 'user_id': None, 'file_name': 'batch.docx', 'file_content': template,
+        }).inserted_id)
+    archive = archive.buffer if data_descriptors else archive
+    return app, project_id, archive.getvalue()
+
+def _put(client, upload_id, data, first, size):
+    return client.put(f"/api/batch_uploads/{upload_id}", data=data,
+                      headers={'Content-Range': f"bytes {first}-{first + len(data) - 1}/{size}"})
+
+def _wait_for_generated(client, upload_id, count, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/api/batch_uploads/{upload_id}").get_json()
+        if status['members_generated'] >= count:
+            return status
+        time.sleep(0.2)
+    raise AssertionError(f"only {status['members_generated']} members generated")
+
+def test_chunked_upload_resumes_and_starts_early():
+    """Chunks resume from the server's offset, arrived workbooks are generated before the upload completes"""
+    app, project_id, archive = _batch()
+    client = app.test_client()
+    size = len(archive)
+    response = client.post(f"/api/projects/{project_id}/batch_uploads",
+                           json={'filename': 'batch.zip', 'size': size, 'sha256': hashlib.sha256(archive).hexdigest()})
+    assert response.status_code == 201
+    upload_id = response.get_json()['upload_id']
+
+    half = size // 2
+    assert _put(client, upload_id, archive[:half], 0, size).get_json()['received'] == half
+    # A retried chunk from a stale offset is refused with the offset to resume from
+    conflict = _put(client, upload_id, archive[:10], 0, size)
+    assert conflict.status_code == 409 and conflict.get_json()['received'] == half
+    status = _wait_for_generated(client, upload_id, 1)
+    assert status['received'] == half and status['status'] == 'uploading'
+
+    assert _put(client, upload_id, archive[half:], half, size).get_json()['received'] == size
+    preflight = client.post(f"/api/projects/{project_id}/preflight_zip", data={'upload_id': upload_id})
+    assert preflight.get_json()['valid_files'] == 3
+
+    payload = client.post(f"/api/batch_uploads/{upload_id}/complete").get_json()
+    assert payload['processed_files'] == 3 and payload['total_files'] == 3
+    with zipfile.ZipFile(payload['download_zip']) as zf:
+        assert len(zf.namelist()) == 6  # by name and by code
+    os.remove(payload['download_zip'])
+    assert client.get(f"/api/batch_uploads/{upload_id}").status_code == 404
+    print("✅ Chunked upload resumes and starts generating early")
+
+def test_upload_checks_checksum_and_data_descriptors():
+    """A corrupted upload is rejected on completion; members sized only in the central directory still run"""
+    app, project_id, archive = _batch(files=2, data_descriptors=True)
+    client = app.test_client()
+    size = len(archive)
+    upload_id = client.post(f"/api/projects/{project_id}/batch_uploads",
+                            json={'filename': 'batch.zip', 'size': size, 'sha256': '0' * 64}).get_json()['upload_id']
+    assert _put(client, upload_id, archive, 0, size).status_code == 200
+    response = client.post(f"/api/batch_uploads/{upload_id}/complete")
+    assert response.status_code == 400 and 'SHA-256' in response.get_json()['error']
+
+    upload_id = client.post(f"/api/projects/{project_id}/batch_uploads",
+                            json={'filename': 'batch.zip', 'size': size}).get_json()['upload_id']
+    assert _put(client, upload_id, archive, 0, size).status_code == 200
+    assert client.get(f"/api/batch_uploads/{upload_id}").get_json()['members_arrived'] == 0
+    payload = client.post(f"/api/batch_uploads/{upload_id}/complete").get_json()
+    assert payload['processed_files'] == 2
+    os.remove(payload['download_zip'])
+    print("✅ Upload checks its checksum and reads data-descriptor members")
+
+def test_completion_gives_up_on_members_held_by_other_workers():
+    """A member another worker keeps generating is failed at the wait deadline; claims are kept fresh while generating"""
+    app, project_id, archive = _batch(files=2, data_descriptors=True)
+    client = app.test_client()
+    size = len(archive)
+    upload_id = client.post(f"/api/projects/{project_id}/batch_uploads",
+                            json={'filename': 'batch.zip', 'size': size}).get_json()['upload_id']
+    assert _put(client, upload_id, archive, 0, size).status_code == 200
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        held = zf.getinfo("folder/batch_0.xlsx")
+    with app.app_context():
+        store = get_batch_upload_store(app.mongo.db)
+        store.add_member(upload_id, held.header_offset, held.filename)
+        assert store.claim_member(upload_id, held.header_offset)
+
+    wait, projects.MEMBER_WAIT_SECONDS = projects.MEMBER_WAIT_SECONDS, 0
+    try:
+        payload = client.post(f"/api/batch_uploads/{upload_id}/complete").get_json()
+    finally:
+        projects.MEMBER_WAIT_SECONDS = wait
+    assert (payload['processed_files'], payload['total_files']) == (1, 2), payload
+    os.remove(payload['download_zip'])
+
+    heartbeat, batch_upload.MEMBER_HEARTBEAT_SECONDS = batch_upload.MEMBER_HEARTBEAT_SECONDS, 0.05
+    try:
+        with app.app_context():
+            assert store.list_members(upload_id) == []
+            store.add_member(upload_id, 0, "a.xlsx")
+            store.claim_member(upload_id, 0)
+            claimed_at = store.list_members(upload_id)[0]['claimed_at']
+            with store.heartbeat(upload_id, 0):
+                time.sleep(0.2)
+            assert store.list_members(upload_id)[0]['claimed_at'] > claimed_at
+            store.delete(upload_id)
+    finally:
+        batch_upload.MEMBER_HEARTBEAT_SECONDS = heartbeat
+    print("✅ Completion gives up on members held by other workers")
+
+if __name__ == "__main__":
+    test_chunked_upload_resumes_and_starts_early()
+    test_upload_checks_checksum_and_data_descriptors()
+    test_completion_gives_up_on_members_held_by_other_workers()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the synthetic benchmark inputs and baseline comparison
+"""
+
+import json
+import os
+import tempfile
+
+import openpyxl
+from flask import Flask
+
+from benchmarks import bench_charts, chart_digests
+from benchmarks.bench_report import compare, percentile
+from benchmarks.local_mongo import LocalMongo
+from benchmarks.synthetic import build_template, build_workbook
+from routes.projects import validate_excel_structure
+
+def test_synthetic_workbook_matches_report_layout():
+    """Synthetic workbooks pass the batch validation and reference their data by range"""
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "synthetic.xlsx")
+    sections = build_workbook(workbook_path, sections=3, chart_mix=["bar", "pie", "heatmap"], series_length=5, placeholders=4)
+    build_template(os.path.join(directory, "synthetic.docx"), sections=3, placeholders=4)
+
+    assert sections == {"section1": "bar", "section2": "pie", "section3": "heatmap"}
+    with Flask(__name__).app_context():
+        valid, message = validate_excel_structure(workbook_path)
+    assert valid, message
+
+    wb = openpyxl.load_workbook(workbook_path)
+    attrs = json.loads(wb["report"]["H2"].value)
+    assert attrs["series"]["data"][0]["values"] == "B2:B6"
+    assert wb["data"]["B6"].value is not None
+    print("✅ Synthetic workbook has the expected layout")
+
+def test_compare_flags_regressions():
+    """Slower latency and lower throughput beyond the threshold are regressions"""
+    baseline = {"single_report": {"throughput_per_second": 1.0, "latency_seconds": {"p95": 2.0}}}
+    current = {"single_report": {"throughput_per_second": 0.95, "latency_seconds": {"p95": 2.5}}}
+    rows = {row[0]: row for row in compare(baseline, current, threshold_percent=10.0)}
+
+    assert rows["single_report.throughput_per_second"][4] is False
+    assert rows["single_report.latency_seconds.p95"][4] is True
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    print("✅ Baseline comparison flags regressions")
+
+def test_chart_compare_only_flags_slower_cases():
+    """Per-chart comparison skips failed cases and flags only those slower than the threshold"""
+    baseline = {"results": [
+        {"chart_type": "bar", "size": "small", "success": True, "seconds_p50": 0.2},
+        {"chart_type": "line", "size": "small", "success": True, "seconds_p50": 0.2},
+        {"chart_type": "box", "size": "small", "success": False, "seconds_p50": 0.0},
+    ]}
+    current = {"results": [
+        {"chart_type": "bar", "size": "small", "success": True, "seconds_p50": 0.3},
+        {"chart_type": "line", "size": "small", "success": True, "seconds_p50": 0.21},
+        {"chart_type": "box", "size": "small", "success": True, "seconds_p50": 0.5},
+    ]}
+    regressions = bench_charts.compare(baseline, current, threshold_percent=20.0)
+
+    assert [r[0] for r in regressions] == ["bar/small"]
+    print("✅ Chart comparison flags slower chart types")
+
+def test_chart_digests_are_repeatable():
+    """The same chart case hashes to the same images, so a refactor can be compared byte for byte"""
+    from benchmarks.bench_report import create_bench_app
+
+    app = create_bench_app()
+    work_dir = tempfile.mkdtemp()
+    digests = [chart_digests.chart_digest(app, work_dir, "bar/no_labels", "bar", chart_digests._no_labels, 12)
+               for _ in range(2)]
+
+    assert digests[0] and digests[0] == digests[1]
+    assert {name for name, *_ in chart_digests.cases()} >= set(chart_digests.ALL_CHART_TYPES)
+    assert chart_digests.compare({"bar": "a", "line": "b"}, {"bar": "a", "line": "c", "new": "d"}) == ["line"]
+    print("✅ Chart image digests are repeatable")
+
+def test_local_mongo_round_trip():
+    """The in-memory Mongo stand-in supports the calls the batch route makes"""
+    db = LocalMongo().db
+    project_id = db.projects.insert_one({'name': 'p', 'file_content': b'x'}).inserted_id
+    db.projects.update_one({'_id': project_id}, {'$set': {'name': 'q'}})
+
+    assert db.projects.find_one({'_id': project_id})['name'] == 'q'
+    assert db.command('ping')['ok'] == 1.0
+    print("✅ Local Mongo stand-in round trip")
+
+if __name__ == "__main__":
+    test_synthetic_workbook_matches_report_layout()
+    test_compare_flags_regressions()
+    test_chart_compare_only_flags_slower_cases()
+    test_chart_digests_are_repeatable()
+    test_local_mongo_round_trip()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script that every chart is rendered with exactly one figure
+"""
+
+import os
+import tempfile
+
+import matplotlib.pyplot as plt
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from renderers import RENDERER_REGISTRY, _renderers, register_renderer
+from renderers.bar import BarRenderer
+from routes.projects import _generate_report
+from utils.report_timing import ReportTimer
+
+CHART_MIX = ["bar", "stacked_column", "line", "area", "scatter", "pie", "heatmap", "treemap"]
+
+class ScratchFigureRenderer(BarRenderer):
+    """Bar renderer that opens a throwaway figure before drawing and leaves it to generate_chart to close"""
+
+    def render(self, chart):
+        plt.figure()
+        return super().render(chart)
+
+def _report_charts(chart_mix, project_id):
+    """report_timer.charts of a one-chart-per-section report"""
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=len(chart_mix), chart_mix=chart_mix, series_length=8, placeholders=0)
+    build_template(template_path, sections=len(chart_mix), placeholders=0, with_table=False)
+
+    app = create_bench_app()
+    report_timer = ReportTimer()
+    with app.app_context():
+        output = _generate_report(project_id, template_path, workbook_path, report_timer=report_timer)
+    assert output and os.path.exists(output)
+    os.remove(output)
+    return report_timer.charts
+
+def test_each_chart_builds_one_figure():
+    """Each chart builds one Matplotlib figure, no Plotly traces, and closes it"""
+    charts = {chart["chart_type"]: chart for chart in _report_charts(CHART_MIX, "figures_test")}
+    assert sorted(charts) == sorted(CHART_MIX)
+    for chart_type, chart in charts.items():
+        assert chart["success"], chart_type
+        assert (chart["figures"], chart["traces"]) == (1, 0), (chart_type, chart)
+    assert plt.get_fignums() == []
+    print("✅ Every chart builds exactly one figure")
+
+def test_extra_figures_are_counted():
+    """A second figure a renderer opens counts towards its chart and is closed with it"""
+    original, scratch = RENDERER_REGISTRY["bar"], f"{__name__}:ScratchFigureRenderer"
+    register_renderer("bar", scratch)
+    try:
+        charts = _report_charts(["bar", "line"], "scratch_figures_test")
+    finally:
+        register_renderer("bar", original)
+        _renderers.pop(scratch, None)
+
+    assert [(c["chart_type"], c["figures"]) for c in charts] == [("bar", 2), ("line", 1)], charts
+    assert plt.get_fignums() == []
+    print("✅ Extra figures are counted and closed")
+
+if __name__ == "__main__":
+    test_each_chart_builds_one_figure()
+    test_extra_figures_are_counted()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for SVG chart output, the PNG optimisation stage and image reuse
+"""
+
+import json
+import os
+import re
+import tempfile
+import zipfile
+
+import openpyxl
+from docx import Document
+from PIL import Image
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from routes.projects import _generate_report
+from utils.chart_output import png_optimization_settings, resolve_chart_output_format
+from utils.report_timing import ReportTimer
+
+SVG_BLIP = "{http://schemas.microsoft.com/office/drawing/2016/SVG/main}svgBlip"
+R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+
+def _report(chart_mix, chart_output_format, chart_formats=None, png_optimization=None, report_timer=None):
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=len(chart_mix), chart_mix=chart_mix, series_length=8, placeholders=0)
+    build_template(template_path, sections=len(chart_mix), placeholders=0, with_table=False)
+    if chart_formats:
+        wb = openpyxl.load_workbook(workbook_path)
+        ws = wb["report"]
+        column = [cell.value for cell in ws[1]].index("Chart_Attributes") + 1
+        for row, chart_format in zip(range(2, 2 + len(chart_mix)), chart_formats):
+            attrs = json.loads(ws.cell(row, column).value)
+            attrs["chart_meta"]["chart_output_format"] = chart_format
+            ws.cell(row, column).value = json.dumps(attrs)
+        wb.save(workbook_path)
+
+    app = create_bench_app()
+    with app.app_context():
+        return _generate_report("chart_output_test", template_path, workbook_path, report_timer=report_timer,
+                                chart_output_format=chart_output_format, png_optimization=png_optimization)
+
+def test_resolve_chart_output_format():
+    """The chart setting wins over the project setting; unknown values fall back to PNG"""
+    assert resolve_chart_output_format(None, None) == "png"
+    assert resolve_chart_output_format(None, "svg") == "svg"
+    assert resolve_chart_output_format("PNG", "svg") == "png"
+    assert resolve_chart_output_format("emf", "svg") == "svg"
+    print("✅ Chart output format is resolved")
+
+def test_svg_charts_embed_vector_image_with_fallback():
+    """SVG charts are embedded through svgBlip next to a PNG fallback; a chart can opt back into PNG"""
+    output = _report(["bar", "line", "pie"], "svg", chart_formats=[None, None, "png"])
+    assert output and os.path.exists(output)
+
+    with zipfile.ZipFile(output) as zf:
+        media = sorted(name for name in zf.namelist() if name.startswith("word/media/"))
+        content_types = zf.read("[Content_Types].xml").decode()
+    assert len([name for name in media if name.endswith(".svg")]) == 2, media
+    assert len([name for name in media if name.endswith(".png")]) == 3, media
+    assert re.search(r'image/svg\+xml', content_types)
+
+    document_part = Document(output).part
+    svg_blips = document_part.element.body.iter(SVG_BLIP)
+    targets = [document_part.related_parts[blip.get(R_EMBED)].partname for blip in svg_blips]
+    assert len(targets) == 2 and all(str(target).endswith(".svg") for target in targets)
+    os.remove(output)
+    print("✅ SVG charts are embedded with a PNG fallback")
+
+def test_png_optimization_settings():
+    """Presets and custom objects are accepted; out-of-range values are rejected"""
+    assert png_optimization_settings(None) is None
+    assert png_optimization_settings("off") is None
+    assert png_optimization_settings("palette")["palette_colors"] == 256
+    assert png_optimization_settings({"palette_colors": 64}) == {"palette_colors": 64, "compress_level": 9, "strip_metadata": True}
+    for invalid in ("tiny", {"palette_colors": 1000}, {"compress_level": 12}, ["palette"]):
+        try:
+            png_optimization_settings(invalid)
+        except ValueError:
+            continue
+        raise AssertionError(f"{invalid!r} was accepted")
+    print("✅ PNG optimisation settings are validated")
+
+def _media_sizes(docx_path):
+    with zipfile.ZipFile(docx_path) as zf:
+        return {info.filename: info.file_size for info in zf.infolist() if info.filename.startswith("word/media/")}
+
+def test_palette_optimization_shrinks_chart_images():
+    """The palette preset re-encodes every chart as a smaller palette PNG before insertion"""
+    chart_mix = ["bar", "line", "pie"]
+    plain = _report(chart_mix, "png")
+    report_timer = ReportTimer()
+    optimized = _report(chart_mix, "png", png_optimization="palette", report_timer=report_timer)
+
+    before, after = _media_sizes(plain), _media_sizes(optimized)
+    assert len(after) == len(before) == 3
+    assert sum(after.values()) < sum(before.values()) / 2, (before, after)
+    with zipfile.ZipFile(optimized) as zf, zf.open(sorted(after)[0]) as image:
+        img = Image.open(image)
+        assert img.mode == "P" and "Software" not in img.info
+    assert report_timer.stages["png_optimization"] > 0
+    os.remove(plain)
+    os.remove(optimized)
+    print("✅ Palette optimisation shrinks chart images")
+
+def test_repeated_chart_is_rendered_and_stored_once():
+    """A chart placeholder repeated in a paragraph and a table cell is rendered once and stored in one media part"""
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=1, chart_mix=["bar"], series_length=8, placeholders=0)
+    build_template(template_path, sections=1, placeholders=0, with_table=False)
+    template = Document(template_path)
+    template.add_paragraph("${section1_chart}")
+    template.add_table(rows=1, cols=1).cell(0, 0).text = "${section1_chart}"
+    template.save(template_path)
+
+    app = create_bench_app()
+    for chart_output_format, expected_media in (("png", [".png"]), ("svg", [".png", ".svg"])):
+        report_timer = ReportTimer()
+        with app.app_context():
+            output = _generate_report("image_reuse_test", template_path, workbook_path, report_timer=report_timer,
+                                      chart_output_format=chart_output_format)
+        with zipfile.ZipFile(output) as zf:
+            media = sorted(os.path.splitext(name)[1] for name in zf.namelist() if name.startswith("word/media/"))
+            drawings = zf.read("word/document.xml").decode().count("<wp:inline")
+        assert len(report_timer.charts) == 1
+        assert media == expected_media, media
+        assert drawings == 3
+        os.remove(output)
+    print("✅ Repeated charts are rendered and stored once")
+
+if __name__ == "__main__":
+    test_resolve_chart_output_format()
+    test_svg_charts_embed_vector_image_with_fallback()
+    test_png_optimization_settings()
+    test_palette_optimization_shrinks_chart_images()
+    test_repeated_chart_is_rendered_and_stored_once()
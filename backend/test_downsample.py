@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for downsampling long line, area and scatter series
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import openpyxl
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from renderers.downsample import downsample_series, downsample_settings, label_indices, lttb_indices, minmax_indices
+from routes.projects import _generate_report
+from utils.report_timing import ReportTimer
+
+def test_lttb_and_minmax_keep_the_shape():
+    """Both methods keep the end points and minmax keeps every spike"""
+    y = np.sin(np.linspace(0, 20, 10000))
+    y[1234], y[8765] = 50.0, -50.0
+
+    keep = lttb_indices(np.arange(len(y), dtype=float), y, 500)
+    assert len(keep) == 500 and keep[0] == 0 and keep[-1] == len(y) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 1234 in keep and 8765 in keep
+
+    keep = minmax_indices(y, 500)
+    assert len(keep) <= 502 and keep[0] == 0 and keep[-1] == len(y) - 1
+    assert 1234 in keep and 8765 in keep
+
+    assert list(lttb_indices(np.arange(5.0), np.arange(5.0), 500)) == [0, 1, 2, 3, 4]
+    print("✅ LTTB and min/max bucketing keep the series shape")
+
+def test_labels_are_limited():
+    """Text labels are thinned with the points and limited to the extrema plus a maximum count"""
+    labels = label_indices([3, 1, 9, 4, 5, 2, 8, 7, 6, 0], 3)
+    assert len(labels) == 3 and 2 in labels and 9 in labels
+
+    app = create_bench_app()
+    with app.app_context():
+        assert downsample_settings(None, (10, 6)) is None
+        assert downsample_settings("spline", (10, 6)) is None
+        assert downsample_settings(True, (10, 6)) == {"method": "lttb", "points": 2000, "max_labels": 20}
+
+        settings = downsample_settings({"method": "minmax", "points": 100, "max_labels": 5}, (10, 6))
+        x = list(range(5000))
+        y = [float(v % 97) for v in x]
+        series = {"name": "S", "text": [str(v) for v in y], "marker": {"size": [4] * 5000}}
+        x_out, y_out, series_out, keep = downsample_series(x, y, series, settings)
+    assert len(x_out) == len(y_out) == len(series_out["text"]) == len(series_out["marker"]["size"]) == len(keep)
+    assert len(x_out) <= 102
+    assert 0 < sum(text is not None for text in series_out["text"]) <= 5
+    assert len(series["text"]) == 5000
+    print("✅ Labels are limited on downsampled series")
+
+def test_downsampled_charts_render():
+    """Line, area and scatter charts with thousands of points render with downsampling on"""
+    chart_mix = ["line", "area", "scatter"]
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=len(chart_mix), chart_mix=chart_mix, series_length=5000, placeholders=0)
+    build_template(template_path, sections=len(chart_mix), placeholders=0, with_table=False)
+
+    wb = openpyxl.load_workbook(workbook_path)
+    ws = wb["report"]
+    column = [cell.value for cell in ws[1]].index("Chart_Attributes") + 1
+    for row, method in zip(range(2, 5), ["lttb", "minmax", "lttb"]):
+        attrs = json.loads(ws.cell(row, column).value)
+        attrs["chart_meta"]["downsample"] = {"method": method, "points": 400}
+        ws.cell(row, column).value = json.dumps(attrs)
+    wb.save(workbook_path)
+
+    app = create_bench_app()
+    report_timer = ReportTimer()
+    with app.app_context():
+        output = _generate_report("downsample_test", template_path, workbook_path, report_timer=report_timer)
+    assert output and os.path.exists(output)
+    os.remove(output)
+
+    assert sorted(chart["chart_type"] for chart in report_timer.charts) == sorted(chart_mix)
+    assert all(chart["success"] for chart in report_timer.charts), report_timer.charts
+    print("✅ Downsampled charts render")
+
+def test_line_labels_stay_on_the_axis():
+    """Labels of a downsampled line are placed at the drawn points, inside the axis limits"""
+    from matplotlib.figure import Figure
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=1, chart_mix=["line"], series_length=3000, placeholders=0)
+    build_template(template_path, sections=1, placeholders=0, with_table=False)
+
+    wb = openpyxl.load_workbook(workbook_path)
+    ws = wb["report"]
+    column = [cell.value for cell in ws[1]].index("Chart_Attributes") + 1
+    attrs = json.loads(ws.cell(2, column).value)
+    # Line labels are drawn on the secondary axis
+    attrs["chart_meta"].update({"downsample": {"method": "lttb", "points": 300, "max_labels": 10},
+                                "disable_secondary_y": False, "value_format": ".1f", "data_label_font_size": 8})
+    ws.cell(2, column).value = json.dumps(attrs)
+    wb.save(workbook_path)
+
+    # Label positions and axis limits of every saved chart, read as it is saved
+    labels = []
+    savefig = Figure.savefig
+    def recording_savefig(fig, *args, **kwargs):
+        for ax in fig.axes:
+            labels.extend((text.get_position()[0], ax.get_xlim()) for text in ax.texts)
+        return savefig(fig, *args, **kwargs)
+
+    app = create_bench_app()
+    report_timer = ReportTimer()
+    Figure.savefig = recording_savefig
+    try:
+        with app.app_context():
+            output = _generate_report("downsample_labels", template_path, workbook_path, report_timer=report_timer)
+    finally:
+        Figure.savefig = savefig
+    assert output and os.path.exists(output)
+    os.remove(output)
+
+    assert all(chart["success"] for chart in report_timer.charts), report_timer.charts
+    assert 0 < len(labels) <= 10, labels
+    for x, (left, right) in labels:
+        assert left <= x <= right, (x, left, right)
+    print("✅ Downsampled line labels stay on the axis")
+
+if __name__ == "__main__":
+    test_lttb_and_minmax_keep_the_shape()
+    test_labels_are_limited()
+    test_downsampled_charts_render()
+    test_line_labels_stay_on_the_axis()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared chart error store
+"""
+
+import os
+import tempfile
+
+import openpyxl
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from routes.projects import _generate_report
+from utils.error_store import MAX_ERRORS_PER_REPORT, ReportErrors
+
+def test_errors_are_bounded():
+    """A report keeps at most MAX_ERRORS_PER_REPORT chart errors and counts the rest"""
+    report_errors = ReportErrors()
+    for i in range(MAX_ERRORS_PER_REPORT + 50):
+        report_errors.add(f"section{i}_chart", {"user_message": "x" * 5000, "chart_type": "bar"})
+    assert len(report_errors.charts) == MAX_ERRORS_PER_REPORT and report_errors.dropped == 50
+    assert len(report_errors.user_message("section0_chart", "")) == 2000
+    print("✅ Chart errors are bounded")
+
+def test_errors_are_shared_between_workers():
+    """Errors written by one worker's report are read back by another worker and cleared for both"""
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0)
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    wb = openpyxl.load_workbook(workbook_path)
+    ws = wb["report"]
+    ws.cell(3, [cell.value for cell in ws[1]].index("Chart_Attributes") + 1).value = "{not json"
+    wb.save(workbook_path)
+
+    worker, other_worker = create_bench_app(), create_bench_app()
+    other_worker.mongo = worker.mongo
+    with worker.app_context():
+        project_id = str(worker.mongo.db.projects.insert_one({'name': 'p', 'user_id': None}).inserted_id)
+        output = _generate_report(project_id, template_path, workbook_path)
+    assert output and os.path.exists(output)
+    os.remove(output)
+    assert not hasattr(worker, 'chart_errors') and not hasattr(worker, 'report_generation_errors')
+
+    client = other_worker.test_client()
+    errors = client.get(f"/api/projects/{project_id}/chart_errors").get_json()
+    assert [error["tag"] for error in errors["report_generation_errors"]] == ["section2_chart"]
+    assert errors["report_generation_errors_detailed"]["section2_chart"]["error"] == "Invalid JSON format in chart configuration"
+    assert errors["chart_generation_errors"] == {} and errors["report_generated_at"]
+    assert worker.mongo.db.report_errors.find_one({'project_id': project_id})['expires_at']
+
+    assert client.post(f"/api/projects/{project_id}/clear_errors").status_code == 200
+    errors = worker.test_client().get(f"/api/projects/{project_id}/chart_errors").get_json()
+    assert errors["report_generation_errors"] == [] and errors["report_generated_at"] is None
+    print("✅ Chart errors are shared between workers")
+
+if __name__ == "__main__":
+    test_errors_are_bounded()
+    test_errors_are_shared_between_workers()
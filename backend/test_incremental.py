@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental report regeneration
+"""
+
+import os
+import tempfile
+import zipfile
+
+import openpyxl
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from routes.projects import _generate_report
+from utils.chart_artifacts import ChartArtifactStore, get_chart_artifact_store
+from utils.report_timing import ReportTimer
+
+def _regenerate(app, project_id, template_path, workbook_path):
+    report_timer = ReportTimer()
+    with app.app_context():
+        output = _generate_report(project_id, template_path, workbook_path, report_timer=report_timer, incremental=True)
+    assert output and os.path.exists(output)
+    with zipfile.ZipFile(output) as zf:
+        media = sorted(name for name in zf.namelist() if name.startswith("word/media/"))
+    os.remove(output)
+    return report_timer, media
+
+def test_only_changed_charts_are_rendered_again():
+    """A second run reuses every chart image; editing one section's cells re-renders only that chart"""
+    chart_mix = ["bar", "line", "pie"]
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=3, chart_mix=chart_mix, series_length=4, placeholders=0)
+    build_template(template_path, sections=3, placeholders=0, with_table=False)
+
+    store = get_chart_artifact_store()
+    store.root = tempfile.mkdtemp()
+    app = create_bench_app()
+
+    first, first_media = _regenerate(app, "incremental_test", template_path, workbook_path)
+    assert len(first.charts) == 3 and first.reused_charts == []
+
+    second, second_media = _regenerate(app, "incremental_test", template_path, workbook_path)
+    assert second.charts == [] and len(second.reused_charts) == 3
+    assert len(second_media) == len(first_media) == 3
+
+    # section2_chart reads its values from D2:D5 of the data sheet
+    wb = openpyxl.load_workbook(workbook_path)
+    wb["data"]["D3"] = 12345
+    wb.save(workbook_path)
+    third, _ = _regenerate(app, "incremental_test", template_path, workbook_path)
+    assert [chart["tag"] for chart in third.charts] == ["section2_chart"]
+    assert sorted(third.reused_charts) == ["section1_chart", "section3_chart"]
+
+    # Stored images belong to one project
+    other, _ = _regenerate(app, "incremental_other", template_path, workbook_path)
+    assert len(other.charts) == 3
+    assert len(os.listdir(os.path.join(store.root, "incremental_test"))) == 3
+    print("✅ Only changed charts are rendered again")
+
+def test_reused_chart_images_are_removed_after_the_report():
+    """Checked-out copies of stored chart images do not outlive the report"""
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0)
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    get_chart_artifact_store().root = tempfile.mkdtemp()
+    app = create_bench_app()
+
+    checked_out = []
+    checkout = ChartArtifactStore.checkout
+
+    def recording_checkout(self, project_id, fingerprint):
+        image_path = checkout(self, project_id, fingerprint)
+        checked_out.append(image_path)
+        return image_path
+
+    _regenerate(app, "checkout_test", template_path, workbook_path)
+    ChartArtifactStore.checkout = recording_checkout
+    try:
+        second, _ = _regenerate(app, "checkout_test", template_path, workbook_path)
+    finally:
+        ChartArtifactStore.checkout = checkout
+
+    assert len(second.reused_charts) == 2 and len(checked_out) == 2 and all(checked_out)
+    assert not [path for path in checked_out if os.path.exists(path)]
+    print("✅ Reused chart images are removed after the report")
+
+if __name__ == "__main__":
+    test_only_changed_charts_are_rendered_again()
+    test_reused_chart_images_are_removed_after_the_report()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the multiprocess /metrics store
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+
+import utils.metrics
+from utils.metrics import MetricsRegistry, render_prometheus
+
+def _dead_worker_snapshot(directory):
+    """Write a snapshot that looks like it came from an exited gunicorn worker"""
+    snapshot = {
+        'pid': 2 ** 22 + 17,  # above the default pid_max, so never a live process
+        'counters': {'graph_reports_generated_total': {json.dumps([["status", "success"]]): 3}},
+        'gauges': {'graph_queue_depth': {json.dumps([["queue", "reports_in_progress"]]): 5}},
+        'histograms': {}
+    }
+    with open(os.path.join(directory, f"worker_{snapshot['pid']}.json"), 'w') as f:
+        json.dump(snapshot, f)
+
+def test_metrics_aggregate_across_workers():
+    """Counters from every worker are summed, gauges only come from live workers"""
+    directory = tempfile.mkdtemp()
+    registry = MetricsRegistry(directory=directory)
+    registry.inc('graph_reports_generated_total', status='success')
+    registry.record_cache('user', hit=True)
+    registry.record_cache('user', hit=False)
+    registry.observe('graph_http_request_duration_seconds', 0.2, route='/api/projects', method='GET')
+    _dead_worker_snapshot(directory)
+
+    text = render_prometheus(registry)
+    assert 'graph_reports_generated_total{status="success"} 4' in text
+    assert 'reports_in_progress' not in text
+    assert 'graph_cache_hit_ratio{cache="user"} 0.5' in text
+    assert 'graph_http_request_duration_seconds_bucket{method="GET",route="/api/projects",le="0.25"} 1' in text
+    assert 'graph_http_request_duration_seconds_bucket{method="GET",route="/api/projects",le="0.1"} 0' in text
+    print("✅ Metrics merged across worker snapshots")
+
+def test_compact_dead_workers_keeps_totals():
+    """Compacting exited workers into the archive does not change the exported totals"""
+    directory = tempfile.mkdtemp()
+    registry = MetricsRegistry(directory=directory)
+    registry.inc('graph_reports_generated_total', status='success')
+    _dead_worker_snapshot(directory)
+
+    assert registry.compact_dead_workers() == 1
+    assert 'graph_reports_generated_total{status="success"} 4' in render_prometheus(registry)
+    assert not any(name.startswith('worker_') and str(2 ** 22 + 17) in name for name in os.listdir(directory))
+    print("✅ Dead worker snapshots compacted into the archive")
+
+def test_worker_exit_flushes_recent_counters():
+    """Counters recorded inside the flush interval are on disk once the worker exits"""
+    directory = tempfile.mkdtemp()
+    registry = MetricsRegistry(directory=directory, flush_interval=3600)
+    registry.inc('graph_reports_generated_total', status='success')
+    registry.inc('graph_reports_generated_total', status='success')
+
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(os.path.dirname(__file__), 'gunicorn.conf.py'))
+    gunicorn_conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gunicorn_conf)
+    previous = utils.metrics.metrics_registry
+    utils.metrics.metrics_registry = registry
+    try:
+        gunicorn_conf.worker_exit(None, None)
+    finally:
+        utils.metrics.metrics_registry = previous
+
+    with open(os.path.join(directory, f'worker_{os.getpid()}.json')) as f:
+        snapshot = json.load(f)
+    assert snapshot['counters']['graph_reports_generated_total'][json.dumps([["status", "success"]])] == 2
+    print("✅ Worker exit writes the final metrics snapshot")
+
+if __name__ == "__main__":
+    test_metrics_aggregate_across_workers()
+    test_compact_dead_workers_keeps_totals()
+    test_worker_exit_flushes_recent_counters()
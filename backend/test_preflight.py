@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch ZIP preflight validation
+"""
+
+import io
+import json
+import os
+import tempfile
+import zipfile
+
+import openpyxl
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_workbook
+from routes import projects
+from routes.projects import preflight_excel_workbook
+
+def _broken_workbook(path):
+    """A workbook with one problem per chart row"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Report_Name", "Report_Code", "Text_Tag", "Text", "Chart_Tag", "Chart_Attributes", "Chart_Type"])
+    good_series = {"x_axis": "A2:A4", "data": [{"name": "S", "values": "B2:B4"}]}
+    ws.append(["Broken", "BRK", None, None, "section1_chart", "{not json", "bar"])
+    ws.append([None, None, None, None, "section2_chart", json.dumps({"chart_meta": {"source_sheet": "missing"}, "series": good_series}), "bar"])
+    ws.append([None, None, None, None, "section3_chart", json.dumps({"chart_meta": {"source_sheet": "data"}, "series": {"x_axis": "A2:A4", "data": [{"values": "Z2:Z4"}]}}), "line"])
+    ws.append([None, None, None, None, "section4_chart", json.dumps({"chart_meta": {"source_sheet": "data"}, "series": good_series}), "spiral"])
+    data = wb.create_sheet("data")
+    for r, (label, value) in enumerate([("a", 1), ("b", 2), ("c", 3)], 2):
+        data[f"A{r}"], data[f"B{r}"] = label, value
+    wb.save(path)
+
+def test_preflight_accepts_synthetic_workbook():
+    """A well-formed workbook has no errors and reports its charts and metadata"""
+    path = os.path.join(tempfile.mkdtemp(), "ok.xlsx")
+    build_workbook(path, sections=4, chart_mix=["bar", "pie", "heatmap", "line"], series_length=5, placeholders=2)
+
+    errors, warnings, info = preflight_excel_workbook(path)
+    assert errors == [], errors
+    assert info['charts'] == 4
+    assert info['report_code'] == "SYN-1234"
+    print("✅ Preflight accepts a valid workbook")
+
+def test_preflight_reports_every_chart_problem():
+    """Invalid JSON, missing sheets, empty ranges and unknown chart types are all reported"""
+    path = os.path.join(tempfile.mkdtemp(), "broken.xlsx")
+    _broken_workbook(path)
+
+    errors, _, _ = preflight_excel_workbook(path)
+    joined = "\n".join(errors)
+    assert "section1_chart): invalid Chart_Attributes JSON" in joined
+    assert "source_sheet 'missing' does not exist" in joined
+    assert "series.data[0].values range data!Z2:Z4 is empty" in joined
+    assert "unknown chart type 'spiral'" in joined
+    print("✅ Preflight reports chart configuration problems")
+
+def test_preflight_reports_oversized_and_invalid_references():
+    """Bad columns and ranges over the cell limits are one error each; the other references are still checked"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Report_Name", "Report_Code", "Text_Tag", "Text", "Chart_Tag", "Chart_Attributes", "Chart_Type"])
+    series = {"x_axis": "A2:A4", "data": [{"name": "S", "values": "B2:B4"}, {"name": "Bad", "values": "ZZZZ1"},
+                                           {"name": "Big", "values": "C1:C80"}, {"name": "Empty", "values": "D2:D20"},
+                                           {"name": "Over", "values": "E1:E40"}]}
+    ws.append(["Limits", "LIM", None, None, "section1_chart", json.dumps({"chart_meta": {"source_sheet": "data"}, "series": series}), "bar"])
+    data = wb.create_sheet("data")
+    for r, (label, value) in enumerate([("a", 1), ("b", 2), ("c", 3)], 2):
+        data[f"A{r}"], data[f"B{r}"] = label, value
+    path = os.path.join(tempfile.mkdtemp(), "limits.xlsx")
+    wb.save(path)
+
+    limits = projects.PREFLIGHT_MAX_REFERENCE_CELLS, projects.PREFLIGHT_MAX_WORKBOOK_CELLS
+    projects.PREFLIGHT_MAX_REFERENCE_CELLS, projects.PREFLIGHT_MAX_WORKBOOK_CELLS = 50, 60
+    try:
+        errors, _, _ = preflight_excel_workbook(path)
+    finally:
+        projects.PREFLIGHT_MAX_REFERENCE_CELLS, projects.PREFLIGHT_MAX_WORKBOOK_CELLS = limits
+
+    assert errors == [
+        "Row 2 (section1_chart): series.data[1].values reference ZZZZ1 has an invalid column",
+        "Row 2 (section1_chart): series.data[2].values range C1:C80 covers 80 cells (limit 50)",
+        "Row 2 (section1_chart): series.data[4].values range E1:E40 takes the workbook past 60 referenced cells",
+        "Row 2 (section1_chart): series.data[3].values range data!D2:D20 is empty",
+    ], errors
+    print("✅ Preflight reports oversized and invalid references")
+
+def test_preflight_endpoint_reports_per_file():
+    """The endpoint validates each workbook in the ZIP without generating reports"""
+    directory = tempfile.mkdtemp()
+    build_workbook(os.path.join(directory, "ok.xlsx"), sections=2, series_length=4, placeholders=1)
+    _broken_workbook(os.path.join(directory, "broken.xlsx"))
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.write(os.path.join(directory, "ok.xlsx"), arcname="ok.xlsx")
+        zf.write(os.path.join(directory, "broken.xlsx"), arcname="nested/broken.xlsx")
+    archive.seek(0)
+
+    app = create_bench_app()
+    with app.app_context():
+        project_id = app.mongo.db.projects.insert_one({'name': 'p', 'user_id': None}).inserted_id
+    response = app.test_client().post(f"/api/projects/{project_id}/preflight_zip",
+                                      data={'zip_file': (archive, 'batch.zip')}, content_type='multipart/form-data')
+
+    payload = response.get_json()
+    assert response.status_code == 200
+    assert (payload['total_files'], payload['valid_files']) == (2, 1)
+    assert {f['file']: f['valid'] for f in payload['files']} == {"ok.xlsx": True, "nested/broken.xlsx": False}
+    print("✅ Preflight endpoint reports per-file results")
+
+if __name__ == "__main__":
+    test_preflight_accepts_synthetic_workbook()
+    test_preflight_reports_every_chart_problem()
+    test_preflight_reports_oversized_and_invalid_references()
+    test_preflight_endpoint_reports_per_file()
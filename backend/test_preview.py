@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for the chart preview endpoint
+"""
+
+import base64
+import io
+import os
+import tempfile
+
+from PIL import Image
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_workbook
+
+def _post_preview(app, project_id, workbook_path, **form):
+    with open(workbook_path, 'rb') as f:
+        data = dict(form, report_file=(io.BytesIO(f.read()), 'report.xlsx'))
+    return app.test_client().post(f"/api/projects/{project_id}/preview_charts", data=data,
+                                  content_type='multipart/form-data')
+
+def test_preview_renders_only_requested_charts():
+    """Requested charts come back as low-DPI PNGs; unknown tags are reported per chart"""
+    workbook_path = os.path.join(tempfile.mkdtemp(), "report.xlsx")
+    build_workbook(workbook_path, sections=3, chart_mix=["bar", "line", "pie"], series_length=8, placeholders=0)
+
+    app = create_bench_app()
+    with app.app_context():
+        project_id = app.mongo.db.projects.insert_one({'name': 'p', 'user_id': None}).inserted_id
+    response = _post_preview(app, project_id, workbook_path, chart_tags="section1_chart,section3_chart,section9_chart")
+
+    payload = response.get_json()
+    assert response.status_code == 200, payload
+    charts = {chart['tag']: chart for chart in payload['charts']}
+    assert list(charts) == ["section1_chart", "section3_chart", "section9_chart"]
+    assert charts["section9_chart"]["error"] == "Chart tag not found in the workbook"
+    for tag in ("section1_chart", "section3_chart"):
+        assert charts[tag]["format"] == "png", charts[tag]
+        image = Image.open(io.BytesIO(base64.b64decode(charts[tag]["image"])))
+        # 72 DPI instead of the report's 200
+        assert image.width < 1000, image.size
+    # Preview failures are not written to the shared error store
+    assert app.mongo.db.report_errors.count_documents({}) == 0
+    print("✅ Preview renders only the requested charts")
+
+def test_preview_validates_request():
+    """Missing tags and bad DPI values are rejected"""
+    workbook_path = os.path.join(tempfile.mkdtemp(), "report.xlsx")
+    build_workbook(workbook_path, sections=1, chart_mix=["bar"], series_length=4, placeholders=0)
+
+    app = create_bench_app()
+    with app.app_context():
+        project_id = app.mongo.db.projects.insert_one({'name': 'p', 'user_id': None}).inserted_id
+    assert _post_preview(app, project_id, workbook_path).status_code == 400
+    assert _post_preview(app, project_id, workbook_path, chart_tags="section1_chart", dpi="high").status_code == 400
+    response = _post_preview(app, project_id, workbook_path, chart_tags="section1_chart", dpi="9999")
+    assert response.status_code == 200 and response.get_json()['dpi'] == 150
+    print("✅ Preview requests are validated")
+
+if __name__ == "__main__":
+    test_preview_renders_only_requested_charts()
+    test_preview_validates_request()
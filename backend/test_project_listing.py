@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for paginated project listing
+"""
+
+from benchmarks.bench_report import create_bench_app
+
+def _create_projects(app, count):
+    with app.app_context():
+        return [str(app.mongo.db.projects.insert_one({
+            'name': f'p{i}', 'description': 'd', 'user_id': None,
+            'file_name': 'template.docx', 'file_content': b'x' * 1024,
+        }).inserted_id) for i in range(count)]
+
+def test_projects_are_paged_newest_first():
+    """Pages follow next_cursor until the last one and never include template blobs"""
+    app = create_bench_app()
+    project_ids = _create_projects(app, 7)
+    client = app.test_client()
+
+    pages, cursor = [], None
+    while True:
+        response = client.get('/api/projects', query_string={'limit': 3, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200
+        payload = response.get_json()
+        pages.append(payload)
+        cursor = payload['next_cursor']
+        if not cursor:
+            break
+
+    assert [len(page['projects']) for page in pages] == [3, 3, 1]
+    assert pages[0]['total'] == 7 and 'total' not in pages[1]
+    listed = [project['id'] for page in pages for project in page['projects']]
+    assert listed == project_ids[::-1]
+    assert all('file_content' not in project for page in pages for project in page['projects'])
+    print("✅ Projects are paged newest first")
+
+def test_project_listing_validates_arguments():
+    """Bad limits and cursors are rejected; single project reads leave the template out"""
+    app = create_bench_app()
+    project_id = _create_projects(app, 1)[0]
+    client = app.test_client()
+
+    assert client.get('/api/projects', query_string={'limit': 'all'}).status_code == 400
+    assert client.get('/api/projects', query_string={'cursor': 'nope'}).status_code == 400
+    assert len(client.get('/api/projects', query_string={'limit': 1000}).get_json()['projects']) == 1
+
+    project = client.get(f'/api/projects/{project_id}').get_json()['project']
+    assert project['file_name'] == 'template.docx' and 'file_content' not in project
+    print("✅ Project listing arguments are validated")
+
+if __name__ == "__main__":
+    test_projects_are_paged_newest_first()
+    test_project_listing_validates_arguments()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the chart renderer registry and the shared chart helpers
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import openpyxl
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from renderers import RENDERER_REGISTRY, get_renderer
+from renderers.helpers import format_data_label, group_and_sort, legend_visible, resolve_font_family, text_alignment
+from routes.projects import KNOWN_CHART_TYPES, _generate_report
+from utils.report_timing import ReportTimer
+
+def test_registry_dispatch():
+    """Chart types map to one cached renderer per family; unknown types use the series renderer"""
+    assert type(get_renderer("pie")).__name__ == "PieRenderer"
+    assert type(get_renderer("bar_of_pie")).__name__ == "BarOfPieRenderer"
+    assert get_renderer("bar of pie") is get_renderer("bar_of_pie")
+    assert get_renderer("line") is get_renderer("area")
+    assert get_renderer("heatmap") is get_renderer("contour")
+    assert type(get_renderer("waterfall")).__name__ == "TreemapRenderer"
+    assert type(get_renderer("bubble")).__name__ == "ScatterRenderer"
+    assert type(get_renderer("spiral")).__name__ == "SeriesRenderer"
+    assert get_renderer("bar_of_pie").backend == "plotly"
+    assert KNOWN_CHART_TYPES == set(RENDERER_REGISTRY)
+    print("✅ Renderer registry dispatches by chart type")
+
+def test_renderer_modules_load_on_first_use():
+    """Importing the registry does not import any renderer module until its chart type is drawn"""
+    script = (
+        "import sys, renderers\n"
+        "others = ('renderers.bar', 'renderers.grid', 'renderers.treemap', 'renderers.pie', 'renderers.bar_of_pie')\n"
+        "assert not [m for m in sys.modules if m in ('renderers.series', 'renderers.line') + others]\n"
+        "renderers.get_renderer('line')\n"
+        "assert 'renderers.series' in sys.modules and 'renderers.line' in sys.modules\n"
+        "assert not [m for m in sys.modules if m in others]\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    print("✅ Renderer modules are imported lazily")
+
+def test_shared_helpers():
+    """Hoisted helpers behave like the former nested ones"""
+    assert group_and_sort(["a", "b", "c"], [2, 3, 1], sort_order="descending") == (["b", "a", "c"], [3, 2, 1])
+    assert group_and_sort(["a", "b", "c"], [2, 3, 1], group_names=["a", "c"]) == (["a", "c"], [2, 1])
+    assert resolve_font_family(None) is None
+    assert resolve_font_family("DejaVu Sans") == "DejaVu Sans"
+    assert resolve_font_family("Times New Roman Missing") == "Helvetica"
+    assert legend_visible({}) and not legend_visible({"showlegend": "off"}) and not legend_visible({"legend": 0})
+    assert format_data_label(0.25, ".0%") == "25%" and format_data_label("n/a", ".1f") == "n/a"
+    assert text_alignment("top left") == "left" and text_alignment("bottom") == "center"
+    print("✅ Shared chart helpers")
+
+def test_data_labels_default_to_the_title_size():
+    """Bar and line data labels without a data_label_font_size are sized from the title font"""
+    chart_mix = ["bar", "line"]
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=len(chart_mix), chart_mix=chart_mix, placeholders=0)
+    build_template(template_path, sections=len(chart_mix), placeholders=0, with_table=False)
+
+    wb = openpyxl.load_workbook(workbook_path)
+    ws = wb["report"]
+    column = [cell.value for cell in ws[1]].index("Chart_Attributes") + 1
+    for row in range(2, 2 + len(chart_mix)):
+        attrs = json.loads(ws.cell(row, column).value)
+        # Line labels are drawn on the secondary axis
+        attrs["chart_meta"].update({"data_labels": True, "data_label_color": "#c00000", "disable_secondary_y": False})
+        attrs["chart_meta"].pop("data_label_font_size", None)
+        ws.cell(row, column).value = json.dumps(attrs)
+    wb.save(workbook_path)
+
+    app = create_bench_app()
+    report_timer = ReportTimer()
+    with app.app_context():
+        output = _generate_report("label_size_test", template_path, workbook_path, report_timer=report_timer)
+    assert output and os.path.exists(output)
+    os.remove(output)
+
+    assert sorted(chart["chart_type"] for chart in report_timer.charts) == sorted(chart_mix)
+    assert all(chart["success"] for chart in report_timer.charts), report_timer.charts
+    print("✅ Data labels default to the title font size")
+
+if __name__ == "__main__":
+    test_registry_dispatch()
+    test_renderer_modules_load_on_first_use()
+    test_shared_helpers()
+    test_data_labels_default_to_the_title_size()
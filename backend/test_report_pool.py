@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the report generation process pool
+"""
+
+import io
+import os
+import tempfile
+
+from docx import Document
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+import utils.report_pool as report_pool
+from utils.report_pool import ReportPool, get_report_pool
+from utils.report_timing import get_timing_histogram
+
+def test_reports_run_in_pool_processes():
+    """upload_report hands the report to a pool process and gets the document, timings and errors back"""
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0)
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+
+    app = create_bench_app()
+    app.config['REPORT_POOL_WORKERS'] = 1
+    app.config['REPORT_POOL_APP_FACTORY'] = 'benchmarks.bench_report:create_bench_app'
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'p', 'user_id': None, 'file_name': 'report.docx', 'file_content': template,
+        }).inserted_id)
+    get_timing_histogram().reset()
+
+    pool = get_report_pool(app)
+    try:
+        with open(workbook_path, 'rb') as f:
+            response = app.test_client().post(f"/api/projects/{project_id}/upload_report", content_type='multipart/form-data',
+                                              data={'response': 'docx', 'report_file': (io.BytesIO(f.read()), 'report.xlsx')})
+        assert response.status_code == 200
+        assert len(Document(io.BytesIO(response.get_data())).inline_shapes) == 2
+        assert response.headers['X-Chart-Errors'] == '0'
+        assert pool._executor is not None, "the report ran in the pool, not in the request thread"
+    finally:
+        pool.shutdown()
+    assert get_timing_histogram().summary()["stages"]["total"]["count"] == 1
+    print("✅ Reports run in pool processes")
+
+def test_inline_pool_serialises_jobs():
+    """With no pool processes, jobs run in the calling thread"""
+    pool = ReportPool(0)
+    assert pool.inline
+    assert pool.call('os.path:join', 'a', 'b') == os.path.join('a', 'b')
+    assert pool._executor is None
+    print("✅ Inline pool runs jobs in the calling thread")
+
+def test_pool_recycles_processes():
+    """Pool processes are replaced after REPORT_POOL_MAX_JOBS jobs each, on every supported Python"""
+    limit = report_pool.MAX_JOBS_PER_PROCESS
+    report_pool.MAX_JOBS_PER_PROCESS = 2
+    pool = ReportPool(1, 'benchmarks.bench_report:create_bench_app')
+    try:
+        pids = [pool.call('os:getpid') for _ in range(5)]
+    finally:
+        report_pool.MAX_JOBS_PER_PROCESS = limit
+        pool.shutdown()
+    assert pids[0] == pids[1] and pids[2] == pids[3] and len(set(pids)) == 3
+    assert os.getpid() not in pids
+    print("✅ Pool processes are recycled")
+
+if __name__ == "__main__":
+    test_reports_run_in_pool_processes()
+    test_inline_pool_serialises_jobs()
+    test_pool_recycles_processes()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for single-request report generation (upload_report with response=docx)
+"""
+
+import glob
+import io
+import json
+import os
+import tempfile
+
+import openpyxl
+from docx import Document
+
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+
+def _project_with_broken_chart():
+    directory = tempfile.mkdtemp()
+    workbook_path = os.path.join(directory, "report.xlsx")
+    template_path = os.path.join(directory, "report.docx")
+    build_workbook(workbook_path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0)
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    wb = openpyxl.load_workbook(workbook_path)
+    ws = wb["report"]
+    ws.cell(3, [cell.value for cell in ws[1]].index("Chart_Attributes") + 1).value = "{not json"
+    wb.save(workbook_path)
+
+    app = create_bench_app()
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'Quarterly', 'user_id': None, 'file_name': 'report.docx', 'file_content': template,
+        }).inserted_id)
+    with open(workbook_path, 'rb') as f:
+        workbook = f.read()
+    return app, project_id, workbook
+
+def _upload(client, project_id, workbook, **form):
+    return client.post(f"/api/projects/{project_id}/upload_report", content_type='multipart/form-data',
+                       data=dict(form, report_file=(io.BytesIO(workbook), 'report.xlsx')))
+
+def test_report_is_streamed_back():
+    """response=docx returns the document with error counts and timings in headers and keeps no copy"""
+    app, project_id, workbook = _project_with_broken_chart()
+    client = app.test_client()
+    response = _upload(client, project_id, workbook, response='docx')
+    assert response.status_code == 200
+    assert 'Quarterly_report.docx' in response.headers['Content-Disposition']
+    document = Document(io.BytesIO(response.get_data()))
+    assert document.inline_shapes, "the working chart is in the streamed document"
+    response.close()
+    assert not glob.glob(os.path.join(tempfile.gettempdir(), "*", f"output_report_{project_id}.docx"))
+
+    assert response.headers['X-Chart-Errors'] == '1' and response.headers['X-Report-Errors'] == '1'
+    timings = json.loads(response.headers['X-Report-Timings'])
+    assert timings['total_seconds'] > 0 and 'doc_save' in timings['stages']
+    assert 'total;dur=' in response.headers['Server-Timing']
+
+    project = app.mongo.db.projects.find_one({'name': 'Quarterly'})
+    assert 'generated_report_path' not in project and project['report_generated_at']
+    # Chart errors are still stored for the "View Errors" dialog
+    errors = client.get(f"/api/projects/{project_id}/chart_errors").get_json()
+    assert [error['tag'] for error in errors['report_generation_errors']] == ['section2_chart']
+    print("✅ Report is streamed back in one request")
+
+def test_report_is_kept_for_download_by_default():
+    """Without response=docx the report is kept for the download route as before"""
+    app, project_id, workbook = _project_with_broken_chart()
+    client = app.test_client()
+    payload = _upload(client, project_id, workbook).get_json()
+    assert os.path.exists(payload['report_path'])
+
+    response = client.get(f"/api/reports/{project_id}/download")
+    assert response.status_code == 200 and response.get_data()[:2] == b'PK'
+    print("✅ Report is kept for download by default")
+
+if __name__ == "__main__":
+    test_report_is_streamed_back()
+    test_report_is_kept_for_download_by_default()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script for per-stage report timings and the rolling latency histogram
+"""
+
+from utils.report_timing import ReportTimer, TimingHistogram
+
+def test_report_timer_stages_and_charts():
+    """Stages are summed and charts pick up their resolved chart type"""
+    timer = ReportTimer()
+    timer.add_stage("chart_rendering", 0.25)
+    with timer.stage("chart_rendering"):
+        pass
+    timer.lap("excel_parsing")
+    timer.note_chart_type("Section1_Chart", "bar")
+    timer.note_chart_build("section1_chart", figures=1, traces=0)
+    timer.record_chart("section1_chart", 0.25, True)
+    timer.record_chart("section2_chart", 0.1, False)
+
+    timings = timer.as_dict()
+    assert timings["stages"]["chart_rendering"] >= 0.25
+    assert "excel_parsing" in timings["stages"]
+    assert timings["charts"][0]["chart_type"] == "bar"
+    assert timings["charts"][1]["chart_type"] == "unknown"
+    assert timings["charts"][1]["success"] is False
+    assert timings["charts"][0]["figures"] == 1
+    assert timings["charts"][1]["figures"] == 0
+    print("✅ Report timer collects stages and charts")
+
+def test_timing_histogram_percentiles():
+    """p50/p95 are nearest-rank over a bounded window"""
+    histogram = TimingHistogram(window_size=100)
+    for i in range(1, 201):
+        timer = ReportTimer()
+        timer.add_stage("doc_save", i / 100.0)
+        timer.note_chart_type("section1_chart", "line")
+        timer.record_chart("section1_chart", i / 100.0, True)
+        histogram.observe_report(timer)
+
+    summary = histogram.summary()
+    doc_save = summary["stages"]["doc_save"]
+    assert doc_save["count"] == 100  # only the last 100 samples are kept
+    assert doc_save["p50"] == 1.5
+    assert doc_save["p95"] == 1.95
+    assert summary["chart_types"]["line"]["p95"] == 1.95
+    print("✅ Timing histogram reports rolling p50/p95")
+
+if __name__ == "__main__":
+    test_report_timer_stages_and_charts()
+    test_timing_histogram_percentiles()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script for worker startup (bytecode cache and lazy report imports)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _run(code, **env):
+    environment = {k: v for k, v in os.environ.items() if k not in ("PYTHONPYCACHEPREFIX", "BYTECODE_CACHE")}
+    environment.update(MONGO_URI="mongodb://localhost:27017/graph_project_test", **env)
+    output = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=environment, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_app_starts_without_report_libraries():
+    """Importing the app and serving a request loads none of the report libraries"""
+    loaded = _run(
+        "import json, sys\n"
+        "import app\n"
+        "app.create_app().test_client().get('/metrics')\n"
+        "print(json.dumps([m for m in ('pandas', 'matplotlib.pyplot', 'plotly', 'openpyxl', 'docx') if m in sys.modules]))\n"
+    )
+    assert loaded == []
+    print("✅ App starts without the report libraries")
+
+def test_bytecode_cache_directory():
+    """Bytecode goes to the configured prefix, and BYTECODE_CACHE=0 writes none"""
+    prefix = tempfile.mkdtemp()
+    code = ("import json, sys\n"
+            "from utils.bytecode import enable_bytecode_cache\n"
+            "print(json.dumps([enable_bytecode_cache(), sys.dont_write_bytecode]))\n")
+    assert _run(code, PYTHONPYCACHEPREFIX=prefix) == [prefix, False]
+    assert _run(code, BYTECODE_CACHE="0") == [None, True]
+    print("✅ Bytecode cache directory is configurable")
+
+if __name__ == "__main__":
+    test_app_starts_without_report_libraries()
+    test_bytecode_cache_directory()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the Flask-Login user cache
+"""
+
+import os
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017/graph_project_test")
+
+from app import create_app
+from benchmarks.local_mongo import LocalMongo
+from utils.user_cache import UserCache, get_user_cache
+
+def test_user_cache_is_bounded():
+    """Entries expire after the TTL and the least recently used user is dropped first"""
+    cache = UserCache(ttl_seconds=0.05, max_size=2)
+    cache.put('a', 'user a')
+    cache.put('b', 'user b')
+    assert cache.get('a') == 'user a'
+    cache.put('c', 'user c')
+    assert cache.get('b') is None and cache.get('a') == 'user a'
+    time.sleep(0.06)
+    assert cache.get('a') is None and cache.get('c') is None
+    print("✅ User cache is bounded")
+
+def test_authenticated_requests_reuse_the_user():
+    """Polling requests load the user from Mongo once; logout drops it from the cache"""
+    app = create_app()
+    app.mongo = LocalMongo()
+    lookups = []
+    users = app.mongo.db.users
+    original_find_one = users.find_one
+    users.find_one = lambda query=None, projection=None: lookups.append(query) or original_find_one(query, projection)
+    index_builds = []
+    users.create_index = lambda keys, **kwargs: index_builds.append(keys)
+    get_user_cache().clear()
+
+    client = app.test_client()
+    details = {'full_name': 'Ada', 'username': 'ada', 'email': 'ada@example.com', 'password': 'pw'}
+    assert client.post('/api/register', json=details).status_code == 201
+    assert client.post('/api/register', json=details).status_code == 400
+    user_id = client.post('/api/login', json={'username': 'ada', 'password': 'pw'}).get_json()['user']['id']
+    # The unique user indexes are built at startup, never by register or login
+    assert index_builds == []
+
+    lookups.clear()
+    for _ in range(5):
+        assert client.get('/api/projects').status_code == 200
+    assert lookups == []
+
+    assert client.get('/api/logout').status_code == 200
+    assert get_user_cache().get(user_id) is None
+    assert client.get('/api/projects').status_code == 401
+    print("✅ Authenticated requests reuse the cached user")
+
+if __name__ == "__main__":
+    test_user_cache_is_bounded()
+    test_authenticated_requests_reuse_the_user()
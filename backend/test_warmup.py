@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-fork rendering warm-up
+"""
+
+import os
+import sys
+
+from utils.warmup import warm_rendering_stack, warmup_enabled
+
+def test_warmup_initialises_rendering_stack():
+    """Every warm-up step runs and leaves the report libraries and renderers loaded"""
+    timings = warm_rendering_stack(dpi=50, freeze=False)
+    assert list(timings) == ["matplotlib", "excel", "plotly", "docx", "renderers"]
+    assert all(name in sys.modules for name in ("pandas", "matplotlib.pyplot", "plotly.graph_objects", "docx"))
+
+    import matplotlib.pyplot as plt
+    from renderers import RENDERER_REGISTRY, _renderers
+    assert plt.get_fignums() == []
+    assert set(_renderers) == set(RENDERER_REGISTRY.values())
+    print("✅ Warm-up initialises the rendering stack")
+
+def test_warmup_can_be_disabled():
+    """RENDER_WARMUP=0 turns the gunicorn hook off"""
+    previous = os.environ.get("RENDER_WARMUP")
+    try:
+        os.environ["RENDER_WARMUP"] = "0"
+        assert not warmup_enabled()
+        os.environ["RENDER_WARMUP"] = "1"
+        assert warmup_enabled()
+    finally:
+        if previous is None:
+            os.environ.pop("RENDER_WARMUP", None)
+        else:
+            os.environ["RENDER_WARMUP"] = previous
+    print("✅ Warm-up can be disabled")
+
+if __name__ == "__main__":
+    test_warmup_initialises_rendering_stack()
+    test_warmup_can_be_disabled()
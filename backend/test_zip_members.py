@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming batch ZIP members with zip-bomb checks
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+
+import utils.batch_upload as batch_upload
+from benchmarks.bench_report import create_bench_app
+from benchmarks.synthetic import build_template, build_workbook
+from utils.batch_upload import UnsafeMember, copy_member
+
+def _workbook(directory, i):
+    path = os.path.join(directory, f"batch_{i}.xlsx")
+    build_workbook(path, sections=2, chart_mix=["bar", "line"], series_length=4, placeholders=0, seed=i)
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_copy_member_limits():
+    """Members over the size or compression-ratio limit are refused before they are inflated"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("bomb.xlsx", b"\0" * (8 * 1024 * 1024))
+        zf.writestr("small.xlsx", b"x" * 1000)
+    with zipfile.ZipFile(archive) as zf:
+        try:
+            copy_member(zf, zf.getinfo("bomb.xlsx"), io.BytesIO())
+            raise AssertionError("ratio limit not enforced")
+        except UnsafeMember as e:
+            assert "expands" in str(e)
+        assert copy_member(zf, zf.getinfo("small.xlsx"), io.BytesIO()) == 1000
+
+        limit = batch_upload.MAX_MEMBER_SIZE
+        batch_upload.MAX_MEMBER_SIZE = 999
+        try:
+            copy_member(zf, zf.getinfo("small.xlsx"), io.BytesIO())
+            raise AssertionError("size limit not enforced")
+        except UnsafeMember as e:
+            assert "999 byte limit" in str(e)
+        finally:
+            batch_upload.MAX_MEMBER_SIZE = limit
+    print("✅ Member size and ratio limits enforced")
+
+def test_extract_member_checks_actual_size():
+    """An arrived member that inflates past its declared size is stopped"""
+    directory = tempfile.mkdtemp()
+    archive_path = os.path.join(directory, 'upload.zip')
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("data.xlsx", b"abc" * 10000)
+    with zipfile.ZipFile(archive_path) as zf:
+        info = zf.getinfo("data.xlsx")
+    store = batch_upload.BatchUploadStore(create_bench_app().mongo.db, directory=os.path.dirname(directory))
+    member = {'name': info.filename, 'method': info.compress_type, 'crc': info.CRC,
+              'data_offset': info.header_offset + 30 + len(info.filename), 'compressed_size': info.compress_size,
+              'file_size': 1000}
+    try:
+        store.extract_member(os.path.basename(directory), member, os.path.join(directory, 'out.xlsx'))
+        raise AssertionError("declared size not enforced")
+    except UnsafeMember as e:
+        assert "declared 1000 bytes" in str(e)
+    print("✅ Arrived members are checked against their declared size")
+
+def test_upload_zip_streams_excel_members():
+    """upload_zip reads only the Excel members and skips unsafe ones"""
+    directory = tempfile.mkdtemp()
+    template_path = os.path.join(directory, "batch.docx")
+    build_template(template_path, sections=2, placeholders=0, with_table=False)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("attachments/notes.txt", "not a workbook")
+        zf.writestr("a/batch_0.xlsx", _workbook(directory, 0))
+        zf.writestr("bomb.xlsx", b"\0" * (8 * 1024 * 1024))
+        zf.writestr("b/batch_1.xlsx", _workbook(directory, 1))
+
+    app = create_bench_app()
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    with app.app_context():
+        project_id = str(app.mongo.db.projects.insert_one({
+            'name': 'p', 'user_id': None, 'file_name': 'batch.docx', 'file_content': template,
+        }).inserted_id)
+
+    response = app.test_client().post(f"/api/projects/{project_id}/upload_zip",
+                                      data={'zip_file': (io.BytesIO(archive.getvalue()), 'batch.zip')})
+    payload = response.get_json()
+    assert response.status_code == 200
+    assert payload['total_files'] == 3 and payload['processed_files'] == 2
+    assert [entry['original_file'] for entry in payload['reports']] == ['batch_0', 'batch_1']
+    os.remove(payload['download_zip'])
+    print("✅ upload_zip streams Excel members and skips the zip bomb")
+
+if __name__ == "__main__":
+    test_copy_member_limits()
+    test_extract_member_checks_actual_size()
+    test_upload_zip_streams_excel_members()
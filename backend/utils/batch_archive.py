@@ -0,0 +1,103 @@
+"""
+Batch report ZIP, compressed while the batch is still being generated.
+
+Reports are queued as they finish and written by one background thread, so
+deflating a report overlaps with rendering the next one (zlib releases the
+GIL, and reports usually render in the report pool process). Only the last
+report is compressed after generation ends.
+"""
+
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_METHODS = {
+    'stored': zipfile.ZIP_STORED,
+    'deflated': zipfile.ZIP_DEFLATED,
+    'bzip2': zipfile.ZIP_BZIP2,
+    'lzma': zipfile.ZIP_LZMA,
+}
+# DOCX parts and chart images are compressed already, so higher levels save next to nothing over level 1
+# (see benchmarks/bench_batch_archive.py)
+DEFAULT_COMPRESSION = 'deflated'
+DEFAULT_COMPRESSLEVEL = 1
+
+
+def compression_settings(config):
+    """(zipfile method, level) from BATCH_ZIP_COMPRESSION / BATCH_ZIP_COMPRESSLEVEL in a Flask config"""
+    name = str(config.get('BATCH_ZIP_COMPRESSION') or DEFAULT_COMPRESSION).lower()
+    if name not in COMPRESSION_METHODS:
+        logger.warning(f"Unknown BATCH_ZIP_COMPRESSION {name!r}, using {DEFAULT_COMPRESSION}")
+        name = DEFAULT_COMPRESSION
+    level = config.get('BATCH_ZIP_COMPRESSLEVEL')
+    level = DEFAULT_COMPRESSLEVEL if level in (None, '') else int(level)
+    # Levels only apply to deflate (0-9) and bzip2 (1-9)
+    if name == 'stored' or name == 'lzma':
+        level = None
+    elif name == 'bzip2':
+        level = min(max(level, 1), 9)
+    else:
+        level = min(max(level, 0), 9)
+    return COMPRESSION_METHODS[name], level
+
+
+class BatchArchive:
+    """
+    The download ZIP of a batch: reports_by_name/<name>.docx and reports_by_code/<code>.docx.
+
+    add_report() returns at once; close() waits for the queued writes and
+    moves the finished ZIP to path, so a partial archive is never served.
+    """
+
+    def __init__(self, path, compression=zipfile.ZIP_DEFLATED, compresslevel=DEFAULT_COMPRESSLEVEL, background=True):
+        self.path = path
+        self._partial_path = f"{path}.{os.getpid()}.partial"
+        self._zip = zipfile.ZipFile(self._partial_path, 'w', compression=compression, compresslevel=compresslevel)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='batch-archive') if background else None
+        self._futures = []
+        self._names = {}
+
+    def _write(self, report_path, arcnames):
+        for arcname in arcnames:
+            self._zip.write(report_path, arcname=arcname)
+
+    def add_report(self, entry, report_path):
+        """Queue a generated report; it must stay on disk until close()"""
+        arcnames = []
+        for arcname in (f"reports_by_name/{entry['name']}.docx", f"reports_by_code/{entry['code']}.docx"):
+            if arcname in self._names:
+                # A deduplicated workbook brings the same report again; anything else is a name clash
+                if self._names[arcname] != report_path:
+                    logger.warning(f"⚠️ {arcname} is already in the batch archive, skipping the copy from {report_path}")
+                continue
+            self._names[arcname] = report_path
+            arcnames.append(arcname)
+        if self._executor is None:
+            self._write(report_path, arcnames)
+        else:
+            self._futures.append(self._executor.submit(self._write, report_path, arcnames))
+
+    def close(self):
+        """Finish the queued writes and publish the ZIP; returns its path"""
+        try:
+            for future in self._futures:
+                future.result()
+        except BaseException:
+            self.abort()
+            raise
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._zip.close()
+        os.replace(self._partial_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Drop the archive after a failure"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+        self._zip.close()
+        if os.path.exists(self._partial_path):
+            os.remove(self._partial_path)
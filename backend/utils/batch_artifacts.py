@@ -0,0 +1,107 @@
+"""
+Finished batch results, kept for repeatable downloads.
+
+Each batch gets its own id: the download ZIP is stored as
+BATCH_ARTIFACT_DIR/<batch_id>.zip and its result (the upload_zip response)
+in the batch_results collection. Concurrent batches of one project no longer
+share a file, and a download can be repeated or resumed with a Range request
+until the batch expires. The directory must be shared by every worker and
+host that serves downloads (e.g. an EFS/NFS mount); records expire through a
+TTL index and their files are removed by the next save.
+"""
+
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+BATCH_ARTIFACT_DIR = os.environ.get('BATCH_ARTIFACT_DIR') or os.path.join(tempfile.gettempdir(), 'batch_artifacts')
+BATCH_COLLECTION = 'batch_results'
+BATCH_TTL_SECONDS = int(os.environ.get('BATCH_ARTIFACT_TTL_SECONDS', 7 * 24 * 3600))
+
+
+class BatchArtifactStore:
+    """Batch ZIPs under BATCH_ARTIFACT_DIR/<batch_id>.zip, results in Mongo"""
+
+    _indexed = False
+
+    def __init__(self, db, directory=BATCH_ARTIFACT_DIR):
+        self.batches = db[BATCH_COLLECTION]
+        self.directory = directory
+
+    def ensure_indexes(self):
+        """Create the TTL and project listing indexes once per process"""
+        if BatchArtifactStore._indexed:
+            return
+        self.batches.create_index('expires_at', expireAfterSeconds=0)
+        self.batches.create_index([('project_id', 1), ('user_id', 1), ('created_at', -1)])
+        BatchArtifactStore._indexed = True
+
+    def new_batch_id(self):
+        os.makedirs(self.directory, exist_ok=True)
+        return uuid.uuid4().hex
+
+    def archive_path(self, batch_id):
+        return os.path.join(self.directory, f"{batch_id}.zip")
+
+    def save(self, batch_id, project_id, user_id, result):
+        """Record a finished batch whose ZIP is at archive_path(batch_id); returns the record"""
+        self.ensure_indexes()
+        now = datetime.utcnow()
+        batch = {
+            '_id': batch_id,
+            'project_id': str(project_id),
+            'user_id': user_id,
+            'size': os.path.getsize(self.archive_path(batch_id)),
+            'result': result,
+            'created_at': now,
+            'expires_at': now + timedelta(seconds=BATCH_TTL_SECONDS),
+        }
+        self.batches.insert_one(batch)
+        self.prune_expired()
+        return batch
+
+    def get(self, batch_id, user_id):
+        """A batch of this user that has not expired and whose ZIP is still there, or None"""
+        batch = self.batches.find_one({'_id': batch_id, 'user_id': user_id})
+        # Mongo's TTL monitor runs once a minute, so expiry is checked here too
+        if not batch or batch['expires_at'] <= datetime.utcnow() or not os.path.exists(self.archive_path(batch_id)):
+            return None
+        return batch
+
+    def list(self, project_id, user_id, limit=20):
+        """Batches of a project, newest first"""
+        batches = self.batches.find({'project_id': str(project_id), 'user_id': user_id}).sort('created_at', -1).limit(limit)
+        now = datetime.utcnow()
+        return [batch for batch in batches if batch['expires_at'] > now]
+
+    def latest(self, project_id, user_id):
+        for batch in self.list(project_id, user_id, limit=5):
+            if os.path.exists(self.archive_path(batch['_id'])):
+                return batch
+        return None
+
+    def delete(self, batch_id):
+        self.batches.delete_one({'_id': batch_id})
+        try:
+            os.remove(self.archive_path(batch_id))
+        except OSError:
+            pass
+
+    def prune_expired(self):
+        """Remove ZIPs older than the TTL, and partial ZIPs of batches that never finished"""
+        cutoff = datetime.utcnow().timestamp() - BATCH_TTL_SECONDS
+        partial_cutoff = datetime.utcnow().timestamp() - 24 * 3600
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            path = os.path.join(self.directory, name)
+            try:
+                mtime = os.path.getmtime(path)
+                if mtime < cutoff or (name.endswith('.partial') and mtime < partial_cutoff):
+                    os.remove(path)
+            except OSError:
+                continue
+
+
+def get_batch_artifact_store(db):
+    """Batch artifact store on the app's database"""
+    return BatchArtifactStore(db)
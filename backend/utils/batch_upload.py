@@ -0,0 +1,355 @@
+"""
+Chunked, resumable batch ZIP uploads.
+
+A client creates an upload (size and optional SHA-256), sends the bytes in
+order with PUT requests carrying a Content-Range, and can ask for the
+number of bytes received to resume after a failure. Upload state lives in
+Mongo so any worker can take the next chunk; the bytes are appended to
+BATCH_UPLOAD_DIR, which must be shared by the workers that serve uploads
+(it is on a single host).
+
+While chunks arrive, the local file headers of the partial archive are
+scanned: every Excel member whose bytes are complete is recorded, so its
+report can be generated before the rest of the archive is uploaded.
+"""
+
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from utils.workbook_fingerprint import DIGEST_FIELDS
+
+BATCH_UPLOAD_DIR = os.environ.get('BATCH_UPLOAD_DIR') or os.path.join(tempfile.gettempdir(), 'batch_uploads')
+UPLOAD_COLLECTION = 'batch_uploads'
+MEMBER_COLLECTION = 'batch_upload_members'
+# Suggested chunk size; a single chunk must stay well under MAX_CONTENT_LENGTH
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_CHUNK_SIZE = 32 * 1024 * 1024
+MAX_UPLOAD_SIZE = int(os.environ.get('BATCH_UPLOAD_MAX_BYTES', 2 * 1024 ** 3))
+UPLOAD_TTL_SECONDS = int(os.environ.get('BATCH_UPLOAD_TTL_SECONDS', 24 * 3600))
+# Zip-bomb limits for batch workbooks: declared sizes are checked before a member is read, actual sizes while it is
+MAX_MEMBER_SIZE = int(os.environ.get('BATCH_MEMBER_MAX_BYTES', 200 * 1024 * 1024))
+MAX_COMPRESSION_RATIO = int(os.environ.get('BATCH_MEMBER_MAX_RATIO', 100))
+# A worker generating a member refreshes its claim every MEMBER_HEARTBEAT_SECONDS; a claim not refreshed for
+# STALE_MEMBER_SECONDS belongs to a worker that died or was recycled, and the member is generated again
+MEMBER_HEARTBEAT_SECONDS = 15
+STALE_MEMBER_SECONDS = 60
+# How long completing an upload waits for members other workers are generating (under the gunicorn timeout)
+MEMBER_WAIT_SECONDS = int(os.environ.get('BATCH_MEMBER_WAIT_SECONDS', 240))
+
+_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+_COPY_BLOCK = 1024 * 1024
+
+
+def is_batch_workbook(name):
+    """Same selection as upload_zip: every .xlsx/.xls member, including subdirectories"""
+    return not name.endswith('/') and (name.endswith('.xlsx') or name.endswith('.xls'))
+
+
+class UnsafeMember(ValueError):
+    """A ZIP member that is too large, expands too much or holds more bytes than it declares"""
+
+
+def check_member_size(name, compressed_size, file_size):
+    """Raise UnsafeMember when a member's declared sizes exceed the batch limits"""
+    if file_size > MAX_MEMBER_SIZE:
+        raise UnsafeMember(f"{name} declares {file_size} bytes, more than the {MAX_MEMBER_SIZE} byte limit")
+    # Workbooks are already zipped, so a high ratio means padding rather than spreadsheet data
+    if file_size > _COPY_BLOCK and file_size > MAX_COMPRESSION_RATIO * max(compressed_size, 1):
+        raise UnsafeMember(f"{name} expands {file_size // max(compressed_size, 1)}x, "
+                           f"more than the {MAX_COMPRESSION_RATIO}x limit")
+
+
+def copy_member(zip_ref, info, target):
+    """
+    Stream one member of an open ZipFile into target; returns the bytes written.
+
+    Only this member is decompressed (zipfile checks its CRC at the end), and
+    reading stops as soon as it produces more than its declared size.
+    """
+    check_member_size(info.filename, info.compress_size, info.file_size)
+    size = 0
+    with zip_ref.open(info) as source:
+        for block in iter(lambda: source.read(_COPY_BLOCK), b''):
+            size += len(block)
+            if size > info.file_size:
+                raise UnsafeMember(f"{info.filename} holds more than its declared {info.file_size} bytes")
+            target.write(block)
+    return size
+
+
+class UploadConflict(Exception):
+    """A chunk did not start at the number of bytes received so far"""
+
+    def __init__(self, received):
+        super().__init__(f"Expected a chunk starting at byte {received}")
+        self.received = received
+
+
+class BatchUploadStore:
+    """Upload sessions in Mongo, bytes under BATCH_UPLOAD_DIR/<upload_id>/"""
+
+    _indexed = False
+
+    def __init__(self, db, directory=BATCH_UPLOAD_DIR):
+        self.uploads = db[UPLOAD_COLLECTION]
+        self.members = db[MEMBER_COLLECTION]
+        self.directory = directory
+
+    def ensure_indexes(self):
+        """Create the TTL and member indexes once per process"""
+        if BatchUploadStore._indexed:
+            return
+        self.uploads.create_index('expires_at', expireAfterSeconds=0)
+        self.members.create_index('expires_at', expireAfterSeconds=0)
+        self.members.create_index([('upload_id', 1), ('offset', 1)], unique=True)
+        BatchUploadStore._indexed = True
+
+    def upload_dir(self, upload_id):
+        return os.path.join(self.directory, upload_id)
+
+    def archive_path(self, upload_id):
+        return os.path.join(self.upload_dir(upload_id), 'upload.zip')
+
+    @staticmethod
+    def _expiry():
+        return datetime.utcnow() + timedelta(seconds=UPLOAD_TTL_SECONDS)
+
+    def prune_expired(self):
+        """Remove the bytes of abandoned uploads; Mongo's TTL index only drops their records"""
+        if not os.path.isdir(self.directory):
+            return
+        cutoff = time.time() - UPLOAD_TTL_SECONDS
+        for upload_id in os.listdir(self.directory):
+            path = self.upload_dir(upload_id)
+            try:
+                if os.path.getmtime(self.archive_path(upload_id)) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+
+    def create(self, project_id, user_id, filename, size, sha256=None):
+        """Start an upload; raises ValueError for a size outside 1..MAX_UPLOAD_SIZE"""
+        if size <= 0 or size > MAX_UPLOAD_SIZE:
+            raise ValueError(f"size must be between 1 and {MAX_UPLOAD_SIZE} bytes")
+        self.ensure_indexes()
+        self.prune_expired()
+        upload = {
+            '_id': uuid.uuid4().hex,
+            'project_id': str(project_id),
+            'user_id': user_id,
+            'filename': filename,
+            'size': size,
+            'sha256': sha256.lower() if sha256 else None,
+            'received': 0,
+            'scanned': 0,
+            'scan_stopped': False,
+            'status': 'uploading',
+            'created_at': datetime.utcnow().isoformat(),
+            'expires_at': self._expiry(),
+        }
+        os.makedirs(self.upload_dir(upload['_id']), exist_ok=True)
+        open(self.archive_path(upload['_id']), 'wb').close()
+        self.uploads.insert_one(upload)
+        return upload
+
+    def get(self, upload_id, user_id):
+        return self.uploads.find_one({'_id': upload_id, 'user_id': user_id})
+
+    def write_chunk(self, upload, offset, stream, length):
+        """
+        Write length bytes from stream at offset; returns the new number of bytes received.
+
+        Raises UploadConflict unless offset is the number of bytes received so
+        far, and ValueError for a chunk that would overrun the declared size.
+        """
+        if upload['status'] != 'uploading' or offset != upload['received']:
+            raise UploadConflict(upload['received'])
+        if length <= 0 or length > MAX_CHUNK_SIZE or offset + length > upload['size']:
+            raise ValueError(f"chunk must be 1..{MAX_CHUNK_SIZE} bytes and end within the upload size")
+        written = 0
+        with open(self.archive_path(upload['_id']), 'r+b') as f:
+            f.seek(offset)
+            while written < length:
+                block = stream.read(min(_COPY_BLOCK, length - written))
+                if not block:
+                    break
+                f.write(block)
+                written += len(block)
+        if written != length:
+            raise ValueError(f"chunk ended after {written} of {length} bytes")
+        # Compare-and-set, so two workers retrying the same chunk cannot both advance the offset
+        result = self.uploads.update_one({'_id': upload['_id'], 'received': offset},
+                                         {'$set': {'received': offset + written, 'expires_at': self._expiry()}})
+        if not result.modified_count:
+            current = self.uploads.find_one({'_id': upload['_id']}) or upload
+            raise UploadConflict(current['received'])
+        upload['received'] = offset + written
+        return upload['received']
+
+    def scan_members(self, upload):
+        """
+        Record the Excel members whose bytes have fully arrived; returns the newly recorded ones.
+
+        Scanning stops for good at the central directory, or at a member whose
+        sizes are only given after its data (data descriptor) or in a Zip64
+        field; those members are picked up from the central directory when the
+        upload completes.
+        """
+        if upload.get('scan_stopped'):
+            return []
+        position, received = upload['scanned'], upload['received']
+        found, stopped = [], False
+        with open(self.archive_path(upload['_id']), 'rb') as f:
+            while position + _LOCAL_HEADER.size <= received:
+                f.seek(position)
+                header = f.read(_LOCAL_HEADER.size)
+                (signature, _, flags, method, _, _, crc, compressed_size, file_size,
+                 name_length, extra_length) = _LOCAL_HEADER.unpack(header)
+                if signature != _LOCAL_HEADER_SIGNATURE or flags & 0x9 or 0xFFFFFFFF in (compressed_size, file_size):
+                    stopped = True
+                    break
+                data_offset = position + _LOCAL_HEADER.size + name_length + extra_length
+                if data_offset + compressed_size > received:
+                    break
+                raw_name = f.read(name_length)
+                name = raw_name.decode('utf-8' if flags & 0x800 else 'cp437')
+                if is_batch_workbook(name) and method in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                    found.append({
+                        'upload_id': upload['_id'], 'offset': position, 'name': name, 'method': method,
+                        'data_offset': data_offset, 'compressed_size': compressed_size, 'file_size': file_size,
+                        'crc': crc, 'status': 'arrived', 'expires_at': self._expiry(),
+                    })
+                position = data_offset + compressed_size
+        for member in found:
+            self.members.update_one({'upload_id': member['upload_id'], 'offset': member['offset']},
+                                    {'$set': member}, upsert=True)
+        self.uploads.update_one({'_id': upload['_id']}, {'$set': {'scanned': position, 'scan_stopped': stopped}})
+        upload.update(scanned=position, scan_stopped=stopped)
+        return found
+
+    def add_member(self, upload_id, offset, name):
+        """Record a member found in the central directory (status 'pending': read it with zipfile)"""
+        self.members.update_one({'upload_id': upload_id, 'offset': offset},
+                                {'$set': {'upload_id': upload_id, 'offset': offset, 'name': name,
+                                          'status': 'pending', 'expires_at': self._expiry()}}, upsert=True)
+
+    def list_members(self, upload_id):
+        return sorted(self.members.find({'upload_id': upload_id}), key=lambda member: member['offset'])
+
+    def claim_member(self, upload_id, offset, statuses=('arrived', 'pending')):
+        """Mark a member as being generated by this worker; False if another worker has it"""
+        now = datetime.utcnow()
+        for status in statuses:
+            result = self.members.update_one(
+                {'upload_id': upload_id, 'offset': offset, 'status': status},
+                {'$set': {'status': 'running', 'claimed_at': now}})
+            if result.modified_count:
+                return True
+        # Take over a member whose worker died or was recycled while generating it
+        result = self.members.update_one(
+            {'upload_id': upload_id, 'offset': offset, 'status': 'running',
+             'claimed_at': {'$lt': now - timedelta(seconds=STALE_MEMBER_SECONDS)}},
+            {'$set': {'status': 'running', 'claimed_at': now}})
+        return bool(result.modified_count)
+
+    @contextmanager
+    def heartbeat(self, upload_id, offset):
+        """Keep refreshing a claimed member's claimed_at while this worker generates it"""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(MEMBER_HEARTBEAT_SECONDS):
+                self.members.update_one({'upload_id': upload_id, 'offset': offset, 'status': 'running'},
+                                        {'$set': {'claimed_at': datetime.utcnow()}})
+
+        thread = threading.Thread(target=beat, name=f"member-heartbeat-{offset}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def abandon_member(self, upload_id, offset):
+        """Mark a member that is not finished as failed (a later finish_member still records its outcome)"""
+        for status in ('running', 'arrived', 'pending'):
+            self.members.update_one({'upload_id': upload_id, 'offset': offset, 'status': status},
+                                    {'$set': {'status': 'failed', 'result': None}})
+
+    def finish_member(self, upload_id, offset, result, digests=None):
+        """Store a member's outcome (the batch entry and report path, or None when it was skipped) and its digests"""
+        self.members.update_one({'upload_id': upload_id, 'offset': offset},
+                                {'$set': dict(digests or {}, status='done' if result else 'failed', result=result)})
+
+    def find_duplicate(self, upload_id, digests):
+        """Result of a generated member with the same file or cell digest, or None"""
+        for field in DIGEST_FIELDS:
+            if not digests.get(field):
+                continue
+            member = self.members.find_one({'upload_id': upload_id, 'status': 'done', field: digests[field]})
+            if member:
+                return member['result']
+        return None
+
+    def extract_member(self, upload_id, member, target_path):
+        """Decompress an arrived member from the partial archive, checking its size and CRC"""
+        check_member_size(member['name'], member['compressed_size'], member['file_size'])
+        decompressor = zlib.decompressobj(-15) if member['method'] == zipfile.ZIP_DEFLATED else None
+        remaining, crc, size = member['compressed_size'], 0, 0
+        with open(self.archive_path(upload_id), 'rb') as source, open(target_path, 'wb') as target:
+            source.seek(member['data_offset'])
+            while remaining:
+                block = source.read(min(_COPY_BLOCK, remaining))
+                if not block:
+                    raise ValueError(f"{member['name']} is truncated")
+                remaining -= len(block)
+                data = decompressor.decompress(block, member['file_size'] - size + 1) if decompressor else block
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+                if size > member['file_size'] or (decompressor and decompressor.unconsumed_tail):
+                    raise UnsafeMember(f"{member['name']} holds more than its declared {member['file_size']} bytes")
+                target.write(data)
+            if decompressor:
+                data = decompressor.flush()
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+                target.write(data)
+        if size != member['file_size'] or crc != member['crc']:
+            raise ValueError(f"{member['name']} failed its size or CRC check")
+
+    def verify(self, upload):
+        """SHA-256 of the received archive; raises ValueError if it is incomplete or does not match"""
+        if upload['received'] != upload['size']:
+            raise ValueError(f"only {upload['received']} of {upload['size']} bytes have been received")
+        digest = hashlib.sha256()
+        with open(self.archive_path(upload['_id']), 'rb') as f:
+            for block in iter(lambda: f.read(_COPY_BLOCK), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        if upload.get('sha256') and upload['sha256'] != sha256:
+            raise ValueError(f"SHA-256 mismatch: expected {upload['sha256']}, received {sha256}")
+        return sha256
+
+    def set_status(self, upload_id, status):
+        self.uploads.update_one({'_id': upload_id}, {'$set': {'status': status}})
+
+    def delete(self, upload_id):
+        self.uploads.delete_one({'_id': upload_id})
+        self.members.delete_many({'upload_id': upload_id})
+        shutil.rmtree(self.upload_dir(upload_id), ignore_errors=True)
+
+
+def get_batch_upload_store(db):
+    """Batch upload store on the app's database"""
+    return BatchUploadStore(db)
@@ -0,0 +1,65 @@
+"""
+Bytecode cache kept outside the source tree.
+
+Compiled modules are written under PYTHONPYCACHEPREFIX (default
+/tmp/graph-project-pycache) instead of __pycache__ folders, so workers
+stop recompiling routes/projects.py on every boot while the checkout
+stays clean. BYTECODE_CACHE=0 goes back to never writing bytecode.
+
+Usage (from backend/, before starting gunicorn):
+    python -m utils.bytecode
+"""
+
+import compileall
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+DEFAULT_PYCACHE_DIR = os.path.join(tempfile.gettempdir(), 'graph-project-pycache')
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIRS = ('routes', 'utils', 'renderers', 'models', 'benchmarks')
+SOURCE_FILES = ('app.py', 'config.py', 'gunicorn.conf.py')
+# Imported lazily by the report paths; importing them once caches their bytecode too
+REPORT_LIBRARIES = ('pandas', 'matplotlib.pyplot', 'plotly.graph_objects', 'plotly.subplots', 'docx',
+                    'openpyxl', 'squarify', 'PIL.Image')
+
+
+def enable_bytecode_cache():
+    """Point the bytecode cache at its directory; returns it, or None when BYTECODE_CACHE=0"""
+    if os.environ.get('BYTECODE_CACHE', '1').lower() in ('0', 'false', 'off'):
+        sys.dont_write_bytecode = True
+        return None
+    if not sys.pycache_prefix:
+        sys.pycache_prefix = os.environ.get('PYTHONPYCACHEPREFIX') or DEFAULT_PYCACHE_DIR
+    sys.dont_write_bytecode = False
+    return sys.pycache_prefix
+
+
+def precompile():
+    """Compile the backend and cache the report libraries' bytecode; returns False if a file failed"""
+    if enable_bytecode_cache() is None:
+        return True
+    ok = True
+    for name in SOURCE_DIRS:
+        path = os.path.join(BACKEND_DIR, name)
+        if os.path.isdir(path):
+            ok = compileall.compile_dir(path, quiet=1) and ok
+    for name in SOURCE_FILES:
+        path = os.path.join(BACKEND_DIR, name)
+        if os.path.exists(path):
+            ok = compileall.compile_file(path, quiet=1) and ok
+    for module in REPORT_LIBRARIES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    return ok
+
+
+if __name__ == '__main__':
+    started = time.perf_counter()
+    success = precompile()
+    print(f"Bytecode cache {sys.pycache_prefix or 'disabled'} ready in {time.perf_counter() - started:.1f}s")
+    sys.exit(0 if success else 1)
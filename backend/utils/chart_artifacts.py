@@ -0,0 +1,178 @@
+import copy
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+
+from renderers.helpers import extract_cell_ranges
+from utils.chart_output import fallback_png_path
+
+# Rendered chart images are kept per project so a regenerated report only re-renders the charts whose inputs changed
+CHART_ARTIFACT_DIR = os.environ.get('CHART_ARTIFACT_DIR', os.path.join(tempfile.gettempdir(), 'chart_artifacts'))
+MANIFEST_COLLECTION = 'report_manifests'
+
+# Files whose changes can alter a rendered chart; any edit invalidates every stored image
+_RENDERING_SOURCES = ('routes/projects.py', 'renderers/*.py', 'utils/chart_output.py')
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=1)
+def rendering_code_version():
+    """Digest of the chart rendering code and library versions"""
+    import matplotlib
+    import plotly
+    digest = hashlib.sha256(f"{matplotlib.__version__}|{plotly.__version__}".encode())
+    for pattern in _RENDERING_SOURCES:
+        for path in sorted(glob.glob(os.path.join(_BACKEND_DIR, pattern))):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def chart_fingerprint(raw_chart_attr, chart_type, workbook, report_df, render_settings):
+    """
+    Hash of everything a chart image is rendered from.
+
+    The chart attributes are resolved against the workbook the same way
+    generate_chart resolves them, so the hash covers the extracted cell
+    values rather than just the range references. Returns None for charts
+    that cannot be fingerprinted (invalid JSON, ChatGPT format), which are
+    always re-rendered.
+    """
+    try:
+        config = json.loads(re.sub(r'//.*?\n|/\*.*?\*/', '', raw_chart_attr, flags=re.DOTALL))
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(config, dict) or ("data" in config and "validation" in config):
+        return None
+
+    resolved = copy.deepcopy(config)
+    chart_meta = resolved.get("chart_meta") if isinstance(resolved.get("chart_meta"), dict) else {}
+    try:
+        sheet = workbook.sheet(chart_meta.get("source_sheet", "sample"))
+    except KeyError:
+        sheet = None
+    payload = {"code": rendering_code_version(), "chart_type": chart_type, "render": render_settings}
+    if sheet is not None:
+        extract_cell_ranges(resolved, sheet)
+    else:
+        # Without a sheet, value_range strings are read from the report sheet
+        import pandas as pd
+        payload["report_df"] = hashlib.sha256(pd.util.hash_pandas_object(report_df, index=True).values.tobytes()).hexdigest()
+    payload["config"] = resolved
+    return _digest(payload)
+
+
+def text_digests(values):
+    """Per-placeholder digests of the text values a report was generated with"""
+    return {key: _digest(value)[:16] for key, value in values.items()}
+
+
+class ChartArtifactStore:
+    """Rendered chart images of each project's last report, keyed by chart fingerprint"""
+
+    def __init__(self, root=None):
+        self.root = root or CHART_ARTIFACT_DIR
+
+    def _project_dir(self, project_id):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_-]', '_', str(project_id)))
+
+    def get(self, project_id, fingerprint):
+        """Stored image for a fingerprint, or None"""
+        for ext in ('.png', '.svg'):
+            path = os.path.join(self._project_dir(project_id), fingerprint + ext)
+            if os.path.exists(path) and (ext == '.png' or os.path.exists(fallback_png_path(path))):
+                return path
+        return None
+
+    def checkout(self, project_id, fingerprint):
+        """
+        Temporary copy of a stored image, so a concurrent prune cannot remove it mid-report; None when missing.
+
+        The caller deletes the copy (and an SVG's PNG fallback) like a freshly rendered chart image.
+        """
+        stored_path = self.get(project_id, fingerprint)
+        if not stored_path:
+            return None
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(stored_path)[1]) as tmpfile:
+            image_path = tmpfile.name
+        try:
+            if stored_path.endswith('.svg'):
+                shutil.copyfile(fallback_png_path(stored_path), fallback_png_path(image_path))
+            shutil.copyfile(stored_path, image_path)
+        except OSError:
+            for path in (image_path, fallback_png_path(image_path)):
+                if os.path.exists(path):
+                    os.remove(path)
+            return None
+        return image_path
+
+    def put(self, project_id, fingerprint, image_path):
+        """Copy a rendered image (and an SVG's PNG fallback) into the store; returns the stored path"""
+        project_dir = self._project_dir(project_id)
+        os.makedirs(project_dir, exist_ok=True)
+        stored_path = os.path.join(project_dir, fingerprint + os.path.splitext(image_path)[1])
+        if image_path.endswith('.svg'):
+            self._copy(fallback_png_path(image_path), fallback_png_path(stored_path))
+        self._copy(image_path, stored_path)
+        return stored_path
+
+    @staticmethod
+    def _copy(source, destination):
+        # Copy then rename so concurrent workers never read a half-written image
+        partial = f"{destination}.{os.getpid()}.partial"
+        shutil.copyfile(source, partial)
+        os.replace(partial, destination)
+
+    def prune(self, project_id, fingerprints):
+        """Delete the project's images that are not in fingerprints"""
+        project_dir = self._project_dir(project_id)
+        if not os.path.isdir(project_dir):
+            return
+        keep = set(fingerprints)
+        for name in os.listdir(project_dir):
+            if name.split('.', 1)[0] not in keep:
+                try:
+                    os.remove(os.path.join(project_dir, name))
+                except OSError:
+                    pass
+
+
+class ReportManifest:
+    """Chart fingerprints and text placeholder digests of a project's last generated report"""
+
+    def __init__(self, db, project_id):
+        self.collection = db[MANIFEST_COLLECTION]
+        self.project_id = str(project_id)
+        previous = self.collection.find_one({'project_id': self.project_id}) or {}
+        # Stored as [key, digest] pairs because placeholder names may contain dots
+        self.charts = dict(previous.get('charts', []))
+        self.texts = dict(previous.get('texts', []))
+
+    def changed_texts(self, texts):
+        """Placeholders whose value differs from the last run"""
+        return sorted(key for key, digest in texts.items() if self.texts.get(key) != digest)
+
+    def save(self, charts, texts):
+        self.collection.update_one(
+            {'project_id': self.project_id},
+            {'$set': {'charts': sorted(charts.items()), 'texts': sorted(texts.items()), 'updated_at': datetime.utcnow().isoformat()}},
+            upsert=True
+        )
+
+
+# Global artifact store instance
+chart_artifact_store = ChartArtifactStore()
+
+def get_chart_artifact_store():
+    """Get the global chart artifact store"""
+    return chart_artifact_store
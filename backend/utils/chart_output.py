@@ -0,0 +1,207 @@
+import hashlib
+import os
+import tempfile
+
+# Matplotlib, Pillow and python-docx are imported where they are used, so importing this module stays cheap
+
+# "png" rasterises charts at 200 DPI; "svg" embeds a vector image with a small PNG fallback
+CHART_OUTPUT_FORMATS = ("png", "svg")
+DEFAULT_CHART_OUTPUT_FORMAT = "png"
+# Word versions without SVG support show the fallback, so it only needs screen resolution
+SVG_FALLBACK_DPI = 96
+SVG_FALLBACK_SCALE = 1
+
+# Project png_optimization presets; a dict with the same keys configures the stage directly
+PNG_OPTIMIZATION_PRESETS = {
+    "off": None,
+    "lossless": {"palette_colors": None, "compress_level": 9, "strip_metadata": True},
+    "palette": {"palette_colors": 256, "compress_level": 9, "strip_metadata": True},
+}
+DEFAULT_PNG_OPTIMIZATION = "off"
+
+SVG_CONTENT_TYPE = "image/svg+xml"
+SVG_BLIP_EXT_URI = "{96DAC541-7B7A-43D3-8B79-37D633B846F1}"
+SVG_BLIP_NS = "http://schemas.microsoft.com/office/drawing/2016/SVG/main"
+
+
+def resolve_chart_output_format(*candidates):
+    """First valid format among chart_meta, project and default settings"""
+    for candidate in candidates:
+        if isinstance(candidate, str) and candidate.strip().lower() in CHART_OUTPUT_FORMATS:
+            return candidate.strip().lower()
+    return DEFAULT_CHART_OUTPUT_FORMAT
+
+
+def fallback_png_path(image_path):
+    """PNG shown by Word versions that cannot render an SVG chart image"""
+    return os.path.splitext(image_path)[0] + ".fallback.png"
+
+
+def save_matplotlib_chart(fig, output_format, **savefig_kwargs):
+    """Save a Matplotlib chart as PNG, or as SVG plus a low-DPI PNG fallback; returns the image path"""
+    if output_format != "svg":
+        tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
+        fig.savefig(tmpfile.name, **savefig_kwargs)
+        return tmpfile.name
+
+    import matplotlib
+    tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".svg")
+    # Keep text as <text> instead of glyph outlines and make the ids reproducible
+    with matplotlib.rc_context({'svg.fonttype': 'none', 'svg.hashsalt': 'chart'}):
+        fig.savefig(tmpfile.name, format="svg", **savefig_kwargs)
+    fig.savefig(fallback_png_path(tmpfile.name), format="png", **dict(savefig_kwargs, dpi=SVG_FALLBACK_DPI))
+    return tmpfile.name
+
+
+def save_plotly_chart(fig, output_format, width=900, height=500, scale=2):
+    """Plotly counterpart of save_matplotlib_chart"""
+    if output_format != "svg":
+        tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
+        fig.write_image(tmpfile.name, width=width, height=height, scale=scale)
+        return tmpfile.name
+
+    tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".svg")
+    fig.write_image(tmpfile.name, format="svg", width=width, height=height)
+    fig.write_image(fallback_png_path(tmpfile.name), format="png", width=width, height=height, scale=SVG_FALLBACK_SCALE)
+    return tmpfile.name
+
+
+class ChartImageRegistry:
+    """
+    Chart images of one generated document.
+
+    A chart tag that appears more than once (e.g. in a paragraph and in a
+    table cell) is rendered once, and identical SVG images share one media
+    part. python-docx already shares identical PNG parts by SHA-1.
+    """
+
+    def __init__(self):
+        self._rendered = {}
+        self._svg_parts = {}
+        self.reused_renders = 0
+
+    def rendered(self, chart_tag):
+        """Image already rendered for chart_tag in this document, or None"""
+        image_path = self._rendered.get(chart_tag.lower())
+        if image_path:
+            self.reused_renders += 1
+        return image_path
+
+    def add_rendered(self, chart_tag, image_path):
+        if image_path:
+            self._rendered[chart_tag.lower()] = image_path
+
+    def remove_images(self):
+        """Delete the temporary chart images (and SVG fallbacks) once the document is saved"""
+        for image_path in self._rendered.values():
+            for path in (image_path, fallback_png_path(image_path)):
+                if os.path.exists(path):
+                    os.remove(path)
+        self._rendered.clear()
+
+    def svg_part(self, package, blob):
+        """The package's media part for this SVG content, created on first use"""
+        from docx.opc.packuri import PackURI
+        from docx.opc.part import Part
+        sha1 = hashlib.sha1(blob).hexdigest()
+        if sha1 not in self._svg_parts:
+            self._svg_parts[sha1] = Part(PackURI(package.next_partname("/word/media/image%d.svg")),
+                                         SVG_CONTENT_TYPE, blob, package)
+        return self._svg_parts[sha1]
+
+
+def add_chart_picture(run, image_path, width, registry=None):
+    """
+    Insert a chart image into a run.
+
+    PNG charts are inserted as-is. SVG charts insert their fallback PNG and
+    attach the SVG through the Office 2016 svgBlip extension, which Word
+    uses instead of the PNG wherever it can render SVG.
+    """
+    if not image_path.endswith(".svg"):
+        return run.add_picture(image_path, width=width)
+
+    from docx.opc.constants import RELATIONSHIP_TYPE as RT
+    from docx.oxml import parse_xml
+
+    inline_shape = run.add_picture(fallback_png_path(image_path), width=width)
+    story_part = run.part
+    with open(image_path, 'rb') as f:
+        blob = f.read()
+    registry = registry or ChartImageRegistry()
+    # relate_to reuses the story part's existing relationship when the SVG part is already related
+    rId = story_part.relate_to(registry.svg_part(story_part.package, blob), RT.IMAGE)
+
+    blip = inline_shape._inline.xpath('.//a:blip')[0]
+    blip.append(parse_xml(
+        f'<a:extLst xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+        f'<a:ext uri="{SVG_BLIP_EXT_URI}">'
+        f'<asvg:svgBlip xmlns:asvg="{SVG_BLIP_NS}" '
+        f'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" r:embed="{rId}"/>'
+        f'</a:ext></a:extLst>'
+    ))
+    return inline_shape
+
+
+def png_optimization_settings(value):
+    """
+    Normalise a project's png_optimization setting.
+
+    Accepts a preset name or a dict with palette_colors (2-256, or None to keep
+    full colour), compress_level (0-9) and strip_metadata. Returns None when the
+    stage is off and raises ValueError for invalid settings.
+    """
+    if value is None or value == "":
+        value = DEFAULT_PNG_OPTIMIZATION
+    if isinstance(value, str):
+        if value not in PNG_OPTIMIZATION_PRESETS:
+            raise ValueError(f"png_optimization must be one of {', '.join(PNG_OPTIMIZATION_PRESETS)} or an object")
+        return PNG_OPTIMIZATION_PRESETS[value]
+    if not isinstance(value, dict):
+        raise ValueError("png_optimization must be a preset name or an object")
+
+    palette_colors = value.get("palette_colors")
+    compress_level = value.get("compress_level", 9)
+    if palette_colors is not None and (not isinstance(palette_colors, int) or not 2 <= palette_colors <= 256):
+        raise ValueError("png_optimization.palette_colors must be between 2 and 256")
+    if not isinstance(compress_level, int) or not 0 <= compress_level <= 9:
+        raise ValueError("png_optimization.compress_level must be between 0 and 9")
+    return {"palette_colors": palette_colors, "compress_level": compress_level,
+            "strip_metadata": bool(value.get("strip_metadata", True))}
+
+
+def optimize_png(path, settings):
+    """Re-encode a PNG in place with palette reduction and zlib settings; returns the bytes saved"""
+    from PIL import Image, PngImagePlugin
+    original_size = os.path.getsize(path)
+    with Image.open(path) as img:
+        img.load()
+    save_kwargs = {"compress_level": settings["compress_level"]}
+    if "dpi" in img.info:
+        save_kwargs["dpi"] = img.info["dpi"]
+    if not settings["strip_metadata"]:
+        pnginfo = PngImagePlugin.PngInfo()
+        for key, text in img.info.items():
+            if isinstance(text, str):
+                pnginfo.add_text(key, text)
+        save_kwargs["pnginfo"] = pnginfo
+    if settings["palette_colors"] and img.mode in ("RGB", "RGBA"):
+        # Flat chart colours survive quantisation well; dithering would only add noise
+        img = img.quantize(colors=settings["palette_colors"], method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+
+    optimized_path = path + ".optimized"
+    img.save(optimized_path, format="PNG", **save_kwargs)
+    saved = original_size - os.path.getsize(optimized_path)
+    if saved > 0:
+        os.replace(optimized_path, path)
+        return saved
+    os.remove(optimized_path)
+    return 0
+
+
+def optimize_chart_image(image_path, settings):
+    """PNG optimisation stage for a chart image (for SVG charts, their PNG fallback); returns the bytes saved"""
+    if not settings:
+        return 0
+    png_path = fallback_png_path(image_path) if image_path.endswith(".svg") else image_path
+    return optimize_png(png_path, settings)
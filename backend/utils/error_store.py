@@ -0,0 +1,100 @@
+import os
+from datetime import datetime, timedelta
+
+# Chart errors of a project's last report, shared by every worker and host through Mongo
+ERROR_COLLECTION = 'report_errors'
+ERROR_TTL_SECONDS = int(os.environ.get('REPORT_ERROR_TTL_SECONDS', 7 * 24 * 3600))
+# A workbook with hundreds of broken charts must not turn into an oversized document
+MAX_ERRORS_PER_REPORT = 200
+MAX_MESSAGE_LENGTH = 2000
+
+
+class ReportErrors:
+    """Chart failures of one report generation, collected in memory and written once when it finishes"""
+
+    def __init__(self):
+        self.charts = {}
+        self.dropped = 0
+        # Charts whose placeholder could not be filled, as listed in report_generation_errors
+        self.report_errors = []
+
+    def add(self, chart_tag, details):
+        """Record a chart failure (the details dict built in generate_chart)"""
+        if chart_tag not in self.charts and len(self.charts) >= MAX_ERRORS_PER_REPORT:
+            self.dropped += 1
+            return
+        self.charts[chart_tag] = {key: value[:MAX_MESSAGE_LENGTH] if isinstance(value, str) else value
+                                  for key, value in details.items()}
+
+    def user_message(self, chart_tag, default):
+        return self.charts.get(chart_tag, {}).get('user_message', default)
+
+    def detailed(self):
+        """Simplified per-chart errors, as returned in report_generation_errors_detailed"""
+        return {tag: {"error": details.get("user_message"), "chart_type": details.get("chart_type"),
+                      "timestamp": details.get("timestamp")}
+                for tag, details in self.charts.items()}
+
+
+class ReportErrorStore:
+    """Mongo-backed chart error store: one TTL-bounded document per project"""
+
+    _indexed = False
+
+    def __init__(self, db):
+        self.collection = db[ERROR_COLLECTION]
+
+    def ensure_indexes(self):
+        """Create the TTL and lookup indexes once per process"""
+        if ReportErrorStore._indexed:
+            return
+        self.collection.create_index('expires_at', expireAfterSeconds=0)
+        self.collection.create_index('project_id', unique=True)
+        ReportErrorStore._indexed = True
+
+    @staticmethod
+    def _entries(errors):
+        # Chart tags come from the workbook and may contain dots, so they are stored as values, not keys
+        return [dict(details, chart_tag=tag) for tag, details in errors.items()]
+
+    def save_report(self, project_id, report_errors, chart_errors, success=True):
+        """
+        Write a finished report's errors in a single upsert.
+
+        A successful report replaces the previous report's errors; a failed one
+        only records the chart failures that happened before it stopped.
+        """
+        self.ensure_indexes()
+        now = datetime.utcnow()
+        fields = {
+            'chart_errors': [] if success else self._entries(report_errors.charts),
+            'detailed_errors': self._entries(report_errors.detailed()),
+            'dropped_errors': report_errors.dropped,
+            'expires_at': now + timedelta(seconds=ERROR_TTL_SECONDS),
+        }
+        if success:
+            fields['report_errors'] = chart_errors[:MAX_ERRORS_PER_REPORT]
+            fields['generated_at'] = now.isoformat()
+        self.collection.update_one({'project_id': str(project_id)}, {'$set': fields}, upsert=True)
+
+    def get(self, project_id):
+        """A project's errors in the chart_errors endpoint's response shape"""
+        document = self.collection.find_one({'project_id': str(project_id)}) or {}
+
+        def by_tag(entries):
+            return {entry['chart_tag']: {k: v for k, v in entry.items() if k != 'chart_tag'} for entry in entries}
+
+        return {
+            "chart_generation_errors": by_tag(document.get('chart_errors', [])),
+            "report_generation_errors": document.get('report_errors', []),
+            "report_generation_errors_detailed": by_tag(document.get('detailed_errors', [])),
+            "report_generated_at": document.get('generated_at')
+        }
+
+    def clear(self, project_id):
+        self.collection.delete_one({'project_id': str(project_id)})
+
+
+def get_error_store(db):
+    """Error store on the app's database"""
+    return ReportErrorStore(db)
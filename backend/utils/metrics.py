@@ -0,0 +1,347 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import psutil
+
+# Metric name -> (type, help). Only metrics listed here are exported.
+METRICS = {
+    'graph_http_requests_total': ('counter', 'HTTP requests by route, method and status'),
+    'graph_http_request_duration_seconds': ('histogram', 'HTTP request latency by route and method'),
+    'graph_reports_generated_total': ('counter', 'Reports generated by outcome'),
+    'graph_charts_generated_total': ('counter', 'Charts rendered by chart type and outcome'),
+    'graph_chart_failures_total': ('counter', 'Chart failures recorded in chart_errors, by chart type and error type'),
+    'graph_cache_requests_total': ('counter', 'Cache lookups by cache and result (hit/miss)'),
+    'graph_queue_depth': ('gauge', 'Work waiting or in progress, summed over live workers'),
+    'graph_worker_rss_bytes': ('gauge', 'Resident set size of each worker process'),
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+ARCHIVE_FILE = 'archive.json'
+
+
+def default_metrics_dir():
+    """Directory shared by all gunicorn workers on this host for metric snapshots"""
+    return (os.environ.get('METRICS_DIR')
+            or os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+            or os.path.join(tempfile.gettempdir(), 'graph_project_metrics'))
+
+
+def _label_key(labels):
+    return json.dumps(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _format_labels(label_key, extra=None):
+    pairs = [tuple(pair) for pair in json.loads(label_key)]
+    if extra:
+        pairs.extend(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Process-local counters, gauges and histograms.
+
+    Each process periodically writes its own snapshot file (worker_<pid>.json)
+    into a directory shared by all gunicorn workers, and /metrics merges every
+    snapshot. Workers never write each other's files, so no cross-process
+    locking is needed; files are replaced atomically so readers never see a
+    partial snapshot. Counters and histograms of exited workers keep counting
+    toward the totals, while gauges only come from live processes.
+    """
+
+    def __init__(self, directory=None, flush_interval=5.0):
+        self.directory = directory or default_metrics_dir()
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset_state()
+
+    def _reset_state(self):
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._process = None
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        # State inherited from the gunicorn master must not be double counted by workers
+        if self._pid != os.getpid():
+            self._reset_state()
+
+    def inc(self, name, amount=1, **labels):
+        """Increment a counter"""
+        with self._lock:
+            self._check_fork()
+            series = self._counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + amount
+        self.maybe_flush()
+
+    def add_gauge(self, name, amount, **labels):
+        """Move a gauge up or down"""
+        with self._lock:
+            self._check_fork()
+            series = self._gauges.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + amount
+        self.maybe_flush()
+
+    def set_gauge(self, name, value, **labels):
+        """Set a gauge to an absolute value"""
+        with self._lock:
+            self._check_fork()
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+        self.maybe_flush()
+
+    def observe(self, name, value, **labels):
+        """Record a histogram observation"""
+        with self._lock:
+            self._check_fork()
+            series = self._histograms.setdefault(name, {})
+            key = _label_key(labels)
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    hist['buckets'][i] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+        self.maybe_flush()
+
+    def record_cache(self, cache, hit):
+        """Count a cache lookup; hit ratios are derived in /metrics"""
+        self.inc('graph_cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+    def _snapshot(self):
+        if self._process is None:
+            self._process = psutil.Process(self._pid)
+        try:
+            rss = self._process.memory_info().rss
+        except psutil.Error:
+            rss = 0
+        self._gauges.setdefault('graph_worker_rss_bytes', {})[_label_key({'pid': self._pid})] = rss
+        return {
+            'pid': self._pid,
+            'written_at': time.time(),
+            'counters': self._counters,
+            'gauges': self._gauges,
+            'histograms': self._histograms,
+        }
+
+    def maybe_flush(self):
+        """Write the snapshot if the flush interval has elapsed"""
+        if time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Atomically write this process's snapshot file"""
+        with self._lock:
+            self._check_fork()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                payload = json.dumps(self._snapshot())
+                path = os.path.join(self.directory, f'worker_{self._pid}.json')
+                fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.worker_', suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+                self._last_flush = time.time()
+            except OSError:
+                # Metrics must never break a request
+                pass
+
+    def _read_snapshots(self):
+        snapshots = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return snapshots
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self):
+        """Merge the snapshots of every worker (live and exited) on this host"""
+        self.flush()
+        merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        for snapshot in self._read_snapshots():
+            for name, series in snapshot.get('counters', {}).items():
+                target = merged['counters'].setdefault(name, {})
+                for key, value in series.items():
+                    target[key] = target.get(key, 0) + value
+            pid = snapshot.get('pid')
+            if pid is not None and psutil.pid_exists(pid):
+                for name, series in snapshot.get('gauges', {}).items():
+                    target = merged['gauges'].setdefault(name, {})
+                    for key, value in series.items():
+                        target[key] = target.get(key, 0) + value
+            for name, series in snapshot.get('histograms', {}).items():
+                target = merged['histograms'].setdefault(name, {})
+                for key, hist in series.items():
+                    current = target.get(key)
+                    if current is None:
+                        target[key] = {'buckets': list(hist['buckets']), 'sum': hist['sum'], 'count': hist['count']}
+                    else:
+                        current['buckets'] = [a + b for a, b in zip(current['buckets'], hist['buckets'])]
+                        current['sum'] += hist['sum']
+                        current['count'] += hist['count']
+        return merged
+
+    def compact_dead_workers(self):
+        """Fold counters and histograms of exited workers into the archive file (run from the gunicorn master)"""
+        archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+        archive = {'pid': None, 'counters': {}, 'gauges': {}, 'histograms': {}}
+        dead_files = []
+        for name in sorted(os.listdir(self.directory)) if os.path.isdir(self.directory) else []:
+            if not name.startswith('worker_') or not name.endswith('.json'):
+                continue
+            try:
+                pid = int(name[len('worker_'):-len('.json')])
+            except ValueError:
+                continue
+            if not psutil.pid_exists(pid):
+                dead_files.append(os.path.join(self.directory, name))
+        if not dead_files:
+            return 0
+        sources = [archive_path] + dead_files if os.path.exists(archive_path) else dead_files
+        for path in sources:
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, series in snapshot.get('counters', {}).items():
+                target = archive['counters'].setdefault(name, {})
+                for key, value in series.items():
+                    target[key] = target.get(key, 0) + value
+            for name, series in snapshot.get('histograms', {}).items():
+                target = archive['histograms'].setdefault(name, {})
+                for key, hist in series.items():
+                    current = target.setdefault(key, {'buckets': [0] * len(hist['buckets']), 'sum': 0.0, 'count': 0})
+                    current['buckets'] = [a + b for a, b in zip(current['buckets'], hist['buckets'])]
+                    current['sum'] += hist['sum']
+                    current['count'] += hist['count']
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.archive_', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(archive, f)
+        os.replace(tmp_path, archive_path)
+        for path in dead_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return len(dead_files)
+
+    def clear(self):
+        """Remove all snapshot files (called once when the gunicorn master starts)"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            self._reset_state()
+
+
+def _temp_dir_usage(limit=50000):
+    """Bytes used under the system temp dir (walk is capped to keep scrapes cheap)"""
+    total = 0
+    seen = 0
+    stack = [tempfile.gettempdir()]
+    while stack and seen < limit:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    seen += 1
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def render_prometheus(registry):
+    """Render the merged metrics in the Prometheus text exposition format"""
+    merged = registry.collect()
+    lines = []
+
+    def header(name, metric_type, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+
+    for name, (metric_type, help_text) in METRICS.items():
+        if metric_type == 'counter':
+            series = merged['counters'].get(name, {})
+        elif metric_type == 'gauge':
+            series = merged['gauges'].get(name, {})
+        else:
+            series = merged['histograms'].get(name, {})
+        header(name, metric_type, help_text)
+        for key in sorted(series):
+            if metric_type == 'histogram':
+                hist = series[key]
+                for bound, count in zip(LATENCY_BUCKETS, hist['buckets']):
+                    lines.append(f'{name}_bucket{_format_labels(key, [("le", _format_value(float(bound)))])} {count}')
+                lines.append(f'{name}_bucket{_format_labels(key, [("le", "+Inf")])} {hist["count"]}')
+                lines.append(f'{name}_sum{_format_labels(key)} {_format_value(float(hist["sum"]))}')
+                lines.append(f'{name}_count{_format_labels(key)} {hist["count"]}')
+            else:
+                lines.append(f'{name}{_format_labels(key)} {_format_value(series[key])}')
+
+    # Cache hit ratio derived from the aggregated lookups
+    header('graph_cache_hit_ratio', 'gauge', 'Cache hit ratio since the master started')
+    lookups = {}
+    for key, value in merged['counters'].get('graph_cache_requests_total', {}).items():
+        labels = dict(tuple(pair) for pair in json.loads(key))
+        stats = lookups.setdefault(labels.get('cache', ''), {'hit': 0, 'miss': 0})
+        stats[labels.get('result', 'miss')] = stats.get(labels.get('result', 'miss'), 0) + value
+    for cache in sorted(lookups):
+        total = lookups[cache]['hit'] + lookups[cache]['miss']
+        ratio = lookups[cache]['hit'] / total if total else 0.0
+        lines.append(f'graph_cache_hit_ratio{_format_labels(_label_key({"cache": cache}))} {_format_value(float(ratio))}')
+
+    header('graph_tempdir_bytes', 'gauge', 'Bytes used under the temp dir that holds reports and batch archives')
+    lines.append(f'graph_tempdir_bytes {_temp_dir_usage()}')
+    header('graph_tempdir_free_bytes', 'gauge', 'Free bytes on the temp dir filesystem')
+    try:
+        free = shutil.disk_usage(tempfile.gettempdir()).free
+    except OSError:
+        free = 0
+    lines.append(f'graph_tempdir_free_bytes {free}')
+    return '\n'.join(lines) + '\n'
+
+
+# Global metrics registry instance
+metrics_registry = MetricsRegistry()
+
+def get_metrics():
+    """Get the global metrics registry"""
+    return metrics_registry
@@ -0,0 +1,130 @@
+"""
+Process pool for report generation.
+
+Gunicorn runs threaded workers so logins, project lists, downloads and
+status polls are never stuck behind a long batch. Report generation is
+CPU-bound and pyplot keeps global state, so it must not run in those
+threads: it runs in a separate pool of processes, each with its own app
+(and Mongo client) built by REPORT_POOL_APP_FACTORY. A request thread
+blocks on its job while the worker's other threads keep serving.
+
+REPORT_POOL_WORKERS sets the number of processes per web worker. With 0,
+jobs run in the calling thread, one at a time; tests and the benchmarks
+use that mode.
+
+Pool processes are spawned, so they do not share the rendering stack the
+gunicorn master warmed before forking (utils/warmup.py): each one imports
+and warms its own, about 100MB of private memory. The rendering memory of a
+host is therefore web workers x REPORT_POOL_WORKERS stacks, which is why
+gunicorn.conf.py sizes the pools from the CPUs shared by all workers.
+"""
+
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Pool processes are replaced after about this many jobs each, like gunicorn's max_requests
+MAX_JOBS_PER_PROCESS = int(os.environ.get('REPORT_POOL_MAX_JOBS', 100))
+
+_pool_app = None
+
+
+def _resolve(target):
+    """'module:attribute' -> object"""
+    module_name, attribute = target.split(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _init_pool_process(app_factory):
+    """Build the pool process's app once and warm the rendering stack before the first job"""
+    global _pool_app
+    _pool_app = _resolve(app_factory)()
+    from utils.warmup import warm_rendering_stack, warmup_enabled
+    if warmup_enabled():
+        warm_rendering_stack(freeze=False, logger=_pool_app.logger)
+
+
+def _run_in_app(target, args, kwargs):
+    with _pool_app.app_context():
+        return _resolve(target)(*args, **kwargs)
+
+
+class ReportPool:
+    """Runs 'module:function' targets in pool processes (or inline when max_workers is 0)"""
+
+    def __init__(self, max_workers, app_factory='app:create_app'):
+        self.max_workers = max_workers
+        self.app_factory = app_factory
+        self._executor = None
+        self._jobs = 0
+        self._lock = threading.Lock()
+        # Inline jobs share this process's pyplot state, so they run one at a time
+        self._inline_lock = threading.Lock()
+
+    @property
+    def inline(self):
+        return self.max_workers <= 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is not None and self._jobs >= MAX_JOBS_PER_PROCESS * self.max_workers:
+                # Recycle the processes (max_tasks_per_child needs Python 3.11); jobs already
+                # submitted still finish in the old ones, which then exit
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._executor is None:
+                # spawn: pool processes must not inherit the web worker's threads, sockets or Mongo client
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_pool_process, initargs=(self.app_factory,))
+                self._jobs = 0
+            self._jobs += 1
+            return self._executor
+
+    def call(self, target, *args, **kwargs):
+        """Run target(*args, **kwargs) inside an app context and return its result"""
+        if self.inline:
+            with self._inline_lock:
+                return _resolve(target)(*args, **kwargs)
+        executor = self._get_executor()
+        try:
+            return executor.submit(_run_in_app, target, args, kwargs).result()
+        except BrokenProcessPool:
+            # A pool process died (e.g. killed for memory); start a fresh pool for the next job
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_report_pool(app):
+    """The report pool of this process for an app, sized from its REPORT_POOL_WORKERS setting"""
+    key = (os.getpid(), id(app))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ReportPool(int(app.config.get('REPORT_POOL_WORKERS', 0)),
+                                            app.config.get('REPORT_POOL_APP_FACTORY', 'app:create_app'))
+        return pool
+
+
+def shutdown_report_pools():
+    """Stop this process's pool processes (gunicorn worker_exit)"""
+    with _pools_lock:
+        pools = [pool for (pid, _), pool in _pools.items() if pid == os.getpid()]
+    for pool in pools:
+        pool.shutdown()
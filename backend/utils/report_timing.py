@@ -0,0 +1,142 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class ReportTimer:
+    """Collects per-stage and per-chart timings for a single report generation"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last_lap = self.started
+        self.stages = {}
+        self.charts = []
+        self.chart_types = {}
+        self.chart_builds = {}
+        self.reused_charts = []
+
+    def add_stage(self, name, seconds):
+        """Add an externally measured duration to a stage"""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def lap(self, name):
+        """Attribute the time since the previous lap (or start) to a sequential stage"""
+        now = time.perf_counter()
+        self.add_stage(name, now - self._last_lap)
+        self._last_lap = now
+
+    def reset_lap(self):
+        """Start the next lap from now without recording anything"""
+        self._last_lap = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block of work; repeated stages with the same name are summed"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def note_chart_type(self, chart_tag, chart_type):
+        """Remember the resolved chart type for a tag (set from inside generate_chart)"""
+        self.chart_types[chart_tag.lower()] = chart_type or "unknown"
+
+    def note_chart_build(self, chart_tag, figures, traces):
+        """Remember how many figures (Matplotlib or Plotly) and Plotly traces a chart built"""
+        self.chart_builds[chart_tag.lower()] = {"figures": figures, "traces": traces}
+
+    def record_chart(self, chart_tag, seconds, success):
+        """Record a single generate_chart call"""
+        build = self.chart_builds.get(chart_tag.lower(), {})
+        self.charts.append({
+            "tag": chart_tag,
+            "chart_type": self.chart_types.get(chart_tag.lower(), "unknown"),
+            "seconds": round(seconds, 4),
+            "success": bool(success),
+            "figures": build.get("figures", 0),
+            "traces": build.get("traces", 0)
+        })
+
+    def note_reused_chart(self, chart_tag):
+        """Record a chart whose image was reused from the project's last report instead of rendered"""
+        self.reused_charts.append(chart_tag)
+
+    def as_dict(self):
+        """Return a JSON-serialisable summary of the collected timings"""
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "charts": list(self.charts),
+            "reused_charts": list(self.reused_charts)
+        }
+
+
+class TimingHistogram:
+    """Rolling in-process window of stage and chart timings with percentile summaries"""
+
+    def __init__(self, window_size=500):
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._chart_types = {}
+
+    def _observe(self, bucket, key, seconds):
+        samples = bucket.get(key)
+        if samples is None:
+            samples = bucket[key] = deque(maxlen=self.window_size)
+        samples.append(seconds)
+
+    def observe_report(self, report_timer):
+        """Add every stage and chart timing of a finished report to the window"""
+        timings = report_timer.as_dict()
+        with self._lock:
+            self._observe(self._stages, "total", timings["total_seconds"])
+            for name, seconds in timings["stages"].items():
+                self._observe(self._stages, name, seconds)
+            for chart in timings["charts"]:
+                self._observe(self._chart_types, chart["chart_type"], chart["seconds"])
+
+    @staticmethod
+    def _percentile(sorted_samples, percent):
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_samples:
+            return None
+        rank = max(math.ceil(percent / 100.0 * len(sorted_samples)), 1)
+        return sorted_samples[rank - 1]
+
+    def _summarise(self, bucket):
+        summary = {}
+        for key, samples in bucket.items():
+            ordered = sorted(samples)
+            summary[key] = {
+                "count": len(ordered),
+                "p50": round(self._percentile(ordered, 50), 4),
+                "p95": round(self._percentile(ordered, 95), 4)
+            }
+        return summary
+
+    def summary(self):
+        """Get p50/p95 latencies per stage and per chart type"""
+        with self._lock:
+            return {
+                "window_size": self.window_size,
+                "stages": self._summarise(self._stages),
+                "chart_types": self._summarise(self._chart_types)
+            }
+
+    def reset(self):
+        """Drop all collected samples"""
+        with self._lock:
+            self._stages.clear()
+            self._chart_types.clear()
+
+
+# Global timing histogram instance
+timing_histogram = TimingHistogram()
+
+def get_timing_histogram():
+    """Get the global report timing histogram"""
+    return timing_histogram
@@ -0,0 +1,59 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from utils.metrics import get_metrics
+
+# Flask-Login loads the user on every authenticated request; dashboard polling makes that constant Mongo traffic
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', 60))
+USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', 1024))
+
+
+class UserCache:
+    """Per-process LRU of User objects by id, each kept for at most ttl_seconds"""
+
+    def __init__(self, ttl_seconds=USER_CACHE_TTL_SECONDS, max_size=USER_CACHE_MAX_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+
+    def get(self, user_id):
+        """Cached user, or None when missing or expired"""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._users.move_to_end(user_id)
+                user = entry[1]
+            else:
+                if entry is not None:
+                    del self._users[user_id]
+                user = None
+        get_metrics().record_cache('user', hit=user is not None)
+        return user
+
+    def put(self, user_id, user):
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._users[user_id] = (time.monotonic() + self.ttl_seconds, user)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_size:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+# Global user cache instance
+user_cache = UserCache()
+
+def get_user_cache():
+    """Get the global user cache"""
+    return user_cache
@@ -0,0 +1,126 @@
+"""
+Rendering stack warm-up for the gunicorn master.
+
+With preload_app the master imports the app once and forks workers from
+it. The report libraries are imported lazily and set up more state on
+first use (Matplotlib's font list and ggplot style, the Agg canvas,
+pandas' openpyxl Excel reader, plotly's trace validators, python-docx's
+default template), so without this every fresh or recycled worker paid
+for that on its first report and kept a private copy. warm_rendering_stack()
+does it once before the first fork; gc.freeze() then keeps the collector
+from touching those objects in the workers, so the pages stay shared
+copy-on-write. RENDER_WARMUP=0 turns it off.
+"""
+
+import gc
+import io
+import os
+import time
+
+from utils.bytecode import REPORT_LIBRARIES
+
+
+def warmup_enabled():
+    return os.environ.get('RENDER_WARMUP', '1').lower() not in ('0', 'false', 'off')
+
+
+def _warm_matplotlib(dpi):
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend('Agg')
+    plt.style.use('ggplot')
+    fig, (ax, pie_ax) = plt.subplots(1, 2, figsize=(4, 2))
+    ax.bar(['a', 'b'], [1, 2], label='bar')
+    ax.plot(['a', 'b'], [2, 1], marker='o', label='line')
+    ax.set_title('Warm-up')
+    ax.legend()
+    pie_ax.pie([1, 2], labels=['a', 'b'], autopct='%1.0f%%')
+    fig.tight_layout()
+    fig.savefig(io.BytesIO(), format='png', dpi=dpi, bbox_inches='tight')
+    fig.savefig(io.BytesIO(), format='svg')
+    plt.close(fig)
+
+
+def _warm_excel():
+    import openpyxl
+    import pandas as pd
+
+    buffer = io.BytesIO()
+    workbook = openpyxl.Workbook()
+    workbook.active.append(['Section', 'Value'])
+    workbook.active.append(['a', 1])
+    workbook.save(buffer)
+    buffer.seek(0)
+    pd.read_excel(buffer, sheet_name=0, keep_default_na=False)
+    buffer.seek(0)
+    openpyxl.load_workbook(buffer, data_only=True)
+
+
+def _warm_plotly():
+    # Only builds a figure: kaleido's export process must be started by each worker, not inherited
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=1, cols=2, specs=[[{'type': 'domain'}, {'type': 'xy'}]])
+    fig.add_trace(go.Pie(labels=['a', 'b'], values=[1, 2]), row=1, col=1)
+    fig.add_trace(go.Bar(x=['a', 'b'], y=[1, 2]), row=1, col=2)
+    fig.add_trace(go.Scatter(x=['a', 'b'], y=[2, 1]), row=1, col=2)
+    fig.update_layout(title='Warm-up', showlegend=False)
+    fig.to_dict()
+
+
+def _warm_docx():
+    from docx import Document
+    from docx.shared import Inches
+
+    document = Document()
+    document.add_paragraph('Warm-up')
+    document.add_table(rows=1, cols=1)
+    document.save(io.BytesIO())
+    Inches(1)
+
+
+def _warm_renderers():
+    from renderers import RENDERER_REGISTRY, get_renderer
+
+    for chart_type in set(RENDERER_REGISTRY):
+        get_renderer(chart_type)
+
+
+def warm_rendering_stack(dpi=None, freeze=True, logger=None):
+    """
+    Initialise the report libraries in this process; returns seconds per step.
+
+    A failing step is logged and skipped: a worker then pays for it on its
+    first report as before.
+    """
+    if dpi is None:
+        from routes.projects import CHART_DPI
+        dpi = CHART_DPI
+    timings = {}
+    for module in REPORT_LIBRARIES:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    steps = (
+        ('matplotlib', lambda: _warm_matplotlib(dpi)),
+        ('excel', _warm_excel),
+        ('plotly', _warm_plotly),
+        ('docx', _warm_docx),
+        ('renderers', _warm_renderers),
+    )
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            if logger:
+                logger.warning("⚠️ Rendering warm-up step %s failed: %s", name, e)
+            continue
+        timings[name] = time.perf_counter() - started
+    gc.collect()
+    if freeze:
+        # Objects created so far are moved to a permanent generation the workers' collections never scan
+        gc.freeze()
+    return timings
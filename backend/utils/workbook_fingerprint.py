@@ -0,0 +1,69 @@
+"""
+Workbook fingerprints for deduplicating the files of a batch.
+
+file_digest matches exact copies. cell_digest covers only what report
+generation reads: sheet names and order, the active sheet and the cell
+values (cached formula results, as with data_only=True). A copy re-saved by
+Excel, which rewrites styles, document properties and the file layout,
+therefore still matches.
+"""
+
+import hashlib
+
+DIGEST_FIELDS = ('file_digest', 'cell_digest')
+_BLOCK = 1024 * 1024
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cell_digest(path):
+    """Digest of sheet names and cell values, or None when openpyxl cannot read the file (e.g. .xls)"""
+    import openpyxl
+    try:
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    except Exception:
+        return None
+    try:
+        digest = hashlib.sha256(f"active={wb.active.title if wb.active else None}".encode())
+        for ws in wb.worksheets:
+            digest.update(f"\0sheet={ws.title}".encode())
+            for row_idx, row in enumerate(ws.iter_rows(min_row=1, values_only=True), 1):
+                values = list(row)
+                # Empty trailing cells and rows depend on how the file was saved, not on its data
+                while values and values[-1] is None:
+                    values.pop()
+                if values:
+                    digest.update(f"\0{row_idx}:{values!r}".encode())
+        return digest.hexdigest()
+    except Exception:
+        return None
+    finally:
+        wb.close()
+
+
+def workbook_digests(path):
+    return {'file_digest': file_digest(path), 'cell_digest': cell_digest(path)}
+
+
+class BatchDuplicates:
+    """Results already generated in one batch, found by either digest of a later workbook"""
+
+    def __init__(self):
+        self._results = {}
+
+    def find(self, digests):
+        for field in DIGEST_FIELDS:
+            if digests.get(field) and (field, digests[field]) in self._results:
+                return self._results[(field, digests[field])]
+        return None
+
+    def add(self, digests, result):
+        for field in DIGEST_FIELDS:
+            if digests.get(field):
+                self._results.setdefault((field, digests[field]), result)
@@ -80,14 +80,19 @@ import axios from 'axios';
 
 axios.defaults.withCredentials = true;
 
+// Projects are listed newest first, one page per request
+const PROJECTS_PAGE_SIZE = 50;
+
 function Dashboard() {
   const navigate = useNavigate();
   const [projects, setProjects] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [openCreateProjectDialog, setOpenCreateProjectDialog] = useState(false);
   const [openEditProjectDialog, setOpenEditProjectDialog] = useState(false);
   const [openReportModal, setOpenReportModal] = useState(false);
-  const [newProject, setNewProject] = useState({ name: '', description: '', file: null });
-  const [editingProject, setEditingProject] = useState({ name: '', description: '', file: null });
+  const [newProject, setNewProject] = useState({ name: '', description: '', chart_output_format: 'png', png_optimization: 'off', file: null });
+  const [editingProject, setEditingProject] = useState({ name: '', description: '', chart_output_format: 'png', png_optimization: 'off', file: null });
   const [selectedProjectForReport, setSelectedProjectForReport] = useState(null);
   const [user, setUser] = useState(null);
   const [isGeneratingReport, setIsGeneratingReport] = useState(false);
@@ -138,15 +143,25 @@ function Dashboard() {
     }
   };
 
+  const fetchProjectsPage = async (cursor) => {
+    const params = { limit: PROJECTS_PAGE_SIZE };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    const response = await axios.get(`${process.env.REACT_APP_API_URL}/api/projects`, { params });
+    setNextCursor(response.data.next_cursor || null);
+    return response.data;
+  };
+
   const loadProjects = async () => {
     setIsLoading(true);
     try {
-      const response = await axios.get(`${process.env.REACT_APP_API_URL}/api/projects`);
-      setProjects(response.data.projects);
+      const page = await fetchProjectsPage(null);
+      setProjects(page.projects);
       
-      // Calculate stats
-      const total = response.data.projects.length;
-      const recent = response.data.projects.filter(p => {
+      // Calculate stats (recent projects are counted over the loaded pages)
+      const total = page.total ?? page.projects.length;
+      const recent = page.projects.filter(p => {
         const daysSince = (new Date() - new Date(p.created_at)) / (1000 * 60 * 60 * 24);
         return daysSince <= 7;
       }).length;
@@ -164,6 +179,19 @@ function Dashboard() {
     }
   };
 
+  const loadMoreProjects = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await fetchProjectsPage(nextCursor);
+      setProjects(prev => [...prev, ...page.projects]);
+    } catch (error) {
+      console.error('Error loading more projects:', error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   // Filter and sort projects
   const filteredAndSortedProjects = projects
     .filter(project => {
@@ -248,6 +276,8 @@ function Dashboard() {
       const formData = new FormData();
       formData.append('name', newProject.name);
       formData.append('description', newProject.description);
+      formData.append('chart_output_format', newProject.chart_output_format);
+      formData.append('png_optimization', newProject.png_optimization);
       if (newProject.file) {
         formData.append('file', newProject.file);
       }
@@ -259,7 +289,7 @@ function Dashboard() {
       });
   
       setOpenCreateProjectDialog(false);
-      setNewProject({ name: '', description: '', file: null });
+      setNewProject({ name: '', description: '', chart_output_format: 'png', png_optimization: 'off', file: null });
       loadProjects();
       showAlert('Success!', 'Project created successfully.', 'success');
     } catch (error) {
@@ -273,6 +303,10 @@ function Dashboard() {
       id: project.id,
       name: project.name,
       description: project.description,
+      chart_output_format: project.chart_output_format || 'png',
+      png_optimization: typeof project.png_optimization === 'object' && project.png_optimization
+        ? 'custom'
+        : (project.png_optimization || 'off'),
       file: null
     });
     setOpenEditProjectDialog(true);
@@ -283,6 +317,11 @@ function Dashboard() {
       const formData = new FormData();
       formData.append('name', editingProject.name);
       formData.append('description', editingProject.description);
+      formData.append('chart_output_format', editingProject.chart_output_format);
+      // Custom settings made through the API are left unchanged
+      if (editingProject.png_optimization !== 'custom') {
+        formData.append('png_optimization', editingProject.png_optimization);
+      }
       if (editingProject.file) {
         formData.append('file', editingProject.file);
       }
@@ -294,7 +333,7 @@ function Dashboard() {
       });
 
       setOpenEditProjectDialog(false);
-      setEditingProject({ name: '', description: '', file: null });
+      setEditingProject({ name: '', description: '', chart_output_format: 'png', png_optimization: 'off', file: null });
       loadProjects();
       showAlert('Success!', 'Project updated successfully.', 'success');
     } catch (error) {
@@ -381,6 +420,48 @@ function Dashboard() {
     setAlert(prev => ({ ...prev, open: false }));
   };
 
+  // Send a batch ZIP in chunks; an interrupted chunk is resent from the server's byte count
+  const uploadZipInChunks = async (zipFile, projectId, onProgress) => {
+    const api = process.env.REACT_APP_API_URL;
+    const body = { filename: zipFile.name, size: zipFile.size };
+    if (window.crypto?.subtle && zipFile.size <= 256 * 1024 * 1024) {
+      const digest = await window.crypto.subtle.digest('SHA-256', await zipFile.arrayBuffer());
+      body.sha256 = Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+    }
+    const created = await axios.post(`${api}/api/projects/${projectId}/batch_uploads`, body);
+    const { upload_id: uploadId, chunk_size: chunkSize } = created.data;
+
+    let received = 0;
+    let failures = 0;
+    while (received < zipFile.size) {
+      const end = Math.min(received + chunkSize, zipFile.size);
+      try {
+        const response = await axios.put(`${api}/api/batch_uploads/${uploadId}`, zipFile.slice(received, end), {
+          headers: {
+            'Content-Type': 'application/octet-stream',
+            'Content-Range': `bytes ${received}-${end - 1}/${zipFile.size}`,
+          },
+        });
+        received = response.data.received;
+        failures = 0;
+      } catch (error) {
+        if (error.response?.status === 409) {
+          received = error.response.data.received;
+        } else if (++failures > 5) {
+          throw error;
+        } else {
+          await new Promise(resolve => setTimeout(resolve, 1000 * failures));
+          const status = await axios.get(`${api}/api/batch_uploads/${uploadId}`).catch(() => null);
+          if (status) {
+            received = status.data.received;
+          }
+        }
+      }
+      onProgress(received, zipFile.size);
+    }
+    return uploadId;
+  };
+
   const handleBatchReportGeneration = async (zipFile) => {
     if (!zipFile || !selectedProjectForReport) {
       showAlert('Error!', 'Please select a ZIP file to upload.', 'error');
@@ -388,23 +469,53 @@ function Dashboard() {
     }
 
       setIsBatchGenerating(true);
-    setBatchProgress({ current: 0, total: 0, message: 'Uploading ZIP file...', percentage: 10 });
+    setBatchProgress({ current: 0, total: 0, message: 'Uploading ZIP file...', percentage: 2 });
 
       try {
-        const formData = new FormData();
-        formData.append('zip_file', zipFile);
+      const api = process.env.REACT_APP_API_URL;
+      const uploadId = await uploadZipInChunks(zipFile, selectedProjectForReport.id, (received, size) => {
+        setBatchProgress({
+          current: 0,
+          total: 0,
+          message: `Uploading ZIP file... ${Math.round((received / size) * 100)}%`,
+          percentage: 2 + Math.round((received / size) * 13),
+        });
+      });
 
-      setBatchProgress({ current: 0, total: 0, message: 'Processing ZIP file...', percentage: 20 });
-      
-        const response = await axios.post(
-          `${process.env.REACT_APP_API_URL}/api/projects/${selectedProjectForReport.id}/upload_zip`,
-          formData,
-          {
-            headers: { 'Content-Type': 'multipart/form-data' },
-          }
+      setBatchProgress({ current: 0, total: 0, message: 'Checking workbooks...', percentage: 15 });
+
+      // Dry-run validation so broken workbooks are reported before any report is rendered
+      const formData = new FormData();
+      formData.append('upload_id', uploadId);
+      const preflight = await axios.post(
+        `${api}/api/projects/${selectedProjectForReport.id}/preflight_zip`,
+        formData,
+        {
+          headers: { 'Content-Type': 'multipart/form-data' },
+        }
+      );
+
+      if (preflight.data.invalid_files > 0) {
+        await axios.delete(`${api}/api/batch_uploads/${uploadId}`).catch(() => {});
+        const problems = preflight.data.files
+          .filter(file => !file.valid)
+          .slice(0, 3)
+          .map(file => `${file.file}: ${file.errors[0]}`)
+          .join('\n');
+        showAlert(
+          'Workbooks Need Fixing ⚠️',
+          `${preflight.data.invalid_files} of ${preflight.data.total_files} workbooks failed validation.\n${problems}`,
+          'warning'
         );
+        return;
+      }
+
+      setBatchProgress({ current: 0, total: 0, message: 'Processing ZIP file...', percentage: 20 });
+
+      // Reports of workbooks that arrived early are already generated; this finishes the rest
+      const response = await axios.post(`${api}/api/batch_uploads/${uploadId}/complete`);
 
-      const { total_files, processed_files } = response.data;
+      const { total_files, processed_files, deduplicated_files } = response.data;
       const percentage = Math.round((processed_files / total_files) * 100);
       
       setBatchProgress({ 
@@ -431,10 +542,8 @@ function Dashboard() {
       });
       
       try {
-        const downloadResponse = await axios.get(
-          `${process.env.REACT_APP_API_URL}/api/reports/batch_reports_${selectedProjectForReport.id}.zip`,
-          { responseType: 'blob' }
-        );
+        // Kept on the server under its batch id, so this download can be repeated until the batch expires
+        const downloadResponse = await axios.get(`${api}${response.data.download_url}`, { responseType: 'blob' });
 
         const blob = new Blob([downloadResponse.data]);
         const link = document.createElement('a');
@@ -453,7 +562,8 @@ function Dashboard() {
         setTimeout(() => {
           showAlert(
             'Batch Processing Complete! 🎉',
-            `Successfully generated and downloaded ${processed_files} out of ${total_files} reports.`,
+            `Successfully generated and downloaded ${processed_files} out of ${total_files} reports.` +
+              (deduplicated_files ? ` ${deduplicated_files} duplicate workbooks reused an identical report.` : ''),
             'success'
           );
           handleCloseReportModal();
@@ -502,91 +612,64 @@ function Dashboard() {
     try {
       const formData = new FormData();
       formData.append('report_file', reportFile);
+      // The generated report comes back in this response, with its chart error counts in headers
+      formData.append('response', 'docx');
 
-      setSingleProgress({ message: 'Processing Excel data...', percentage: 40 });
+      setSingleProgress({ message: 'Generating charts and report...', percentage: 40 });
 
-      await axios.post(
+      const reportResponse = await axios.post(
         `${process.env.REACT_APP_API_URL}/api/projects/${selectedProjectForReport.id}/upload_report`,
         formData,
         {
           headers: { 'Content-Type': 'multipart/form-data' },
+          responseType: 'blob',
+          withCredentials: true,
         }
       );
-      
-      setSingleProgress({ message: 'Generating charts and report...', percentage: 70 });
-      
-      try {
-        const errorResponse = await axios.get(`${process.env.REACT_APP_API_URL}/api/projects/${selectedProjectForReport.id}/chart_errors`);
-        const errors = errorResponse.data;
-        
-        const chartErrorCount = Object.keys(errors.chart_generation_errors || {}).length;
-        const reportErrorCount = (errors.report_generation_errors || []).length;
-        const totalErrors = chartErrorCount + reportErrorCount;
-        
-        if (totalErrors === 0) {
-          showAlert(
-            'Report Generated Successfully! 🎉',
-            'All charts were generated without any errors.',
-            'success'
-          );
-        } else if (totalErrors < 5) {
-          showAlert(
-            'Report Generated with Warnings ⚠️',
-            `${totalErrors} chart(s) failed to generate. The report was created but some charts may be missing. Click "View Errors" for details.`,
-            'warning'
-          );
-        } else {
-          showAlert(
-            'Report Generation Issues ❌',
-            `${totalErrors} charts failed to generate. The report may be incomplete. Click "View Errors" to see what went wrong.`,
-            'error'
-          );
-        }
-      } catch (errorCheckError) {
-        console.error('Error checking for chart errors:', errorCheckError);
-        showAlert(
-          'Report Generated! 📄',
-          'Report was created successfully, but error checking failed.',
-          'warning'
-        );
-      }
 
       setSingleProgress({ message: 'Downloading generated report...', percentage: 90 });
 
-      try {
-        const downloadResponse = await axios.get(
-          `${process.env.REACT_APP_API_URL}/api/reports/${selectedProjectForReport.id}/download`,
-          {
-            responseType: 'blob',
-            withCredentials: true,
-          }
-        );
-
-        const blob = new Blob([downloadResponse.data]);
-        const link = document.createElement('a');
-        link.href = URL.createObjectURL(blob);
+      const chartErrorCount = parseInt(reportResponse.headers['x-chart-errors'] || '0', 10);
+      const reportErrorCount = parseInt(reportResponse.headers['x-report-errors'] || '0', 10);
+      const totalErrors = chartErrorCount + reportErrorCount;
 
-        const contentDisposition = downloadResponse.headers['content-disposition'];
-        let filename = `${selectedProjectForReport.name}_report.docx`;
-        if (contentDisposition) {
-          const filenameMatch = contentDisposition.match(/filename="(.+)"/);
-          if (filenameMatch && filenameMatch[1]) {
-            filename = decodeURIComponent(filenameMatch[1]);
-          }
-        }
-        link.download = filename;
-        link.click();
-        URL.revokeObjectURL(link.href);
-        
-        setSingleProgress({ message: 'Report downloaded successfully!', percentage: 100 });
-      } catch (downloadError) {
-        console.error('Error downloading report:', downloadError.response?.data || downloadError.message);
+      if (totalErrors === 0) {
+        showAlert(
+          'Report Generated Successfully! 🎉',
+          'All charts were generated without any errors.',
+          'success'
+        );
+      } else if (totalErrors < 5) {
         showAlert(
-          'Download Failed! ⚠️',
-          'Report was generated but failed to download. Please try again.',
+          'Report Generated with Warnings ⚠️',
+          `${totalErrors} chart(s) failed to generate. The report was created but some charts may be missing. Click "View Errors" for details.`,
           'warning'
         );
+      } else {
+        showAlert(
+          'Report Generation Issues ❌',
+          `${totalErrors} charts failed to generate. The report may be incomplete. Click "View Errors" to see what went wrong.`,
+          'error'
+        );
+      }
+
+      const blob = new Blob([reportResponse.data]);
+      const link = document.createElement('a');
+      link.href = URL.createObjectURL(blob);
+
+      const contentDisposition = reportResponse.headers['content-disposition'];
+      let filename = `${selectedProjectForReport.name}_report.docx`;
+      if (contentDisposition) {
+        const filenameMatch = contentDisposition.match(/filename="?([^";]+)"?/);
+        if (filenameMatch && filenameMatch[1]) {
+          filename = decodeURIComponent(filenameMatch[1]);
+        }
       }
+      link.download = filename;
+      link.click();
+      URL.revokeObjectURL(link.href);
+
+      setSingleProgress({ message: 'Report downloaded successfully!', percentage: 100 });
 
       setTimeout(() => {
         handleCloseReportModal();
@@ -1354,6 +1437,20 @@ function Dashboard() {
         </Grid>
       )}
 
+      {/* Next page of projects */}
+      {!isLoading && nextCursor && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+          <Button
+            variant="outlined"
+            onClick={loadMoreProjects}
+            disabled={isLoadingMore}
+            startIcon={isLoadingMore ? <CircularProgress size={16} /> : null}
+          >
+            {isLoadingMore ? 'Loading...' : `Load more projects (${projects.length} of ${stats.total})`}
+          </Button>
+        </Box>
+      )}
+
       {/* Project Actions Menu */}
       <Menu
         anchorEl={anchorEl}
@@ -1431,6 +1528,33 @@ function Dashboard() {
             onChange={(e) => setNewProject({ ...newProject, description: e.target.value })}
             sx={{ mb: 2 }}
           />
+          <TextField
+            select
+            margin="dense"
+            label="Chart Image Format"
+            fullWidth
+            value={newProject.chart_output_format}
+            onChange={(e) => setNewProject({ ...newProject, chart_output_format: e.target.value })}
+            helperText="SVG keeps charts sharp and makes reports smaller; older Word versions show a PNG fallback"
+            sx={{ mb: 2 }}
+          >
+            <MenuItem value="png">PNG</MenuItem>
+            <MenuItem value="svg">SVG (vector)</MenuItem>
+          </TextField>
+          <TextField
+            select
+            margin="dense"
+            label="PNG Compression"
+            fullWidth
+            value={newProject.png_optimization}
+            onChange={(e) => setNewProject({ ...newProject, png_optimization: e.target.value })}
+            helperText="Palette reduction makes chart images about 4x smaller, which shrinks batch ZIPs"
+            sx={{ mb: 2 }}
+          >
+            <MenuItem value="off">Off</MenuItem>
+            <MenuItem value="lossless">Lossless (strip metadata, max zlib)</MenuItem>
+            <MenuItem value="palette">Palette (256 colours)</MenuItem>
+          </TextField>
           <Box sx={{ mt: 2 }}>
             <Typography variant="body2" color="text.secondary" sx={{ mb: 1 }}>
               Word Template (Optional)
@@ -1506,6 +1630,36 @@ function Dashboard() {
             onChange={(e) => setEditingProject({ ...editingProject, description: e.target.value })}
             sx={{ mb: 2 }}
           />
+          <TextField
+            select
+            margin="dense"
+            label="Chart Image Format"
+            fullWidth
+            value={editingProject.chart_output_format}
+            onChange={(e) => setEditingProject({ ...editingProject, chart_output_format: e.target.value })}
+            helperText="SVG keeps charts sharp and makes reports smaller; older Word versions show a PNG fallback"
+            sx={{ mb: 2 }}
+          >
+            <MenuItem value="png">PNG</MenuItem>
+            <MenuItem value="svg">SVG (vector)</MenuItem>
+          </TextField>
+          <TextField
+            select
+            margin="dense"
+            label="PNG Compression"
+            fullWidth
+            value={editingProject.png_optimization}
+            onChange={(e) => setEditingProject({ ...editingProject, png_optimization: e.target.value })}
+            helperText="Palette reduction makes chart images about 4x smaller, which shrinks batch ZIPs"
+            sx={{ mb: 2 }}
+          >
+            <MenuItem value="off">Off</MenuItem>
+            <MenuItem value="lossless">Lossless (strip metadata, max zlib)</MenuItem>
+            <MenuItem value="palette">Palette (256 colours)</MenuItem>
+            {editingProject.png_optimization === 'custom' && (
+              <MenuItem value="custom" disabled>Custom</MenuItem>
+            )}
+          </TextField>
           <Box sx={{ mt: 2 }}>
             <Typography variant="body2" color="text.secondary" sx={{ mb: 1 }}>
               Upload new Word template (optional - leave empty to keep current template)